@@ -319,50 +319,102 @@ of the choice of plugin.
 """
 
 from collections import OrderedDict  # noqa
-import pkg_resources  # noqa
+from typing import TYPE_CHECKING
 
+from snapcraft._lazy import LazyModule as _LazyModule
 
-def _get_version():
+
+def _get_version() -> str:
     import os as _os
 
     if _os.environ.get("SNAP_NAME") == "snapcraft":
         return _os.environ["SNAP_VERSION"]
+
+    import pkg_resources
+
     try:
         return pkg_resources.require("snapcraft")[0].version
     except pkg_resources.DistributionNotFound:
         return "devel"
 
 
-# Set this early so that the circular imports aren't too painful
-__version__ = _get_version()
-
-
-from snapcraft._baseplugin import BasePlugin  # noqa
-
-# FIXME LP: #1662658
-from snapcraft._store import (  # noqa
-    create_key,
-    close,
-    download,
-    revisions,
-    gated,
-    list_keys,
-    list_registered,
-    login,
-    push,
-    push_metadata,
-    register,
-    register_key,
-    release,
-    sign_build,
-    status,
-    validate,
-)
-from snapcraft import common  # noqa
-from snapcraft import extractors  # noqa
-from snapcraft import plugins  # noqa
-from snapcraft import sources  # noqa
-from snapcraft import file_utils  # noqa
-from snapcraft import shell_utils  # noqa
-from snapcraft.internal import repo  # noqa
-from snapcraft.project._project_options import ProjectOptions  # noqa
+class _SnapcraftModule(_LazyModule):
+    # The public API is imported when first used: the modules behind it pull
+    # in most of snapcraft and its dependencies, which commands such as
+    # snapcraftctl and snapcraft --version do not need.
+    lazy_attributes = {
+        "BasePlugin": "snapcraft._baseplugin",
+        # FIXME LP: #1662658
+        "create_key": "snapcraft._store",
+        "close": "snapcraft._store",
+        "download": "snapcraft._store",
+        "revisions": "snapcraft._store",
+        "gated": "snapcraft._store",
+        "list_keys": "snapcraft._store",
+        "list_registered": "snapcraft._store",
+        "login": "snapcraft._store",
+        "push": "snapcraft._store",
+        "push_metadata": "snapcraft._store",
+        "register": "snapcraft._store",
+        "register_key": "snapcraft._store",
+        "release": "snapcraft._store",
+        "sign_build": "snapcraft._store",
+        "status": "snapcraft._store",
+        "validate": "snapcraft._store",
+        "ProjectOptions": "snapcraft.project._project_options",
+    }
+    lazy_modules = {
+        "common": "snapcraft.common",
+        "extractors": "snapcraft.extractors",
+        "plugins": "snapcraft.plugins",
+        "sources": "snapcraft.sources",
+        "file_utils": "snapcraft.file_utils",
+        "shell_utils": "snapcraft.shell_utils",
+        "repo": "snapcraft.internal.repo",
+    }
+
+    def __getattr__(self, name):
+        if name == "__version__":
+            # Looking up the version of the installed distribution is slow.
+            self.__version__ = _get_version()
+            return self.__version__
+        return super().__getattr__(name)
+
+
+if TYPE_CHECKING:
+    # Type checkers do not see the lazy attributes, give them the static
+    # imports instead.
+    __version__ = _get_version()
+
+    from snapcraft._baseplugin import BasePlugin  # noqa
+
+    # FIXME LP: #1662658
+    from snapcraft._store import (  # noqa
+        create_key,
+        close,
+        download,
+        revisions,
+        gated,
+        list_keys,
+        list_registered,
+        login,
+        push,
+        push_metadata,
+        register,
+        register_key,
+        release,
+        sign_build,
+        status,
+        validate,
+    )
+    from snapcraft import common  # noqa
+    from snapcraft import extractors  # noqa
+    from snapcraft import plugins  # noqa
+    from snapcraft import sources  # noqa
+    from snapcraft import file_utils  # noqa
+    from snapcraft import shell_utils  # noqa
+    from snapcraft.internal import repo  # noqa
+    from snapcraft.project._project_options import ProjectOptions  # noqa
+
+
+_SnapcraftModule.install(__name__)
@@ -19,7 +19,7 @@ import logging
 import os
 from subprocess import CalledProcessError
 
-from snapcraft.internal import common, errors
+from snapcraft.internal import common, errors, jobserver
 
 
 logger = logging.getLogger(__name__)
@@ -182,6 +182,39 @@ class BasePlugin:
         else:
             return self.project.parallel_build_count
 
+    def get_parallel_build_args(self):
+        """Return the -j arguments for make style builds.
+
+        None are returned while the lifecycle shares a job server, as the
+        build then takes its job slots from the MAKEFLAGS set in the
+        environment returned by get_parallel_build_env.
+        """
+        if self._get_jobserver() is not None:
+            return []
+        return ["-j{}".format(self.parallel_build_count)]
+
+    def get_parallel_build_env(self, env=None):
+        """Return the environment for make style builds.
+
+        While the lifecycle shares a job server, the options of MAKEFLAGS
+        are extended for the build to take its job slots from it.
+
+        :param dict env: the environment to extend, os.environ if None.
+        :returns: env, extended with MAKEFLAGS if needed.
+        """
+        active_jobserver = self._get_jobserver()
+        if active_jobserver is None:
+            return env
+        env = os.environ.copy() if env is None else env.copy()
+        env["MAKEFLAGS"] = active_jobserver.get_makeflags(env.get("MAKEFLAGS", ""))
+        return env
+
+    def _get_jobserver(self):
+        # disable-parallel builds run a single job, without the job server.
+        if self.parallel_build_count > 1:
+            return jobserver.get_jobserver()
+        return None
+
     # Helpers
     def run(self, cmd, cwd=None, **kwargs):
         if not cwd:
@@ -0,0 +1,56 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import importlib
+import sys
+import types
+from typing import Any, Dict  # noqa: F401
+
+
+class LazyModule(types.ModuleType):
+    """Module type importing some of its attributes when first accessed.
+
+    Subclasses map attribute names to the module providing them in
+    lazy_attributes and submodule names to their module in lazy_modules.
+    Module level __getattr__ is only supported from Python 3.7 onwards,
+    so packages install this type with install().
+    """
+
+    lazy_attributes = dict()  # type: Dict[str, str]
+    lazy_modules = dict()  # type: Dict[str, str]
+
+    def __getattr__(self, name: str) -> Any:
+        if name in self.lazy_attributes:
+            module = importlib.import_module(self.lazy_attributes[name])
+            value = getattr(module, name)
+        elif name in self.lazy_modules:
+            value = importlib.import_module(self.lazy_modules[name])
+        else:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(self.__name__, name)
+            )
+        setattr(self, name, value)
+        return value
+
+    def __dir__(self):
+        return sorted(
+            set(super().__dir__()) | set(self.lazy_attributes) | set(self.lazy_modules)
+        )
+
+    @classmethod
+    def install(cls, module_name: str) -> None:
+        """Make the already imported module_name of this type."""
+        sys.modules[module_name].__class__ = cls
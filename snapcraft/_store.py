@@ -31,10 +31,15 @@ from typing import Any, Dict, Iterable, List, Optional, TextIO, TYPE_CHECKING
 from snapcraft.cli import echo
 from tabulate import tabulate
 
-from snapcraft.file_utils import calculate_sha3_384, get_tool_path
+from snapcraft.file_utils import calculate_sha3_384
 from snapcraft import storeapi, yaml_utils
-from snapcraft.internal import cache, deltas, repo
-from snapcraft.internal.errors import SnapDataExtractionError, ToolMissingError
+from snapcraft.internal import cache, deltas, repo, squashfs
+from snapcraft.internal.errors import (
+    SnapDataExtractionError,
+    SquashfsPathNotFoundError,
+    SquashfsReadError,
+    ToolMissingError,
+)
 from snapcraft.internal.deltas.errors import (
     DeltaGenerationError,
     DeltaGenerationTooBigError,
@@ -49,51 +54,26 @@ logger = logging.getLogger(__name__)
 
 
 def _get_data_from_snap_file(snap_path):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        unsquashfs_path = get_tool_path("unsquashfs")
-        try:
-            output = subprocess.check_output(
-                [
-                    unsquashfs_path,
-                    "-d",
-                    os.path.join(temp_dir, "squashfs-root"),
-                    snap_path,
-                    "-e",
-                    os.path.join("meta", "snap.yaml"),
-                ]
-            )
-        except subprocess.CalledProcessError:
-            raise SnapDataExtractionError(os.path.basename(snap_path))
-        logger.debug(output)
-        with open(
-            os.path.join(temp_dir, "squashfs-root", "meta", "snap.yaml")
-        ) as yaml_file:
-            snap_yaml = yaml_utils.load(yaml_file)
-    return snap_yaml
+    try:
+        snap_yaml = squashfs.read_file(snap_path, "meta/snap.yaml")
+    except (SquashfsPathNotFoundError, SquashfsReadError):
+        raise SnapDataExtractionError(os.path.basename(snap_path))
+    return yaml_utils.load(snap_yaml)
 
 
 @contextlib.contextmanager
 def _get_icon_from_snap_file(snap_path):
     icon_file = None
     with tempfile.TemporaryDirectory() as temp_dir:
-        unsquashfs_path = get_tool_path("unsquashfs")
         try:
-            output = subprocess.check_output(
-                [
-                    unsquashfs_path,
-                    "-d",
-                    os.path.join(temp_dir, "squashfs-root"),
-                    snap_path,
-                    "-e",
-                    "meta/gui",
-                ]
-            )
-        except subprocess.CalledProcessError:
+            squashfs.extract(snap_path, temp_dir, paths=["meta/gui"])
+        except SquashfsPathNotFoundError:
+            pass
+        except SquashfsReadError:
             raise SnapDataExtractionError(os.path.basename(snap_path))
-        logger.debug("Output extracting icon from snap: %s", output)
         for extension in ("png", "svg"):
             icon_name = "icon.{}".format(extension)
-            icon_path = os.path.join(temp_dir, "squashfs-root", "meta/gui", icon_name)
+            icon_path = os.path.join(temp_dir, "meta/gui", icon_name)
             if os.path.exists(icon_path):
                 icon_file = open(icon_path, "rb")
                 break
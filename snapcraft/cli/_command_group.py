@@ -13,6 +13,9 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import importlib
+from typing import Dict  # noqa: F401
+
 import click
 
 from snapcraft.internal import deprecations
@@ -40,6 +43,30 @@ _CMD_LEGACY = ["cleanbuild", "refresh", "search", "update", "define"]
 
 
 class SnapcraftGroup(click.Group):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lazy_commands = dict()  # type: Dict[str, str]
+
+    def add_lazy_command(self, cmd_name: str, command_group: str) -> None:
+        """Register cmd_name as provided by command_group.
+
+        :param str cmd_name: the name of the command.
+        :param str command_group: the command group providing the command,
+                                  as <module>:<group>. The module is only
+                                  imported when the command is first used.
+        """
+        self._lazy_commands[cmd_name] = command_group
+
+    def find_command(self, ctx, cmd_name):
+        """Return the command registered as cmd_name, without aliases."""
+        cmd = click.Group.get_command(self, ctx, cmd_name)
+        if cmd is None and cmd_name in self._lazy_commands:
+            module_name, group_name = self._lazy_commands[cmd_name].split(":")
+            command_group = getattr(importlib.import_module(module_name), group_name)
+            cmd = command_group.commands[cmd_name]
+            self.add_command(cmd)
+        return cmd
+
     def get_command(self, ctx, cmd_name):
         new_cmd_name = _CMD_DEPRECATED_REPLACEMENTS.get(cmd_name)
         if new_cmd_name:
@@ -53,14 +80,14 @@ class SnapcraftGroup(click.Group):
                         new_cmd_name, cmd_name
                     )
                 )
-            cmd = click.Group.get_command(self, ctx, new_cmd_name)
+            cmd = self.find_command(ctx, new_cmd_name)
         else:
             cmd_name = _CMD_ALIASES.get(cmd_name, cmd_name)
-            cmd = click.Group.get_command(self, ctx, cmd_name)
+            cmd = self.find_command(ctx, cmd_name)
         return cmd
 
     def list_commands(self, ctx):
-        commands = super().list_commands(ctx)
+        commands = sorted(set(super().list_commands(ctx)) | set(self._lazy_commands))
         # Let's keep edit-collaborators hidden until we get the green light
         # from the store.
         commands.pop(commands.index("edit-collaborators"))
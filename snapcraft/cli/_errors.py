@@ -28,7 +28,6 @@ import click
 
 from . import echo
 import snapcraft
-from snapcraft.config import CLIConfig as _CLIConfig
 from snapcraft.internal import errors
 
 # raven is not available on 16.04
@@ -283,6 +282,9 @@ def _print_trace_output(exc_info, file=sys.stdout) -> None:
 
 
 def _is_send_to_sentry(exc_info) -> bool:  # noqa: C901
+    # The configuration pulls in the store API, only needed on errors.
+    from snapcraft.config import CLIConfig as _CLIConfig
+
     # Check to see if error reporting has been disabled
     if (
         distutils.util.strtobool(os.getenv("SNAPCRAFT_ENABLE_ERROR_REPORTING", "y"))
@@ -20,7 +20,6 @@ import sys
 import click
 from typing import Dict, List
 
-from snapcraft.project import Project, get_snapcraft_yaml
 from snapcraft.cli.echo import confirm, prompt
 from snapcraft.internal import common, errors
 
@@ -114,6 +113,42 @@ _PROVIDER_OPTIONS = [
         envvar="SNAPCRAFT_BIND_SSH",
         supported_providers=["lxd", "multipass"],
     ),
+    dict(
+        param_decls="--copy-project",
+        is_flag=True,
+        help="Copy the project into locally-run build environments instead of mounting it.",
+        envvar="SNAPCRAFT_COPY_PROJECT",
+        supported_providers=["lxd", "multipass"],
+    ),
+    dict(
+        param_decls="--share-caches",
+        is_flag=True,
+        help="Share the download caches of the host with locally-run build environments.",
+        envvar="SNAPCRAFT_SHARE_CACHES",
+        supported_providers=["lxd", "multipass"],
+    ),
+    dict(
+        param_decls="--compiler-cache",
+        metavar="[ccache|sccache]",
+        help="Wrap the compilers used by parts with a persistent compiler cache.",
+        envvar="SNAPCRAFT_COMPILER_CACHE",
+        type=click.Choice(["ccache", "sccache"]),
+        supported_providers=["host", "lxd", "managed-host", "multipass"],
+    ),
+    dict(
+        param_decls="--offline",
+        is_flag=True,
+        help="Only use the dependencies of parts found in the dependency cache.",
+        envvar="SNAPCRAFT_OFFLINE",
+        supported_providers=["host", "lxd", "managed-host", "multipass"],
+    ),
+    dict(
+        param_decls="--content-digests",
+        is_flag=True,
+        help="Only update steps when the content of their files changed, not their timestamps.",
+        envvar="SNAPCRAFT_CONTENT_DIGESTS",
+        supported_providers=["host", "lxd", "managed-host", "multipass"],
+    ),
 ]
 
 
@@ -248,6 +283,8 @@ def get_build_provider_flags(build_provider: str, **kwargs) -> Dict[str, str]:
 
 
 def get_project(*, is_managed_host: bool = False, **kwargs):
+    from snapcraft.project import Project, get_snapcraft_yaml
+
     # We need to do this here until we can get_snapcraft_yaml as part of Project.
     if is_managed_host:
         try:
@@ -285,3 +322,16 @@ def apply_host_provider_flags(build_provider_flags: Dict[str, str]) -> None:
                 os.environ.pop(key)
         else:
             os.environ[key] = str(value)
+
+    # The lifecycle reads the compiler cache to use from the environment.
+    compiler_cache = build_provider_flags.get("compiler_cache")
+    if compiler_cache:
+        os.environ["SNAPCRAFT_COMPILER_CACHE"] = compiler_cache
+
+    # So do plugins, for whether to fetch dependencies.
+    if build_provider_flags.get("offline"):
+        os.environ["SNAPCRAFT_OFFLINE"] = "1"
+
+    # And the lifecycle, for whether steps track the digests of their content.
+    if build_provider_flags.get("content_digests"):
+        os.environ["SNAPCRAFT_CONTENT_DIGESTS"] = "1"
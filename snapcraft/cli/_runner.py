@@ -17,43 +17,85 @@ import functools
 import logging
 import os
 import sys
-from distutils import util
+from typing import cast
 
 import click
 
 import snapcraft
-from snapcraft.internal import log
-from .assertions import assertionscli
-from .containers import containerscli
-from .discovery import discoverycli
-from .legacy import legacycli
-from .lifecycle import lifecyclecli
-from .store import storecli
-from .inspect import inspectcli
-from .remote import remotecli
-from .help import helpcli
-from .extensions import extensioncli
-from .version import versioncli, SNAPCRAFT_VERSION_TEMPLATE
-from .ci import cicli
+from snapcraft.internal import common, log
+from .version import SNAPCRAFT_VERSION_TEMPLATE
 from ._command_group import SnapcraftGroup
 from ._options import add_build_options, add_provider_options
-from ._errors import exception_handler
 
 
-command_groups = [
-    storecli,
-    cicli,
-    assertionscli,
-    containerscli,
-    discoverycli,
-    helpcli,
-    legacycli,
-    lifecyclecli,
-    extensioncli,
-    versioncli,
-    inspectcli,
-    remotecli,
-]
+# Command groups pull in most of snapcraft and its dependencies, so their
+# commands are registered by name and their modules only imported when used.
+command_groups = {
+    "snapcraft.cli.store:storecli": [
+        "close",
+        "export-login",
+        "list-registered",
+        "list-revisions",
+        "login",
+        "logout",
+        "promote",
+        "push",
+        "push-metadata",
+        "register",
+        "release",
+        "status",
+        "whoami",
+    ],
+    "snapcraft.cli.ci:cicli": ["enable-ci"],
+    "snapcraft.cli.assertions:assertionscli": [
+        "create-key",
+        "edit-collaborators",
+        "gated",
+        "list-keys",
+        "register-key",
+        "sign-build",
+        "validate",
+    ],
+    "snapcraft.cli.containers:containerscli": ["refresh"],
+    "snapcraft.cli.discovery:discoverycli": ["list-plugins"],
+    "snapcraft.cli.help:helpcli": ["help"],
+    "snapcraft.cli.legacy:legacycli": ["cleanbuild", "define", "search", "update"],
+    "snapcraft.cli.lifecycle:lifecyclecli": [
+        "build",
+        "clean",
+        "init",
+        "pack",
+        "prime",
+        "pull",
+        "snap",
+        "stage",
+        "try",
+    ],
+    "snapcraft.cli.extensions:extensioncli": [
+        "expand-extensions",
+        "extension",
+        "list-extensions",
+    ],
+    "snapcraft.cli.version:versioncli": ["version"],
+    "snapcraft.cli.inspect:inspectcli": ["inspect"],
+    "snapcraft.cli.remote:remotecli": ["remote-build"],
+}
+
+
+def _print_version(ctx, param, value):
+    # Like click.version_option, but only looking up the version when needed.
+    if not value or ctx.resilient_parsing:
+        return
+    click.echo(SNAPCRAFT_VERSION_TEMPLATE % {"version": snapcraft.__version__})
+    ctx.exit()
+
+
+def _exception_handler(*args, **kwargs):
+    # Error handling pulls in error reporting and the store configuration,
+    # only import it when there is an error to handle.
+    from ._errors import exception_handler
+
+    exception_handler(*args, **kwargs)
 
 
 @click.group(
@@ -61,8 +103,13 @@ command_groups = [
     invoke_without_command=True,
     context_settings=dict(help_option_names=["-h", "--help"]),
 )
-@click.version_option(
-    message=SNAPCRAFT_VERSION_TEMPLATE, version=snapcraft.__version__  # type: ignore
+@click.option(
+    "--version",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=_print_version,
+    help="Show the version and exit.",
 )
 @click.pass_context
 @add_build_options(hidden=True)
@@ -73,7 +120,7 @@ def run(ctx, debug, catch_exceptions=False, **kwargs):
 
     # Debugging snapcraft itself is not tied to debugging a snapcraft project.
     try:
-        is_snapcraft_developer_debug = util.strtobool(
+        is_snapcraft_developer_debug = common.strtobool(
             os.getenv("SNAPCRAFT_ENABLE_DEVELOPER_DEBUG", "n")
         )
     except ValueError:
@@ -90,7 +137,7 @@ def run(ctx, debug, catch_exceptions=False, **kwargs):
 
     # Setup global exception handler (to be called for unhandled exceptions)
     sys.excepthook = functools.partial(
-        exception_handler, debug=is_snapcraft_developer_debug
+        _exception_handler, debug=is_snapcraft_developer_debug
     )
 
     # In an ideal world, this logger setup would be replaced
@@ -101,7 +148,7 @@ def run(ctx, debug, catch_exceptions=False, **kwargs):
 
     # The default command
     if not ctx.invoked_subcommand:
-        snap_command = lifecyclecli.commands["snap"]
+        snap_command = ctx.command.get_command(ctx, "snap")
         # Fill in the context with default values for the snap command.
         if "directory" not in ctx.params:
             ctx.params["directory"] = None
@@ -111,6 +158,6 @@ def run(ctx, debug, catch_exceptions=False, **kwargs):
 
 
 # This would be much easier if they were subcommands
-for command_group in command_groups:
-    for command in command_group.commands:
-        run.add_command(command_group.commands[command])
+for command_group, commands in command_groups.items():
+    for command in commands:
+        cast(SnapcraftGroup, run).add_lazy_command(command, command_group)
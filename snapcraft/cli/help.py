@@ -71,9 +71,9 @@ def help_command(ctx, topic, devel):
         """
             )
         )
-    elif topic in ctx.parent.command.commands:
+    elif ctx.parent.command.find_command(ctx, topic) is not None:
         ctx.info_name = topic
-        click.echo(ctx.parent.command.commands[topic].get_help(ctx))
+        click.echo(ctx.parent.command.find_command(ctx, topic).get_help(ctx))
     elif topic == "topics":
         for key in _TOPICS:
             click.echo(key)
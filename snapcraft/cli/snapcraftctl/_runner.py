@@ -23,10 +23,17 @@ import sys
 import click
 
 from snapcraft.internal import errors
-from snapcraft.cli._errors import exception_handler
 from snapcraft.internal import log
 
 
+def _exception_handler(*args, **kwargs):
+    # Error handling pulls in error reporting and the store configuration,
+    # only import it when there is an error to handle.
+    from snapcraft.cli._errors import exception_handler
+
+    exception_handler(*args, **kwargs)
+
+
 @click.group()
 @click.option("--debug", "-d", is_flag=True, envvar="SNAPCRAFT_ENABLE_DEVELOPER_DEBUG")
 def run(debug):
@@ -38,7 +45,7 @@ def run(debug):
         log_level = logging.INFO
 
     # Setup global exception handler (to be called for unhandled exceptions)
-    sys.excepthook = functools.partial(exception_handler, debug=debug)
+    sys.excepthook = functools.partial(_exception_handler, debug=debug)
 
     # In an ideal world, this logger setup would be replaced
     log.configure(log_level=log_level)
@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager, suppress
 import errno
 import hashlib
@@ -24,7 +25,17 @@ import shutil
 import stat
 import subprocess
 import sys
-from typing import Pattern, Callable, Generator, List, Optional, Set
+from typing import (
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
 
 from snapcraft.internal import common
 from snapcraft.internal.errors import (
@@ -39,6 +50,9 @@ from snapcraft.internal.errors import (
 if sys.version_info < (3, 6):
     import sha3  # noqa
 
+if sys.platform == "linux":
+    import fcntl
+
 
 logger = logging.getLogger(__name__)
 
@@ -178,6 +192,147 @@ def copy(source: str, destination: str, *, follow_symlinks: bool = False) -> Non
         )
 
 
+# ioctl to share the data blocks of a file with another (linux/fs.h).
+_FICLONE = 0x40049409
+
+# (source, destination) device pairs found not to support reflinks or
+# copy_file_range, so that they are only attempted once.
+_reflink_unsupported: Set[Tuple[int, int]] = set()
+_copy_file_range_unsupported: Set[Tuple[int, int]] = set()
+
+_CLONE_UNSUPPORTED_ERRNOS = {
+    errno.EBADF,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+    errno.EOPNOTSUPP,
+    errno.EXDEV,
+}
+
+
+def clone(source: str, destination: str, *, follow_symlinks: bool = False) -> None:
+    """Copy source to destination, sharing data blocks if possible.
+
+    On filesystems that support it (e.g. btrfs or xfs) the destination is a
+    copy-on-write reflink of source. Otherwise the data is copied in kernel
+    with copy_file_range, falling back to a regular copy. Either way, the
+    result behaves like a copy made with copy().
+
+    :param str source: The source to be cloned to destination.
+    :param str destination: Where to put the clone.
+    :param bool follow_symlinks: Whether or not symlinks should be followed.
+
+    :raises SnapcraftCopyFileNotFoundError: If source doesn't exist.
+    """
+    source_path = os.path.realpath(source) if follow_symlinks else source
+    if not os.path.isfile(source_path) or os.path.islink(source_path):
+        copy(source, destination, follow_symlinks=follow_symlinks)
+        return
+
+    with suppress(OSError):
+        os.unlink(destination)
+
+    try:
+        _clone_file(source_path, destination)
+    except FileNotFoundError:
+        raise SnapcraftCopyFileNotFoundError(source)
+    except OSError as e:
+        logger.debug("Unable to clone {!r}: {}".format(source, e))
+        copy(source, destination, follow_symlinks=follow_symlinks)
+        return
+
+    shutil.copystat(source_path, destination)
+    source_stat = os.stat(source_path)
+    try:
+        os.chown(destination, source_stat.st_uid, source_stat.st_gid)
+    except PermissionError as e:
+        logger.debug(
+            "Unable to chown {destination}: {error}".format(
+                destination=destination, error=e
+            )
+        )
+
+
+def _clone_file(source: str, destination: str) -> None:
+    with open(source, "rb") as source_file, open(destination, "wb") as dest_file:
+        devices = (
+            os.fstat(source_file.fileno()).st_dev,
+            os.fstat(dest_file.fileno()).st_dev,
+        )
+        if _reflink(source_file.fileno(), dest_file.fileno(), devices):
+            return
+        if _copy_file_range(source_file.fileno(), dest_file.fileno(), devices):
+            return
+
+        # Start over with a regular copy.
+        source_file.seek(0)
+        dest_file.seek(0)
+        dest_file.truncate()
+        shutil.copyfileobj(source_file, dest_file)
+
+
+def _reflink(source_fd: int, dest_fd: int, devices: Tuple[int, int]) -> bool:
+    if sys.platform != "linux" or devices in _reflink_unsupported:
+        return False
+
+    try:
+        fcntl.ioctl(dest_fd, _FICLONE, source_fd)
+    except OSError as e:
+        if e.errno not in _CLONE_UNSUPPORTED_ERRNOS:
+            raise
+        _reflink_unsupported.add(devices)
+        return False
+    return True
+
+
+def _copy_file_range(source_fd: int, dest_fd: int, devices: Tuple[int, int]) -> bool:
+    # Only available from Python 3.8 on.
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is None or devices in _copy_file_range_unsupported:
+        return False
+
+    try:
+        while copy_file_range(source_fd, dest_fd, 2 ** 30):
+            pass
+    except OSError as e:
+        if e.errno not in _CLONE_UNSUPPORTED_ERRNOS:
+            raise
+        _copy_file_range_unsupported.add(devices)
+        return False
+    # Some filesystems report success without copying anything.
+    return os.lseek(dest_fd, 0, os.SEEK_CUR) == os.fstat(source_fd).st_size
+
+
+def clone_tree(
+    source_tree: str,
+    destination_tree: str,
+    ignore: Callable[[str, List[str]], List[str]] = None,
+) -> None:
+    """Copy a source tree into a destination, sharing data blocks if possible.
+
+    Symlinks are preserved and files are cloned concurrently, see clone().
+
+    :param str source_tree: Source directory to be copied.
+    :param str destination_tree: Destination directory. If this directory
+                                 already exists, the files in `source_tree`
+                                 will take precedence.
+    :param callable ignore: If given, called with two params, source dir and
+                            dir contents, for every dir copied. Should return
+                            list of contents to NOT copy.
+    """
+    with ThreadPoolExecutor() as executor:
+        clones: List[Future] = []
+
+        def _submit_clone(source: str, destination: str) -> None:
+            clones.append(executor.submit(clone, source, destination))
+
+        link_or_copy_tree(
+            source_tree, destination_tree, ignore=ignore, copy_function=_submit_clone
+        )
+        for future in clones:
+            future.result()
+
+
 def link_or_copy_tree(
     source_tree: str,
     destination_tree: str,
@@ -332,6 +487,86 @@ def calculate_hash(path: str, *, algorithm: str) -> str:
     return hasher.hexdigest()
 
 
+# Large enough for content digests to never collide, small enough to keep
+# manifests of many files compact.
+_CONTENT_DIGEST_SIZE = 32
+
+
+def calculate_content_manifest(
+    root: str,
+    *,
+    paths: Optional[Iterable[str]] = None,
+    ignore: Callable[[str, List[str]], List[str]] = None,
+) -> Dict[str, str]:
+    """Calculate the digests of the files in the tree at root.
+
+    Files are hashed with BLAKE2, concurrently. Symlinks are recorded by
+    their target instead of being followed.
+
+    :param paths: paths, relative to root, to record instead of the whole
+                  tree. Directories and paths which do not exist are left out.
+    :param callable ignore: If given, called with two params, directory and
+                            directory contents, for every directory walked.
+                            Should return list of contents to NOT record.
+    :returns: a mapping of the paths, relative to root, to their digests.
+    """
+    if paths is None:
+        paths = _list_content(root, ignore)
+
+    paths = list(paths)
+    with ThreadPoolExecutor() as executor:
+        digests = executor.map(
+            _calculate_content_digest, (os.path.join(root, p) for p in paths)
+        )
+        return {p: d for p, d in zip(paths, digests) if d is not None}
+
+
+def calculate_manifest_digest(manifest: Dict[str, str]) -> str:
+    """Calculate a digest of the whole content recorded in manifest."""
+    hasher = hashlib.blake2b(digest_size=_CONTENT_DIGEST_SIZE)
+    for path, digest in sorted(manifest.items()):
+        hasher.update(os.fsencode(path) + b"\0" + digest.encode() + b"\0")
+    return hasher.hexdigest()
+
+
+def _list_content(
+    root: str, ignore: Optional[Callable[[str, List[str]], List[str]]]
+) -> List[str]:
+    paths: List[str] = []
+    for directory, directories, files in os.walk(root):
+        if ignore is not None:
+            ignored = set(ignore(directory, directories + files))
+            directories[:] = [d for d in directories if d not in ignored]
+            files = [f for f in files if f not in ignored]
+
+        # os.walk lists symlinks to directories with the directories, they
+        # are recorded as files.
+        files.extend(
+            d for d in directories if os.path.islink(os.path.join(directory, d))
+        )
+        paths.extend(os.path.relpath(os.path.join(directory, f), root) for f in files)
+    return paths
+
+
+def _calculate_content_digest(path: str) -> Optional[str]:
+    try:
+        mode = os.lstat(path).st_mode
+        if stat.S_ISLNK(mode):
+            hasher = hashlib.blake2b(
+                b"symlink\0" + os.fsencode(os.readlink(path)),
+                digest_size=_CONTENT_DIGEST_SIZE,
+            )
+            return hasher.hexdigest()
+        if stat.S_ISREG(mode):
+            hasher = hashlib.blake2b(digest_size=_CONTENT_DIGEST_SIZE)
+            for block in _file_reader_iter(path):
+                hasher.update(block)
+            return hasher.hexdigest()
+    except FileNotFoundError:
+        pass
+    return None
+
+
 def get_tool_path(command_name: str) -> str:
     """Return the path to the given command
 
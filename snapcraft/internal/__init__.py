@@ -14,6 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-from snapcraft.internal import cache  # noqa
-from snapcraft.internal import deltas  # noqa
-from snapcraft.internal import states  # noqa
+from snapcraft._lazy import LazyModule as _LazyModule
+
+
+class _InternalModule(_LazyModule):
+    lazy_modules = {
+        "cache": "snapcraft.internal.cache",
+        "deltas": "snapcraft.internal.deltas",
+        "states": "snapcraft.internal.states",
+    }
+
+
+_InternalModule.install(__name__)
@@ -22,19 +22,30 @@ import shlex
 import shutil
 import sys
 from textwrap import dedent
-from typing import Optional, Sequence
+from typing import IO, Optional, Sequence
 from typing import Any, Dict
 
 from xdg import BaseDirectory
 
-from . import errors
+from . import _sync, errors
 from ._snap import SnapInjector
-from snapcraft.internal import common, steps
+from snapcraft.internal import cache, common, steps
 from snapcraft import yaml_utils
 
 
 logger = logging.getLogger(__name__)
 
+# Namespaces of the snapcraft cache shared with build instances.
+_SHARED_CACHE_NAMESPACES = [
+    "compiler",
+    "dependencies",
+    "files",
+    "plugins",
+    "stage-packages",
+    "stage-snaps",
+    "wheels",
+]
+
 
 def _get_platform() -> str:
     return sys.platform
@@ -63,7 +74,7 @@ _CLOUD_USER_DATA_TMPL = dedent(
         devices: ["/"]
         ignore_growroot_disabled: false
     runcmd:
-    - ["ln", "-s", "../usr/share/zoneinfo/{timezone}", "/etc/localtime"]
+    - ["ln", "-sf", "../usr/share/zoneinfo/{timezone}", "/etc/localtime"]
     write_files:
         - path: /root/.bashrc
           permissions: 0644
@@ -180,6 +191,12 @@ class Provider(abc.ABC):
     ) -> Optional[bytes]:
         """Run a command on the instance."""
 
+    @abc.abstractmethod
+    def _run_stream(
+        self, command: Sequence[str], *, stdin: IO = None, stdout: IO = None
+    ) -> None:
+        """Run a command on the instance connecting its stdin and stdout to files."""
+
     @abc.abstractmethod
     def _launch(self):
         """Launch the instance."""
@@ -204,11 +221,33 @@ class Provider(abc.ABC):
         """Provider steps needed to make the project available to the instance.
         """
         target = (self._get_home_directory() / "project").as_posix()
-        self._mount(self.project._project_dir, target)
+        if self.build_provider_flags.get("copy_project"):
+            self._push_project(target)
+        else:
+            self._mount(self.project._project_dir, target)
 
         if self.build_provider_flags.get("bind_ssh"):
             self._mount_ssh()
 
+        if self.build_provider_flags.get("share_caches"):
+            self._mount_shared_caches()
+
+    def _push_project(self, target: str) -> None:
+        """Copy the project into instance local storage at target."""
+        if self._is_mounted(target):
+            self.echoer.warning(
+                "The project is mounted into the build environment, "
+                "clean the project to copy it instead."
+            )
+            return
+
+        _sync.push_directory(
+            source_dir=self.project._project_dir,
+            target=target,
+            state_filepath=os.path.join(self.provider_project_dir, "project-sync.json"),
+            run_stream=self._run_stream,
+        )
+
     def _mount_prime_directory(self) -> bool:
         """Mount the host prime directory into the provider.
 
@@ -227,6 +266,33 @@ class Provider(abc.ABC):
         target = (self._get_home_directory() / ".ssh").as_posix()
         self._mount(src, target)
 
+    def _mount_shared_caches(self) -> None:
+        """Mount the host caches that can be shared with the instance.
+
+        Only caches addressed by content or revision are shared, the users of
+        these take care of locking where concurrent writes could race.
+        """
+        host_cache_root = cache.SnapcraftCache().cache_root
+        home_dir = self._get_home_directory()
+        cache_mounts = [
+            (
+                os.path.join(host_cache_root, namespace),
+                home_dir / ".cache" / "snapcraft" / namespace,
+            )
+            for namespace in _SHARED_CACHE_NAMESPACES
+        ]
+        # The rust plugin uses the cargo home of the user.
+        cache_mounts.append(
+            (
+                cache.PluginCache(plugin_name="rust", namespace="registry").cache_dir,
+                home_dir / ".cargo" / "registry",
+            )
+        )
+
+        for host_source, target in cache_mounts:
+            os.makedirs(host_source, exist_ok=True)
+            self._mount(host_source, target.as_posix())
+
     def expose_prime(self) -> None:
         """Provider steps needed to expose the prime directory to the host.
         """
@@ -246,6 +312,25 @@ class Provider(abc.ABC):
             command.extend(["--output", output])
         self._run(command=command)
 
+        # Without a mount the snap needs to be brought back to the host.
+        if self.build_provider_flags.get("copy_project"):
+            self._pull_snaps(output=output)
+
+    def _pull_snaps(self, *, output: Optional[str]) -> None:
+        if output:
+            output_dir, output_name = os.path.split(output)
+            patterns = [output_name]
+        else:
+            output_dir = ""
+            patterns = ["*.snap"]
+
+        _sync.pull_files(
+            source_dir=(self._get_home_directory() / "project" / output_dir).as_posix(),
+            patterns=patterns,
+            destination=os.path.join(self.project._project_dir, output_dir),
+            run_stream=self._run_stream,
+        )
+
     def clean_project(self) -> bool:
         try:
             shutil.rmtree(self.provider_project_dir)
@@ -285,17 +370,111 @@ class Provider(abc.ABC):
             if os.path.exists(self.provider_project_dir):
                 shutil.rmtree(self.provider_project_dir)
             os.makedirs(self.provider_project_dir)
+            warm_instance_name = self._get_warm_instance_name()
+            if warm_instance_name is not None and self._launch_from_warm_instance(
+                warm_instance_name
+            ):
+                self._restore_warm_snap_registry(warm_instance_name)
+                # Bring whatever changed since the warm instance was saved up
+                # to speed, the package indexes included.
+                self._setup_snapcraft()
+                self._run(["snapcraft", "refresh"])
+                return
+
             # then launch
             self._launch()
             # We need to setup snapcraft now to be able to refresh
             self._setup_snapcraft()
             # and do first boot related things
             self._run(["snapcraft", "refresh"])
+
+            if warm_instance_name is not None:
+                self._save_warm_instance(warm_instance_name)
+                self._save_warm_snap_registry(warm_instance_name)
         else:
             # We always setup snapcraft after a start to bring it up to speed with
             # what is on the host
             self._setup_snapcraft()
 
+    def _get_warm_instance_name(self) -> Optional[str]:
+        """Return the name of the warm instance matching this project.
+
+        Warm instances are fully set up instances kept per build base,
+        architecture and snapcraft revision. They are only used when the
+        snapcraft snap from the host is injected, as otherwise the revision
+        in the instance is not known up front.
+        """
+        if not self._get_is_snap_injection_capable() or not common.is_snap():
+            return None
+
+        snapcraft_revision = os.getenv("SNAP_REVISION")
+        build_base = self.project.info.get_build_base()
+        if not snapcraft_revision or build_base is None:
+            return None
+
+        return "{}-{}-{}".format(
+            self._get_warm_instance_prefix(), self.project.deb_arch, snapcraft_revision
+        )
+
+    def _get_warm_instance_prefix(self) -> str:
+        return "snapcraft-warm-{}".format(self.project.info.get_build_base())
+
+    def _is_stale_warm_instance(self, name: str) -> bool:
+        """Return whether name is a warm instance superseded by this project's."""
+        prefix = "{}-{}-".format(
+            self._get_warm_instance_prefix(), self.project.deb_arch
+        )
+        return name.startswith(prefix) and name != self._get_warm_instance_name()
+
+    def _get_warm_instance_dir(self, warm_instance_name: str) -> str:
+        return os.path.join(
+            BaseDirectory.save_data_path("snapcraft"),
+            "warm-instances",
+            self._get_provider_name(),
+            warm_instance_name,
+        )
+
+    def _launch_from_warm_instance(self, warm_instance_name: str) -> bool:
+        """Launch the instance as a clone of warm_instance_name.
+
+        Providers that cannot clone instances keep this default.
+
+        :returns: True if the instance was launched from the warm instance.
+        """
+        return False
+
+    def _save_warm_instance(self, warm_instance_name: str) -> None:
+        """Keep a clone of the freshly set up instance as warm_instance_name."""
+
+    def _restore_warm_snap_registry(self, warm_instance_name: str) -> None:
+        warm_registry_filepath = os.path.join(
+            self._get_warm_instance_dir(warm_instance_name), "snap-registry.yaml"
+        )
+        if os.path.exists(warm_registry_filepath):
+            shutil.copyfile(
+                warm_registry_filepath,
+                os.path.join(self.provider_project_dir, "snap-registry.yaml"),
+            )
+
+    def _save_warm_snap_registry(self, warm_instance_name: str) -> None:
+        registry_filepath = os.path.join(
+            self.provider_project_dir, "snap-registry.yaml"
+        )
+        if not os.path.exists(registry_filepath):
+            return
+
+        warm_instance_dir = self._get_warm_instance_dir(warm_instance_name)
+        # Only the latest warm instance for a base and architecture is kept.
+        warm_instances_dir = os.path.dirname(warm_instance_dir)
+        if os.path.isdir(warm_instances_dir):
+            for name in os.listdir(warm_instances_dir):
+                if name != warm_instance_name and self._is_stale_warm_instance(name):
+                    shutil.rmtree(os.path.join(warm_instances_dir, name))
+        os.makedirs(warm_instance_dir, exist_ok=True)
+        shutil.copyfile(
+            registry_filepath, os.path.join(warm_instance_dir, "snap-registry.yaml")
+        )
+
     def _ensure_base(self) -> None:
         info = self._load_info()
         provider_base = info["base"] if "base" in info else None
@@ -386,6 +565,20 @@ class Provider(abc.ABC):
             value = str(value)
             env_list.append(f"{key}={value}")
 
+        # Configure the compiler cache for the lifecycle in the instance.
+        compiler_cache = self.build_provider_flags.get("compiler_cache")
+        if compiler_cache:
+            env_list.append(f"SNAPCRAFT_COMPILER_CACHE={compiler_cache}")
+            compiler_cache_size = os.environ.get("SNAPCRAFT_COMPILER_CACHE_SIZE")
+            if compiler_cache_size:
+                env_list.append(f"SNAPCRAFT_COMPILER_CACHE_SIZE={compiler_cache_size}")
+
+        if self.build_provider_flags.get("offline"):
+            env_list.append("SNAPCRAFT_OFFLINE=1")
+
+        if self.build_provider_flags.get("content_digests"):
+            env_list.append("SNAPCRAFT_CONTENT_DIGESTS=1")
+
         return env_list
 
     def _get_home_directory(self) -> pathlib.Path:
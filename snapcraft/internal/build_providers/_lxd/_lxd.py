@@ -20,7 +20,7 @@ import subprocess
 import sys
 import urllib.parse
 import warnings
-from typing import Dict, Optional, Sequence
+from typing import IO, Dict, Optional, Sequence
 
 from .._base_provider import Provider
 from .._base_provider import errors
@@ -187,6 +187,24 @@ class LXD(Provider):
 
         return output
 
+    def _run_stream(
+        self, command: Sequence[str], *, stdin: IO = None, stdout: IO = None
+    ) -> None:
+        self._ensure_container_running()
+
+        cmd = [self._LXC_BIN, "exec", self.instance_name, "--"]
+        cmd.extend(command)
+        self._log_run(cmd)
+
+        try:
+            subprocess.check_call(cmd, stdin=stdin, stdout=stdout)
+        except subprocess.CalledProcessError as process_error:
+            raise errors.ProviderExecError(
+                provider_name=self._get_provider_name(),
+                command=command,
+                exit_code=process_error.returncode,
+            ) from process_error
+
     def _launch(self) -> None:
         config = {
             "name": self.instance_name,
@@ -207,6 +225,53 @@ class LXD(Provider):
 
         self._start()
 
+    def _launch_from_warm_instance(self, warm_instance_name: str) -> bool:
+        if not self._lxd_client.containers.exists(warm_instance_name):
+            return False
+
+        self.echoer.wrapped(
+            "Cloning the build environment from {!r}".format(warm_instance_name)
+        )
+        config = {
+            "name": self.instance_name,
+            "source": {"type": "copy", "source": warm_instance_name},
+        }
+        try:
+            self._container = self._lxd_client.containers.create(config, wait=True)
+        except pylxd.exceptions.LXDAPIException as lxd_api_error:
+            logger.warning(
+                "Failed to clone {!r}, launching a new container: {}".format(
+                    warm_instance_name, lxd_api_error
+                )
+            )
+            return False
+
+        self._start()
+        return True
+
+    def _save_warm_instance(self, warm_instance_name: str) -> None:
+        # A warm instance is a stopped copy that new instances are cloned from.
+        try:
+            for container in self._lxd_client.containers.all():
+                if self._is_stale_warm_instance(container.name):
+                    container.delete(wait=True)
+            if not self._lxd_client.containers.exists(warm_instance_name):
+                self._lxd_client.containers.create(
+                    {
+                        "name": warm_instance_name,
+                        "source": {"type": "copy", "source": self.instance_name},
+                    },
+                    wait=True,
+                )
+        except pylxd.exceptions.LXDAPIException as lxd_api_error:
+            # Not being able to keep a warm instance only makes the next
+            # clean build slower.
+            logger.warning(
+                "Failed to save warm instance {!r}: {}".format(
+                    warm_instance_name, lxd_api_error
+                )
+            )
+
     def _start(self):
         if not self._lxd_client.containers.exists(self.instance_name):
             raise errors.ProviderInstanceNotFoundError(instance_name=self.instance_name)
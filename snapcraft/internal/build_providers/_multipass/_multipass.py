@@ -17,7 +17,7 @@
 import logging
 import os
 import sys
-from typing import Dict, Optional, Sequence
+from typing import IO, Dict, Optional, Sequence
 
 from .. import errors
 from .._base_provider import Provider
@@ -94,6 +94,17 @@ class Multipass(Provider):
             instance_name=self.instance_name, command=cmd, hide_output=hide_output
         )
 
+    def _run_stream(
+        self, command: Sequence[str], *, stdin: IO = None, stdout: IO = None
+    ) -> None:
+        cmd = ["sudo", "-i"]
+        cmd.extend(command)
+        self._log_run(cmd)
+
+        self._multipass_cmd.execute_stream(
+            instance_name=self.instance_name, command=cmd, stdin=stdin, stdout=stdout
+        )
+
     def _get_disk_image(self) -> str:
         return "snapcraft:{}".format(self.project.info.get_build_base())
 
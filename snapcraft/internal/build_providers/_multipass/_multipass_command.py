@@ -20,6 +20,7 @@ import subprocess
 
 from time import sleep
 from typing import Any, Callable, Dict, List, Optional, Sequence, Union  # noqa: F401
+from typing import IO
 
 from ._windows import windows_reload_multipass_path_env, windows_install_multipass
 
@@ -238,6 +239,32 @@ class MultipassCommand:
 
         return output
 
+    def execute_stream(
+        self,
+        *,
+        command: Sequence[str],
+        instance_name: str,
+        stdin: IO = None,
+        stdout: IO = None
+    ) -> None:
+        """Passthrough for running multipass exec connected to files.
+
+        :param list command: the command to exectute on the instance.
+        :param str instance_name: the name of the instance to execute command.
+        :param stdin: file to read the standard input of command from.
+        :param stdout: file to write the standard output of command to.
+        """
+        cmd = [self.provider_cmd, "exec", instance_name, "--"] + list(command)
+        logger.debug("Running {}".format(" ".join(cmd)))
+        try:
+            subprocess.check_call(cmd, stdin=stdin, stdout=stdout)
+        except subprocess.CalledProcessError as process_error:
+            raise errors.ProviderExecError(
+                provider_name=self.provider_name,
+                command=command,
+                exit_code=process_error.returncode,
+            ) from process_error
+
     def shell(self, *, instance_name: str) -> None:
         """Passthrough for running multipass shell.
 
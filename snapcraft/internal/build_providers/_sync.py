@@ -0,0 +1,176 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import stat
+import tarfile
+import tempfile
+from typing import Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Build artifacts of the project are never sent into the instance.
+_EXCLUDED_TOP_LEVEL_DIRS = frozenset(["parts", "stage", "prime"])
+
+
+def _scan(source_dir: str) -> Dict[str, List[int]]:
+    """Return the mode, size and modification time of the files in source_dir."""
+    entries = dict()  # type: Dict[str, List[int]]
+    for root, directories, files in os.walk(source_dir):
+        if root == source_dir:
+            directories[:] = [
+                d for d in directories if d not in _EXCLUDED_TOP_LEVEL_DIRS
+            ]
+            files = [f for f in files if not f.endswith(".snap")]
+
+        # Symlinks to directories are listed in directories but not followed.
+        for name in directories + files:
+            path = os.path.join(root, name)
+            file_stat = os.lstat(path)
+            entries[os.path.relpath(path, source_dir)] = [
+                file_stat.st_mode,
+                file_stat.st_size,
+                file_stat.st_mtime_ns,
+            ]
+    return entries
+
+
+def _load_state(state_filepath: str) -> Dict[str, List[int]]:
+    try:
+        with open(state_filepath) as state_file:
+            return json.load(state_file)
+    except (OSError, ValueError):
+        return dict()
+
+
+def _save_state(state_filepath: str, state: Dict[str, List[int]]) -> None:
+    dirpath = os.path.dirname(state_filepath)
+    if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+    with open(state_filepath + ".new", "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(state_filepath + ".new", state_filepath)
+
+
+def push_directory(
+    *,
+    source_dir: str,
+    target: str,
+    state_filepath: str,
+    run_stream: Callable[..., None]
+) -> None:
+    """Push the contents of source_dir into target in the instance.
+
+    The files are sent as a single tar stream into a tar process running
+    in the instance. What was pushed is recorded in state_filepath, so that
+    subsequent pushes only send files that changed and only remove from
+    target the files that are gone from source_dir.
+
+    :param run_stream: a callable which can run commands in the instance,
+                       feeding stdin into them.
+    """
+    previous = _load_state(state_filepath)
+    current = _scan(source_dir)
+
+    # Entries that changed type are removed before being sent again.
+    removed = sorted(
+        p
+        for p, entry in previous.items()
+        if p not in current or stat.S_IFMT(entry[0]) != stat.S_IFMT(current[p][0])
+    )
+    # Sorting ensures directories are created before their contents.
+    changed = sorted(p for p in current if previous.get(p) != current[p])
+    logger.debug(
+        "Pushing {} changed and removing {} deleted entries from {!r}".format(
+            len(changed), len(removed), source_dir
+        )
+    )
+
+    if removed:
+        with tempfile.TemporaryFile() as paths:
+            paths.write(
+                b"\0".join(os.fsencode(os.path.join(target, p)) for p in removed)
+            )
+            paths.seek(0)
+            run_stream(["xargs", "--null", "rm", "-rf", "--"], stdin=paths)
+
+    run_stream(["mkdir", "-p", target])
+    if changed:
+        with tempfile.TemporaryFile() as stream:
+            with tarfile.open(fileobj=stream, mode="w") as tar:
+                for path in changed:
+                    tar.add(
+                        os.path.join(source_dir, path), arcname=path, recursive=False
+                    )
+            stream.seek(0)
+            run_stream(
+                ["tar", "--extract", "--no-same-owner", "--directory", target],
+                stdin=stream,
+            )
+
+    _save_state(state_filepath, current)
+
+
+def pull_files(
+    *,
+    source_dir: str,
+    patterns: Sequence[str],
+    destination: str,
+    run_stream: Callable[..., None]
+) -> None:
+    """Pull the files in source_dir matching patterns into destination.
+
+    The matching files are sent out of the instance as a single tar stream.
+
+    :param run_stream: a callable which can run commands in the instance,
+                       writing their stdout into a file.
+    """
+    command = ["find", source_dir, "-mindepth", "1", "-maxdepth", "1", "("]
+    for index, pattern in enumerate(patterns):
+        if index:
+            command.append("-o")
+        command.extend(["-name", pattern])
+    command.extend([")", "-type", "f", "-printf", "%P\\0"])
+
+    with tempfile.TemporaryFile() as names, tempfile.TemporaryFile() as stream:
+        run_stream(command, stdout=names)
+        if os.fstat(names.fileno()).st_size == 0:
+            return
+        names.seek(0)
+        run_stream(
+            [
+                "tar",
+                "--create",
+                "--directory",
+                source_dir,
+                "--null",
+                "--files-from",
+                "-",
+            ],
+            stdin=names,
+            stdout=stream,
+        )
+        stream.seek(0)
+        with tarfile.open(fileobj=stream, mode="r") as tar:
+            # Only regular files directly in source_dir are expected.
+            members = [
+                m
+                for m in tar.getmembers()
+                if m.isfile() and os.path.basename(m.name) == m.name
+            ]
+            tar.extractall(destination, members=members)
@@ -15,6 +15,11 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from ._apt import AptStagePackageCache  # noqa
-from ._cache import SnapcraftCache  # noqa
+from ._cache import PluginCache, SnapcraftCache, locked  # noqa
+from ._compiler import CompilerCache, get_compiler_cache  # noqa
+from ._dependency import DependencyCache, get_lockfiles_digest, is_offline  # noqa
 from ._file import FileCache  # noqa
+from ._resolved_project import ResolvedProjectCache  # noqa
 from ._snap import SnapCache  # noqa
+from ._stage_snap import StageSnapCache  # noqa
+from ._wheel import WheelCache  # noqa
@@ -14,10 +14,36 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import os
+import sys
+from typing import Iterator
 
 from xdg import BaseDirectory
 
+if sys.platform == "linux":
+    import fcntl
+
+
+@contextlib.contextmanager
+def locked(directory: str) -> Iterator[None]:
+    """Hold an exclusive lock on directory while in the context.
+
+    Cache directories can be shared by concurrent snapcraft processes,
+    including ones running in build instances the cache is mounted into.
+    """
+    os.makedirs(directory, exist_ok=True)
+    if sys.platform != "linux":
+        yield
+        return
+
+    with open(os.path.join(directory, ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 
 class SnapcraftCache:
     """Generic cache base class.
@@ -45,3 +71,19 @@ class SnapcraftStagePackageCache(SnapcraftCache):
     def __init__(self):
         super().__init__()
         self.stage_package_cache_root = os.path.join(self.cache_root, "stage-packages")
+
+
+class PluginCache(SnapcraftCache):
+    """Cache for the downloads of the tools used by a plugin."""
+
+    def __init__(self, *, plugin_name: str, namespace: str) -> None:
+        """Create a new PluginCache.
+
+        :param str plugin_name: the name of the plugin using the cache.
+        :param str namespace: what is cached, such as the tool it is for.
+        """
+        super().__init__()
+        self.cache_dir = os.path.join(
+            self.cache_root, "plugins", plugin_name, namespace
+        )
+        os.makedirs(self.cache_dir, exist_ok=True)
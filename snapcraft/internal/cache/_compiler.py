@@ -0,0 +1,153 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import logging
+import os
+import re
+import subprocess
+from typing import Dict, Optional, Tuple
+
+from snapcraft.internal import errors
+from ._cache import SnapcraftCache
+
+logger = logging.getLogger(__name__)
+
+_SUPPORTED_LAUNCHERS = ["ccache", "sccache"]
+_DEFAULT_MAX_SIZE = "5G"
+
+# Statistics reported by `ccache --print-stats` (ccache >= 4).
+_CCACHE_HIT_KEYS = ["direct_cache_hit", "preprocessed_cache_hit"]
+_CCACHE_MISS_KEYS = ["cache_miss"]
+# Statistics reported by `ccache --show-stats` (ccache < 4).
+_CCACHE_LEGACY_HIT = re.compile(r"^cache hit \((direct|preprocessed)\)\s+(\d+)$")
+_CCACHE_LEGACY_MISS = re.compile(r"^cache miss\s+(\d+)$")
+
+
+def get_compiler_cache() -> Optional["CompilerCache"]:
+    """Return the compiler cache configured for the project, if any.
+
+    The cache is enabled by setting SNAPCRAFT_COMPILER_CACHE to the
+    launcher to use, and bounded by SNAPCRAFT_COMPILER_CACHE_SIZE.
+    """
+    launcher = os.environ.get("SNAPCRAFT_COMPILER_CACHE")
+    if not launcher:
+        return None
+
+    return CompilerCache(
+        launcher=launcher,
+        max_size=os.environ.get("SNAPCRAFT_COMPILER_CACHE_SIZE", _DEFAULT_MAX_SIZE),
+    )
+
+
+class CompilerCache(SnapcraftCache):
+    """Cache of compiler outputs shared by the builds of all parts.
+
+    The compilers run by the build of parts are wrapped with the launcher,
+    ccache or sccache, through the build environment.
+    """
+
+    def __init__(self, *, launcher: str, max_size: str = _DEFAULT_MAX_SIZE) -> None:
+        if launcher not in _SUPPORTED_LAUNCHERS:
+            raise errors.InvalidCompilerCacheError(
+                launcher=launcher, supported=_SUPPORTED_LAUNCHERS
+            )
+
+        super().__init__()
+        self.launcher = launcher
+        self.max_size = max_size
+        self.cache_dir = os.path.join(self.cache_root, "compiler", launcher)
+
+    def get_environment(self, *, compiler_prefix: str = "") -> Dict[str, str]:
+        """Return the build environment wrapping the compilers."""
+        env = {
+            "CC": "{} {}gcc".format(self.launcher, compiler_prefix),
+            "CXX": "{} {}g++".format(self.launcher, compiler_prefix),
+        }
+        if self.launcher == "ccache":
+            env["CCACHE_DIR"] = self.cache_dir
+            env["CCACHE_MAXSIZE"] = self.max_size
+        else:
+            env["SCCACHE_DIR"] = self.cache_dir
+            env["SCCACHE_CACHE_SIZE"] = self.max_size
+            # ccache cannot wrap rustc.
+            env["RUSTC_WRAPPER"] = self.launcher
+
+        return env
+
+    def get_stats(self) -> Optional[Tuple[int, int]]:
+        """Return the hits and misses recorded by the launcher.
+
+        :returns: a tuple of hits and misses, or None if the launcher could
+                  not report them.
+        """
+        env = os.environ.copy()
+        env.update(self.get_environment())
+        try:
+            if self.launcher == "ccache":
+                return _get_ccache_stats(env)
+            else:
+                return _get_sccache_stats(env)
+        except (OSError, subprocess.CalledProcessError, KeyError, ValueError) as e:
+            logger.debug("Unable to get {} statistics: {}".format(self.launcher, e))
+            return None
+
+
+def _get_ccache_stats(env: Dict[str, str]) -> Tuple[int, int]:
+    try:
+        output = subprocess.check_output(
+            ["ccache", "--print-stats"], env=env, stderr=subprocess.DEVNULL
+        )
+    except subprocess.CalledProcessError:
+        return _get_legacy_ccache_stats(env)
+
+    hits = misses = 0
+    for line in output.decode().splitlines():
+        key, _, value = line.partition("\t")
+        if key in _CCACHE_HIT_KEYS:
+            hits += int(value)
+        elif key in _CCACHE_MISS_KEYS:
+            misses += int(value)
+    return hits, misses
+
+
+def _get_legacy_ccache_stats(env: Dict[str, str]) -> Tuple[int, int]:
+    # ccache releases without --print-stats only report human readable stats.
+    hits = misses = 0
+    output = subprocess.check_output(["ccache", "--show-stats"], env=env)
+    for line in output.decode().splitlines():
+        hit_match = _CCACHE_LEGACY_HIT.match(line.strip())
+        miss_match = _CCACHE_LEGACY_MISS.match(line.strip())
+        if hit_match:
+            hits += int(hit_match.group(2))
+        elif miss_match:
+            misses += int(miss_match.group(1))
+    return hits, misses
+
+
+def _get_sccache_stats(env: Dict[str, str]) -> Tuple[int, int]:
+    output = subprocess.check_output(
+        ["sccache", "--show-stats", "--stats-format", "json"], env=env
+    )
+    stats = json.loads(output.decode())["stats"]
+
+    def _count(value) -> int:
+        # Newer versions of sccache count per language.
+        if isinstance(value, dict):
+            return sum(value.get("counts", {}).values())
+        return int(value)
+
+    return _count(stats["cache_hits"]), _count(stats["cache_misses"])
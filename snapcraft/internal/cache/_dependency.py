@@ -0,0 +1,132 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import hashlib
+import logging
+import os
+from typing import Iterable, Iterator, Optional
+
+from snapcraft.internal import common, errors
+from ._cache import SnapcraftCache, locked
+
+logger = logging.getLogger(__name__)
+
+
+def is_offline() -> bool:
+    """Return whether dependencies must only come from the dependency cache.
+
+    Offline mode is enabled by setting SNAPCRAFT_OFFLINE.
+    """
+    return common.strtobool(os.environ.get("SNAPCRAFT_OFFLINE", "n"))
+
+
+def get_lockfiles_digest(
+    lockfile_paths: Iterable[str], *, extra: Iterable[str] = ()
+) -> Optional[str]:
+    """Return a digest of the lockfiles which exist in lockfile_paths.
+
+    :param extra: strings also pinning the dependencies, such as packages
+                  named on the command line.
+    :returns: the digest or None if none of the lockfiles exist.
+    """
+    digest = hashlib.sha384()
+    found = False
+    for path in lockfile_paths:
+        try:
+            with open(path, "rb") as lockfile:
+                content = lockfile.read()
+        except FileNotFoundError:
+            continue
+        found = True
+        digest.update(os.path.basename(path).encode() + b"\0")
+        digest.update(hashlib.sha384(content).digest())
+
+    if not found:
+        return None
+
+    digest.update(b"\0".join(e.encode() for e in sorted(extra)))
+    return digest.hexdigest()
+
+
+class DependencyCache(SnapcraftCache):
+    """Cache of the dependencies fetched by the package manager of a plugin.
+
+    The package manager of an ecosystem (pip, npm, go, ...) keeps what it
+    downloads in store_dir, its own content addressed store. Once every
+    dependency pinned by a set of lockfiles is fetched, the digest of the
+    lockfiles is recorded, so later fetches for the same lockfiles can be
+    done offline when running offline.
+    """
+
+    def __init__(self, *, ecosystem: str) -> None:
+        """Create a new DependencyCache.
+
+        :param str ecosystem: the package manager the dependencies are for.
+        """
+        super().__init__()
+        self.ecosystem = ecosystem
+        self.cache_dir = os.path.join(self.cache_root, "dependencies", ecosystem)
+        self.store_dir = os.path.join(self.cache_dir, "store")
+        self._lockfiles_dir = os.path.join(self.cache_dir, "lockfiles")
+        os.makedirs(self.store_dir, exist_ok=True)
+
+    def has_lockfiles(self, digest: Optional[str]) -> bool:
+        """Return whether the dependencies pinned by digest were fetched."""
+        if digest is None:
+            return False
+        return os.path.exists(os.path.join(self._lockfiles_dir, digest))
+
+    def add_lockfiles(self, digest: str) -> None:
+        """Record the dependencies pinned by digest as fetched."""
+        os.makedirs(self._lockfiles_dir, exist_ok=True)
+        open(os.path.join(self._lockfiles_dir, digest), "w").close()
+
+    @contextlib.contextmanager
+    def fetch(self, *, part_name: str, digest: Optional[str]) -> Iterator[bool]:
+        """Fetch the dependencies pinned by digest in this context.
+
+        The context yields whether the fetch must be done offline, from
+        store_dir alone, which is only the case when running offline.
+        Otherwise the package manager is expected to prefer store_dir but may
+        still use the network, the store can have been pruned by the package
+        manager since the lockfiles were recorded. Fetches into the store are
+        serialised.
+
+        Without lockfiles, a digest of None, what is missing from the store
+        is only known to the package manager, which is left to fail when
+        running offline.
+
+        :raises errors.DependencyCacheMissError: if running offline and the
+                                                 dependencies are not cached.
+        """
+        offline = is_offline()
+        cached = self.has_lockfiles(digest)
+        if cached:
+            logger.debug(
+                "Using cached {} dependencies for part {!r}".format(
+                    self.ecosystem, part_name
+                )
+            )
+        elif digest is not None and offline:
+            raise errors.DependencyCacheMissError(
+                part_name=part_name, ecosystem=self.ecosystem
+            )
+
+        with locked(self.cache_dir):
+            yield offline
+            if digest is not None and not cached:
+                self.add_lockfiles(digest)
@@ -16,6 +16,7 @@
 import logging
 import os
 import shutil
+import tempfile
 from typing import Optional
 
 from snapcraft.file_utils import calculate_hash
@@ -60,7 +61,18 @@ class FileCache(SnapcraftCache):
                 # this must not be hard-linked, as rebuilding a snap
                 # with changes should invalidate the cache, hence avoids
                 # using fileutils.link_or_copy.
-                shutil.copyfile(filename, cached_file_path)
+                # The cache can be shared, so the file is only made visible
+                # once complete.
+                with tempfile.NamedTemporaryFile(
+                    dir=os.path.dirname(cached_file_path), delete=False
+                ) as new_file:
+                    pass
+                try:
+                    shutil.copyfile(filename, new_file.name)
+                    os.replace(new_file.name, cached_file_path)
+                except OSError:
+                    os.unlink(new_file.name)
+                    raise
         except OSError:
             logger.warning("Unable to cache file {}.".format(cached_file_path))
             return None
@@ -0,0 +1,83 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import json
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from ._cache import SnapcraftProjectCache
+
+logger = logging.getLogger(__name__)
+
+
+class ResolvedProjectCache(SnapcraftProjectCache):
+    """Cache for the resolved snapcraft.yaml of a project.
+
+    Only the latest entry is kept, stored as JSON in a file named after its
+    key.
+    """
+
+    def __init__(self, *, project_name: str) -> None:
+        super().__init__(project_name=project_name)
+        self.resolved_project_cache_root = os.path.join(
+            self.project_cache_root, "resolved"
+        )
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.resolved_project_cache_root, "{}.json".format(key))
+
+    def get(self, *, key: str) -> Optional[Dict[str, Any]]:
+        """Get the resolved snapcraft.yaml cached for key.
+
+        :returns: the resolved snapcraft.yaml or None if not cached.
+        """
+        try:
+            with open(self._get_entry_path(key)) as entry_file:
+                return json.load(entry_file, object_pairs_hook=collections.OrderedDict)
+        except (OSError, ValueError):
+            return None
+
+    def add(self, *, key: str, snapcraft_yaml: Dict[str, Any]) -> None:
+        """Cache snapcraft_yaml for key, replacing any other entry.
+
+        snapcraft_yaml is not cached if it does not survive being stored as
+        JSON unchanged.
+        """
+        try:
+            contents = json.dumps(snapcraft_yaml)
+        except (TypeError, ValueError):
+            contents = None
+        if (
+            contents is None
+            or json.loads(contents, object_pairs_hook=collections.OrderedDict)
+            != snapcraft_yaml
+        ):
+            logger.debug("Not caching the resolved project: not JSON serializable.")
+            return
+
+        entry_path = self._get_entry_path(key)
+        try:
+            os.makedirs(self.resolved_project_cache_root, exist_ok=True)
+            with open(entry_path + ".new", "w") as entry_file:
+                entry_file.write(contents)
+            os.replace(entry_path + ".new", entry_path)
+            for entry in os.listdir(self.resolved_project_cache_root):
+                if entry != os.path.basename(entry_path):
+                    os.remove(os.path.join(self.resolved_project_cache_root, entry))
+        except OSError as e:
+            logger.debug("Unable to cache the resolved project: {}".format(e))
@@ -17,11 +17,10 @@
 import logging
 import os
 import shutil
-import subprocess
-import tempfile
 
 from ._cache import SnapcraftProjectCache
 from snapcraft import file_utils, yaml_utils
+from snapcraft.internal import squashfs
 
 logger = logging.getLogger(__name__)
 
@@ -39,23 +38,7 @@ class SnapCache(SnapcraftProjectCache):
         return snap_cache_root
 
     def _get_snap_deb_arch(self, snap_filename):
-        with tempfile.TemporaryDirectory() as temp_dir:
-            unsquashfs_path = file_utils.get_tool_path("unsquashfs")
-            output = subprocess.check_output(
-                [
-                    unsquashfs_path,
-                    "-d",
-                    os.path.join(temp_dir, "squashfs-root"),
-                    snap_filename,
-                    "-e",
-                    os.path.join("meta", "snap.yaml"),
-                ]
-            )
-            logger.debug(output)
-            with open(
-                os.path.join(temp_dir, "squashfs-root", "meta", "snap.yaml")
-            ) as yaml_file:
-                snap_yaml = yaml_utils.load(yaml_file)
+        snap_yaml = yaml_utils.load(squashfs.read_file(snap_filename, "meta/snap.yaml"))
         # XXX: add multiarch support later
         try:
             return snap_yaml["architectures"][0]
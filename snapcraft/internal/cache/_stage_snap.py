@@ -0,0 +1,82 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import logging
+import os
+import shutil
+import tempfile
+from typing import Iterator, Optional
+
+from ._cache import SnapcraftCache
+
+logger = logging.getLogger(__name__)
+
+
+class StageSnapCache(SnapcraftCache):
+    """Cache for extracted stage-snap revisions.
+
+    Each revision is kept in its own directory named <snap-name>_<revision>
+    holding the downloaded snap and assertion files next to a tree directory
+    with the extracted contents of the snap.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.stage_snap_cache_root = os.path.join(self.cache_root, "stage-snaps")
+
+    def _get_entry_path(self, *, snap_name: str, revision: str) -> str:
+        return os.path.join(
+            self.stage_snap_cache_root, "{}_{}".format(snap_name, revision)
+        )
+
+    def get(self, *, snap_name: str, revision: str) -> Optional[str]:
+        """Get the cache entry for revision of snap_name.
+
+        :returns: path to the cache entry or None if not cached.
+        """
+        entry_path = self._get_entry_path(snap_name=snap_name, revision=revision)
+        if os.path.isdir(os.path.join(entry_path, "tree")):
+            return entry_path
+        return None
+
+    @contextlib.contextmanager
+    def new_entry(self) -> Iterator[str]:
+        """Provide a directory to prepare a cache entry in.
+
+        The directory is removed on exit unless it was added to the cache.
+        """
+        os.makedirs(self.stage_snap_cache_root, exist_ok=True)
+        entry_path = tempfile.mkdtemp(prefix=".new-", dir=self.stage_snap_cache_root)
+        try:
+            yield entry_path
+        finally:
+            shutil.rmtree(entry_path, ignore_errors=True)
+
+    def add(self, *, entry_path: str, snap_name: str, revision: str) -> str:
+        """Add an entry prepared with new_entry as revision of snap_name.
+
+        :returns: path to the cache entry.
+        """
+        cached_path = self._get_entry_path(snap_name=snap_name, revision=revision)
+        try:
+            os.rename(entry_path, cached_path)
+        except OSError:
+            # Another process beat us to it, theirs is as good as ours.
+            if self.get(snap_name=snap_name, revision=revision) is None:
+                raise
+            logger.debug("{!r} is already cached.".format(cached_path))
+        return cached_path
@@ -0,0 +1,75 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict
+
+from ._cache import SnapcraftCache
+
+# The environment compiled extensions of wheels are built with.
+_BUILD_ENVIRONMENT_KEYS = [
+    "CC",
+    "CFLAGS",
+    "CPPFLAGS",
+    "CXX",
+    "CXXFLAGS",
+    "LDFLAGS",
+    "PKG_CONFIG_PATH",
+]
+
+
+class WheelCache(SnapcraftCache):
+    """Cache of the wheels built by pip from source distributions.
+
+    The name, version, python ABI and platform of a wheel are part of its
+    file name, which pip matches against what it needs. Wheels built in
+    different build environments are kept apart, in a directory per digest
+    of the environment.
+    """
+
+    def __init__(self, *, build_environment: Dict[str, str]) -> None:
+        """Create a new WheelCache.
+
+        :param dict build_environment: the environment wheels are built in.
+        """
+        super().__init__()
+        environment = {k: build_environment.get(k) for k in _BUILD_ENVIRONMENT_KEYS}
+        digest = hashlib.sha384(
+            json.dumps(environment, sort_keys=True).encode()
+        ).hexdigest()
+        self.cache_dir = os.path.join(self.cache_root, "wheels", digest)
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def add(self, wheel_path: str) -> None:
+        """Add the wheel in wheel_path to the cache."""
+        cached_path = os.path.join(self.cache_dir, os.path.basename(wheel_path))
+        if os.path.exists(cached_path):
+            return
+
+        # The cache can be shared, so the wheel is only made visible once
+        # complete.
+        with tempfile.NamedTemporaryFile(dir=self.cache_dir, delete=False) as new_file:
+            pass
+        try:
+            shutil.copyfile(wheel_path, new_file.name)
+            os.replace(new_file.name, cached_path)
+        except OSError:
+            os.unlink(new_file.name)
+            raise
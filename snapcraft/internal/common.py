@@ -28,7 +28,7 @@ import urllib
 from contextlib import suppress
 from typing import Callable, List
 
-from snapcraft.internal import errors
+from snapcraft.internal import errors, jobserver
 
 
 SNAPCRAFT_FILES = ["parts", "stage", "prime"]
@@ -66,6 +66,10 @@ def _run(cmd: List[str], runner: Callable, **kwargs):
         print("exec {}".format(cmd_string), file=run_file)
         run_file.flush()
         run_file.seek(0)
+        # Builds take their job slots from the lifecycle's job server.
+        active_jobserver = jobserver.get_jobserver()
+        if active_jobserver is not None:
+            kwargs.setdefault("pass_fds", active_jobserver.fds)
         try:
             return runner(["/bin/sh"], stdin=run_file, **kwargs)
         except subprocess.CalledProcessError as call_error:
@@ -126,6 +130,31 @@ def is_snap() -> bool:
     return is_snap
 
 
+def strtobool(value: str) -> bool:
+    """Convert a string representation of truth to a bool.
+
+    Like distutils.util.strtobool, which is slow to import.
+
+    :raises ValueError: if value is not a representation of truth.
+    """
+    value = value.lower()
+    if value in ("y", "yes", "t", "true", "on", "1"):
+        return True
+    elif value in ("n", "no", "f", "false", "off", "0"):
+        return False
+    else:
+        raise ValueError("invalid truth value {!r}".format(value))
+
+
+def use_content_digests() -> bool:
+    """Return whether steps track the digests of their content.
+
+    Without content digests, steps are outdated by timestamps alone. They are
+    enabled by setting SNAPCRAFT_CONTENT_DIGESTS.
+    """
+    return strtobool(os.environ.get("SNAPCRAFT_CONTENT_DIGESTS", "n"))
+
+
 def is_process_container() -> bool:
     logger.debug("snapcraft is running in a docker or podman (OCI) container")
     return any([os.path.exists(p) for p in (_DOCKERENV_FILE, _PODMAN_FILE)])
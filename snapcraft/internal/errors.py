@@ -20,7 +20,7 @@ from abc import ABC, abstractmethod
 from snapcraft import formatting_utils
 from snapcraft.internal import steps
 from subprocess import CalledProcessError
-from typing import Dict, List, Union, Optional, TYPE_CHECKING
+from typing import Dict, List, Sequence, Union, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from snapcraft.internal.pluginhandler._dirty_report import DirtyReport
@@ -91,7 +91,7 @@ class SnapcraftReportableException(SnapcraftException, ABC):
 
 
 class MissingStateCleanError(SnapcraftException):
-    def __init__(self, step: steps.Step) -> None:
+    def __init__(self, step: "steps.Step") -> None:
         self.step = step
 
     def get_brief(self) -> str:
@@ -105,7 +105,7 @@ class StepOutdatedError(SnapcraftException):
     def __init__(
         self,
         *,
-        step: steps.Step,
+        step: "steps.Step",
         part: str,
         dirty_report: "DirtyReport" = None,
         outdated_report: "OutdatedReport" = None,
@@ -573,7 +573,7 @@ class ScriptletDuplicateDataError(ScriptletBaseError):
     )
 
     def __init__(
-        self, step: steps.Step, other_step: steps.Step, keys: List[str]
+        self, step: "steps.Step", other_step: "steps.Step", keys: List[str]
     ) -> None:
         self.keys = keys
         super().__init__(
@@ -586,7 +586,7 @@ class ScriptletDuplicateDataError(ScriptletBaseError):
 class ScriptletDuplicateFieldError(ScriptletBaseError):
     fmt = "Unable to set {field}: it was already set in the {step.name!r} step."
 
-    def __init__(self, field: str, step: steps.Step) -> None:
+    def __init__(self, field: str, step: "steps.Step") -> None:
         super().__init__(field=field, step=step)
 
 
@@ -683,6 +683,41 @@ class SnapDataExtractionError(SnapcraftError):
         super().__init__(snap=snap)
 
 
+class SquashfsReadError(SnapcraftException):
+    def __init__(self, *, path: str, message: str) -> None:
+        self.path = path
+        self.message = message
+
+    def get_brief(self) -> str:
+        return f"Failed to read squashfs image {self.path!r}: {self.message}."
+
+    def get_resolution(self) -> str:
+        return "The file may be corrupted, verify it and try again."
+
+
+class SquashfsUnsupportedCompressionError(SnapcraftException):
+    def __init__(self, *, compression: str) -> None:
+        self.compression = compression
+
+    def get_brief(self) -> str:
+        return f"Squashfs compression {self.compression!r} is not supported."
+
+    def get_resolution(self) -> str:
+        return "Use unsquashfs to read this image."
+
+
+class SquashfsPathNotFoundError(SnapcraftException):
+    def __init__(self, *, image: str, path: str) -> None:
+        self.image = image
+        self.path = path
+
+    def get_brief(self) -> str:
+        return f"Cannot find {self.path!r} in squashfs image {self.image!r}."
+
+    def get_resolution(self) -> str:
+        return "Verify the path exists in the image and is a regular file."
+
+
 class ProjectNotFoundError(SnapcraftReportableError):
     fmt = "Failed to find project files."
 
@@ -736,3 +771,39 @@ class CorruptedElfFileError(SnapcraftException):
 
     def get_resolution(self) -> str:
         return "Remove the suspect files from the snap using the `stage` or `prime` keywords."
+
+
+class InvalidCompilerCacheError(SnapcraftException):
+    def __init__(self, *, launcher: str, supported: Sequence[str]) -> None:
+        self.launcher = launcher
+        self.supported = supported
+
+    def get_brief(self) -> str:
+        return f"Unsupported compiler cache {self.launcher!r}."
+
+    def get_resolution(self) -> str:
+        return "Set SNAPCRAFT_COMPILER_CACHE to one of {}.".format(
+            formatting_utils.humanize_list(self.supported, "or")
+        )
+
+
+class DependencyCacheMissError(SnapcraftException):
+    def __init__(self, *, part_name: str, ecosystem: str) -> None:
+        self.part_name = part_name
+        self.ecosystem = ecosystem
+
+    def get_brief(self) -> str:
+        return (
+            f"The {self.ecosystem} dependencies of part {self.part_name!r} "
+            "are not in the dependency cache."
+        )
+
+    def get_details(self) -> str:
+        return (
+            "Dependencies cannot be fetched from the network when running "
+            "offline, and no dependencies were cached for the lockfiles of "
+            "this part."
+        )
+
+    def get_resolution(self) -> str:
+        return "Run once without --offline to populate the dependency cache."
@@ -0,0 +1,123 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Job slots shared by the builds of all parts.
+
+The job server follows the protocol of the GNU make jobserver: a pipe
+holds one token per job slot beyond the implicit slot every build starts
+with. make, and the tools speaking the protocol (cargo, ninja, ...), take
+a token from the pipe before starting a job and put it back once done, so
+nested builds never run more jobs than there are slots.
+"""
+
+import contextlib
+import logging
+import os
+import re
+from typing import Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = b"+"
+
+# The options of MAKEFLAGS setting the jobs a build runs.
+_JOBS_OPTION = re.compile(r"-j\d*|--jobs(=\d+)?|--jobserver-(auth|fds|style)=\S*")
+
+_jobserver: Optional["JobServer"] = None
+
+
+class JobServer:
+    """A GNU make compatible job server with a fixed number of job slots."""
+
+    def __init__(self, jobs: int) -> None:
+        self.jobs = max(jobs, 1)
+        self._read_fd, self._write_fd = os.pipe()
+        self.reset()
+
+    @property
+    def fds(self) -> Tuple[int, int]:
+        """Return the read and write ends of the pipe holding the tokens."""
+        return self._read_fd, self._write_fd
+
+    def get_makeflags(self, makeflags: str = "") -> str:
+        """Return MAKEFLAGS for builds to take their job slots from here.
+
+        The options of makeflags are kept, but for those setting the jobs
+        to run, which are replaced by the ones of this job server.
+
+        make < 4.2 only knows about --jobserver-fds and newer releases
+        prefer --jobserver-auth, make ignores the option it does not know
+        in MAKEFLAGS. make < 4.2 also only joins a job server when MAKEFLAGS
+        carries a -j without a number, which newer releases accept as well.
+
+        MAKEFLAGS must only be given to commands the pipe is passed to,
+        make falls back to a single job otherwise.
+        """
+        flags = [f for f in makeflags.split() if not _JOBS_OPTION.fullmatch(f)]
+        # Variable definitions come last, after a lone --.
+        index = flags.index("--") if "--" in flags else len(flags)
+        flags[index:index] = [
+            "-j",
+            "--jobserver-fds={0},{1}".format(*self.fds),
+            "--jobserver-auth={0},{1}".format(*self.fds),
+        ]
+        return " ".join(flags)
+
+    def reset(self) -> None:
+        """Put back the tokens lost by builds which did not return them.
+
+        This must only be called while no build is running.
+        """
+        os.set_blocking(self._read_fd, False)
+        try:
+            while os.read(self._read_fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+        finally:
+            os.set_blocking(self._read_fd, True)
+
+        # The first job of a build runs without a token.
+        os.write(self._write_fd, _TOKEN * (self.jobs - 1))
+
+    def close(self) -> None:
+        os.close(self._read_fd)
+        os.close(self._write_fd)
+
+    def __enter__(self) -> "JobServer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def get_jobserver() -> Optional[JobServer]:
+    """Return the job server of the lifecycle being executed, if any."""
+    return _jobserver
+
+
+@contextlib.contextmanager
+def serve(jobs: int) -> Iterator[JobServer]:
+    """Share job slots among the builds run within this context."""
+    global _jobserver
+
+    with JobServer(jobs) as jobserver:
+        logger.debug("Sharing {} job slots among builds".format(jobserver.jobs))
+        _jobserver = jobserver
+        try:
+            yield jobserver
+        finally:
+            _jobserver = None
@@ -14,13 +14,15 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import logging
-from typing import List, Optional, Sequence
+from typing import Iterator, List, Optional, Sequence
 
 from snapcraft import config, storeapi
 from snapcraft.internal import (
     common,
     errors,
+    jobserver,
     pluginhandler,
     project_loader,
     repo,
@@ -82,6 +84,9 @@ def execute(
             "The repo backend is not returning the list of installed packages"
         )
 
+    if project_config.compiler_cache:
+        repo.check_for_command(project_config.compiler_cache.launcher)
+
     content_snaps = project_config.project._get_content_snaps()
     required_snaps = project_config.build_snaps | content_snaps
 
@@ -119,7 +124,10 @@ def execute(
     global_state.save(filepath=project_config.project._get_global_state_file_path())
 
     executor = _Executor(project_config)
-    executor.run(step, part_names)
+    # The builds of all parts, and whatever they build in turn, share as many
+    # job slots as there are parallel builds.
+    with jobserver.serve(project_config.project.parallel_build_count):
+        executor.run(step, part_names)
     if not executor.steps_were_run:
         logger.warn(
             "The requested action has already been taken. Consider\n"
@@ -172,6 +180,14 @@ class _Executor:
                     # XXX check only for collisions on the parts that have
                     # already been built --elopio - 20170713
                     pluginhandler.check_for_collisions(self.config.all_parts)
+                elif current_step == steps.PULL:
+                    # Download the stage-snaps of all parts that are about
+                    # to be pulled concurrently.
+                    self.parts_config.fetch_stage_snaps(
+                        p
+                        for p in parts
+                        if not self._cache.has_step_run(p, current_step)
+                    )
                 for part in parts:
                     self._handle_step(part_names, part, step, current_step, cli_config)
 
@@ -300,18 +316,44 @@ class _Executor:
         common.env = self.parts_config.build_env_for_part(part)
         common.env.extend(self.config.project_env())
 
+        active_jobserver = jobserver.get_jobserver()
+        if active_jobserver is not None:
+            active_jobserver.reset()
+
         part = _replace_in_part(part)
 
     def _run_step(self, *, step: steps.Step, part, progress, hint=""):
         self._prepare_step(step=step, part=part)
 
         notify_part_progress(part, progress, hint)
-        getattr(part, step.name)()
+        with self._report_compiler_cache(part, step):
+            getattr(part, step.name)()
 
         # We know we just ran this step, so rather than check, manually twiddle
         # the cache
         self._complete_step(part, step)
 
+    @contextlib.contextmanager
+    def _report_compiler_cache(self, part, step: steps.Step) -> Iterator[None]:
+        compiler_cache = self.config.compiler_cache
+        if step != steps.BUILD or compiler_cache is None:
+            yield
+            return
+
+        stats_before = compiler_cache.get_stats()
+        yield
+        stats_after = compiler_cache.get_stats()
+        if stats_before is None or stats_after is None:
+            return
+
+        hits = stats_after[0] - stats_before[0]
+        misses = stats_after[1] - stats_before[1]
+        logger.info(
+            "Compiler cache ({}) for part {!r}: {} hits, {} misses".format(
+                compiler_cache.launcher, part.name, hits, misses
+            )
+        )
+
     def _complete_step(self, part, step):
         self._cache.clear_step(part, step)
         self._cache.add_step_run(part, step)
@@ -363,7 +405,8 @@ class _Executor:
                 "Updating {} step for".format(step.name),
                 "({})".format(outdated_report.get_summary()),
             )
-            update_function()
+            with self._report_compiler_cache(part, step):
+                update_function()
 
             # We know we just ran this step, so rather than check, manually
             # twiddle the cache
@@ -16,10 +16,12 @@
 import logging
 import re
 import subprocess
-from typing import FrozenSet
+from typing import TYPE_CHECKING, FrozenSet
 
 from snapcraft import file_utils
-from snapcraft.internal import elf
+
+if TYPE_CHECKING:
+    from snapcraft.internal import elf  # noqa: F401
 
 
 logger = logging.getLogger(__name__)
@@ -58,7 +60,7 @@ def rewrite_python_shebangs(root_dir):
     )
 
 
-def clear_execstack(*, elf_files: FrozenSet[elf.ElfFile]) -> None:
+def clear_execstack(*, elf_files: FrozenSet["elf.ElfFile"]) -> None:
     """Clears the execstack for the relevant elf_files
 
     param elf.ElfFile elf_files: the full list of elf files to analyze
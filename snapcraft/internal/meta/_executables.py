@@ -0,0 +1,110 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import os
+import stat
+from typing import Dict, Iterable, List, Optional
+
+from snapcraft.internal import common
+
+
+class ExecutableIndex:
+    """Index of the executables in a prime directory.
+
+    The prime directory is walked once, when first searched, and the
+    status and shebang of the files asked about are kept, so resolving the
+    commands of every app, hook and command-chain entry does not walk or
+    probe the prime directory over and over again.
+
+    Paths that do not exist are looked up again every time, as they may be
+    created after being asked about.
+    """
+
+    def __init__(self, prime_dir: str) -> None:
+        self.prime_dir = prime_dir
+        self._walk_roots: Optional[List[str]] = None
+        self._files_by_name: Dict[str, List[str]] = collections.defaultdict(list)
+        self._stats: Dict[str, os.stat_result] = dict()
+        self._shebangs: Dict[str, Optional[bytes]] = dict()
+        self._bin_paths: Optional[List[str]] = None
+
+    def _stat(self, path: str) -> Optional[os.stat_result]:
+        path_stat = self._stats.get(path)
+        if path_stat is None:
+            try:
+                path_stat = self._stats[path] = os.stat(path)
+            except OSError:
+                return None
+        return path_stat
+
+    def _walk(self) -> List[str]:
+        if self._walk_roots is None:
+            self._walk_roots = list()
+            for root, _, files in os.walk(self.prime_dir):
+                self._walk_roots.append(root)
+                for name in files:
+                    self._files_by_name[name].append(os.path.join(root, name))
+        return self._walk_roots
+
+    def exists(self, path: str) -> bool:
+        """Return whether path exists."""
+        return self._stat(path) is not None
+
+    def is_executable(self, path: str) -> bool:
+        """Return whether path is an executable file."""
+        path_stat = self._stat(path)
+        if path_stat is None or not stat.S_ISREG(path_stat.st_mode):
+            return False
+
+        return bool(path_stat.st_mode & (stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH))
+
+    def get_bin_paths(self) -> List[str]:
+        """Return the existing bin directories in the prime directory."""
+        if self._bin_paths is None:
+            self._bin_paths = common.get_bin_paths(root=self.prime_dir)
+        return self._bin_paths
+
+    def find(self, binary: str) -> Optional[str]:
+        """Return the first executable binary found walking the prime directory.
+
+        :returns: the path to binary or None if not found.
+        """
+        walk_roots = self._walk()
+        candidates: Iterable[str]
+        if os.path.sep in binary:
+            candidates = (os.path.join(root, binary) for root in walk_roots)
+        else:
+            candidates = self._files_by_name.get(binary, [])
+
+        for path in candidates:
+            if self.is_executable(path):
+                return path
+        return None
+
+    def read_shebang(self, path: str) -> Optional[bytes]:
+        """Return the shebang line of path, without the leading #!.
+
+        :returns: the stripped line or None if path does not start with #!.
+        :raises OSError: if path cannot be read.
+        """
+        if path not in self._shebangs:
+            with open(path, "rb") as exefile:
+                if exefile.read(2) == b"#!":
+                    self._shebangs[path] = exefile.readline().strip()
+                else:
+                    self._shebangs[path] = None
+        return self._shebangs[path]
@@ -35,6 +35,7 @@ from snapcraft.extractors import _metadata
 from snapcraft.internal.deprecations import handle_deprecation_notice
 from snapcraft.internal.meta import errors as meta_errors, _manifest, _version
 from snapcraft.internal.meta.snap import Snap
+from snapcraft.internal.meta._executables import ExecutableIndex
 
 logger = logging.getLogger(__name__)
 
@@ -332,6 +333,7 @@ class _SnapPackaging:
         self._snapcraft_yaml_path = project_config.project.info.snapcraft_yaml_file_path
         self._prime_dir = project_config.project.prime_dir
         self._parts_dir = project_config.project.parts_dir
+        self._executable_index = ExecutableIndex(self._prime_dir)
 
         self._arch_triplet = project_config.project.arch_triplet
         self._is_host_compatible_with_base = (
@@ -362,7 +364,9 @@ class _SnapPackaging:
     def finalize_snap_meta_commands(self) -> None:
         for app_name, app in self._snap_meta.apps.items():
             app.prime_commands(
-                base=self._project_config.project.info.base, prime_dir=self._prime_dir
+                base=self._project_config.project.info.base,
+                prime_dir=self._prime_dir,
+                executable_index=self._executable_index,
             )
 
     def finalize_snap_meta_command_chains(self) -> None:
@@ -409,7 +413,9 @@ class _SnapPackaging:
                 gui_dir=self.meta_gui_dir,
                 icon_path=icon_path,
             )
-            app.validate_command_chain_executables(self._prime_dir)
+            app.validate_command_chain_executables(
+                self._prime_dir, executable_index=self._executable_index
+            )
 
         if "icon" in self._config_data:
             # TODO: use developer.ubuntu.com once it has updated documentation.
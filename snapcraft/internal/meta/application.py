@@ -21,7 +21,7 @@ from snapcraft import yaml_utils
 from typing import Any, Dict, List, Optional, Sequence  # noqa: F401
 
 from . import errors
-from ._utils import _executable_is_valid
+from ._executables import ExecutableIndex
 from .command import Command
 from .desktop import DesktopFile
 
@@ -43,7 +43,7 @@ class Application:
         command_chain: List[str] = None,
         prepend_command_chain: List[str] = None,
         passthrough: Dict[str, Any] = None,
-        commands: Dict[str, Command] = None
+        commands: Dict[str, Command] = None,
     ) -> None:
         """Initialize an application entry.
 
@@ -99,7 +99,13 @@ class Application:
     def _massage_commands(self, *, base: Optional[str]) -> bool:
         return base in _MASSAGED_BASES
 
-    def prime_commands(self, *, base: Optional[str], prime_dir: str) -> None:
+    def prime_commands(
+        self,
+        *,
+        base: Optional[str],
+        prime_dir: str,
+        executable_index: Optional[ExecutableIndex] = None,
+    ) -> None:
         can_use_wrapper = self.can_use_wrapper(base)
         massage_command = self._massage_commands(base=base)
         for command in self.commands.values():
@@ -107,6 +113,7 @@ class Application:
                 can_use_wrapper=can_use_wrapper,
                 massage_command=massage_command,
                 prime_dir=prime_dir,
+                executable_index=executable_index,
             )
 
     def write_command_wrappers(self, *, prime_dir: str) -> None:
@@ -128,13 +135,18 @@ class Application:
 
         desktop_file.write(gui_dir=gui_dir, icon_path=icon_path)
 
-    def validate_command_chain_executables(self, prime_dir: str) -> None:
+    def validate_command_chain_executables(
+        self, prime_dir: str, executable_index: Optional[ExecutableIndex] = None
+    ) -> None:
+        if executable_index is None:
+            executable_index = ExecutableIndex(prime_dir)
+
         for item in self.command_chain:
             executable_path = os.path.join(prime_dir, item)
 
             # command-chain entries must always be relative to the root of
             # the snap, i.e. PATH is not used.
-            if not _executable_is_valid(executable_path):
+            if not executable_index.is_executable(executable_path):
                 raise errors.InvalidCommandChainError(item, self.app_name)
 
     def validate(self) -> None:
@@ -23,8 +23,7 @@ import shutil
 from typing import List, Optional
 
 from . import errors
-from ._utils import _executable_is_valid
-from snapcraft.internal import common
+from ._executables import ExecutableIndex
 
 
 logger = logging.getLogger(__name__)
@@ -43,15 +42,20 @@ _FMT_SNAPD_WRAPPER = (
 )
 
 
-def _get_shebang_from_file(file_path: str) -> List[str]:
+def _get_shebang_from_file(
+    file_path: str, executable_index: Optional[ExecutableIndex] = None
+) -> List[str]:
     """Returns the shebang from file_path."""
-    if not os.path.exists(file_path):
+    if executable_index is None:
+        executable_index = ExecutableIndex(os.path.dirname(file_path))
+
+    if not executable_index.exists(file_path):
         raise errors.ShebangNotFoundError()
 
-    with open(file_path, "rb") as exefile:
-        if exefile.read(2) != b"#!":
-            raise errors.ShebangNotFoundError()
-        shebang_line = exefile.readline().strip().decode("utf-8")
+    shebang = executable_index.read_shebang(file_path)
+    if shebang is None:
+        raise errors.ShebangNotFoundError()
+    shebang_line = shebang.decode("utf-8")
 
     # posix is set to False to respect the quoting of variables.
     shebang_parts = shlex.split(shebang_line, posix=False)
@@ -65,24 +69,24 @@ def _get_shebang_from_file(file_path: str) -> List[str]:
     return shebang_parts
 
 
-def _find_executable(*, binary: str, prime_dir: str) -> str:
+def _find_executable(
+    *, binary: str, prime_dir: str, executable_index: Optional[ExecutableIndex] = None
+) -> str:
+    if executable_index is None:
+        executable_index = ExecutableIndex(prime_dir)
+
     found_path: Optional[str] = None
-    binary_paths = (
-        os.path.join(p, binary) for p in common.get_bin_paths(root=prime_dir)
-    )
+    binary_paths = (os.path.join(p, binary) for p in executable_index.get_bin_paths())
     for binary_path in binary_paths:
-        if _executable_is_valid(binary_path):
+        if executable_index.is_executable(binary_path):
             found_path = binary_path
             break
     else:
         # Last chance to find in the prime_dir, mostly for backwards compatibility,
         # to find the executable, historical snaps like those built with the catkin
         # plugin will have roslaunch in a path like /opt/ros/bin/roslaunch.
-        for root, _, files in os.walk(prime_dir):
-            if _executable_is_valid(os.path.join(root, binary)):
-                found_path = os.path.join(root, binary)
-                break
-        else:
+        found_path = executable_index.find(binary)
+        if found_path is None:
             # Finally, check if it is part of the system.
             found_path = shutil.which(binary)
 
@@ -101,7 +105,9 @@ def _get_command_path(*, command: str, prime_dir: str) -> str:
     return os.path.join(prime_dir, command)
 
 
-def _massage_command(*, command: str, prime_dir: str) -> str:
+def _massage_command(
+    *, command: str, prime_dir: str, executable_index: Optional[ExecutableIndex] = None
+) -> str:
     """Rewrite command to take into account interpreter and pathing.
 
     (1) Interpreter: if shebang is found in file, explicitly prepend
@@ -118,6 +124,9 @@ def _massage_command(*, command: str, prime_dir: str) -> str:
     if command.startswith("/"):
         return command
 
+    if executable_index is None:
+        executable_index = ExecutableIndex(prime_dir)
+
     # command_parts holds the lexical split of a command entry.
     # posix is set to False to respect the quoting of variables.
     command_parts = shlex.split(command, posix=False)
@@ -136,7 +145,7 @@ def _massage_command(*, command: str, prime_dir: str) -> str:
     # snap).
     # If a shebang is found, command_path is rewritten to point to the shebang.
     with contextlib.suppress(errors.ShebangNotFoundError, errors.ShebangInRoot):
-        shebang_parts = _get_shebang_from_file(command_path)
+        shebang_parts = _get_shebang_from_file(command_path, executable_index)
         # Add the shebang (interpreter) to the front of the command.
         command_parts = shebang_parts + command_parts
         # And make sure the original command is prepended with $SNAP so it is
@@ -147,13 +156,18 @@ def _massage_command(*, command: str, prime_dir: str) -> str:
 
     # If the command is part of the snap (starts with $SNAP) it NEEDS to exist
     # within the prime directory.
-    if not os.path.exists(command_path) and command_parts[0].startswith("$SNAP/"):
+    command_exists = executable_index.exists(command_path)
+    if not command_exists and command_parts[0].startswith("$SNAP/"):
         raise errors.PrimedCommandNotFoundError(command_parts[0])
     # if the command is "pathless", make an attempt to find the executable within
     # the prime directory and as a last resort (for backwards compatibility),
     # at the root of the filesystem.
-    elif not os.path.exists(command_path):
-        command_path = _find_executable(binary=command_parts[0], prime_dir=prime_dir)
+    elif not command_exists:
+        command_path = _find_executable(
+            binary=command_parts[0],
+            prime_dir=prime_dir,
+            executable_index=executable_index,
+        )
 
     # A command found within the prime directory will have a command_path that
     # starts with the prime directory leading the path. Make it relative to
@@ -204,14 +218,26 @@ class Command:
         )
 
     def prime_command(
-        self, *, can_use_wrapper: bool, massage_command: bool = True, prime_dir: str
+        self,
+        *,
+        can_use_wrapper: bool,
+        massage_command: bool = True,
+        prime_dir: str,
+        executable_index: Optional[ExecutableIndex] = None,
     ) -> str:
         """Finalize and prime command, massaging as necessary.
 
         Check if command is in prime_dir and raise exception if not valid."""
 
+        if executable_index is None:
+            executable_index = ExecutableIndex(prime_dir)
+
         if massage_command:
-            self.command = _massage_command(command=self.command, prime_dir=prime_dir)
+            self.command = _massage_command(
+                command=self.command,
+                prime_dir=prime_dir,
+                executable_index=executable_index,
+            )
 
         if self.requires_wrapper:
             if not can_use_wrapper:
@@ -223,7 +249,7 @@ class Command:
         else:
             command_parts = shlex.split(self.command)
             command_path = os.path.join(prime_dir, command_parts[0])
-            if not _executable_is_valid(command_path):
+            if not executable_index.is_executable(command_path):
                 raise errors.InvalidAppCommandNotExecutable(
                     command=self.command, app_name=self._app_name
                 )
@@ -23,7 +23,7 @@ from typing import Any, Dict, List, Set, Sequence, Optional
 from snapcraft import yaml_utils
 from snapcraft.internal import common
 from snapcraft.internal.meta import errors
-from snapcraft.internal.meta.application import Application
+from snapcraft.internal.meta import application
 from snapcraft.internal.meta.hooks import Hook
 from snapcraft.internal.meta.plugs import ContentPlug, Plug
 from snapcraft.internal.meta.slots import ContentSlot, Slot
@@ -72,7 +72,7 @@ class Snap:
         self.type: Optional[str] = None
         self.plugs: Dict[str, Plug] = dict()
         self.slots: Dict[str, Slot] = dict()
-        self.apps: Dict[str, Application] = dict()
+        self.apps: Dict[str, application.Application] = dict()
         self.hooks: Dict[str, Hook] = dict()
         self.passthrough: Dict[str, Any] = dict()
         self.layout: Dict[str, Any] = dict()
@@ -194,7 +194,9 @@ class Snap:
                     snap.slots[slot_name] = slot
             elif key == "apps":
                 for app_name, app_dict in snap_dict[key].items():
-                    app = Application.from_dict(app_dict=app_dict, app_name=app_name)
+                    app = application.Application.from_dict(
+                        app_dict=app_dict, app_name=app_name
+                    )
                     snap.apps[app_name] = app
             elif key == "hooks":
                 for hook_name, hook_dict in snap_dict[key].items():
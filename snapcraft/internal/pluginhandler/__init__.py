@@ -21,21 +21,24 @@ import filecmp
 import logging
 import os
 import shutil
-import subprocess
 import sys
 from glob import glob, iglob
 from typing import cast, Dict, List, Optional, Set, Sequence, TYPE_CHECKING
 
 import snapcraft.extractors
 from snapcraft import file_utils, yaml_utils
-from snapcraft.internal import common, elf, errors, repo, sources, states, steps, xattrs
+from snapcraft.internal import common, elf, errors, repo, sources, states, steps
 from snapcraft.internal.mangling import clear_execstack
 
 from ._build_attributes import BuildAttributes
 from ._dependencies import MissingDependencyResolver
 from ._metadata_extraction import extract_metadata
 from ._plugin_loader import load_plugin  # noqa
+from ._machine_manifest import MachineManifest  # noqa
 from ._runner import Runner
+from ._stage_snaps import StageSnapsPipeline  # noqa
+from ._stage_package_origins import StagePackageOrigins
+from . import _organize
 from ._patchelf import PartPatcher
 from ._dirty_report import Dependency, DirtyReport  # noqa
 from ._outdated_report import OutdatedReport
@@ -65,19 +68,29 @@ class PluginHandler:
         base,
         confinement,
         snap_type,
-        soname_cache
+        soname_cache,
+        stage_snaps_pipeline,
+        machine_manifest
     ) -> None:
         self.valid = False
         self.plugin = plugin
         self._part_properties = _expand_part_properties(part_properties, part_schema)
         self.stage_packages: List[str] = list()
         self._stage_packages_repo = stage_packages_repo
+        self._stage_package_origins = StagePackageOrigins(
+            os.path.join(self.plugin.osrepodir, "stage-packages-origins.json")
+        )
+        self._organize_journal = _organize.OrganizeJournal(
+            os.path.join(self.plugin.partdir, "organize-journal.json")
+        )
         self._grammar_processor = grammar_processor
         self._snap_base_path = snap_base_path
         self._base = base
         self._confinement = confinement
         self._snap_type = snap_type
         self._soname_cache = soname_cache
+        self._stage_snaps_pipeline = stage_snaps_pipeline
+        self._machine_manifest = machine_manifest
         self._source = grammar_processor.get_source()
         if not self._source:
             self._source = part_schema["source"].get("default")
@@ -324,13 +337,38 @@ class PluginHandler:
                 timestamp = self.step_timestamp(step)
 
                 for previous_step in reversed(step.previous_steps()):
-                    # Has a previous step run since this one ran? Then this
-                    # step needs to be updated.
+                    # Has a previous step run since this one ran, changing
+                    # what it produced? Then this step needs to be updated.
                     with contextlib.suppress(errors.StepHasNotRunError):
-                        if timestamp < self.step_timestamp(previous_step):
+                        if timestamp < self.step_timestamp(
+                            previous_step
+                        ) and self._has_content_changed(step, previous_step):
                             return OutdatedReport(previous_step_modified=previous_step)
             return None
 
+    def _has_content_changed(self, step: steps.Step, previous_step: steps.Step) -> bool:
+        """Return whether what previous_step produced changed since step ran.
+
+        Without content digests recorded for step, any run of previous_step
+        is a change.
+        """
+        if not common.use_content_digests():
+            return True
+
+        input_digest = getattr(
+            states.get_state(self.plugin.statedir, step), "input_digest", None
+        )
+        if input_digest is None:
+            return True
+
+        # Earlier steps only change what step uses through the step right
+        # before it, which is outdated itself if they did.
+        if previous_step != step.previous_step():
+            return False
+
+        previous_state = states.get_state(self.plugin.statedir, previous_step)
+        return getattr(previous_state, "content_digest", None) != input_digest
+
     def is_dirty(self, step: steps.Step) -> bool:
         """Return true if the given step is dirty.
 
@@ -392,10 +430,40 @@ class PluginHandler:
     def mark_done(self, step, state=None):
         if not state:
             state = {}
+        elif common.use_content_digests():
+            self._record_content_digests(step, state)
 
         with open(states.get_step_state_file(self.plugin.statedir, step), "w") as f:
             f.write(yaml_utils.dump(state))
 
+    def _record_content_digests(self, step: steps.Step, state) -> None:
+        """Record digests of what step used and produced in its state.
+
+        The digest of what the step before produced is the input_digest, and
+        that of what step produced the content_digest. The pull step also
+        records the content_manifest of a local source.
+        """
+        previous_step = step.previous_step()
+        if previous_step:
+            previous_state = states.get_state(self.plugin.statedir, previous_step)
+            state.input_digest = getattr(previous_state, "content_digest", None)
+
+        if step == steps.PULL:
+            state.content_manifest = getattr(
+                self.source_handler, "content_manifest", None
+            )
+            manifest = file_utils.calculate_content_manifest(self.plugin.sourcedir)
+        elif step == steps.BUILD:
+            manifest = file_utils.calculate_content_manifest(self.plugin.installdir)
+        elif step == steps.STAGE:
+            manifest = file_utils.calculate_content_manifest(
+                self.stagedir, paths=state.files
+            )
+        else:
+            # Nothing uses what the prime step produced.
+            return
+        state.content_digest = file_utils.calculate_manifest_digest(manifest)
+
     def mark_cleaned(self, step):
         state_file = states.get_step_state_file(self.plugin.statedir, step)
         if os.path.exists(state_file):
@@ -404,27 +472,24 @@ class PluginHandler:
         if os.path.isdir(self.plugin.statedir) and not os.listdir(self.plugin.statedir):
             os.rmdir(self.plugin.statedir)
 
+    def get_stage_snaps(self) -> Set[str]:
+        return self._grammar_processor.get_stage_snaps()
+
     def _fetch_stage_snaps(self):
-        stage_snaps = self._grammar_processor.get_stage_snaps()
+        stage_snaps = self.get_stage_snaps()
         if stage_snaps:
-            repo.snaps.download_snaps(
-                snaps_list=stage_snaps, directory=self.plugin.snapsdir
-            )
+            self._stage_snaps_pipeline.fetch(stage_snaps)
 
     def _unpack_stage_snaps(self):
-        stage_snaps = self._grammar_processor.get_stage_snaps()
+        stage_snaps = self.get_stage_snaps()
         if not stage_snaps:
             return
 
         logger.debug("Unpacking stage-snaps to {!r}".format(self.plugin.stage_snaps))
-        snap_files = iglob(os.path.join(self.plugin.snapsdir, "*.snap"))
-        snap_sources = (
-            sources.Snap(source=s, source_dir=self.plugin.snapsdir) for s in snap_files
+        os.makedirs(self.plugin.snapsdir, exist_ok=True)
+        self._stage_snaps_pipeline.provision(
+            stage_snaps, snaps_dir=self.plugin.snapsdir, dst=self.plugin.installdir
         )
-        for snap_source in snap_sources:
-            snap_source.provision(
-                self.plugin.installdir, clean_target=False, keep_snap=True
-            )
 
     def _fetch_stage_packages(self):
         stage_packages = self._grammar_processor.get_stage_packages()
@@ -441,7 +506,8 @@ class PluginHandler:
             logger.debug(
                 "Unpacking stage-packages to {!r}".format(self.plugin.installdir)
             )
-            self._stage_packages_repo.unpack(self.plugin.installdir)
+            origins = self._stage_packages_repo.unpack(self.plugin.installdir)
+            self._stage_package_origins.save(origins)
 
     def prepare_pull(self, force=False):
         self.makedirs()
@@ -540,6 +606,8 @@ class PluginHandler:
 
     def prepare_build(self, force=False):
         self.makedirs()
+        # Collect the machine manifest while building.
+        self._machine_manifest.prefetch()
         # Stage packages are fetched and unpacked in the pull step, but we'll
         # unpack again here just in case the build step has been cleaned.
         self._unpack_stage_packages()
@@ -567,12 +635,9 @@ class PluginHandler:
                     return []
 
             # No hard-links being used here in case the build process modifies
-            # these files.
-            shutil.copytree(
-                self.plugin.sourcedir,
-                self.plugin.build_basedir,
-                symlinks=True,
-                ignore=ignore,
+            # these files, but data is shared copy-on-write where supported.
+            file_utils.clone_tree(
+                self.plugin.sourcedir, self.plugin.build_basedir, ignore=ignore
             )
 
         self._do_build()
@@ -580,12 +645,12 @@ class PluginHandler:
     def update_build(self):
         if not self.plugin.out_of_source_build:
             # Use the local source to update. It's important to use
-            # file_utils.copy instead of link_or_copy, as the build process
+            # file_utils.clone instead of link_or_copy, as the build process
             # may modify these files
             source = sources.Local(
                 self.plugin.sourcedir,
                 self.plugin.build_basedir,
-                copy_function=file_utils.copy,
+                copy_function=file_utils.clone,
             )
             if not source.check(
                 states.get_step_state_file(self.plugin.statedir, steps.BUILD)
@@ -621,7 +686,7 @@ class PluginHandler:
     def mark_build_done(self):
         build_properties = self.plugin.get_build_properties()
         plugin_manifest = self.plugin.get_manifest()
-        machine_manifest = self._get_machine_manifest()
+        machine_manifest = self._machine_manifest.get()
 
         # Extract any requested metadata available in the build directory,
         # followed by the install directory (which takes precedence)
@@ -665,41 +730,6 @@ class PluginHandler:
             ),
         )
 
-    def _get_machine_manifest(self):
-        # Use subprocess directly here. common.run_output will use binaries out
-        # of the snap, and we want to use the one on the host.
-        try:
-            output = subprocess.check_output(
-                [
-                    "uname",
-                    "--kernel-name",
-                    "--kernel-release",
-                    "--kernel-version",
-                    "--machine",
-                    "--processor",
-                    "--hardware-platform",
-                    "--operating-system",
-                ]
-            )
-        except subprocess.CalledProcessError as e:
-            logger.warning(
-                "'uname' exited with code {}: unable to record machine "
-                "manifest".format(e.returncode)
-            )
-            return {}
-
-        try:
-            uname = output.decode(sys.getfilesystemencoding()).strip()
-        except UnicodeEncodeError:
-            logger.warning("Could not decode output for 'uname' correctly")
-            uname = output.decode("latin-1", "surrogateescape").strip()
-
-        return {
-            "uname": uname,
-            "installed-packages": sorted(repo.Repo.get_installed_packages()),
-            "installed-snaps": sorted(repo.snaps.get_installed_snaps()),
-        }
-
     def clean_build(self):
         if self.is_clean(steps.BUILD):
             return
@@ -709,6 +739,7 @@ class PluginHandler:
 
         if os.path.exists(self.plugin.installdir):
             shutil.rmtree(self.plugin.installdir)
+        self._organize_journal.remove()
 
         self.plugin.clean_build()
         self.mark_cleaned(steps.BUILD)
@@ -737,7 +768,14 @@ class PluginHandler:
     def _organize(self, *, overwrite=False):
         fileset = self._get_fileset("organize", {})
 
-        _organize_filesets(self.name, fileset.copy(), self.plugin.installdir, overwrite)
+        moves = _organize_filesets(
+            self.name,
+            fileset.copy(),
+            self.plugin.installdir,
+            overwrite,
+            self._organize_journal,
+        )
+        self._stage_package_origins.organize(moves)
 
     def stage(self, force=False):
         self._do_runner_step(steps.STAGE)
@@ -802,15 +840,6 @@ class PluginHandler:
         if self.is_clean(steps.PRIME):
             self.mark_prime_done(set(), set(), set(), set())
 
-    def _get_primed_stage_packages(self, snap_files: Set[str]) -> Set[str]:
-        primed_stage_packages: Set[str] = set()
-        for snap_file in snap_files:
-            snap_file = os.path.join(self.primedir, snap_file)
-            stage_package = xattrs.read_origin_stage_package(snap_file)
-            if stage_package:
-                primed_stage_packages.add(stage_package)
-        return primed_stage_packages
-
     def _do_prime(self) -> None:
         snap_files, snap_dirs = self.migratable_fileset_for(steps.PRIME)
         _migrate_files(snap_files, snap_dirs, self.stagedir, self.primedir)
@@ -820,7 +849,7 @@ class PluginHandler:
         else:
             dependency_paths = set()
 
-        primed_stage_packages = self._get_primed_stage_packages(snap_files)
+        primed_stage_packages = self._stage_package_origins.get_packages(snap_files)
         self.mark_prime_done(
             snap_files, snap_dirs, dependency_paths, primed_stage_packages
         )
@@ -1159,7 +1188,21 @@ def _migrate_files(
         fixup_func(dst)
 
 
-def _organize_filesets(part_name, fileset, base_dir, overwrite):
+def _organize_filesets(part_name, fileset, base_dir, overwrite, journal=None):
+    """Organize files in base_dir according to fileset.
+
+    Sources are renamed into their destinations. When overwriting, what was
+    organized before is only replaced where it changed, and the files an
+    entry put in place before, as recorded in journal, are removed if the
+    entry no longer provides them.
+
+    :returns: the paths moved, as pairs of source and destination paths
+              relative to base_dir, in the order they were moved.
+    """
+    previous = journal.load() if journal and overwrite else dict()
+    organized = dict()
+    stale = set()
+    moves = []
     for key in sorted(fileset, key=lambda x: ["*" in x, x]):
         src = os.path.join(base_dir, key)
         # Remove the leading slash if there so os.path.join
@@ -1171,44 +1214,99 @@ def _organize_filesets(part_name, fileset, base_dir, overwrite):
         # Keep track of the number of glob expansions so we can properly error if more
         # than one tries to organize to the same file
         src_count = 0
+        key_files = []
         for src in sources:
             src_count += 1
 
-            if os.path.isdir(src) and "*" not in key:
-                file_utils.link_or_copy_tree(src, dst)
-                # TODO create alternate organization location to avoid
-                # deletions.
-                shutil.rmtree(src)
-                continue
-            elif os.path.isfile(dst):
-                if overwrite and src_count <= 1:
-                    with contextlib.suppress(FileNotFoundError):
-                        os.remove(dst)
-                elif src_count > 1:
-                    raise errors.SnapcraftOrganizeError(
-                        part_name,
-                        "multiple files to be organized into {!r}. If this is supposed "
-                        "to be a directory, end it with a forward slash.".format(
-                            os.path.relpath(dst, base_dir)
-                        ),
-                    )
-                else:
-                    raise errors.SnapcraftOrganizeError(
-                        part_name,
-                        "trying to organize file {key!r} to {dst!r}, but {dst!r} "
-                        "already exists".format(
-                            key=key, dst=os.path.relpath(dst, base_dir)
-                        ),
+            real_dst = _get_organize_destination(
+                part_name, key, src, dst, src_count, base_dir, overwrite
+            )
+            # Without a record of what was organized before, what was there
+            # is replaced as a whole.
+            if overwrite and key not in previous and real_dst != dst:
+                stale.update(_get_organized_files(real_dst, real_dst, base_dir))
+
+            key_files.extend(_get_organized_files(src, real_dst, base_dir))
+            # A glob can match the directory organized into by an earlier run.
+            if not (os.path.isdir(real_dst) and os.path.samefile(src, real_dst)):
+                _organize.move(src, real_dst)
+                moves.append(
+                    (
+                        os.path.relpath(src, base_dir),
+                        os.path.relpath(real_dst, base_dir),
                     )
-            if os.path.isdir(dst) and overwrite:
-                real_dst = os.path.join(dst, os.path.basename(src))
-                if os.path.isdir(real_dst):
-                    shutil.rmtree(real_dst)
-                else:
-                    with contextlib.suppress(FileNotFoundError):
-                        os.remove(real_dst)
-            os.makedirs(os.path.dirname(dst), exist_ok=True)
-            shutil.move(src, dst)
+                )
+
+        if src_count:
+            organized[key] = key_files
+            stale.update(previous.get(key, []))
+        elif key in previous:
+            # Nothing was installed again for this entry, so what was
+            # organized before is kept.
+            organized[key] = previous[key]
+
+    for files in organized.values():
+        stale.difference_update(files)
+    _organize.remove_stale(base_dir, stale)
+
+    if journal:
+        journal.save(organized)
+
+    return moves
+
+
+def _get_organize_destination(part_name, key, src, dst, src_count, base_dir, overwrite):
+    if os.path.isdir(src) and "*" not in key:
+        if not os.path.isdir(dst) and os.path.lexists(dst):
+            raise errors.SnapcraftOrganizeError(
+                part_name,
+                "trying to organize directory {key!r} to {dst!r}, but {dst!r} "
+                "is not a directory".format(
+                    key=key, dst=os.path.relpath(dst, base_dir)
+                ),
+            )
+        return dst
+    elif os.path.isfile(dst):
+        if overwrite and src_count <= 1:
+            return dst
+        elif src_count > 1:
+            raise errors.SnapcraftOrganizeError(
+                part_name,
+                "multiple files to be organized into {!r}. If this is supposed "
+                "to be a directory, end it with a forward slash.".format(
+                    os.path.relpath(dst, base_dir)
+                ),
+            )
+        else:
+            raise errors.SnapcraftOrganizeError(
+                part_name,
+                "trying to organize file {key!r} to {dst!r}, but {dst!r} "
+                "already exists".format(key=key, dst=os.path.relpath(dst, base_dir)),
+            )
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.isdir(dst) and not os.path.samefile(src, dst):
+        real_dst = os.path.join(dst, os.path.basename(src))
+        if not overwrite and os.path.lexists(real_dst):
+            raise errors.SnapcraftOrganizeError(
+                part_name,
+                "trying to organize file {key!r} to {dst!r}, but {dst!r} "
+                "already exists".format(
+                    key=key, dst=os.path.relpath(real_dst, base_dir)
+                ),
+            )
+        return real_dst
+    return dst
+
+
+def _get_organized_files(src, dst, base_dir):
+    """Return the files src provides when organized to dst, from base_dir."""
+    if not os.path.lexists(src):
+        return []
+    return [
+        os.path.normpath(os.path.relpath(os.path.join(dst, f), base_dir))
+        for f in _organize.list_files(src)
+    ]
 
 
 def _clean_migrated_files(snap_files, snap_dirs, directory):
@@ -0,0 +1,130 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import copy
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from snapcraft.internal import cache, repo
+
+logger = logging.getLogger(__name__)
+
+_DPKG_STATUS_PATH = "/var/lib/dpkg/status"
+_BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+class MachineManifest:
+    """Collect the manifest of the building machine once for all parts.
+
+    Collection starts in the background on the first call to prefetch, so
+    it can overlap with the build of the first part, and its result is
+    shared by every call to get.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._future: Optional[Future] = None
+
+    def prefetch(self) -> None:
+        """Start collecting the manifest if not already started."""
+        with self._lock:
+            if self._future is None:
+                executor = ThreadPoolExecutor(max_workers=1)
+                self._future = executor.submit(_get_machine_manifest)
+                executor.shutdown(wait=False)
+
+    def get(self) -> Dict[str, Any]:
+        """Return the manifest, waiting for its collection if needed."""
+        self.prefetch()
+        # Parts get their own copy as it ends up in their state.
+        return copy.deepcopy(self._future.result())  # type: ignore
+
+
+def _get_machine_manifest() -> Dict[str, Any]:
+    # Use subprocess directly here. common.run_output will use binaries out
+    # of the snap, and we want to use the one on the host.
+    try:
+        output = subprocess.check_output(
+            [
+                "uname",
+                "--kernel-name",
+                "--kernel-release",
+                "--kernel-version",
+                "--machine",
+                "--processor",
+                "--hardware-platform",
+                "--operating-system",
+            ]
+        )
+    except subprocess.CalledProcessError as e:
+        logger.warning(
+            "'uname' exited with code {}: unable to record machine "
+            "manifest".format(e.returncode)
+        )
+        return {}
+
+    try:
+        uname = output.decode(sys.getfilesystemencoding()).strip()
+    except UnicodeEncodeError:
+        logger.warning("Could not decode output for 'uname' correctly")
+        uname = output.decode("latin-1", "surrogateescape").strip()
+
+    return {
+        "uname": uname,
+        "installed-packages": sorted(_get_installed_packages()),
+        "installed-snaps": sorted(repo.snaps.get_installed_snaps()),
+    }
+
+
+def _get_installed_packages() -> List[str]:
+    # Loading the package cache of the host is slow, so the list is kept
+    # until the next boot or change to the dpkg database.
+    try:
+        with open(_BOOT_ID_PATH) as boot_id_file:
+            boot_id = boot_id_file.read().strip()
+        dpkg_status_mtime = os.stat(_DPKG_STATUS_PATH).st_mtime_ns
+    except OSError:
+        return repo.Repo.get_installed_packages()
+
+    key = "{}-{}".format(boot_id, dpkg_status_mtime)
+    cache_path = os.path.join(
+        cache.SnapcraftCache().cache_root, "host", "installed-packages.json"
+    )
+    try:
+        with open(cache_path) as cache_file:
+            cached = json.load(cache_file)
+        if cached["key"] == key:
+            return cached["installed-packages"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    installed_packages = repo.Repo.get_installed_packages()
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(cache_path + ".new", "w") as cache_file:
+            json.dump(
+                {"key": key, "installed-packages": installed_packages}, cache_file
+            )
+        os.replace(cache_path + ".new", cache_path)
+    except OSError as e:
+        logger.debug("Unable to cache installed packages: {}".format(e))
+    return installed_packages
@@ -0,0 +1,134 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import filecmp
+import json
+import os
+import shutil
+import stat
+from typing import Dict, Iterable, List
+
+
+class OrganizeJournal:
+    """Record of the files organize moved for each organize entry.
+
+    On an update of the build, the entries of a part are organized again
+    over what was organized before. The journal tells which files in the
+    destinations an entry put there, so those the update no longer installs
+    are removed while everything else is left as is.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def load(self) -> Dict[str, List[str]]:
+        try:
+            with open(self._path) as journal_file:
+                return json.load(journal_file)
+        except (OSError, ValueError):
+            return dict()
+
+    def save(self, journal: Dict[str, List[str]]) -> None:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path + ".new", "w") as journal_file:
+            json.dump(journal, journal_file)
+        os.replace(self._path + ".new", self._path)
+
+    def remove(self) -> None:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self._path)
+
+
+def list_files(path: str) -> List[str]:
+    """Return the files in the tree at path, relative to path.
+
+    A path which is not a directory is listed as a single file, ".".
+    Symlinks to directories are listed as files.
+    """
+    if not os.path.isdir(path) or os.path.islink(path):
+        return [os.curdir]
+
+    files: List[str] = []
+    for root, directories, file_names in os.walk(path):
+        relative_root = os.path.relpath(root, path)
+        file_names.extend(
+            d for d in directories if os.path.islink(os.path.join(root, d))
+        )
+        files.extend(
+            os.path.normpath(os.path.join(relative_root, f)) for f in file_names
+        )
+    return files
+
+
+def move(source: str, destination: str) -> None:
+    """Move source to destination, replacing and merging what is there.
+
+    Paths are renamed rather than copied, and a directory is merged into an
+    existing directory file by file. A file which is identical to the one it
+    would replace is dropped instead, so the destination keeps its
+    timestamps.
+    """
+    if _is_directory(source) and _is_directory(destination):
+        for entry in os.listdir(source):
+            move(os.path.join(source, entry), os.path.join(destination, entry))
+        os.rmdir(source)
+    elif _is_unchanged(source, destination):
+        os.unlink(source)
+    else:
+        if _is_directory(destination):
+            shutil.rmtree(destination)
+        # shutil.move renames, only copying across filesystems.
+        shutil.move(source, destination)
+
+
+def remove_stale(base_dir: str, paths: Iterable[str]) -> None:
+    """Remove paths, relative to base_dir, and the directories they empty."""
+    for path in sorted(paths, reverse=True):
+        try:
+            os.remove(os.path.join(base_dir, path))
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+
+        parent = os.path.dirname(path)
+        while parent:
+            try:
+                os.rmdir(os.path.join(base_dir, parent))
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
+
+
+def _is_directory(path: str) -> bool:
+    return os.path.isdir(path) and not os.path.islink(path)
+
+
+def _is_unchanged(source: str, destination: str) -> bool:
+    try:
+        source_stat = os.lstat(source)
+        destination_stat = os.lstat(destination)
+    except FileNotFoundError:
+        return False
+
+    if source_stat.st_mode != destination_stat.st_mode:
+        return False
+    if stat.S_ISLNK(source_stat.st_mode):
+        return os.readlink(source) == os.readlink(destination)
+    if stat.S_ISREG(source_stat.st_mode):
+        return source_stat.st_size == destination_stat.st_size and filecmp.cmp(
+            source, destination, shallow=False
+        )
+    return False
@@ -23,6 +23,7 @@ import sys
 import jsonschema
 
 import snapcraft
+from snapcraft.project._schema import validate
 from snapcraft.project.errors import YamlValidationError
 from snapcraft.internal import errors
 from typing import Optional
@@ -159,7 +160,7 @@ def _make_options(part_schema, definitions_schema, properties, plugin_schema):
         part_schema, definitions_schema, plugin_schema
     )
 
-    jsonschema.validate(properties, plugin_schema)
+    validate(properties, plugin_schema)
 
     options = _populate_options(properties, plugin_schema)
 
@@ -17,12 +17,13 @@
 import contextlib
 import json
 import os
+import selectors
 import subprocess
 import sys
 import tempfile
 import textwrap
-import time
-from typing import Any, Callable, Dict  # noqa
+import threading
+from typing import Any, Callable, Dict, Optional  # noqa
 
 from snapcraft.internal import common, errors
 
@@ -124,7 +125,35 @@ class Runner:
 
             status = None
             try:
-                while status is None:
+                with _ProcessExitWatcher(process) as exit_watcher:
+                    status = self._handle_calls(
+                        scriptlet_name, call_fifo, feedback_fifo, exit_watcher
+                    )
+            finally:
+                call_fifo.close()
+                feedback_fifo.close()
+
+            if status:
+                raise errors.ScriptletRunError(
+                    scriptlet_name=scriptlet_name, code=status
+                )
+
+    def _handle_calls(
+        self,
+        scriptlet_name: str,
+        call_fifo: "_NonBlockingRWFifo",
+        feedback_fifo: "_NonBlockingRWFifo",
+        exit_watcher: "_ProcessExitWatcher",
+    ) -> int:
+        # Instead of polling, sleep until either snapcraftctl writes a function
+        # call into the FIFO or the scriptlet exits, whichever comes first.
+        with selectors.DefaultSelector() as selector:
+            selector.register(call_fifo.fileno(), selectors.EVENT_READ, call_fifo)
+            selector.register(exit_watcher.fileno(), selectors.EVENT_READ, exit_watcher)
+
+            while True:
+                ready = [key.data for key, _ in selector.select()]
+                if call_fifo in ready:
                     function_call = call_fifo.read()
                     if function_call:
                         # Handle the function and let caller know that function
@@ -138,18 +167,8 @@ class Runner:
                                 )
                             )
                         )
-                    status = process.poll()
-
-                    # Don't loop TOO busily
-                    time.sleep(0.1)
-            finally:
-                call_fifo.close()
-                feedback_fifo.close()
-
-            if status:
-                raise errors.ScriptletRunError(
-                    scriptlet_name=scriptlet_name, code=status
-                )
+                if exit_watcher in ready:
+                    return exit_watcher.returncode
 
     def _handle_builtin_function(self, scriptlet_name, function_call):
         try:
@@ -204,23 +223,71 @@ class _NonBlockingRWFifo:
         # Using RDWR for every FIFO just so we can open them reliably whenever
         # (i.e. write-only FIFOs can't be opened successfully until the reader
         # is in place)
-        self._fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)  # type: Optional[int]
 
     def read(self) -> str:
         total_read = ""
         with contextlib.suppress(BlockingIOError):
-            value = os.read(self._fd, 1024)
+            value = os.read(self.fileno(), 1024)
             while value:
                 total_read += value.decode(sys.getfilesystemencoding())
-                value = os.read(self._fd, 1024)
+                value = os.read(self.fileno(), 1024)
         return total_read
 
     def write(self, data: str) -> int:
-        return os.write(self._fd, data.encode(sys.getfilesystemencoding()))
+        return os.write(self.fileno(), data.encode(sys.getfilesystemencoding()))
+
+    def fileno(self) -> int:
+        if self._fd is None:
+            raise ValueError("I/O operation on closed FIFO")
+        return self._fd
 
     def close(self) -> None:
         if self._fd is not None:
             os.close(self._fd)
+            self._fd = None
+
+
+class _ProcessExitWatcher:
+    """Provide a file descriptor that becomes readable when a process exits.
+
+    A pidfd is used where the platform supports it, otherwise a thread waits
+    on the process and signals exit through a pipe.
+    """
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        self._process = process
+        self._thread = None  # type: Optional[threading.Thread]
+
+        try:
+            self._read_fd = os.pidfd_open(process.pid)  # type: ignore
+        except (AttributeError, OSError):
+            self._read_fd, write_fd = os.pipe()
+            self._thread = threading.Thread(
+                target=self._wait, args=(write_fd,), daemon=True
+            )
+            self._thread.start()
+
+    def _wait(self, write_fd: int) -> None:
+        self._process.wait()
+        os.close(write_fd)
+
+    @property
+    def returncode(self) -> int:
+        return self._process.wait()
+
+    def fileno(self) -> int:
+        return self._read_fd
+
+    def __enter__(self) -> "_ProcessExitWatcher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # The waiting thread (if any) is a daemon that closes its own end of
+        # the pipe, so there is nothing to join here. This matters when
+        # leaving due to an error, as the scriptlet may still be blocked on
+        # snapcraftctl feedback.
+        os.close(self._read_fd)
 
 
 def _get_env():
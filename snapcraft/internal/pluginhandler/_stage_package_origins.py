@@ -0,0 +1,67 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+from typing import Dict, Iterable, Sequence, Set, Tuple
+
+
+class StagePackageOrigins:
+    """Record of the stage package each installed file of a part comes from.
+
+    The record is written when stage packages are unpacked and follows the
+    files moved by organize, so the stage packages which end up primed are
+    found from the paths of the primed files alone.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+
+    def load(self) -> Dict[str, str]:
+        try:
+            with open(self._path) as origins_file:
+                return json.load(origins_file)
+        except (OSError, ValueError):
+            return dict()
+
+    def save(self, origins: Dict[str, str]) -> None:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        with open(self._path + ".new", "w") as origins_file:
+            json.dump(origins, origins_file)
+        os.replace(self._path + ".new", self._path)
+
+    def organize(self, moves: Sequence[Tuple[str, str]]) -> None:
+        """Apply moves, pairs of source and destination paths, to the record."""
+        origins = self.load()
+        if not origins or not moves:
+            return
+
+        for src, dst in moves:
+            if src in origins:
+                origins[dst] = origins.pop(src)
+                continue
+
+            # Anything else moved is a directory.
+            prefix = src + os.sep
+            for path in [p for p in origins if p.startswith(prefix)]:
+                origins[os.path.join(dst, path[len(prefix) :])] = origins.pop(path)
+
+        self.save(origins)
+
+    def get_packages(self, paths: Iterable[str]) -> Set[str]:
+        """Return the stage packages the files in paths come from."""
+        origins = self.load()
+        return {origins[p] for p in paths if p in origins}
@@ -0,0 +1,125 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import collections
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from glob import glob
+from typing import Dict, Iterable, Optional, Tuple
+
+from snapcraft import file_utils
+from snapcraft.internal import cache, repo, sources
+
+logger = logging.getLogger(__name__)
+
+
+class StageSnapsPipeline:
+    """Fetch the stage-snaps of all parts in a project.
+
+    Every <snap-name>/<channel> is downloaded once, concurrently with the
+    others, and every revision is extracted once into a StageSnapCache from
+    which parts clone their stage-snaps.
+    """
+
+    def __init__(self, *, max_workers: Optional[int] = None) -> None:
+        self._cache = cache.StageSnapCache()
+        self._max_workers = max_workers
+        self._entries: Dict[str, str] = dict()
+        self._lock = threading.Lock()
+        self._revision_locks: Dict[
+            Tuple[str, str], threading.Lock
+        ] = collections.defaultdict(threading.Lock)
+
+    def fetch(self, snaps: Iterable[str]) -> Dict[str, str]:
+        """Download and extract snaps of the format <snap-name>/<channel>.
+
+        :returns: a mapping of each snap to its cache entry.
+        """
+        snaps = set(snaps)
+        pending = sorted(s for s in snaps if s not in self._entries)
+        if pending:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                entries = executor.map(self._fetch_snap, pending)
+                self._entries.update(zip(pending, entries))
+
+        return {s: self._entries[s] for s in snaps}
+
+    def provision(self, snaps: Iterable[str], *, snaps_dir: str, dst: str) -> None:
+        """Clone the contents of snaps into dst and their files into snaps_dir.
+
+        The cache is shared across projects, so nothing is hard-linked out of
+        it where a build could modify it in place.
+        """
+        for entry_path in self.fetch(snaps).values():
+            for snap_file in os.listdir(entry_path):
+                if snap_file.endswith((".snap", ".assert")):
+                    file_utils.clone(
+                        os.path.join(entry_path, snap_file),
+                        os.path.join(snaps_dir, snap_file),
+                    )
+            file_utils.clone_tree(os.path.join(entry_path, "tree"), dst)
+
+    def _fetch_snap(self, snap: str) -> str:
+        snap_pkg = repo.snaps.SnapPackage(snap)
+        if not snap_pkg.is_valid():
+            raise repo.errors.SnapUnavailableError(
+                snap_name=snap_pkg.name, snap_channel=snap_pkg.channel
+            )
+
+        # Skip the download if the revision on the channel is known and
+        # already cached.
+        revision = snap_pkg.get_store_revision()
+        if revision is not None:
+            entry_path = self._cache.get(snap_name=snap_pkg.name, revision=revision)
+            if entry_path is not None:
+                logger.debug("Using cached snap {!r}".format(entry_path))
+                return entry_path
+
+        with self._cache.new_entry() as new_entry_path:
+            # TODO: use dependency injected echoer
+            logger.info("Downloading snap {!r}".format(snap_pkg.name))
+            snap_pkg.download(directory=new_entry_path)
+            snap_file = glob(os.path.join(new_entry_path, "*.snap"))[0]
+            revision = _get_revision(snap_file)
+
+            # Different channels can point to the same revision.
+            with self._get_revision_lock(snap_pkg.name, revision):
+                entry_path = self._cache.get(snap_name=snap_pkg.name, revision=revision)
+                if entry_path is not None:
+                    return entry_path
+
+                logger.debug("Extracting {!r}".format(snap_file))
+                sources.Snap(source=snap_file, source_dir=new_entry_path).provision(
+                    os.path.join(new_entry_path, "tree"),
+                    clean_target=False,
+                    keep_snap=True,
+                )
+                return self._cache.add(
+                    entry_path=new_entry_path,
+                    snap_name=snap_pkg.name,
+                    revision=revision,
+                )
+
+    def _get_revision_lock(self, snap_name: str, revision: str) -> threading.Lock:
+        with self._lock:
+            return self._revision_locks[(snap_name, revision)]
+
+
+def _get_revision(snap_file: str) -> str:
+    # snap download names files <snap-name>_<revision>.snap
+    return os.path.splitext(os.path.basename(snap_file))[0].rpartition("_")[2]
@@ -15,21 +15,23 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import collections
+import hashlib
+import json
 import logging
 import os
 import os.path
 import re
 
 import jsonschema
-from typing import List, Set
+from typing import Any, Dict, List, Set
 
-from snapcraft import project, formatting_utils
-from snapcraft.internal import common, deprecations, repo, states, steps
+from snapcraft import file_utils, project, formatting_utils
+from snapcraft.internal import cache, common, deprecations, repo, states, steps
 from snapcraft.internal.errors import SnapcraftEnvironmentError
 from snapcraft.internal.meta.snap import Snap
 from snapcraft.project._schema import Validator
 from ._parts_config import PartsConfig
-from ._extensions import apply_extensions
+from ._extensions import apply_extensions, get_extensions_digest
 from ._env import (
     build_env_for_stage,
     runtime_env,
@@ -201,11 +203,8 @@ class Config:
         self.build_snaps = set()  # type: Set[str]
         self.project = project
 
-        # raw_snapcraft_yaml is read only, create a new copy
-        snapcraft_yaml = apply_extensions(project.info.get_raw_snapcraft())
-
+        snapcraft_yaml = _get_resolved_snapcraft_yaml(project)
         self.validator = Validator(snapcraft_yaml)
-        self.validator.validate()
 
         snapcraft_yaml = self._expand_filesets(snapcraft_yaml)
 
@@ -228,6 +227,11 @@ class Config:
         if self.data.get("version") == "git":
             self.build_tools.add("git")
 
+        # sccache is not packaged for every base, so only ccache is installed.
+        self.compiler_cache = cache.get_compiler_cache()
+        if self.compiler_cache and self.compiler_cache.launcher == "ccache":
+            self.build_tools.add("ccache")
+
         # XXX: Resetting snap_meta due to above mangling of data.
         # Convergence to operating on snap_meta will remove this requirement...
         project._snap_meta = Snap.from_dict(self.data)
@@ -252,6 +256,7 @@ class Config:
             validator=self.validator,
             build_snaps=self.build_snaps,
             build_tools=self.build_tools,
+            compiler_cache=self.compiler_cache,
         )
 
     def _ensure_no_duplicate_app_aliases(self):
@@ -349,6 +354,48 @@ class Config:
         return snapcraft_yaml
 
 
+def _get_resolved_snapcraft_yaml(project: project.Project) -> Dict[str, Any]:
+    # raw_snapcraft_yaml is read only, create a new copy
+    raw_snapcraft_yaml = project.info.get_raw_snapcraft()
+    if not isinstance(project.info.name, str):
+        # Let validation report it.
+        resolved_project_cache = None
+    else:
+        resolved_project_cache = cache.ResolvedProjectCache(
+            project_name=project.info.name
+        )
+        key = _get_resolved_project_key(project, raw_snapcraft_yaml)
+        snapcraft_yaml = resolved_project_cache.get(key=key)
+        if snapcraft_yaml is not None:
+            logger.debug("Using the cached resolved project {!r}.".format(key))
+            return snapcraft_yaml
+
+    snapcraft_yaml = apply_extensions(raw_snapcraft_yaml)
+    Validator(snapcraft_yaml).validate()
+
+    if resolved_project_cache is not None:
+        resolved_project_cache.add(key=key, snapcraft_yaml=snapcraft_yaml)
+    return snapcraft_yaml
+
+
+def _get_resolved_project_key(
+    project: project.Project, raw_snapcraft_yaml: Dict[str, Any]
+) -> str:
+    # Applying extensions and validating only depend on the snapcraft.yaml,
+    # the extensions and the schema, except for the check of the icon existing.
+    icon = raw_snapcraft_yaml.get("icon")
+    key_data = [
+        file_utils.calculate_hash(
+            project.info.snapcraft_yaml_file_path, algorithm="sha384"
+        ),
+        get_extensions_digest(),
+        project.deb_arch,
+        Validator().schema_digest,
+        isinstance(icon, str) and os.path.exists(icon),
+    ]
+    return hashlib.sha384(json.dumps(key_data).encode()).hexdigest()
+
+
 def _expand_filesets_for(step, properties):
     filesets = properties.get("filesets", {})
     fileset_for_step = properties.get(step, {})
@@ -17,5 +17,6 @@
 from ._utils import (  # noqa: F401
     apply_extensions,
     find_extension,
+    get_extensions_digest,
     supported_extension_names,
 )
@@ -17,6 +17,8 @@
 import collections
 import contextlib
 import copy
+import functools
+import hashlib
 import jsonschema
 import importlib
 import logging
@@ -27,6 +29,7 @@ from typing import Any, Dict, List, Optional, Set, Type
 from .. import errors
 from ._extension import Extension
 from snapcraft.project import errors as project_errors
+from snapcraft.project._schema import validate
 
 logger = logging.getLogger(__name__)
 
@@ -118,6 +121,24 @@ def supported_extension_names() -> List[str]:
     return extension_names
 
 
+@functools.lru_cache(maxsize=None)
+def get_extensions_digest() -> str:
+    """Return the sha384 digest of the source of all extensions.
+
+    :returns: the hex digest of the extension modules and their helpers.
+    :rtype: str
+    """
+    extensions_dir = os.path.dirname(__file__)
+    digest = hashlib.sha384()
+    for file_name in sorted(os.listdir(extensions_dir)):
+        if not file_name.endswith(".py"):
+            continue
+        digest.update(file_name.encode())
+        with open(os.path.join(extensions_dir, file_name), "rb") as extension_file:
+            digest.update(extension_file.read())
+    return digest.hexdigest()
+
+
 def _load_extension(
     base: Optional[str], extension_name: str, yaml_data: Dict[str, Any]
 ) -> Extension:
@@ -205,9 +226,7 @@ def _validate_extension_format(extension_names):
     if extension_names is not None:
         format_check = jsonschema.FormatChecker()
         try:
-            jsonschema.validate(
-                extension_names, extension_schema, format_checker=format_check
-            )
+            validate(extension_names, extension_schema, format_checker=format_check)
         except jsonschema.ValidationError as e:
             raise project_errors.YamlValidationError(
                 "The 'extensions' property does not match the required schema: {}".format(
@@ -35,14 +35,26 @@ logger = logging.getLogger(__name__)
 
 
 class PartsConfig:
-    def __init__(self, *, parts, project, validator, build_snaps, build_tools):
+    def __init__(
+        self,
+        *,
+        parts,
+        project,
+        validator,
+        build_snaps,
+        build_tools,
+        compiler_cache=None
+    ):
         self._soname_cache = elf.SonameCache()
+        self._stage_snaps_pipeline = pluginhandler.StageSnapsPipeline()
+        self._machine_manifest = pluginhandler.MachineManifest()
         self._parts_data = parts.get("parts", {})
         self._snap_type = parts.get("type", "app")
         self._project = project
         self._validator = validator
         self.build_snaps = build_snaps
         self.build_tools = build_tools
+        self._compiler_cache = compiler_cache
 
         self.all_parts = []
         self._part_names = []
@@ -161,6 +173,14 @@ class PartsConfig:
 
         return None
 
+    def fetch_stage_snaps(self, parts) -> None:
+        """Fetch the stage-snaps of parts all at once."""
+        stage_snaps = set()  # type: Set[str]
+        for part in parts:
+            stage_snaps |= part.get_stage_snaps()
+        if stage_snaps:
+            self._stage_snaps_pipeline.fetch(stage_snaps)
+
     def clean_part(self, part_name, staged_state, primed_state, step):
         part = self.get_part(part_name)
         part.clean(staged_state, primed_state, step)
@@ -220,6 +240,8 @@ class PartsConfig:
             confinement=self._project.info.confinement,
             snap_type=self._snap_type,
             soname_cache=self._soname_cache,
+            stage_snaps_pipeline=self._stage_snaps_pipeline,
+            machine_manifest=self._machine_manifest,
         )
 
         self.build_snaps |= grammar_processor.get_build_snaps()
@@ -263,6 +285,16 @@ class PartsConfig:
             for variable, value in ChainMap(part_env, global_env).items():
                 env.append('{}="{}"'.format(variable, value))
 
+            if self._compiler_cache:
+                compiler_prefix = ""
+                if self._project.is_cross_compiling:
+                    compiler_prefix = self._project.cross_compiler_prefix
+                compiler_env = self._compiler_cache.get_environment(
+                    compiler_prefix=compiler_prefix
+                )
+                for variable, value in compiler_env.items():
+                    env.append('{}="{}"'.format(variable, value))
+
             # Finally, add the declared environment from the part.
             # This is done only for the "root" part.
             env += part.build_environment
@@ -14,8 +14,12 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+from concurrent.futures import Future, ThreadPoolExecutor
+import contextlib
 from datetime import datetime
+import functools
 import gzip
+import http.client
 import logging
 import os
 import shutil
@@ -26,7 +30,7 @@ import urllib.error
 from lazr import restfulclient
 from lazr.restfulclient.resource import Entry
 from launchpadlib.launchpad import Launchpad
-from typing import Any, Dict, List, Sequence, Optional
+from typing import Any, Dict, List, Sequence, Optional, Set, Tuple
 from urllib.parse import unquote, urlsplit
 from xdg import BaseDirectory
 from . import errors
@@ -37,9 +41,16 @@ from snapcraft.internal.sources._git import Git
 from snapcraft.project import Project
 
 _LP_POLL_INTERVAL = 30
+# Polling starts at this interval and backs off up to the requested one
+# while no build changes state.
+_LP_POLL_MIN_INTERVAL = 5
 _LP_SUCCESS_STATUS = "Successfully built"
 _LP_FAIL_STATUS = "Failed to build"
 
+# Files at least twice this size are downloaded in concurrent ranges.
+_DOWNLOAD_RANGE_MIN_SIZE = 8 * 1024 * 1024
+_DOWNLOAD_RANGES = 4
+
 logger = logging.getLogger(__name__)
 
 
@@ -77,6 +88,66 @@ def _get_url_basename(url: str):
     return unquote(path).split("/")[-1]
 
 
+class _RangedDownloadUnsupportedError(Exception):
+    """The server did not honor a range request."""
+
+
+def _download_range(url: str, fd: int, byte_range: Tuple[int, int]) -> None:
+    start, end = byte_range
+    request = urllib.request.Request(url, headers={"Range": f"bytes={start}-{end}"})
+    with urllib.request.urlopen(request) as response:
+        if response.status != 206:
+            raise _RangedDownloadUnsupportedError()
+        offset = start
+        for chunk in iter(functools.partial(response.read, 2 ** 20), b""):
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+    if offset != end + 1:
+        raise _RangedDownloadUnsupportedError()
+
+
+def _download_ranged(url: str, dst: str) -> bool:
+    """Download url to dst fetching byte ranges concurrently.
+
+    :return: False if the file is too small, the server does not support
+             range requests or fetching a range failed, in which case dst
+             is not left behind.
+    """
+    request = urllib.request.Request(url, method="HEAD")
+    try:
+        with urllib.request.urlopen(request) as response:
+            size = int(response.headers.get("Content-Length", 0))
+            accept_ranges = response.headers.get("Accept-Ranges")
+    except (OSError, ValueError) as error:
+        logger.debug(f"Not downloading {url} in ranges: {error}")
+        return False
+    if accept_ranges != "bytes" or size < 2 * _DOWNLOAD_RANGE_MIN_SIZE:
+        return False
+
+    range_size = max(-(-size // _DOWNLOAD_RANGES), _DOWNLOAD_RANGE_MIN_SIZE)
+    ranges = [
+        (start, min(start + range_size, size) - 1)
+        for start in range(0, size, range_size)
+    ]
+    try:
+        with open(dst, "wb") as f:
+            f.truncate(size)
+            download = functools.partial(_download_range, url, f.fileno())
+            with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+                list(executor.map(download, ranges))
+    except (
+        _RangedDownloadUnsupportedError,
+        OSError,
+        http.client.HTTPException,
+    ) as error:
+        # A partly downloaded file would look complete, as it has its size.
+        logger.debug(f"Failed to download {url} in ranges: {error!r}")
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(dst)
+        return False
+    return True
+
+
 class LaunchpadClient:
     """Launchpad remote builder operations."""
 
@@ -143,14 +214,20 @@ class LaunchpadClient:
         os.makedirs(cache_dir, mode=0o700, exist_ok=True)
         return cache_dir
 
-    def _fetch_artifacts(self, snap: Entry) -> None:
-        """Fetch build arftifacts (logs and snaps)."""
-        builds = self._get_builds(snap)
-
-        logger.debug("Downloading artifacts...")
-        for build in builds:
-            self._download_snap(build)
-            self._download_log(build)
+    def _fetch_artifacts(
+        self, build: Dict[str, Any], executor: ThreadPoolExecutor
+    ) -> List[Future]:
+        """Fetch build artifacts (logs and snaps) for a finished build."""
+        logger.debug("Downloading artifacts for {}...".format(build["arch_tag"]))
+
+        # Launchpad is queried from this thread only, the downloads
+        # themselves happen in the executor.
+        downloads = [
+            executor.submit(self._download_snap_file, url=url, snap_name=snap_name)
+            for url, snap_name in self._get_snap_urls(build)
+        ]
+        downloads.append(executor.submit(self._download_log, build))
+        return downloads
 
     def _get_builds_collection_entry(self, snap: Entry) -> Optional[Entry]:
         logger.debug("Fetching builds collection information from Launchpad...")
@@ -326,29 +403,52 @@ class LaunchpadClient:
         self._wait_for_build_request_acceptance(build_request, timeout=timeout)
 
     def monitor_build(self, interval: int = _LP_POLL_INTERVAL) -> None:
-        """Check build progress, and download artifacts when ready."""
-        snap = self._get_snap()
-
-        while True:
-            builds = self._get_builds(snap)
-            pending = False
-            timestamp = str(datetime.now())
-            logger.info(f"Build status as of {timestamp}:")
-            for build in builds:
-                state = build["buildstate"]
-                arch = build["arch_tag"]
-                logger.info(f"\tarch={arch}\tstate={state}")
-
-                if _is_build_pending(build):
-                    pending = True
+        """Check build progress, and download artifacts when ready.
 
-            if pending is False:
-                break
-
-            time.sleep(interval)
-
-        # Build is complete - download build artifacts.
-        self._fetch_artifacts(snap)
+        Artifacts for each architecture are downloaded as soon as its build
+        finishes, while the remaining builds are still being monitored.
+        """
+        snap = self._get_snap()
+        min_interval = min(_LP_POLL_MIN_INTERVAL, interval)
+        poll_interval = min_interval
+        build_states: Dict[str, str] = dict()
+        fetched: Set[str] = set()
+        downloads: List[Future] = []
+
+        with ThreadPoolExecutor() as executor:
+            while True:
+                builds = self._get_builds(snap)
+                pending = False
+                changed = False
+                timestamp = str(datetime.now())
+                logger.info(f"Build status as of {timestamp}:")
+                for build in builds:
+                    state = build["buildstate"]
+                    arch = build["arch_tag"]
+                    logger.info(f"\tarch={arch}\tstate={state}")
+
+                    if build_states.get(arch) != state:
+                        build_states[arch] = state
+                        changed = True
+
+                    if _is_build_pending(build):
+                        pending = True
+                    elif arch not in fetched:
+                        fetched.add(arch)
+                        downloads.extend(self._fetch_artifacts(build, executor))
+
+                if pending is False:
+                    break
+
+                if changed:
+                    poll_interval = min_interval
+                else:
+                    poll_interval = min(poll_interval * 2, interval)
+                time.sleep(poll_interval)
+
+            # Raise any download error.
+            for download in downloads:
+                download.result()
 
     def get_build_status(self) -> Dict[str, str]:
         """Get status of builds."""
@@ -387,6 +487,10 @@ class LaunchpadClient:
         # TODO: consolidate with, and use indicators.download_requests_stream
         logger.debug(f"Downloading: {url}")
         try:
+            # Compressed logs are small, only try ranges for other files.
+            if not gunzip and _download_ranged(url, dst):
+                return
+
             with urllib.request.urlopen(url) as response:
                 # Wrap response with gzipfile if gunzip is requested.
                 if gunzip:
@@ -396,15 +500,16 @@ class LaunchpadClient:
         except urllib.error.HTTPError as e:
             logger.error(f"Error downloading {url}: {e.reason}")
 
-    def _download_snap(self, build: Dict[str, Any]) -> None:
+    def _get_snap_urls(self, build: Dict[str, Any]) -> List[Tuple[str, str]]:
         arch = build["arch_tag"]
         snap_build = self._lp_load_url(build["self_link"])
         urls = snap_build.getFileUrls()
 
         if not urls:
             logger.error(f"Snap file not available for arch {arch!r}.")
-            return
+            return []
 
+        snap_urls: List[Tuple[str, str]] = []
         for url in urls:
             snap_name = _get_url_basename(url)
 
@@ -413,8 +518,12 @@ class LaunchpadClient:
                 logger.info("Skipping unknown artifact: {url}")
                 continue
 
-            self._download_file(url=url, dst=snap_name)
-            logger.info("Snapped {}".format(snap_name))
+            snap_urls.append((url, snap_name))
+        return snap_urls
+
+    def _download_snap_file(self, *, url: str, snap_name: str) -> None:
+        self._download_file(url=url, dst=snap_name)
+        logger.info("Snapped {}".format(snap_name))
 
     def _gitify_repository(self, repo_dir: str) -> Git:
         """Git-ify source repository tree.
@@ -14,18 +14,23 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
 import logging
 import os
 import pathlib
 import shutil
-import subprocess
+import tarfile
+import tempfile
+import zlib
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
+from typing import IO
 
 import snapcraft
 import snapcraft.internal.sources
-from snapcraft import yaml_utils
+from snapcraft import file_utils, yaml_utils
 from snapcraft.file_utils import rmtree
 from snapcraft.project import Project
 from snapcraft.internal.meta import _version
@@ -33,6 +38,10 @@ from snapcraft.internal.remote_build import errors
 
 logger = logging.getLogger(__name__)
 
+# Size of the chunks of the tar stream compressed in parallel, each becomes
+# an independent member of the resulting gzip file.
+_GZIP_CHUNK_SIZE = 4 * 1024 * 1024
+
 
 class WorkTree:
     """Manages tree for remote-build project."""
@@ -67,6 +76,10 @@ class WorkTree:
         self._cache_dir = os.path.join(self._base_dir, "cache")
         os.makedirs(self._cache_dir, exist_ok=True)
 
+        # Initialize cache for source archives, kept across runs so unchanged
+        # sources are not archived again.
+        self._archives_dir = os.path.join(self._base_dir, "archives")
+
         # Initialize clean repo to ship to remote builder.
         self._repo_dir = os.path.join(self._base_dir, "repo")
         if os.path.exists(self._repo_dir):
@@ -131,26 +144,103 @@ class WorkTree:
             )
         return os.path.join(self._repo_sources_dir, part_name, tarball_filename)
 
+    def _get_part_archive_cache_dir(self, part_name: str, selector=None) -> str:
+        """Get directory to keep the specified part's archive across runs.
+
+        :param str part_name: Name of part.
+        :param str selector: Source selector, if any (e.g. "on amd64").
+        :return: Directory path to store the archive and its digest.
+        """
+        if selector:
+            return os.path.join(self._archives_dir, part_name, selector)
+
+        return os.path.join(self._archives_dir, part_name)
+
     def _archive_part_sources(self, part_name: str, selector=None):
         """Archive sources at source_dir into archive_path.
 
+        The archive is deterministic and only recreated when the digest of
+        its contents changes.
+
         :param str part_name: Name of part.
         :param str selector: Source selector, if any (e.g. "on amd64").
         :return: Relative path to archive within repository.
         """
         source_path = self._get_part_cache_dir(part_name, selector)
         archive_path = self._get_part_tarball_path(part_name, selector)
-
-        logger.debug("creating source archive: {}".format(archive_path))
+        cached_archive_path = os.path.join(
+            self._get_part_archive_cache_dir(part_name, selector),
+            os.path.basename(archive_path),
+        )
+        digest_path = cached_archive_path + ".sha256"
+
+        os.makedirs(os.path.dirname(cached_archive_path), exist_ok=True)
+        with tempfile.SpooledTemporaryFile(
+            max_size=_GZIP_CHUNK_SIZE * 16, mode="w+b"
+        ) as tar:
+            digest = _write_deterministic_tar(source_path, tar)
+
+            if (
+                os.path.exists(cached_archive_path)
+                and _read_digest(digest_path) == digest
+            ):
+                logger.debug("reusing source archive: {}".format(archive_path))
+            else:
+                logger.debug("creating source archive: {}".format(archive_path))
+                tar.seek(0)
+                _gzip_parallel(tar, cached_archive_path)
+                with open(digest_path, "w") as f:
+                    f.write(digest)
 
         os.makedirs(os.path.split(archive_path)[0], exist_ok=True)
-        command = ["tar", "czf", archive_path, "-C", source_path, "."]
-        subprocess.check_call(command)
+        file_utils.link_or_copy(cached_archive_path, archive_path)
         relpath = os.path.relpath(archive_path, self._repo_dir)
 
         # Ensure Linux path formatting is used.
         return pathlib.Path(relpath).as_posix()
 
+    def _update_local_source(
+        self, part_name: str, source_handler, download_dir: str, selector=None
+    ) -> None:
+        """Bring the cached copy of a local source up to date.
+
+        :param str part_name: Name of part.
+        :param source_handler: Local source handler for the part.
+        :param str download_dir: Directory holding the cached copy.
+        :param str selector: Source selector, if any (e.g. "on amd64").
+        """
+        stamp_path = os.path.join(
+            self._get_part_archive_cache_dir(part_name, selector), "pulled"
+        )
+        is_cached = os.path.exists(download_dir) and os.path.exists(stamp_path)
+
+        # Create the new stamp before looking for changes so anything
+        # modified while updating is picked up on the next run.
+        new_stamp_path = stamp_path + ".new"
+        os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+        pathlib.Path(new_stamp_path).touch()
+
+        if not is_cached:
+            self._pull_clean(part_name, source_handler, download_dir)
+        else:
+            if source_handler.check(stamp_path):
+                source_handler.update()
+            _remove_stale_files(source_handler.source_abspath, download_dir)
+
+        os.replace(new_stamp_path, stamp_path)
+
+    def _pull_clean(self, part_name: str, source_handler, download_dir: str) -> None:
+        # Remove existing cache directory (if exists)
+        if os.path.exists(download_dir):
+            rmtree(download_dir)
+
+        # Pull sources, but create directory first if part
+        # is configured to use the `dump` plugin.
+        if self._snapcraft_config["parts"][part_name].get("plugin") == "dump":
+            os.makedirs(download_dir, exist_ok=True)
+
+        source_handler.pull()
+
     def _pull_source(self, part_name: str, source: str, selector=None) -> str:
         """Pull source_url for part to source_dir. Returns source.
 
@@ -177,16 +267,12 @@ class WorkTree:
 
         logger.info("Packaging sources for {}...".format(print_name))
 
-        # Remove existing cache directory (if exists)
-        if os.path.exists(download_dir):
-            rmtree(download_dir)
-
-        # Pull sources, but create directory first if part
-        # is configured to use the `dump` plugin.
-        if self._snapcraft_config["parts"][part_name].get("plugin") == "dump":
-            os.makedirs(download_dir, exist_ok=True)
-
-        source_handler.pull()
+        if isinstance(source_handler, snapcraft.internal.sources.Local):
+            self._update_local_source(
+                part_name, source_handler, download_dir, selector=selector
+            )
+        else:
+            self._pull_clean(part_name, source_handler, download_dir)
 
         # Create source archive.
         return self._archive_part_sources(part_name, selector)
@@ -331,3 +417,93 @@ class WorkTree:
             yaml_utils.dump(self._prepared_snapcraft_config, stream=f)
 
         return self._repo_dir
+
+
+class _HashingWriter:
+    """Write-only file wrapper computing the sha256 of what is written."""
+
+    def __init__(self, fileobj: IO[bytes]) -> None:
+        self._fileobj = fileobj
+        self._hash = hashlib.sha256()
+
+    def write(self, data: bytes) -> int:
+        self._hash.update(data)
+        return self._fileobj.write(data)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _write_deterministic_tar(source_path: str, fileobj: IO[bytes]) -> str:
+    """Write an uncompressed tar of source_path to fileobj.
+
+    Entries are sorted and ownership and timestamps are reset, so the same
+    content always results in the same stream.
+
+    :return: sha256 hex digest of the tar stream.
+    """
+    writer = _HashingWriter(fileobj)
+    with tarfile.open(
+        fileobj=writer, mode="w|", format=tarfile.GNU_FORMAT  # type: ignore
+    ) as tar:
+        _add_to_tar(tar, source_path, ".")
+        for root, directories, files in os.walk(source_path):
+            # Symlinks to directories are added as links, not walked.
+            directories.sort()
+            for name in sorted(directories + files):
+                path = os.path.join(root, name)
+                _add_to_tar(tar, path, "./" + os.path.relpath(path, source_path))
+    return writer.hexdigest()
+
+
+def _add_to_tar(tar: tarfile.TarFile, path: str, arcname: str) -> None:
+    tarinfo = tar.gettarinfo(path, arcname=arcname)
+    tarinfo.mtime = 0
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    if tarinfo.isreg():
+        with open(path, "rb") as f:
+            tar.addfile(tarinfo, f)
+    else:
+        tar.addfile(tarinfo)
+
+
+def _gzip_member(data: bytes) -> bytes:
+    # wbits=31 produces a gzip member with a zeroed (reproducible) header.
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _gzip_parallel(source: IO[bytes], archive_path: str) -> None:
+    """Compress source into archive_path as a multi-member gzip file.
+
+    Chunks are compressed concurrently, zlib releases the GIL while working.
+    """
+    chunks = iter(lambda: source.read(_GZIP_CHUNK_SIZE), b"")
+    partial_path = archive_path + ".partial"
+    with ThreadPoolExecutor() as executor, open(partial_path, "wb") as archive:
+        for member in executor.map(_gzip_member, chunks):
+            archive.write(member)
+    os.replace(partial_path, archive_path)
+
+
+def _read_digest(digest_path: str) -> str:
+    try:
+        with open(digest_path) as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return ""
+
+
+def _remove_stale_files(source_dir: str, cache_dir: str) -> None:
+    """Remove entries in cache_dir which no longer exist in source_dir."""
+    for root, directories, files in os.walk(cache_dir, topdown=False):
+        for name in directories + files:
+            path = os.path.join(root, name)
+            relpath = os.path.relpath(path, cache_dir)
+            if os.path.lexists(os.path.join(source_dir, relpath)):
+                continue
+            if os.path.isdir(path) and not os.path.islink(path):
+                rmtree(path)
+            else:
+                os.unlink(path)
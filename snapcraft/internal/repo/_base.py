@@ -24,7 +24,7 @@ import re
 import shutil
 import stat
 
-from typing import List, Set
+from typing import Dict, List
 
 from snapcraft import file_utils
 from snapcraft.internal import mangling, xattrs
@@ -200,6 +200,9 @@ class BaseRepo:
         After the unpack logic is executed, normalize should be called.
 
         :param str unpackdir: target directory to unpack packages to.
+        :returns: the package each unpacked file comes from, keyed by the
+                  path of the file relative to unpackdir.
+        :rtype: dict
         """
         raise errors.NoNativeBackendError()
 
@@ -220,20 +223,23 @@ class BaseRepo:
 
     def _mark_origin_stage_package(
         self, sources_dir: str, stage_package: str
-    ) -> Set[str]:
-        """Mark all files in sources_dir as coming from stage_package."""
-        file_list = set()
+    ) -> Dict[str, str]:
+        """Mark all files in sources_dir as coming from stage_package.
+
+        The extended attributes of the files are only written as well when
+        build information is recorded.
+        """
+        write_xattrs = bool(os.environ.get("SNAPCRAFT_BUILD_INFO"))
+        origins = dict()  # type: Dict[str, str]
         for (root, dirs, files) in os.walk(sources_dir):
             for file_name in files:
                 file_path = os.path.join(root, file_name)
+                origins[os.path.relpath(file_path, sources_dir)] = stage_package
 
-                # Mark source.
-                xattrs.write_origin_stage_package(file_path, stage_package)
-
-                file_path = os.path.relpath(root, sources_dir)
-                file_list.add(file_path)
+                if write_xattrs:
+                    xattrs.write_origin_stage_package(file_path, stage_package)
 
-        return file_list
+        return origins
 
     def _remove_useless_files(self, unpackdir):
         """Remove files that aren't useful or will clash with other parts."""
@@ -27,9 +27,10 @@ import string
 import subprocess
 import sys
 import tempfile
+import threading
 import urllib
 import urllib.request
-from typing import Dict, Set, List, Tuple  # noqa: F401
+from typing import Dict, Iterator, Set, List, Optional, Tuple  # noqa: F401
 
 import apt
 from xml.etree import ElementTree
@@ -216,19 +217,26 @@ class _AptCache:
                 raise errors.CacheUpdateFailedError(str(e))
         return apt_cache
 
-    @contextlib.contextmanager
-    def archive(self, cache_dir):
+    def open(self, cache_dir) -> apt.Cache:
         try:
             apt_cache = self._setup_apt(cache_dir)
             apt_cache.open()
-
-            try:
-                yield apt_cache
-            finally:
-                apt_cache.close()
         except Exception as e:
             logger.debug("Exception occurred: {!r}".format(e))
             raise e
+        return apt_cache
+
+    @contextlib.contextmanager
+    def archive(self, cache_dir):
+        apt_cache = self.open(cache_dir)
+        try:
+            yield apt_cache
+        finally:
+            apt_cache.close()
+
+    @property
+    def keyrings(self) -> Tuple[str, ...]:
+        return tuple(self._keyrings)
 
     def sources_digest(self):
         return hashlib.sha384(
@@ -280,6 +288,64 @@ class _AptCache:
         return os.path.abspath(destfile)
 
 
+class _PackageIndexes:
+    """Package indexes shared by everything querying apt in this session.
+
+    Loading package indexes is expensive, so the host cache is only loaded
+    again when the dpkg database or the apt lists change, and each archive
+    of stage-packages is loaded once for its sources and keyrings. Changes
+    marked on a cache are cleared when done with it.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._host_cache = None  # type: Optional[apt.Cache]
+        self._host_snapshot = None  # type: Optional[Tuple[int, ...]]
+        self._archive_caches = dict()  # type: Dict[Tuple[str, ...], apt.Cache]
+
+    @contextlib.contextmanager
+    def host(self) -> Iterator[apt.Cache]:
+        with self._lock:
+            snapshot = _get_host_snapshot()
+            if self._host_cache is None or snapshot != self._host_snapshot:
+                logger.debug("Loading the host package indexes")
+                self._host_cache = apt.Cache()
+                self._host_snapshot = snapshot
+            try:
+                yield self._host_cache
+            finally:
+                self._host_cache.clear()
+
+    @contextlib.contextmanager
+    def archive(self, apt_handler: _AptCache, cache_dir: str) -> Iterator[apt.Cache]:
+        # The cache_dir is specific to the sources in use.
+        key = (cache_dir,) + apt_handler.keyrings
+        with self._lock:
+            apt_cache = self._archive_caches.get(key)
+            if apt_cache is None:
+                # Other processes can share cache_dir.
+                with cache.locked(cache_dir):
+                    apt_cache = apt_handler.open(cache_dir)
+                self._archive_caches[key] = apt_cache
+            try:
+                yield apt_cache
+            finally:
+                apt_cache.clear()
+
+
+def _get_host_snapshot() -> Tuple[int, ...]:
+    snapshot = []
+    for path in ("/var/lib/dpkg/status", "/var/lib/apt/lists"):
+        try:
+            snapshot.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            snapshot.append(0)
+    return tuple(snapshot)
+
+
+_package_indexes = _PackageIndexes()
+
+
 class Ubuntu(BaseRepo):
     @classmethod
     def get_package_libraries(cls, package_name):
@@ -347,7 +413,7 @@ class Ubuntu(BaseRepo):
             if installing the packages on the host failed.
         """
         new_packages = []  # type: List[Tuple[str, str]]
-        with apt.Cache() as apt_cache:
+        with _package_indexes.host() as apt_cache:
             try:
                 cls._mark_install(apt_cache, package_names)
             except errors.PackageNotFoundError as e:
@@ -438,12 +504,12 @@ class Ubuntu(BaseRepo):
 
     @classmethod
     def build_package_is_valid(cls, package_name):
-        with apt.Cache() as apt_cache:
+        with _package_indexes.host() as apt_cache:
             return package_name in apt_cache
 
     @classmethod
     def is_package_installed(cls, package_name):
-        with apt.Cache() as apt_cache:
+        with _package_indexes.host() as apt_cache:
             if package_name not in apt_cache:
                 return False
             return apt_cache[package_name].installed
@@ -451,7 +517,7 @@ class Ubuntu(BaseRepo):
     @classmethod
     def get_installed_packages(cls):
         installed_packages = []
-        with apt.Cache() as apt_cache:
+        with _package_indexes.host() as apt_cache:
             for package in apt_cache:
                 if package.installed:
                     installed_packages.append(
@@ -477,11 +543,11 @@ class Ubuntu(BaseRepo):
         )
 
     def is_valid(self, package_name):
-        with self._apt.archive(self._cache.base_dir) as apt_cache:
+        with _package_indexes.archive(self._apt, self._cache.base_dir) as apt_cache:
             return package_name in apt_cache
 
     def get(self, package_names) -> None:
-        with self._apt.archive(self._cache.base_dir) as apt_cache:
+        with _package_indexes.archive(self._apt, self._cache.base_dir) as apt_cache:
             self._mark_install(apt_cache, package_names)
             self._filter_base_packages(apt_cache, package_names)
             self._autokeep_packages(apt_cache)
@@ -544,10 +610,11 @@ class Ubuntu(BaseRepo):
         for package in apt_cache.get_changes():
             pkg_list.append(str(package.candidate))
             try:
-                source = self._apt.fetch_binary(
-                    package_candidate=package.candidate,
-                    destination=self._cache.packages_dir,
-                )
+                with cache.locked(self._cache.base_dir):
+                    source = self._apt.fetch_binary(
+                        package_candidate=package.candidate,
+                        destination=self._cache.packages_dir,
+                    )
             except apt.package.FetchError as e:
                 raise errors.PackageFetchError(str(e))
             destination = os.path.join(self._downloaddir, os.path.basename(source))
@@ -574,15 +641,17 @@ class Ubuntu(BaseRepo):
         except subprocess.CalledProcessError:
             raise errors.UnpackError(deb_path)
 
-    def unpack(self, unpackdir) -> None:
+    def unpack(self, unpackdir) -> Dict[str, str]:
+        origins = dict()  # type: Dict[str, str]
         pkgs_abs_path = glob.glob(os.path.join(self._downloaddir, "*.deb"))
         for pkg in pkgs_abs_path:
             with tempfile.TemporaryDirectory() as temp_dir:
                 self._extract_deb(pkg, temp_dir)
                 deb_name = self._extract_deb_name_version(pkg)
-                self._mark_origin_stage_package(temp_dir, deb_name)
+                origins.update(self._mark_origin_stage_package(temp_dir, deb_name))
                 file_utils.link_or_copy_tree(temp_dir, unpackdir)
         self.normalize(unpackdir)
+        return origins
 
     def _manifest_dep_names(self, apt_cache):
         manifest_dep_names = set()
@@ -19,7 +19,7 @@ import logging
 import os
 import sys
 from subprocess import check_call, check_output, CalledProcessError
-from typing import List, Sequence, Set, Union
+from typing import List, Optional, Sequence, Set, Union
 from urllib import parse
 
 import requests_unixsocket
@@ -135,6 +135,13 @@ class SnapPackage:
 
         return snap_store_info["channels"]
 
+    def get_store_revision(self) -> Optional[str]:
+        """Returns the revision the store offers on the channel, if known."""
+        store_channels = self._get_store_channels()
+        with contextlib.suppress(KeyError):
+            return str(store_channels[self.channel]["revision"])
+        return None
+
     def get_current_channel(self):
         current_channel = ""
         if self.installed:
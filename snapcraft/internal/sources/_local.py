@@ -14,12 +14,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import contextlib
 import copy
 import functools
 import glob
 import os
+from typing import Dict, Optional
 
-from snapcraft import file_utils
+from snapcraft import file_utils, yaml_utils
 from snapcraft.internal import common
 from ._base import Base
 
@@ -31,6 +33,9 @@ class Local(Base):
         self.copy_function = copy_function
 
         self._ignore = functools.partial(_ignore, self.source_abspath, os.getcwd())
+        # The digests of the source files pulled, only kept when using
+        # content digests.
+        self.content_manifest: Optional[Dict[str, str]] = None
 
     def pull(self):
         file_utils.link_or_copy_tree(
@@ -39,6 +44,8 @@ class Local(Base):
             ignore=self._ignore,
             copy_function=self.copy_function,
         )
+        if common.use_content_digests():
+            self.content_manifest = self._get_content_manifest()
 
     def _check(self, target):
         try:
@@ -48,7 +55,37 @@ class Local(Base):
 
         self._updated_files = set()
         self._updated_directories = set()
+        self._removed_files = set()
+
+        recorded_manifest = None
+        if common.use_content_digests():
+            recorded_manifest = _load_content_manifest(target)
+
+        if recorded_manifest is not None:
+            # Files are only updated when their content changed, whatever
+            # their timestamps.
+            self.content_manifest = self._get_content_manifest()
+            self._updated_files = {
+                path
+                for path, digest in self.content_manifest.items()
+                if recorded_manifest.get(path) != digest
+            }
+            self._removed_files = set(recorded_manifest) - set(self.content_manifest)
+        else:
+            self._check_timestamps(target_mtime)
+
+        return (
+            len(self._updated_files) > 0
+            or len(self._updated_directories) > 0
+            or len(self._removed_files) > 0
+        )
+
+    def _get_content_manifest(self) -> Dict[str, str]:
+        return file_utils.calculate_content_manifest(
+            self.source_abspath, ignore=functools.partial(self._ignore, check=True)
+        )
 
+    def _check_timestamps(self, target_mtime: float) -> None:
         for (root, directories, files) in os.walk(self.source_abspath, topdown=True):
             ignored = set(self._ignore(root, directories + files, check=True))
             if ignored:
@@ -76,9 +113,12 @@ class Local(Base):
                     else:
                         self._updated_directories.add(relpath)
 
-        return len(self._updated_files) > 0 or len(self._updated_directories) > 0
-
     def _update(self):
+        # Without a recorded manifest to check against, the manifest is
+        # started from what is updated now.
+        if common.use_content_digests() and self.content_manifest is None:
+            self.content_manifest = self._get_content_manifest()
+
         # First, copy the directories
         for directory in self._updated_directories:
             file_utils.link_or_copy_tree(
@@ -95,6 +135,18 @@ class Local(Base):
                 os.path.join(self.source_dir, file_path),
             )
 
+        # Finally, remove the files removed from the source
+        for file_path in self._removed_files:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(self.source_dir, file_path))
+
+
+def _load_content_manifest(target: str) -> Optional[Dict[str, str]]:
+    # The target is the state of the step the source was last pulled in.
+    with open(target) as state_file:
+        state = yaml_utils.load(state_file)
+    return getattr(state, "content_manifest", None)
+
 
 def _ignore(source, current_directory, directory, files, check=False):
     if directory == source or directory == current_directory:
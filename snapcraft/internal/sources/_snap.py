@@ -14,6 +14,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import io
 import os
 import shutil
 import tempfile
@@ -21,6 +22,11 @@ import tempfile
 from . import errors
 from ._base import FileBase
 from snapcraft import file_utils, yaml_utils
+from snapcraft.internal import squashfs
+from snapcraft.internal.errors import (
+    SquashfsPathNotFoundError,
+    SquashfsUnsupportedCompressionError,
+)
 
 
 class Snap(FileBase):
@@ -89,6 +95,25 @@ class Snap(FileBase):
             os.makedirs(dst)
             shutil.move(tmp_snap, snap_file)
 
+        try:
+            with squashfs.SquashFsImage(snap_file) as image:
+                snap_name = _get_snap_name_from_image(image)
+                # Rename meta and snap dirs from the snap
+                image.extract(
+                    dst,
+                    rename={
+                        d: "{}.{}".format(d, snap_name)
+                        for d in ["meta", "snap"]
+                        if image.exists(d)
+                    },
+                )
+        except SquashfsUnsupportedCompressionError:
+            self._provision_with_unsquashfs(snap_file, dst)
+
+        if not keep_snap:
+            os.remove(snap_file)
+
+    def _provision_with_unsquashfs(self, snap_file: str, dst: str) -> None:
         # unsquashfs [options] filesystem [directories or files to extract]
         # options:
         # -force: if file already exists then overwrite
@@ -104,9 +129,6 @@ class Snap(FileBase):
                 shutil.move(rename, "{}.{}".format(rename, snap_name))
             file_utils.link_or_copy_tree(source_tree=temp_dir, destination_tree=dst)
 
-        if not keep_snap:
-            os.remove(snap_file)
-
 
 def _get_snap_name(snap_dir: str) -> str:
     try:
@@ -114,3 +136,11 @@ def _get_snap_name(snap_dir: str) -> str:
             return yaml_utils.load(snap_yaml)["name"]
     except (FileNotFoundError, KeyError) as snap_error:
         raise errors.InvalidSnapError() from snap_error
+
+
+def _get_snap_name_from_image(image: squashfs.SquashFsImage) -> str:
+    try:
+        snap_yaml = io.StringIO(image.read_file("meta/snap.yaml").decode())
+        return yaml_utils.load(snap_yaml)["name"]
+    except (SquashfsPathNotFoundError, KeyError) as snap_error:
+        raise errors.InvalidSnapError() from snap_error
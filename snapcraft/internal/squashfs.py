@@ -0,0 +1,653 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""In-process reader for squashfs 4.0 images, such as snaps.
+
+Listing an image, reading single files and extracting trees do not require
+unsquashfs nor a temporary directory. Data blocks are decompressed in
+parallel when extracting. Images using a compression algorithm that is not
+available to Python (e.g. lzo) are extracted with unsquashfs instead.
+"""
+
+import collections
+import functools
+import logging
+import lzma
+import os
+import shutil
+import stat
+import struct
+import subprocess
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)  # noqa
+
+from snapcraft import file_utils
+from snapcraft.internal.errors import (
+    SquashfsPathNotFoundError,
+    SquashfsReadError,
+    SquashfsUnsupportedCompressionError,
+)
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = 0x73717368
+_SUPERBLOCK = struct.Struct("<IIIIIHHHHHHQQQQQQQQ")
+_METADATA_BLOCK_SIZE = 8192
+_METADATA_UNCOMPRESSED = 1 << 15
+_DATA_UNCOMPRESSED = 1 << 24
+_NO_FRAGMENT = 0xFFFFFFFF
+
+_COMPRESSORS = {1: "gzip", 2: "lzma", 3: "lzo", 4: "xz", 5: "lz4", 6: "zstd"}
+
+# Basic inode types, extended types are these plus 7.
+_DIRECTORY = 1
+_REGULAR = 2
+_SYMLINK = 3
+_BLOCK_DEVICE = 4
+_CHARACTER_DEVICE = 5
+_FIFO = 6
+_SOCKET = 7
+
+_FILE_TYPES = {
+    _DIRECTORY: stat.S_IFDIR,
+    _REGULAR: stat.S_IFREG,
+    _SYMLINK: stat.S_IFLNK,
+    _BLOCK_DEVICE: stat.S_IFBLK,
+    _CHARACTER_DEVICE: stat.S_IFCHR,
+    _FIFO: stat.S_IFIFO,
+    _SOCKET: stat.S_IFSOCK,
+}
+
+
+class _Inode:
+    def __init__(
+        self, *, inode_type: int, permissions: int, uid: int, gid: int, mtime: int
+    ) -> None:
+        self.inode_type = inode_type
+        self.mode = _FILE_TYPES[inode_type] | permissions
+        self.uid = uid
+        self.gid = gid
+        self.mtime = mtime
+        self.number = 0
+
+        # Directories.
+        self.directory_block = 0
+        self.directory_offset = 0
+        self.directory_size = 0
+
+        # Regular files.
+        self.blocks_start = 0
+        self.block_sizes = ()  # type: Sequence[int]
+        self.fragment = _NO_FRAGMENT
+        self.fragment_offset = 0
+        self.file_size = 0
+
+        # Symlinks and devices.
+        self.target = ""
+        self.rdev = 0
+
+    def is_dir(self) -> bool:
+        return self.inode_type == _DIRECTORY
+
+    def is_file(self) -> bool:
+        return self.inode_type == _REGULAR
+
+
+class _MetadataCursor:
+    """Sequential reader over (possibly several) metadata blocks."""
+
+    def __init__(self, image: "SquashFsImage", position: int, offset: int) -> None:
+        self._image = image
+        self._position = position
+        self._offset = offset
+
+    def read(self, size: int) -> bytes:
+        chunks = []
+        while size > 0:
+            data, next_position = self._image._read_metadata_block(self._position)
+            chunk = data[self._offset : self._offset + size]
+            if not chunk:
+                raise SquashfsReadError(
+                    path=self._image.path, message="truncated metadata"
+                )
+            chunks.append(chunk)
+            size -= len(chunk)
+            self._offset += len(chunk)
+            if self._offset >= len(data):
+                self._position = next_position
+                self._offset = 0
+        return b"".join(chunks)
+
+    def unpack(self, fmt: str) -> Tuple:
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))
+
+
+def _get_decompressor(compressor: int) -> Callable[[bytes], bytes]:
+    if compressor == 1:
+        return zlib.decompress
+    elif compressor == 2:
+        return functools.partial(lzma.decompress, format=lzma.FORMAT_ALONE)
+    elif compressor == 4:
+        return functools.partial(lzma.decompress, format=lzma.FORMAT_XZ)
+    raise SquashfsUnsupportedCompressionError(
+        compression=_COMPRESSORS.get(compressor, str(compressor))
+    )
+
+
+class SquashFsImage:
+    """Read-only access to the contents of a squashfs image.
+
+    Paths are relative to the root of the image, using "/" as separator.
+    """
+
+    def __init__(self, path: str, *, max_workers: int = None) -> None:
+        """Open the image at path.
+
+        :param str path: path to the squashfs image.
+        :param int max_workers: number of threads used to decompress data
+                                blocks when extracting.
+        :raises SquashfsReadError: if path is not a valid squashfs 4.0 image.
+        :raises SquashfsUnsupportedCompressionError: if the image compression
+                                                     cannot be handled.
+        """
+        self.path = path
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._fd: Optional[int] = os.open(path, os.O_RDONLY)
+        try:
+            self._read_superblock()
+        except Exception:
+            self.close()
+            raise
+
+        # Caches are safe to share between the decompression threads.
+        self._read_metadata_block = functools.lru_cache(maxsize=512)(
+            self._read_metadata_block_uncached
+        )
+        self._read_fragment = functools.lru_cache(maxsize=64)(
+            self._read_fragment_uncached
+        )
+        self._ids = self._read_lookup_table(self._id_table_start, self._id_count, "I")
+        if self._fragment_count:
+            self._fragments = self._read_lookup_table(
+                self._fragment_table_start, self._fragment_count, "QII"
+            )
+        else:
+            self._fragments = []
+
+    def __enter__(self) -> "SquashFsImage":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _get_fd(self) -> int:
+        if self._fd is None:
+            raise SquashfsReadError(path=self.path, message="image is closed")
+        return self._fd
+
+    def _read_superblock(self) -> None:
+        data = os.pread(self._get_fd(), _SUPERBLOCK.size, 0)
+        if len(data) < _SUPERBLOCK.size:
+            raise SquashfsReadError(path=self.path, message="file is too small")
+
+        (
+            magic,
+            _,
+            _,
+            self._block_size,
+            self._fragment_count,
+            compressor,
+            block_log,
+            _,
+            self._id_count,
+            major,
+            minor,
+            self._root_inode,
+            _,
+            self._id_table_start,
+            _,
+            self._inode_table_start,
+            self._directory_table_start,
+            self._fragment_table_start,
+            _,
+        ) = _SUPERBLOCK.unpack(data)
+
+        if magic != _MAGIC:
+            raise SquashfsReadError(path=self.path, message="bad magic number")
+        if (major, minor) != (4, 0):
+            raise SquashfsReadError(
+                path=self.path,
+                message="unsupported version {}.{}".format(major, minor),
+            )
+        if self._block_size != 1 << block_log:
+            raise SquashfsReadError(path=self.path, message="inconsistent block size")
+
+        self._decompress = _get_decompressor(compressor)
+
+    def _pread(self, size: int, position: int) -> bytes:
+        data = os.pread(self._get_fd(), size, position)
+        if len(data) != size:
+            raise SquashfsReadError(path=self.path, message="unexpected end of file")
+        return data
+
+    def _uncompress(self, data: bytes) -> bytes:
+        try:
+            return self._decompress(data)
+        except (lzma.LZMAError, zlib.error) as error:
+            raise SquashfsReadError(path=self.path, message=str(error)) from error
+
+    def _read_metadata_block_uncached(self, position: int) -> Tuple[bytes, int]:
+        (header,) = struct.unpack("<H", self._pread(2, position))
+        size = header & ~_METADATA_UNCOMPRESSED
+        data = self._pread(size, position + 2)
+        if not header & _METADATA_UNCOMPRESSED:
+            data = self._uncompress(data)
+        return data, position + 2 + size
+
+    def _read_lookup_table(self, start: int, count: int, entry_format: str) -> List:
+        entry = struct.Struct("<" + entry_format)
+        table_size = count * entry.size
+        block_count = -(-table_size // _METADATA_BLOCK_SIZE)
+        block_positions = struct.unpack(
+            "<{}Q".format(block_count), self._pread(block_count * 8, start)
+        )
+        data = b"".join(self._read_metadata_block(p)[0] for p in block_positions)
+        entries = [
+            entry.unpack_from(data, offset)
+            for offset in range(0, table_size, entry.size)
+        ]
+        if len(entry_format) == 1:
+            return [e[0] for e in entries]
+        return entries
+
+    def _read_inode(self, reference: int) -> _Inode:
+        cursor = _MetadataCursor(
+            self, self._inode_table_start + (reference >> 16), reference & 0xFFFF
+        )
+        inode_type, permissions, uid, gid, mtime, number = cursor.unpack("<HHHHII")
+        extended = inode_type > _SOCKET
+        if extended:
+            inode_type -= _SOCKET
+        try:
+            inode = _Inode(
+                inode_type=inode_type,
+                permissions=permissions,
+                uid=self._ids[uid],
+                gid=self._ids[gid],
+                mtime=mtime,
+            )
+        except (KeyError, IndexError) as error:
+            raise SquashfsReadError(path=self.path, message="corrupt inode") from error
+        inode.number = number
+
+        if inode_type == _DIRECTORY:
+            self._read_directory_inode(inode, cursor, extended)
+        elif inode_type == _REGULAR:
+            self._read_file_inode(inode, cursor, extended)
+        elif inode_type == _SYMLINK:
+            _, target_size = cursor.unpack("<II")
+            inode.target = os.fsdecode(cursor.read(target_size))
+        elif inode_type in (_BLOCK_DEVICE, _CHARACTER_DEVICE):
+            _, rdev = cursor.unpack("<II")
+            inode.rdev = os.makedev(
+                (rdev & 0xFFF00) >> 8, (rdev & 0xFF) | ((rdev >> 12) & 0xFFF00)
+            )
+        return inode
+
+    def _read_directory_inode(
+        self, inode: _Inode, cursor: _MetadataCursor, extended: bool
+    ) -> None:
+        if extended:
+            _, size, block, _, _, offset, _ = cursor.unpack("<IIIIHHI")
+        else:
+            block, _, size, offset, _ = cursor.unpack("<IIHHI")
+        inode.directory_block = block
+        inode.directory_offset = offset
+        inode.directory_size = size
+
+    def _read_file_inode(
+        self, inode: _Inode, cursor: _MetadataCursor, extended: bool
+    ) -> None:
+        if extended:
+            start, size, _, _, fragment, offset, _ = cursor.unpack("<QQQIIII")
+        else:
+            start, fragment, offset, size = cursor.unpack("<IIII")
+        if fragment == _NO_FRAGMENT:
+            block_count = -(-size // self._block_size)
+        else:
+            block_count = size // self._block_size
+        inode.blocks_start = start
+        inode.block_sizes = cursor.unpack("<{}I".format(block_count))
+        inode.fragment = fragment
+        inode.fragment_offset = offset
+        inode.file_size = size
+
+    def _read_directory(self, inode: _Inode) -> List[Tuple[str, int]]:
+        # Directory sizes include 3 bytes for the implicit "." and "..".
+        remaining = inode.directory_size - 3
+        cursor = _MetadataCursor(
+            self,
+            self._directory_table_start + inode.directory_block,
+            inode.directory_offset,
+        )
+        entries = []
+        while remaining > 0:
+            count, start, _ = cursor.unpack("<IIi")
+            remaining -= 12
+            for _ in range(count + 1):
+                offset, _, _, name_size = cursor.unpack("<HhHH")
+                name = os.fsdecode(cursor.read(name_size + 1))
+                remaining -= 8 + name_size + 1
+                entries.append((name, (start << 16) | offset))
+        return entries
+
+    def _walk(self, inode: _Inode, path: str) -> Iterator[Tuple[str, _Inode]]:
+        for name, reference in self._read_directory(inode):
+            child = self._read_inode(reference)
+            child_path = "/".join((path, name)) if path else name
+            yield child_path, child
+            if child.is_dir():
+                yield from self._walk(child, child_path)
+
+    def _lookup(self, path: str) -> _Inode:
+        inode = self._read_inode(self._root_inode)
+        for name in (n for n in path.split("/") if n):
+            if not inode.is_dir():
+                raise SquashfsPathNotFoundError(image=self.path, path=path)
+            entries = dict(self._read_directory(inode))
+            try:
+                inode = self._read_inode(entries[name])
+            except KeyError:
+                raise SquashfsPathNotFoundError(image=self.path, path=path)
+        return inode
+
+    def list(self) -> List[str]:
+        """Return the paths of all the entries in the image."""
+        return [p for p, _ in self._walk(self._read_inode(self._root_inode), "")]
+
+    def exists(self, path: str) -> bool:
+        """Return True if path exists in the image."""
+        try:
+            self._lookup(path)
+        except SquashfsPathNotFoundError:
+            return False
+        return True
+
+    def read_file(self, path: str) -> bytes:
+        """Return the contents of the regular file at path.
+
+        :raises SquashfsPathNotFoundError: if path is not a regular file.
+        """
+        inode = self._lookup(path)
+        if not inode.is_file():
+            raise SquashfsPathNotFoundError(image=self.path, path=path)
+        return b"".join(job() for job in self._get_block_jobs(inode))
+
+    def _read_data_block(self, position: int, size_word: int, length: int) -> bytes:
+        size = size_word & ~_DATA_UNCOMPRESSED
+        # A size of 0 denotes a sparse block.
+        if size == 0:
+            return bytes(length)
+        data = self._pread(size, position)
+        if not size_word & _DATA_UNCOMPRESSED:
+            data = self._uncompress(data)
+        return data
+
+    def _read_fragment_uncached(self, index: int) -> bytes:
+        try:
+            start, size_word, _ = self._fragments[index]
+        except IndexError as error:
+            raise SquashfsReadError(
+                path=self.path, message="corrupt fragment index"
+            ) from error
+        return self._read_data_block(start, size_word, self._block_size)
+
+    def _read_fragment_tail(self, inode: _Inode, length: int) -> bytes:
+        fragment = self._read_fragment(inode.fragment)
+        return fragment[inode.fragment_offset : inode.fragment_offset + length]
+
+    def _get_block_jobs(self, inode: _Inode) -> List[Callable[[], bytes]]:
+        """Return callables returning, in order, the chunks of a file."""
+        jobs = []  # type: List[Callable[[], bytes]]
+        position = inode.blocks_start
+        remaining = inode.file_size
+        for size_word in inode.block_sizes:
+            length = min(self._block_size, remaining)
+            jobs.append(
+                functools.partial(self._read_data_block, position, size_word, length)
+            )
+            position += size_word & ~_DATA_UNCOMPRESSED
+            remaining -= length
+        if inode.fragment != _NO_FRAGMENT and remaining > 0:
+            jobs.append(functools.partial(self._read_fragment_tail, inode, remaining))
+        return jobs
+
+    def extract(
+        self, dest: str, *, paths: Sequence[str] = None, rename: Dict[str, str] = None
+    ) -> None:
+        """Extract the image, or some paths of it, into dest.
+
+        Existing files in dest are replaced, similar to `unsquashfs -force`.
+
+        :param str dest: directory to extract to, created if needed.
+        :param list paths: if set, only extract these paths (and their
+                           contents if they are directories).
+        :param dict rename: map of paths in the image to the path they should
+                            be extracted to, relative to dest.
+        :raises SquashfsPathNotFoundError: if one of paths does not exist.
+        """
+        if paths is not None:
+            paths = [p.strip("/") for p in paths]
+            for path in paths:
+                self._lookup(path)
+
+        os.makedirs(dest, exist_ok=True)
+        directories = []  # type: List[Tuple[str, _Inode]]
+        files = []  # type: List[Tuple[str, _Inode]]
+        links = {}  # type: Dict[int, str]
+        hard_links = []  # type: List[Tuple[str, str]]
+        for path, inode in self._walk(self._read_inode(self._root_inode), ""):
+            if not _is_wanted(path, paths):
+                continue
+            target = os.path.join(dest, _rename(path, rename))
+            if inode.is_dir():
+                _make_directory(target)
+                directories.append((target, inode))
+                continue
+
+            _remove(target)
+            if inode.number in links:
+                # Squashfs shares inodes between hard linked entries.
+                hard_links.append((links[inode.number], target))
+                continue
+            links[inode.number] = target
+            if inode.is_file():
+                files.append((target, inode))
+            else:
+                _create_special_file(target, inode)
+
+        self._extract_files(files)
+        _create_hard_links(hard_links)
+
+        # Restore permissions last, directories could be read-only.
+        for target, inode in reversed(directories):
+            _set_attributes(target, inode)
+
+    def _extract_files(self, files: List[Tuple[str, _Inode]]) -> None:
+        # Blocks from all files are decompressed concurrently, limiting how
+        # many are held in memory, and written out in order by this thread.
+        window = self._max_workers * 4
+        pending = collections.deque()  # type: collections.deque
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for target, inode in files:
+                jobs = self._get_block_jobs(inode)
+                fileobj = open(target, "wb")
+                if not jobs:
+                    _close_file(fileobj, target, inode)
+                for index, job in enumerate(jobs):
+                    is_last = index == len(jobs) - 1
+                    pending.append(
+                        (fileobj, target, inode, is_last, executor.submit(job))
+                    )
+                    if len(pending) >= window:
+                        _write_pending(pending.popleft())
+            while pending:
+                _write_pending(pending.popleft())
+
+
+def _is_wanted(path: str, paths: Optional[Sequence[str]]) -> bool:
+    if paths is None:
+        return True
+    return any(
+        path == p or path.startswith(p + "/") or p.startswith(path + "/") for p in paths
+    )
+
+
+def _rename(path: str, rename: Optional[Dict[str, str]]) -> str:
+    for source, destination in (rename or {}).items():
+        if path == source or path.startswith(source + "/"):
+            return destination + path[len(source) :]
+    return path
+
+
+def _create_special_file(target: str, inode: _Inode) -> None:
+    if inode.inode_type == _SYMLINK:
+        os.symlink(inode.target, target)
+    else:
+        try:
+            os.mknod(target, inode.mode, inode.rdev)
+        except PermissionError:
+            logger.warning("Could not create device {!r}.".format(target))
+            return
+    _set_attributes(target, inode)
+
+
+def _write_pending(pending: Tuple) -> None:
+    fileobj, target, inode, is_last, future = pending
+    fileobj.write(future.result())
+    if is_last:
+        _close_file(fileobj, target, inode)
+
+
+def _close_file(fileobj, target: str, inode: _Inode) -> None:
+    # Sparse files ending in holes need their size set explicitly.
+    fileobj.truncate(inode.file_size)
+    fileobj.close()
+    _set_attributes(target, inode)
+
+
+def _create_hard_links(hard_links: List[Tuple[str, str]]) -> None:
+    for source, target in hard_links:
+        # Sources may be missing for devices we had no permission to create.
+        if os.path.lexists(source):
+            os.link(source, target)
+
+
+def _make_directory(path: str) -> None:
+    if not os.path.isdir(path) or os.path.islink(path):
+        _remove(path)
+        os.mkdir(path, 0o700)
+
+
+def _remove(path: str) -> None:
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+def _set_attributes(path: str, inode: _Inode) -> None:
+    is_symlink = inode.inode_type == _SYMLINK
+    # Like unsquashfs, only restore ownership when running as root.
+    if os.geteuid() == 0:
+        os.chown(path, inode.uid, inode.gid, follow_symlinks=not is_symlink)
+    if not is_symlink:
+        os.chmod(path, stat.S_IMODE(inode.mode))
+    if not is_symlink or os.utime in os.supports_follow_symlinks:
+        os.utime(path, (inode.mtime, inode.mtime), follow_symlinks=not is_symlink)
+
+
+def read_file(image: str, path: str) -> bytes:
+    """Return the contents of path inside the squashfs image.
+
+    :raises SquashfsPathNotFoundError: if path is not a regular file.
+    :raises SquashfsReadError: if image cannot be read.
+    """
+    try:
+        with SquashFsImage(image) as squashfs_image:
+            return squashfs_image.read_file(path)
+    except SquashfsUnsupportedCompressionError:
+        logger.debug("Falling back to unsquashfs to read {!r}.".format(image))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        _unsquashfs(image, temp_dir, [path])
+        try:
+            with open(os.path.join(temp_dir, path), "rb") as f:
+                return f.read()
+        except (FileNotFoundError, IsADirectoryError):
+            raise SquashfsPathNotFoundError(image=image, path=path)
+
+
+def extract(
+    image: str, dest: str, *, paths: Sequence[str] = None, rename: Dict[str, str] = None
+) -> None:
+    """Extract the squashfs image, or some paths of it, into dest.
+
+    See SquashFsImage.extract for details on the arguments.
+    """
+    try:
+        with SquashFsImage(image) as squashfs_image:
+            squashfs_image.extract(dest, paths=paths, rename=rename)
+            return
+    except SquashfsUnsupportedCompressionError:
+        logger.debug("Falling back to unsquashfs to extract {!r}.".format(image))
+
+    os.makedirs(dest, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(dest)) as temp_dir:
+        extract_dir = os.path.join(temp_dir, "squashfs-root")
+        _unsquashfs(image, extract_dir, paths)
+        for source, destination in (rename or {}).items():
+            source_path = os.path.join(extract_dir, source)
+            if os.path.lexists(source_path):
+                shutil.move(source_path, os.path.join(extract_dir, destination))
+        file_utils.link_or_copy_tree(source_tree=extract_dir, destination_tree=dest)
+
+
+def _unsquashfs(image: str, dest: str, paths: Optional[Sequence[str]]) -> None:
+    # unsquashfs [options] filesystem [directories or files to extract]
+    command = [file_utils.get_tool_path("unsquashfs"), "-force", "-dest", dest, image]
+    if paths:
+        command.extend(paths)
+    try:
+        output = subprocess.check_output(command)
+    except subprocess.CalledProcessError as error:
+        raise SquashfsReadError(path=image, message=str(error)) from error
+    logger.debug(output)
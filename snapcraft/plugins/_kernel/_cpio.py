@@ -0,0 +1,137 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import contextlib
+import os
+import stat
+import subprocess
+from typing import BinaryIO, Iterator, List, Tuple, cast
+
+_NEWC_MAGIC = b"070701"
+_TRAILER = "TRAILER!!!"
+_CHUNK_SIZE = 1024 * 1024
+
+
+def _walk(root: str) -> Iterator[Tuple[str, str]]:
+    # Parent directories come before their contents, as with find.
+    yield ".", root
+    for directory, directories, files in os.walk(root):
+        directories.sort()
+        for name in sorted(directories + files):
+            path = os.path.join(directory, name)
+            yield os.path.relpath(path, root), path
+
+
+def _pad(length: int) -> bytes:
+    return b"\0" * (-length % 4)
+
+
+def _write_header(
+    archive: BinaryIO,
+    *,
+    name: str,
+    ino: int,
+    mode: int = 0,
+    mtime: int = 0,
+    size: int = 0,
+    rdev: int = 0
+) -> None:
+    encoded_name = name.encode() + b"\0"
+    fields = [
+        ino,
+        mode,
+        # The initrd is unpacked as root, whoever built it.
+        0,
+        0,
+        1,
+        mtime,
+        size,
+        0,
+        0,
+        os.major(rdev),
+        os.minor(rdev),
+        len(encoded_name),
+        0,
+    ]
+    header = _NEWC_MAGIC + b"".join(b"%08X" % f for f in fields)
+    archive.write(header + encoded_name + _pad(len(header) + len(encoded_name)))
+
+
+def write_newc(root: str, archive: BinaryIO) -> None:
+    """Write the tree at root to archive as a cpio archive in newc format.
+
+    This is the format of initramfs archives, the same that
+    `find . | cpio --create --format=newc` writes from root. Files are read
+    and written in chunks, so that archive can be the pipe into a
+    compressor.
+    """
+    for ino, (name, path) in enumerate(_walk(root), start=1):
+        st = os.lstat(path)
+        mtime = int(st.st_mtime)
+        if stat.S_ISLNK(st.st_mode):
+            data = os.readlink(path).encode()
+            _write_header(
+                archive,
+                name=name,
+                ino=ino,
+                mode=st.st_mode,
+                mtime=mtime,
+                size=len(data),
+            )
+            archive.write(data + _pad(len(data)))
+        elif stat.S_ISREG(st.st_mode):
+            # Hard links are archived as separate files.
+            _write_header(
+                archive,
+                name=name,
+                ino=ino,
+                mode=st.st_mode,
+                mtime=mtime,
+                size=st.st_size,
+            )
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    archive.write(chunk)
+            archive.write(_pad(st.st_size))
+        else:
+            _write_header(
+                archive,
+                name=name,
+                ino=ino,
+                mode=st.st_mode,
+                mtime=mtime,
+                rdev=st.st_rdev,
+            )
+
+    _write_header(archive, name=_TRAILER, ino=0)
+
+
+def write_initrd(root: str, initrd_path: str, *, compression_cmd: List[str]) -> None:
+    """Write the tree at root to initrd_path as a compressed initramfs.
+
+    The archive is streamed into compression_cmd, which reads it from stdin
+    and writes the compressed initrd to stdout.
+    """
+    with open(initrd_path, "wb") as initrd_file:
+        compressor = subprocess.Popen(
+            compression_cmd, stdin=subprocess.PIPE, stdout=initrd_file
+        )
+        compressor_stdin = cast(BinaryIO, compressor.stdin)
+        # The compressor failing is reported by its exit code.
+        with contextlib.suppress(BrokenPipeError), compressor_stdin:
+            write_newc(root, compressor_stdin)
+    if compressor.wait() != 0:
+        raise subprocess.CalledProcessError(compressor.returncode, compression_cmd)
@@ -0,0 +1,143 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import fnmatch
+import os
+from typing import Dict, List, Set
+
+from . import errors
+
+
+def _get_module_name(module_path: str) -> str:
+    # Module names do not tell dashes and underscores apart.
+    return os.path.basename(module_path).split(".ko")[0].replace("-", "_")
+
+
+def _read_lines(path: str) -> List[str]:
+    try:
+        with open(path) as f:
+            return [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+class ModulesDep:
+    """The module dependencies written by depmod for a kernel release.
+
+    The modules.dep, modules.alias, modules.softdep and modules.builtin
+    files are read once, so that the modules modprobe would load for any
+    number of modules can be looked up without running it.
+    """
+
+    def __init__(self, *, root: str, kernel_release: str) -> None:
+        """Create a new ModulesDep.
+
+        :param str root: the directory the modules are installed into.
+        :param str kernel_release: the release of the kernel.
+        :raises KernelModulesDepNotFoundError: if there is no modules.dep.
+        """
+        self.kernel_release = kernel_release
+        self.modules_path = os.path.join(root, "lib", "modules", kernel_release)
+
+        # modules.dep lists every module, with all it depends on in the
+        # order modprobe loads them, last first.
+        self._module_paths: Dict[str, str] = dict()
+        self._dependencies: Dict[str, List[str]] = dict()
+        modules_dep_path = os.path.join(self.modules_path, "modules.dep")
+        try:
+            with open(modules_dep_path) as modules_dep:
+                modules_dep_lines = modules_dep.readlines()
+        except FileNotFoundError:
+            raise errors.KernelModulesDepNotFoundError(kernel_release=kernel_release)
+        for line in modules_dep_lines:
+            module_path, _, dependency_paths = line.partition(":")
+            if not module_path.strip():
+                continue
+            name = _get_module_name(module_path)
+            self._module_paths[name] = self._get_path(module_path.strip())
+            self._dependencies[name] = [
+                _get_module_name(d) for d in dependency_paths.split()
+            ]
+
+        self._aliases: List[List[str]] = [
+            line.split()[1:3]
+            for line in _read_lines(os.path.join(self.modules_path, "modules.alias"))
+            if line.startswith("alias ") and len(line.split()) >= 3
+        ]
+
+        self._softdeps: Dict[str, List[str]] = dict()
+        softdep_path = os.path.join(self.modules_path, "modules.softdep")
+        for line in _read_lines(softdep_path):
+            fields = line.split()
+            if fields[0] != "softdep" or len(fields) < 2:
+                continue
+            self._softdeps[_get_module_name(fields[1])] = [
+                _get_module_name(f) for f in fields[2:] if f not in ("pre:", "post:")
+            ]
+
+        self._builtin: Set[str] = {
+            _get_module_name(line)
+            for line in _read_lines(os.path.join(self.modules_path, "modules.builtin"))
+        }
+
+    def _get_path(self, module_path: str) -> str:
+        # Older depmod releases write absolute paths.
+        if os.path.isabs(module_path):
+            return module_path
+        return os.path.join(self.modules_path, module_path)
+
+    def _resolve_name(self, module: str) -> List[str]:
+        name = _get_module_name(module)
+        if name in self._module_paths or name in self._builtin:
+            return [name]
+
+        # modprobe takes module aliases as well, which can be patterns.
+        names = [
+            _get_module_name(alias_module)
+            for pattern, alias_module in self._aliases
+            if fnmatch.fnmatchcase(module, pattern)
+        ]
+        if not names:
+            raise errors.KernelModuleNotFoundError(
+                module=module, kernel_release=self.kernel_release
+            )
+        return names
+
+    def get_module_paths(self, modules: List[str]) -> List[str]:
+        """Return the paths to the modules needed to load modules.
+
+        The modules, their dependencies and soft dependencies are returned
+        once each, as `modprobe --show-depends` would for each module. Built
+        in modules have no path and are skipped.
+
+        :raises KernelModuleNotFoundError: if a module cannot be found.
+        """
+        module_paths: Dict[str, str] = dict()
+        pending = [name for module in modules for name in self._resolve_name(module)]
+        seen: Set[str] = set()
+        while pending:
+            name = pending.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+
+            # Soft dependencies may not be installed.
+            if name in self._module_paths:
+                module_paths[name] = self._module_paths[name]
+                pending.extend(self._dependencies[name])
+            pending.extend(self._softdeps.get(name, []))
+
+        return list(module_paths.values())
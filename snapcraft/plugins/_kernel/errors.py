@@ -0,0 +1,50 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+from snapcraft.internal import errors
+
+
+class KernelModulesDepNotFoundError(errors.SnapcraftException):
+    def __init__(self, *, kernel_release: str) -> None:
+        self.kernel_release = kernel_release
+
+    def get_brief(self) -> str:
+        return "Cannot find the modules.dep for kernel release {!r}.".format(
+            self.kernel_release
+        )
+
+    def get_resolution(self) -> str:
+        return (
+            "Check that depmod, from kmod, is installed and that the kernel "
+            "build installed its modules."
+        )
+
+
+class KernelModuleNotFoundError(errors.SnapcraftException):
+    def __init__(self, *, module: str, kernel_release: str) -> None:
+        self.module = module
+        self.kernel_release = kernel_release
+
+    def get_brief(self) -> str:
+        return "Cannot find kernel module {!r} for kernel release {!r}.".format(
+            self.module, self.kernel_release
+        )
+
+    def get_resolution(self) -> str:
+        return (
+            "Check that the module is built by the kernel configuration "
+            "and that it is spelled correctly in kernel-initrd-modules."
+        )
@@ -29,7 +29,7 @@ from typing import Dict, List, Optional, Sequence, Set
 
 import snapcraft
 from snapcraft import file_utils
-from snapcraft.internal import mangling
+from snapcraft.internal import cache, mangling
 from ._python_finder import get_python_command, get_python_headers, get_python_home
 from . import errors
 
@@ -70,6 +70,16 @@ def _process_package_args(
     return args
 
 
+def _normalize_project_name(name: str) -> str:
+    # As done by pip and in wheel file names, see PEP 503 and PEP 427.
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def _get_wheel_project(wheel: str) -> str:
+    # Wheel file names start with {distribution}-{version}.
+    return _normalize_project_name(wheel.split("-", 1)[0])
+
+
 def _replicate_owner_mode(path):
     # Don't bother with a path that doesn't exist or is a symlink. The target
     # of the symlink will either be updated anyway, or we won't have permission
@@ -132,6 +142,8 @@ class Pip:
 
         self._python_package_dir = os.path.join(part_dir, "python-packages")
         os.makedirs(self._python_package_dir, exist_ok=True)
+        # Parts are worked on in parts/<part-name>.
+        self._part_name = os.path.basename(part_dir)
 
         self.__python_command = None  # type:str
         self.__python_home = None  # type: str
@@ -266,25 +278,60 @@ class Pip:
             process_dependency_links=process_dependency_links, constraints=constraints
         )
 
-        # Using pip with a few special parameters:
-        #
-        # --disable-pip-version-check: Don't whine if pip is out-of-date with
-        #                              the version on pypi.
-        # --dest: Download packages into the directory we've set aside for it.
-        #
-        # For cwd, setup_py_dir will be the actual directory we need to be in
-        # or None.
-        self._run(
-            [
-                "download",
-                "--disable-pip-version-check",
-                "--dest",
-                self._python_package_dir,
-            ]
-            + args
-            + package_args,
-            cwd=setup_py_dir,
+        lockfile_paths = list(requirements or []) + sorted(constraints or [])
+        if setup_py_dir:
+            lockfile_paths.extend(
+                os.path.join(setup_py_dir, f)
+                for f in ("setup.py", "setup.cfg", "pyproject.toml")
+            )
+        digest = cache.get_lockfiles_digest(
+            lockfile_paths,
+            extra=[str(self._python_major_version)]
+            + list(packages or [])
+            + lockfile_paths,
         )
+        dependency_cache = cache.DependencyCache(ecosystem="pip")
+
+        with dependency_cache.fetch(
+            part_name=self._part_name, digest=digest
+        ) as offline:
+            # Using pip with a few special parameters:
+            #
+            # --disable-pip-version-check: Don't whine if pip is out-of-date
+            #                              with the version on pypi.
+            # --dest: Download packages into the directory we've set aside
+            #         for it.
+            # --find-links: Take the packages already in the dependency
+            #               cache from there.
+            # --no-index: Don't hit pypi when running offline.
+            #
+            # For cwd, setup_py_dir will be the actual directory we need to
+            # be in or None.
+            cache_args = ["--find-links", dependency_cache.store_dir]
+            if offline:
+                cache_args.insert(0, "--no-index")
+
+            previous_packages = set(os.listdir(self._python_package_dir))
+            self._run(
+                [
+                    "download",
+                    "--disable-pip-version-check",
+                    "--dest",
+                    self._python_package_dir,
+                ]
+                + cache_args
+                + args
+                + package_args,
+                cwd=setup_py_dir,
+            )
+
+            for package in os.listdir(self._python_package_dir):
+                cached_package = os.path.join(dependency_cache.store_dir, package)
+                if package in previous_packages or os.path.exists(cached_package):
+                    continue
+                file_utils.link_or_copy(
+                    os.path.join(self._python_package_dir, package), cached_package
+                )
 
     def install(
         self,
@@ -344,7 +391,7 @@ class Pip:
         # --no-index: Don't hit pypi, assume the packages are already
         #             downloaded (i.e. by using `self.download()`)
         # --find-links: Provide the directory into which the packages should
-        #               have already been fetched
+        #               have already been fetched, and the wheel cache.
         #
         # For cwd, setup_py_dir will be the actual directory we need to be in
         # or None.
@@ -356,6 +403,8 @@ class Pip:
                 "--no-index",
                 "--find-links",
                 self._python_package_dir,
+                "--find-links",
+                self._get_wheel_cache().cache_dir,
             ]
             + args
             + package_args,
@@ -404,6 +453,10 @@ class Pip:
             process_dependency_links=process_dependency_links, constraints=constraints
         )
 
+        wheel_cache = self._get_wheel_cache()
+        project_name = None  # type: Optional[str]
+        if setup_py_dir is not None:
+            project_name = self._get_project_name(setup_py_dir)
         wheels = []  # type: List[str]
         with tempfile.TemporaryDirectory() as temp_dir:
 
@@ -412,7 +465,8 @@ class Pip:
             # --no-index: Don't hit pypi, assume the packages are already
             #             downloaded (i.e. by using `self.download()`)
             # --find-links: Provide the directory into which the packages
-            #               should have already been fetched
+            #               should have already been fetched, and the wheel
+            #               cache, so wheels built before are not built again.
             # --wheel-dir: Build wheels into a temporary working area rather
             #              rather than cwd. We'll copy them over. FIXME: We can
             #              probably get away just building them in the package
@@ -423,6 +477,8 @@ class Pip:
                     "--no-index",
                     "--find-links",
                     self._python_package_dir,
+                    "--find-links",
+                    wheel_cache.cache_dir,
                     "--wheel-dir",
                     temp_dir,
                 ]
@@ -432,6 +488,16 @@ class Pip:
             )
             wheels = os.listdir(temp_dir)
             for wheel in wheels:
+                # Wheels which were downloaded are not cached, nor is the
+                # wheel of the project in setup_py_dir, as it changes with
+                # its source. Nothing is cached if that project is unknown.
+                is_project_wheel = setup_py_dir is not None and (
+                    project_name is None or _get_wheel_project(wheel) == project_name
+                )
+                if not is_project_wheel and not os.path.exists(
+                    os.path.join(self._python_package_dir, wheel)
+                ):
+                    wheel_cache.add(os.path.join(temp_dir, wheel))
                 file_utils.link_or_copy(
                     os.path.join(temp_dir, wheel),
                     os.path.join(self._python_package_dir, wheel),
@@ -512,6 +578,29 @@ class Pip:
 
         return env
 
+    def _get_project_name(self, setup_py_dir: str) -> Optional[str]:
+        try:
+            output = snapcraft.internal.common.run_output(
+                [self._python_command, "setup.py", "--name"],
+                cwd=setup_py_dir,
+                env=self.env(),
+            )
+        except subprocess.CalledProcessError:
+            return None
+        # setup.py may print more than the name, which comes last.
+        lines = output.splitlines()
+        if not lines:
+            return None
+        return _normalize_project_name(lines[-1])
+
+    def _get_wheel_cache(self) -> cache.WheelCache:
+        # The build environment of the part is exported over the one of pip.
+        env = self.env()
+        for variable in snapcraft.internal.common.env:
+            key, _, value = variable.partition("=")
+            env[key] = value
+        return cache.WheelCache(build_environment=env)
+
     def _run(self, args, runner=None, **kwargs):
         env = self.env()
 
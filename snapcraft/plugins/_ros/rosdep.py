@@ -14,14 +14,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import hashlib
+import json
 import os
 import logging
 import re
 import shutil
 import subprocess
 import sys
+import tempfile
 
-from snapcraft.internal import errors, repo
+from snapcraft.internal import cache, errors, repo
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +83,7 @@ class Rosdep:
         self._rosdep_install_path = os.path.join(self._rosdep_path, "install")
         self._rosdep_sources_path = os.path.join(self._rosdep_path, "sources.list.d")
         self._rosdep_cache_path = os.path.join(self._rosdep_path, "cache")
+        self._resolution_cache_path = None
 
     def setup(self):
         # Make sure we can run multiple times without error, while leaving the
@@ -125,6 +129,8 @@ class Rosdep:
                 "Error updating rosdep database:\n{}".format(output)
             )
 
+        self._resolution_cache_path = self._get_resolution_cache_path()
+
     def get_dependencies(self, package_name=None):
         """Obtain dependencies for a given package, or entire workspace.
 
@@ -154,6 +160,36 @@ class Rosdep:
             raise RosdepPackageNotFoundError(package_name)
 
     def resolve_dependency(self, dependency_name):
+        return self.resolve_dependencies([dependency_name])[dependency_name]
+
+    def resolve_dependencies(self, dependency_names):
+        """Resolve dependencies into system dependencies.
+
+        Dependencies are looked up in the resolution cache first, the rest
+        are resolved by a single rosdep run.
+
+        :param list dependency_names: names of the dependencies to resolve.
+        :returns: a dict of dependency name -> dependency type -> dependencies.
+        :raises RosdepDependencyNotResolvedError: if any of the dependencies
+                                                  cannot be resolved.
+        """
+        resolution_cache_path = self._resolution_cache_path
+        resolutions = _load_resolutions(resolution_cache_path)
+
+        unresolved = sorted(set(dependency_names) - set(resolutions))
+        if len(unresolved) == 1:
+            resolutions[unresolved[0]] = self._resolve(unresolved[0])
+        elif unresolved:
+            resolutions.update(self._resolve_all(unresolved))
+
+        if unresolved and resolution_cache_path is not None:
+            _save_resolutions(
+                resolution_cache_path, {d: resolutions[d] for d in unresolved}
+            )
+
+        return {d: resolutions[d] for d in dependency_names}
+
+    def _resolve(self, dependency_name):
         try:
             # rosdep needs three pieces of information here:
             #
@@ -174,33 +210,70 @@ class Rosdep:
         except subprocess.CalledProcessError:
             raise RosdepDependencyNotResolvedError(dependency_name)
 
-        # The output of rosdep follows the pattern:
-        #
-        #    #apt
-        #    package1
-        #    package2
-        #    #pip
-        #    pip-package1
-        #    pip-package2
-        #
-        # Split these out into a dict of dependency type -> dependencies.
-        delimiters = re.compile(r"\n|\s")
-        lines = delimiters.split(output)
-        dependencies = {}
-        dependency_set = None
-        for line in lines:
-            line = line.strip()
-            if line.startswith("#"):
-                key = line.strip("# ")
-                dependencies[key] = set()
-                dependency_set = dependencies[key]
-            elif line:
-                if dependency_set is None:
-                    raise RosdepUnexpectedResultError(dependency_name, output)
-                else:
-                    dependency_set.add(line)
-
-        return dependencies
+        return _parse_resolution(dependency_name, output)
+
+    def _resolve_all(self, dependency_names):
+        try:
+            output = self._run(
+                ["resolve"]
+                + dependency_names
+                + [
+                    "--rosdistro",
+                    self._ros_distro,
+                    "--os",
+                    "ubuntu:{}".format(self._ubuntu_distro),
+                ]
+            )
+        except subprocess.CalledProcessError as e:
+            # rosdep still prints what it could resolve.
+            output = e.output.decode(sys.getfilesystemencoding()).strip()
+
+        # When given several dependencies, rosdep prefixes the resolution of
+        # each with a #ROSDEP[dependency] line.
+        resolutions = {}
+        sections = re.split(r"^#ROSDEP\[(.*)\]$", output, flags=re.MULTILINE)
+        for dependency_name, section in zip(sections[1::2], sections[2::2]):
+            section = section.strip()
+            if section:
+                resolutions[dependency_name] = _parse_resolution(
+                    dependency_name, section
+                )
+
+        # Resolve what rosdep failed on by itself to report the right error.
+        for dependency_name in dependency_names:
+            if dependency_name not in resolutions:
+                resolutions[dependency_name] = self._resolve(dependency_name)
+
+        return resolutions
+
+    def _get_resolution_cache_path(self):
+        # Resolutions are only valid for the rosdep database, as fetched by
+        # rosdep update, they were made with.
+        sources_cache_path = os.path.join(
+            self._rosdep_cache_path, "rosdep", "sources.cache"
+        )
+        if not os.path.isdir(sources_cache_path):
+            return None
+
+        digest = hashlib.sha384()
+        for root, directories, files in os.walk(sources_cache_path):
+            directories.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                digest.update(
+                    os.path.relpath(file_path, sources_cache_path).encode() + b"\0"
+                )
+                with open(file_path, "rb") as sources_file:
+                    digest.update(hashlib.sha384(sources_file.read()).digest())
+
+        # Shared by all the ROS plugins.
+        resolution_cache = cache.PluginCache(plugin_name="ros", namespace="rosdep")
+        return os.path.join(
+            resolution_cache.cache_dir,
+            self._ros_distro,
+            self._ubuntu_distro,
+            "{}.json".format(digest.hexdigest()),
+        )
 
     def _run(self, arguments):
         env = os.environ.copy()
@@ -230,3 +303,70 @@ class Rosdep:
             .decode("utf8")
             .strip()
         )
+
+
+def _parse_resolution(dependency_name, output):
+    # The output of rosdep follows the pattern:
+    #
+    #    #apt
+    #    package1
+    #    package2
+    #    #pip
+    #    pip-package1
+    #    pip-package2
+    #
+    # Split these out into a dict of dependency type -> dependencies.
+    delimiters = re.compile(r"\n|\s")
+    lines = delimiters.split(output)
+    dependencies = {}
+    dependency_set = None
+    for line in lines:
+        line = line.strip()
+        if line.startswith("#"):
+            key = line.strip("# ")
+            dependencies[key] = set()
+            dependency_set = dependencies[key]
+        elif line:
+            if dependency_set is None:
+                raise RosdepUnexpectedResultError(dependency_name, output)
+            else:
+                dependency_set.add(line)
+
+    return dependencies
+
+
+def _load_resolutions(resolution_cache_path):
+    if resolution_cache_path is None:
+        return {}
+
+    try:
+        with open(resolution_cache_path) as resolution_cache_file:
+            resolutions = json.load(resolution_cache_file)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+    return {
+        dependency_name: {k: set(v) for k, v in dependencies.items()}
+        for dependency_name, dependencies in resolutions.items()
+    }
+
+
+def _save_resolutions(resolution_cache_path, resolutions):
+    resolution_cache_dir = os.path.dirname(resolution_cache_path)
+    with cache.locked(resolution_cache_dir):
+        # Other parts may have added their own resolutions meanwhile.
+        saved_resolutions = _load_resolutions(resolution_cache_path)
+        saved_resolutions.update(resolutions)
+
+        with tempfile.NamedTemporaryFile(
+            "w", dir=resolution_cache_dir, delete=False
+        ) as resolution_cache_file:
+            json.dump(
+                {
+                    dependency_name: {k: sorted(v) for k, v in dependencies.items()}
+                    for dependency_name, dependencies in saved_resolutions.items()
+                },
+                resolution_cache_file,
+                sort_keys=True,
+            )
+        os.replace(resolution_cache_file.name, resolution_cache_path)
@@ -851,10 +851,9 @@ def _find_system_dependencies(catkin_packages, rosdep, rospack, catkin):
     if catkin_packages is None:
         catkin_packages = rospack.list_names()
 
-    for dependency in dependencies:
-        _resolve_package_dependencies(
-            catkin_packages, dependency, catkin, rosdep, resolved_dependencies
-        )
+    _resolve_package_dependencies(
+        catkin_packages, dependencies, catkin, rosdep, resolved_dependencies
+    )
 
     # We currently have nested dict structure of:
     #    dependency name -> package type -> package names
@@ -872,19 +871,26 @@ def _find_system_dependencies(catkin_packages, rosdep, rospack, catkin):
 
 
 def _resolve_package_dependencies(
-    catkin_packages, dependency, catkin, rosdep, resolved_dependencies
+    catkin_packages, dependencies, catkin, rosdep, resolved_dependencies
 ):
-    # No need to resolve this dependency if we know it's local, or if
-    # we've already resolved it into a system dependency
-    if dependency in resolved_dependencies or (
-        catkin_packages and dependency in catkin_packages
-    ):
-        return
-
-    if _dependency_is_in_underlay(catkin, dependency):
-        # Package was found-- don't pull anything extra to satisfy
-        # this dependency.
-        logger.debug("Satisfied dependency {!r} in underlay".format(dependency))
+    system_dependencies = []
+    for dependency in sorted(dependencies):
+        # No need to resolve this dependency if we know it's local, or if
+        # we've already resolved it into a system dependency
+        if dependency in resolved_dependencies or (
+            catkin_packages and dependency in catkin_packages
+        ):
+            continue
+
+        if _dependency_is_in_underlay(catkin, dependency):
+            # Package was found-- don't pull anything extra to satisfy
+            # this dependency.
+            logger.debug("Satisfied dependency {!r} in underlay".format(dependency))
+            continue
+
+        system_dependencies.append(dependency)
+
+    if not system_dependencies:
         return
 
     # In this situation, the package depends on something that we
@@ -892,15 +898,16 @@ def _resolve_package_dependencies(
     # but the developer could have also forgotten to tell us to build
     # it.
     try:
-        these_dependencies = rosdep.resolve_dependency(dependency)
-    except _ros.rosdep.RosdepDependencyNotResolvedError:
-        raise CatkinInvalidSystemDependencyError(dependency)
+        these_dependencies = rosdep.resolve_dependencies(system_dependencies)
+    except _ros.rosdep.RosdepDependencyNotResolvedError as e:
+        raise CatkinInvalidSystemDependencyError(e.dependency)
 
-    for key, value in these_dependencies.items():
-        if key not in _SUPPORTED_DEPENDENCY_TYPES:
-            raise CatkinUnsupportedDependencyTypeError(key, dependency)
+    for dependency, dependency_types in these_dependencies.items():
+        for key, value in dependency_types.items():
+            if key not in _SUPPORTED_DEPENDENCY_TYPES:
+                raise CatkinUnsupportedDependencyTypeError(key, dependency)
 
-        resolved_dependencies[dependency] = {key: value}
+            resolved_dependencies[dependency] = {key: value}
 
 
 def _dependency_is_in_underlay(catkin, dependency):
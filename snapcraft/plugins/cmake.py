@@ -117,12 +117,14 @@ class CMakePlugin(snapcraft.BasePlugin):
 
         # TODO: there is a better way to specify the job count on newer versions of cmake
         # https://github.com/Kitware/CMake/commit/1ab3881ec9e809ac5f6cad5cd84048310b8683e2
-        self.run(
-            ["cmake", "--build", ".", "--", "-j{}".format(self.parallel_build_count)],
-            env=env,
-        )
-
-        self.run(["cmake", "--build", ".", "--target", "install"], env=env)
+        build_args = self.get_parallel_build_args()
+        if build_args:
+            build_args = ["--"] + build_args
+        env = self.get_parallel_build_env(env)
+        self.run(["cmake", "--build", "."] + build_args, env=env)
+
+        # The install target builds anything still out of date first.
+        self.run(["cmake", "--build", ".", "--target", "install"] + build_args, env=env)
 
     def _get_processed_flags(self) -> List[str]:
         # Return the original if no build_snaps are in options.
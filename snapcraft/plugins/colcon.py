@@ -699,10 +699,9 @@ def _find_system_dependencies(colcon_packages, rosdep):
         # let's get the dependencies for the entire workspace.
         dependencies |= rosdep.get_dependencies()
 
-    for dependency in dependencies:
-        _resolve_package_dependencies(
-            colcon_packages, dependency, rosdep, resolved_dependencies
-        )
+    _resolve_package_dependencies(
+        colcon_packages, dependencies, rosdep, resolved_dependencies
+    )
 
     # We currently have nested dict structure of:
     #    dependency name -> package type -> package names
@@ -718,13 +717,17 @@ def _find_system_dependencies(colcon_packages, rosdep):
 
 
 def _resolve_package_dependencies(
-    colcon_packages, dependency, rosdep, resolved_dependencies
+    colcon_packages, dependencies, rosdep, resolved_dependencies
 ):
-    # No need to resolve this dependency if we know it's local, or if
+    # No need to resolve a dependency if we know it's local, or if
     # we've already resolved it into a system dependency
-    if dependency in resolved_dependencies or (
-        colcon_packages and dependency in colcon_packages
-    ):
+    system_dependencies = [
+        dependency
+        for dependency in sorted(dependencies)
+        if dependency not in resolved_dependencies
+        and not (colcon_packages and dependency in colcon_packages)
+    ]
+    if not system_dependencies:
         return
 
     # In this situation, the package depends on something that we
@@ -732,12 +735,13 @@ def _resolve_package_dependencies(
     # but the developer could have also forgotten to tell us to build
     # it.
     try:
-        these_dependencies = rosdep.resolve_dependency(dependency)
-    except _ros.rosdep.RosdepDependencyNotResolvedError:
-        raise ColconInvalidSystemDependencyError(dependency)
+        these_dependencies = rosdep.resolve_dependencies(system_dependencies)
+    except _ros.rosdep.RosdepDependencyNotResolvedError as e:
+        raise ColconInvalidSystemDependencyError(e.dependency)
 
-    for key, value in these_dependencies.items():
-        if key not in _SUPPORTED_DEPENDENCY_TYPES:
-            raise ColconUnsupportedDependencyTypeError(key, dependency)
+    for dependency, dependency_types in these_dependencies.items():
+        for key, value in dependency_types.items():
+            if key not in _SUPPORTED_DEPENDENCY_TYPES:
+                raise ColconUnsupportedDependencyTypeError(key, dependency)
 
-        resolved_dependencies[dependency] = {key: value}
+            resolved_dependencies[dependency] = {key: value}
@@ -57,7 +57,7 @@ from typing import Any, Dict, List, Optional, TYPE_CHECKING
 
 import snapcraft
 from snapcraft import common
-from snapcraft.internal import elf, errors
+from snapcraft.internal import cache, elf, errors
 
 if TYPE_CHECKING:
     from snapcraft.project import Project
@@ -65,6 +65,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 _GO_MOD_REQUIRED_GO_VERSION = "1.13"
+# go build -o takes a directory for several packages from this version on.
+_GO_BUILD_OUTPUT_DIR_REQUIRED_GO_VERSION = "1.13"
 
 
 class GoModRequiredVersionError(errors.SnapcraftException):
@@ -161,10 +163,7 @@ class GoPlugin(snapcraft.BasePlugin):
         else:
             raise errors.PluginBaseError(part_name=self.name, base=base)
 
-    def _is_using_go_mod(self, cwd: str) -> bool:
-        if not os.path.exists(os.path.join(cwd, "go.mod")):
-            return False
-
+    def _get_go_version(self) -> str:
         if self._go_version is None:
             go_version_cmd_output: str = self._run_output(["go", "version"])
             version_match = self._version_regex.match(go_version_cmd_output)
@@ -178,13 +177,29 @@ class GoPlugin(snapcraft.BasePlugin):
 
             self._go_version = version_match.group(1)
 
-        if parse_version(self._go_version) < parse_version(_GO_MOD_REQUIRED_GO_VERSION):
-            raise GoModRequiredVersionError(go_version=self._go_version)
+        return self._go_version
+
+    def _is_using_go_mod(self, cwd: str) -> bool:
+        if not os.path.exists(os.path.join(cwd, "go.mod")):
+            return False
+
+        go_version = self._get_go_version()
+        if parse_version(go_version) < parse_version(_GO_MOD_REQUIRED_GO_VERSION):
+            raise GoModRequiredVersionError(go_version=go_version)
 
         return True
 
     def _pull_go_mod(self) -> None:
-        self._run(["go", "mod", "download"], cwd=self.sourcedir)
+        dependency_cache = cache.DependencyCache(ecosystem="go")
+        digest = cache.get_lockfiles_digest(
+            [os.path.join(self.sourcedir, f) for f in ("go.mod", "go.sum")]
+        )
+        with dependency_cache.fetch(part_name=self.name, digest=digest) as offline:
+            env = self._build_environment()
+            if offline:
+                # Only take modules from the module cache.
+                env["GOPROXY"] = "off"
+            self.run(["go", "mod", "download"], cwd=self.sourcedir, env=env)
 
     def _pull_go_packages(self) -> None:
         os.makedirs(self._gopath_src, exist_ok=True)
@@ -240,37 +255,32 @@ class GoPlugin(snapcraft.BasePlugin):
         main_packages = [p[0] for p in packages_split if p[1] == "main"]
         return main_packages
 
-    def _build(self, *, package: str = "") -> None:
+    def _get_build_cmd(self, *, relink: bool = False) -> List[str]:
         build_cmd = ["go", "build"]
 
         if self.options.go_buildtags:
             build_cmd.extend(["-tags={}".format(",".join(self.options.go_buildtags))])
 
-        relink_cmd = build_cmd + ["-ldflags", "-linkmode=external"]
+        if relink:
+            build_cmd.extend(["-ldflags", "-linkmode=external"])
 
-        if self._is_using_go_mod(self.builddir) and not package:
-            work_dir = self.builddir
-            build_cmd.extend(["-o", self._install_bin_dir])
-            relink_cmd.extend(["-o", self._install_bin_dir])
-        else:
-            work_dir = self._install_bin_dir
-            build_cmd.append(package)
-            relink_cmd.append(package)
-
-        pre_build_files = os.listdir(self._install_bin_dir)
-        self._run(build_cmd, cwd=work_dir)
-        post_build_files = os.listdir(self._install_bin_dir)
-
-        new_files = set(post_build_files) - set(pre_build_files)
-        if len(new_files) != 1:
-            raise RuntimeError(f"Expected one binary to be built, found: {new_files!r}")
-        binary_path = os.path.join(self._install_bin_dir, new_files.pop())
+        return build_cmd
 
+    def _needs_relink(self, binary_path: str) -> bool:
         # Relink with system linker if executable is dynamic in order to be
         # able to set rpath later on. This workaround can be removed after
         # https://github.com/NixOS/patchelf/issues/146 is fixed.
-        if self._is_classic and elf.ElfFile(path=binary_path).is_dynamic:
-            self._run(relink_cmd, cwd=work_dir)
+        return self._is_classic and elf.ElfFile(path=binary_path).is_dynamic
+
+    def _build_go_mod(self) -> None:
+        build_args = ["-o", self._install_bin_dir]
+        self._run(self._get_build_cmd() + build_args, cwd=self.builddir)
+
+        if any(
+            self._needs_relink(os.path.join(self._install_bin_dir, b))
+            for b in os.listdir(self._install_bin_dir)
+        ):
+            self._run(self._get_build_cmd(relink=True) + build_args, cwd=self.builddir)
 
     def _build_go_packages(self) -> None:
         if self.options.go_packages:
@@ -278,8 +288,47 @@ class GoPlugin(snapcraft.BasePlugin):
         else:
             packages = self._get_local_main_packages()
 
-        for package in packages:
-            self._build(package=package)
+        build_cmd = self._get_build_cmd()
+        if parse_version(self._get_go_version()) >= parse_version(
+            _GO_BUILD_OUTPUT_DIR_REQUIRED_GO_VERSION
+        ):
+            # Build all the packages at once, sharing the work on their
+            # common dependencies.
+            self._run(
+                build_cmd + ["-o", self._install_bin_dir] + packages,
+                cwd=self._install_bin_dir,
+            )
+            relink_packages = [
+                p
+                for p in packages
+                if os.path.exists(self._get_binary_path(p))
+                and self._needs_relink(self._get_binary_path(p))
+            ]
+            if relink_packages:
+                self._run(
+                    self._get_build_cmd(relink=True)
+                    + ["-o", self._install_bin_dir]
+                    + relink_packages,
+                    cwd=self._install_bin_dir,
+                )
+        else:
+            for package in packages:
+                binary_path = self._get_binary_path(package)
+                build_args = ["-o", binary_path, package]
+                self._run(build_cmd + build_args, cwd=self._install_bin_dir)
+                if self._needs_relink(binary_path):
+                    self._run(
+                        self._get_build_cmd(relink=True) + build_args,
+                        cwd=self._install_bin_dir,
+                    )
+
+    def _get_binary_path(self, package: str) -> str:
+        # go names binaries after the last element of the import path that
+        # is not a major version suffix.
+        elements = package.rstrip("/").split("/")
+        if len(elements) > 1 and re.fullmatch(r"v[0-9]+", elements[-1]):
+            elements.pop()
+        return os.path.join(self._install_bin_dir, elements[-1])
 
     def build(self) -> None:
         super().build()
@@ -290,7 +339,7 @@ class GoPlugin(snapcraft.BasePlugin):
         os.makedirs(self._install_bin_dir)
 
         if self._is_using_go_mod(cwd=self.builddir):
-            self._build()
+            self._build_go_mod()
         else:
             self._build_go_packages()
 
@@ -319,6 +368,17 @@ class GoPlugin(snapcraft.BasePlugin):
         env = os.environ.copy()
         env["GOPATH"] = self._gopath
         env["GOBIN"] = self._gopath_bin
+        # Share downloaded modules among parts, go locks the module cache
+        # itself. Versions of go before 1.15 keep using GOPATH/pkg/mod.
+        if "GOMODCACHE" not in env:
+            env["GOMODCACHE"] = cache.DependencyCache(ecosystem="go").store_dir
+        if cache.is_offline():
+            env["GOPROXY"] = "off"
+        # Share the build cache among parts and builds, go locks it itself.
+        if "GOCACHE" not in env:
+            env["GOCACHE"] = cache.PluginCache(
+                plugin_name="go", namespace="build"
+            ).cache_dir
 
         library_paths: List[str] = []
         for root in [self.installdir, self.project.stage_dir]:
@@ -64,9 +64,10 @@ import logging
 import os
 import subprocess
 import re
+import shlex
 
 import snapcraft
-from snapcraft.internal import errors
+from snapcraft.internal import cache, errors
 
 logger = logging.getLogger(__name__)
 
@@ -115,6 +116,13 @@ class KBuildPlugin(snapcraft.BasePlugin):
         if logger.isEnabledFor(logging.DEBUG):
             self.make_cmd.append("V=1")
 
+        # The kernel makefiles set CC, ignoring the one in the environment.
+        compiler_cache = cache.get_compiler_cache()
+        if compiler_cache:
+            self.make_cmd.append(
+                "CC={} $(CROSS_COMPILE)gcc".format(compiler_cache.launcher)
+            )
+
     def enable_cross_compilation(self):
         self.make_cmd.append("ARCH={}".format(self.project.kernel_arch))
         if os.environ.get("CROSS_COMPILE"):
@@ -217,7 +225,9 @@ class KBuildPlugin(snapcraft.BasePlugin):
 
     def do_remake_config(self):
         # update config to include kconfig amendments using oldconfig
-        cmd = 'yes "" | {} oldconfig'.format(" ".join(self.make_cmd))
+        cmd = 'yes "" | {} oldconfig'.format(
+            " ".join(shlex.quote(c) for c in self.make_cmd)
+        )
         subprocess.check_call(cmd, shell=True, cwd=self.builddir)
 
     def do_configure(self):
@@ -236,16 +246,24 @@ class KBuildPlugin(snapcraft.BasePlugin):
             makeflags = re.sub(r"-I[\S]*", "", os.environ["MAKEFLAGS"])
             os.environ["MAKEFLAGS"] = makeflags
         # build the software
-        self.run(self.make_cmd + self.make_targets)
+        self.run(
+            self._get_parallel_make_cmd() + self.make_targets,
+            env=self.get_parallel_build_env(),
+        )
 
     def do_install(self):
         # install to installdir
         self.run(
-            self.make_cmd
+            self._get_parallel_make_cmd()
             + ["CONFIG_PREFIX={}".format(self.installdir)]
-            + self.make_install_targets
+            + self.make_install_targets,
+            env=self.get_parallel_build_env(),
         )
 
+    def _get_parallel_make_cmd(self):
+        # The job server, if any, is only known once building.
+        return self.make_cmd[:1] + self.get_parallel_build_args() + self.make_cmd[2:]
+
     def build(self):
         super().build()
 
@@ -64,12 +64,13 @@ import subprocess
 import tempfile
 
 import snapcraft
-from snapcraft.plugins import kbuild
+from snapcraft.plugins import _kernel, kbuild
 
 logger = logging.getLogger(__name__)
 
 
-_compression_command = {"gz": "gzip"}
+# Compressors which use all the cores they are given.
+_compression_command = {"gz": ["pigz", "-c"]}
 
 default_kernel_image_target = {
     "amd64": "bzImage",
@@ -204,13 +205,15 @@ class KernelPlugin(kbuild.KBuildPlugin):
 
     @property
     def compression_cmd(self):
-        return _compression_command[self.options.kernel_initrd_compression]
+        command = _compression_command[self.options.kernel_initrd_compression]
+        return command + ["-p", str(self.parallel_build_count)]
 
     def __init__(self, name, options, project):
         super().__init__(name, options, project)
 
-        # We need to be able to shell out to modprobe
-        self.build_packages.append("kmod")
+        # depmod, run by modules_install, writes the modules.dep the initrd
+        # modules are resolved from.
+        self.build_packages.extend(["kmod", "pigz"])
 
         self._set_kernel_targets()
 
@@ -313,38 +316,20 @@ class KernelPlugin(kbuild.KBuildPlugin):
 
         initrd_unpacked_path = self._unpack_generic_initrd()
 
-        modprobe_outs = []
-
-        # modprobe is typically in /sbin, which may not always be available on
-        # the PATH. Add it for this call.
-        env = os.environ.copy()
-        env["PATH"] += ":/sbin"
-        for module in self.options.kernel_initrd_modules:
-            modprobe_out = self.run_output(
-                [
-                    "modprobe",
-                    "-n",
-                    "--show-depends",
-                    "-d",
-                    self.installdir,
-                    "-S",
-                    self.kernel_release,
-                    module,
-                ],
-                env=env,
-            )
-            modprobe_outs.extend(modprobe_out.split(os.linesep))
+        modules_dep = _kernel.ModulesDep(
+            root=self.installdir, kernel_release=self.kernel_release
+        )
+        module_paths = modules_dep.get_module_paths(self.options.kernel_initrd_modules)
 
-        modprobe_outs = [_ for _ in modprobe_outs if _]
         modules_path = os.path.join("lib", "modules", self.kernel_release)
-        for src in set(_.split()[1] for _ in modprobe_outs):
+        for src in module_paths:
             dst = os.path.join(
                 initrd_unpacked_path, os.path.relpath(src, self.installdir)
             )
             os.makedirs(os.path.dirname(dst), exist_ok=True)
             os.link(src, dst)
 
-        if modprobe_outs:
+        if module_paths:
             for module_info in ["modules.dep", "modules.dep.bin"]:
                 module_info_path = os.path.join(modules_path, module_info)
                 src = os.path.join(self.installdir, module_info_path)
@@ -363,11 +348,8 @@ class KernelPlugin(kbuild.KBuildPlugin):
 
         initrd = "initrd-{}.img".format(self.kernel_release)
         initrd_path = os.path.join(self.installdir, initrd)
-        subprocess.check_call(
-            "find . | cpio --create --format=newc | "
-            "{} > {}".format(self.compression_cmd, initrd_path),
-            shell=True,
-            cwd=initrd_unpacked_path,
+        _kernel.write_initrd(
+            initrd_unpacked_path, initrd_path, compression_cmd=self.compression_cmd
         )
         unversioned_initrd_path = os.path.join(self.installdir, "initrd.img")
         os.link(initrd_path, unversioned_initrd_path)
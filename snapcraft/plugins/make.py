@@ -105,7 +105,10 @@ class MakePlugin(snapcraft.BasePlugin):
         if self.options.make_parameters:
             command.extend(self.options.make_parameters)
 
-        self.run(command + ["-j{}".format(self.parallel_build_count)], env=env)
+        self.run(
+            command + self.get_parallel_build_args(),
+            env=self.get_parallel_build_env(env),
+        )
         if self.options.artifacts:
             for artifact in self.options.artifacts:
                 source_path = os.path.join(self.builddir, artifact)
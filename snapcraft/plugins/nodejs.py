@@ -46,12 +46,12 @@ import contextlib
 import json
 import os
 import shutil
-import subprocess
-import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 
 import snapcraft
 from snapcraft import sources
-from snapcraft.internal import errors
+from snapcraft.internal import cache, errors
 from snapcraft.file_utils import link_or_copy, link_or_copy_tree
 
 
@@ -67,6 +67,7 @@ _NODEJS_ARCHES = {
     "s390x": "s390x",
 }
 _YARN_LATEST_URL = "https://yarnpkg.com/latest.tar.gz"
+_LOCKFILES = ["npm-shrinkwrap.json", "package-lock.json", "yarn.lock"]
 # e.g.; https://github.com/yarnpkg/yarn/releases/download/v1.12.0/yarn-v1.12.0.tar.gz
 _YARN_VERSION_URL = (
     "https://github.com/yarnpkg/yarn/releases/download/{version}/yarn-{version}.tar.gz"
@@ -178,16 +179,11 @@ class NodePlugin(snapcraft.BasePlugin):
                 self._manifest["yarn-lock-contents"] = lock_file.read()
 
         # Get the names and versions of installed packages
-        if self.options.nodejs_package_manager == "npm":
-            installed_node_packages = self._get_installed_node_packages(self.installdir)
-            self._manifest["node-packages"] = [
-                "{}={}".format(name, installed_node_packages[name])
-                for name in installed_node_packages
-            ]
-        # Skip this step if yarn is used, as it may produce different
-        # dependency trees than npm
-        else:
-            self._manifest["node-packages"] = []
+        installed_node_packages = _get_installed_node_packages(self.installdir)
+        self._manifest["node-packages"] = [
+            "{}={}".format(name, installed_node_packages[name])
+            for name in installed_node_packages
+        ]
 
     def _install_node_and_yarn(self, rootdir):
         self._nodejs_tar.provision(self._npm_dir, clean_target=False, keep_tarball=True)
@@ -209,13 +205,30 @@ class NodePlugin(snapcraft.BasePlugin):
 
         flags = []
 
+        # Dependencies are downloaded into the dependency cache, for both
+        # installs to take them from there.
+        dependency_cache = cache.DependencyCache(
+            ecosystem=self.options.nodejs_package_manager
+        )
         if self.options.nodejs_package_manager == "npm":
             flags.append("--unsafe-perm")
-
-        # Run once to download dependencies and run install scripts
-        self.run(cmd + ["install"] + flags, rootdir)
+            flags.extend(["--cache", dependency_cache.store_dir])
+        else:
+            flags.extend(["--cache-folder", dependency_cache.store_dir])
 
         package_json = self._get_package_json(rootdir)
+        digest = cache.get_lockfiles_digest(
+            [os.path.join(rootdir, lockfile) for lockfile in _LOCKFILES],
+            extra=[json.dumps(package_json, sort_keys=True)],
+        )
+        with dependency_cache.fetch(part_name=self.name, digest=digest) as offline:
+            # Run once to download dependencies and run install scripts
+            if offline:
+                fetch_flags = ["--offline"]
+            else:
+                fetch_flags = ["--prefer-offline"]
+            self.run(cmd + ["install"] + flags + fetch_flags, rootdir)
+
         # Take into account scoped names
         name = package_json["name"].lstrip("@").replace("/", "-")
         version = package_json["version"]
@@ -283,30 +296,6 @@ class NodePlugin(snapcraft.BasePlugin):
         except FileNotFoundError as not_found_error:
             raise NodejsPluginMissingPackageJsonError() from not_found_error
 
-    def _get_installed_node_packages(self, cwd):
-        # There is no yarn ls
-        cmd = [os.path.join(self._npm_dir, "bin", "npm"), "ls", "--json"]
-        try:
-            output = self.run_output(cmd, cwd)
-        except subprocess.CalledProcessError as error:
-            # XXX When dependencies have missing dependencies, an error like
-            # this is printed to stderr:
-            # npm ERR! peer dep missing: glob@*, required by glob-promise@3.1.0
-            # retcode is not 0, which raises an exception.
-            output = error.output.decode(sys.getfilesystemencoding()).strip()
-        packages = collections.OrderedDict()
-        output_json = json.loads(output, object_pairs_hook=collections.OrderedDict)
-        dependencies = output_json.get("dependencies", [])
-        while dependencies:
-            key, value = dependencies.popitem(last=False)
-            # XXX Just as above, dependencies without version are the ones
-            # missing.
-            if "version" in value:
-                packages[key] = value["version"]
-            if "dependencies" in value:
-                dependencies.update(value["dependencies"])
-        return packages
-
     def get_manifest(self):
         return self._manifest
 
@@ -342,6 +331,105 @@ def _create_bins(package_json, directory):
         os.chmod(os.path.realpath(target), 0o755)
 
 
+def _get_installed_node_packages(rootdir: str) -> Dict[str, str]:
+    """Return the names and versions of the packages installed in rootdir.
+
+    Packages are listed breadth first, the way npm ls lists them, from the
+    package-lock.json left by npm or else from the node_modules tree.
+    """
+    try:
+        with open(os.path.join(rootdir, "package-lock.json")) as lock_file:
+            package_lock = json.load(
+                lock_file, object_pairs_hook=collections.OrderedDict
+            )
+    except FileNotFoundError:
+        return _scan_node_modules(rootdir)
+    return _get_locked_node_packages(package_lock)
+
+
+def _get_locked_node_packages(package_lock: Dict) -> Dict[str, str]:
+    packages: Dict[str, str] = collections.OrderedDict()
+    # lockfileVersion 2 and later list packages by path.
+    if "packages" in package_lock:
+        paths = sorted(
+            (p for p in package_lock["packages"] if p),
+            key=lambda p: p.count("node_modules/"),
+        )
+        for path in paths:
+            value = package_lock["packages"][path]
+            # Links and missing packages have no version.
+            if "version" in value and not value.get("dev", False):
+                name = path.rsplit("node_modules/", 1)[-1]
+                packages[name] = value["version"]
+        return packages
+
+    dependencies = collections.OrderedDict(package_lock.get("dependencies", {}))
+    while dependencies:
+        key, value = dependencies.popitem(last=False)
+        if value.get("dev", False):
+            continue
+        if "version" in value:
+            packages[key] = value["version"]
+        if "dependencies" in value:
+            dependencies.update(value["dependencies"])
+    return packages
+
+
+def _scan_node_modules(rootdir: str) -> Dict[str, str]:
+    packages: Dict[str, str] = collections.OrderedDict()
+    # Each level of the tree is read concurrently.
+    with ThreadPoolExecutor() as executor:
+        package_dirs = _list_node_modules(rootdir)
+        while package_dirs:
+            versions = executor.map(_read_package_version, package_dirs)
+            for package_dir, version in zip(package_dirs, versions):
+                # Packages without a version are missing.
+                if version is not None:
+                    name = package_dir.rsplit("node_modules" + os.sep, 1)[-1]
+                    packages[name.replace(os.sep, "/")] = version
+            package_dirs = [
+                d
+                for package_dir in package_dirs
+                if not os.path.islink(package_dir)
+                for d in _list_node_modules(package_dir)
+            ]
+    return packages
+
+
+def _list_node_modules(package_dir: str) -> List[str]:
+    node_modules_dir = os.path.join(package_dir, "node_modules")
+    try:
+        entries = sorted(os.listdir(node_modules_dir))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+    package_dirs: List[str] = []
+    for entry in entries:
+        # Skip .bin and the metadata of package managers.
+        if entry.startswith("."):
+            continue
+        path = os.path.join(node_modules_dir, entry)
+        if not os.path.isdir(path):
+            continue
+        if entry.startswith("@"):
+            package_dirs.extend(
+                os.path.join(path, scoped)
+                for scoped in sorted(os.listdir(path))
+                if os.path.isdir(os.path.join(path, scoped))
+            )
+        else:
+            package_dirs.append(path)
+    return package_dirs
+
+
+def _read_package_version(package_dir: str) -> Optional[str]:
+    try:
+        with open(os.path.join(package_dir, "package.json")) as json_file:
+            return json.load(json_file).get("version")
+    except (FileNotFoundError, ValueError):
+        return None
+
+
 def _get_nodejs_base(node_engine, machine):
     if machine not in _NODEJS_ARCHES:
         raise errors.SnapcraftEnvironmentError(
@@ -39,7 +39,7 @@ import os
 
 import snapcraft
 from snapcraft import common
-from snapcraft.internal import errors
+from snapcraft.internal import cache, errors
 
 
 class QmakePlugin(snapcraft.BasePlugin):
@@ -120,7 +120,10 @@ class QmakePlugin(snapcraft.BasePlugin):
             ["qmake"] + self._extra_config() + self.options.options + sources, env=env
         )
 
-        self.run(["make", "-j{}".format(self.parallel_build_count)], env=env)
+        self.run(
+            ["make"] + self.get_parallel_build_args(),
+            env=self.get_parallel_build_env(env),
+        )
 
         self.run(["make", "install", "INSTALL_ROOT=" + self.installdir], env=env)
 
@@ -136,6 +139,13 @@ class QmakePlugin(snapcraft.BasePlugin):
             for path in paths:
                 extra_config.append('INCLUDEPATH+="{}"'.format(path))
 
+        # qmake writes the compilers into the Makefiles it generates.
+        compiler_cache = cache.get_compiler_cache()
+        if compiler_cache:
+            compiler_env = compiler_cache.get_environment()
+            extra_config.append("QMAKE_CC={}".format(compiler_env["CC"]))
+            extra_config.append("QMAKE_CXX={}".format(compiler_env["CXX"]))
+
         return extra_config
 
     def _build_environment(self):
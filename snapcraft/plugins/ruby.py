@@ -173,12 +173,12 @@ class RubyPlugin(BasePlugin):
 
         env = os.environ.copy()
         env.update(self._env_dict(self.installdir))
-        self.run(command, env=env, **kwargs)
+        self.run(command, env=self.get_parallel_build_env(env), **kwargs)
 
     def _ruby_install(self, builddir):
         self._ruby_tar.provision(builddir, clean_target=False, keep_tarball=True)
         self._run(["./configure", "--disable-install-rdoc", "--prefix=/"], cwd=builddir)
-        self._run(["make", "-j{}".format(self.parallel_build_count)], cwd=builddir)
+        self._run(["make"] + self.get_parallel_build_args(), cwd=builddir)
         self._run(
             ["make", "install", "DESTDIR={}".format(self.installdir)], cwd=builddir
         )
@@ -53,7 +53,7 @@ import toml
 import snapcraft
 from snapcraft import sources
 from snapcraft import shell_utils
-from snapcraft.internal import errors
+from snapcraft.internal import cache, errors
 
 _RUSTUP = "https://sh.rustup.rs/"
 logger = logging.getLogger(__name__)
@@ -172,7 +172,18 @@ class RustPlugin(snapcraft.BasePlugin):
         toolchain = self._get_toolchain()
         if toolchain is not None:
             fetch_cmd.insert(1, "+{}".format(toolchain))
-        self.run(fetch_cmd, env=self._build_env())
+
+        # Crates are kept in the registry of the cargo home, the dependency
+        # cache records which lockfiles the registry has every crate for.
+        dependency_cache = cache.DependencyCache(ecosystem="cargo")
+        digest = cache.get_lockfiles_digest([os.path.join(sourcedir, "Cargo.lock")])
+        with dependency_cache.fetch(part_name=self.name, digest=digest) as offline:
+            if offline:
+                fetch_cmd.append("--offline")
+            # The registry can be shared with other build instances, which
+            # cargo does not lock for.
+            with cache.locked(os.path.join(self._rust_dir, "registry")):
+                self.run(fetch_cmd, env=self._build_env())
 
     def _get_target(self) -> str:
         # Cf. rustc --print target-list
@@ -218,6 +229,9 @@ class RustPlugin(snapcraft.BasePlugin):
         if self.project.is_cross_compiling:
             install_cmd.extend(["--target", self._get_target()])
 
+        if cache.is_offline():
+            install_cmd.append("--offline")
+
         if self.options.rust_features:
             install_cmd.append("--features")
             install_cmd.append(" ".join(self.options.rust_features))
@@ -19,7 +19,7 @@ import os
 from datetime import datetime
 
 from snapcraft.internal.deprecations import handle_deprecation_notice
-from snapcraft.internal.meta.snap import Snap
+from snapcraft.internal.meta import snap
 from typing import Set
 from ._project_options import ProjectOptions
 from ._project_info import ProjectInfo  # noqa: F401
@@ -65,7 +65,7 @@ class Project(ProjectOptions):
         # XXX: (Re)set by Config because it mangles source data.
         # Ideally everywhere wold converge to operating on snap_meta, and ww
         # would only need to initialize it once (properly).
-        self._snap_meta = Snap()
+        self._snap_meta = snap.Snap()
 
     def _get_project_directory_hash(self) -> str:
         m = hashlib.sha1()
@@ -15,10 +15,13 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import functools
+import hashlib
 import os
 
 import json
 import jsonschema
+from typing import Any, Dict, Tuple
 
 from . import errors
 from snapcraft.internal import common
@@ -30,6 +33,12 @@ class Validator:
         self._snapcraft = snapcraft_yaml if snapcraft_yaml else {}
         self._load_schema()
 
+    @property
+    def schema_digest(self) -> str:
+        """Return the sha384 digest of the schema file."""
+
+        return self._schema_digest
+
     @property
     def schema(self):
         """Return all schema properties."""
@@ -55,8 +64,7 @@ class Validator:
             os.path.join(common.get_schemadir(), "snapcraft.json")
         )
         try:
-            with open(schema_file) as fp:
-                self._schema = json.load(fp)
+            self._schema, self._schema_digest = _read_schema(schema_file)
         except FileNotFoundError:
             raise errors.YamlValidationError(
                 "snapcraft validation file is missing from installation path"
@@ -65,8 +73,37 @@ class Validator:
     def validate(self, *, source="snapcraft.yaml"):
         format_check = jsonschema.FormatChecker()
         try:
-            jsonschema.validate(
-                self._snapcraft, self._schema, format_checker=format_check
-            )
+            validate(self._snapcraft, self._schema, format_checker=format_check)
         except jsonschema.ValidationError as e:
             raise errors.YamlValidationError.from_validation_error(e, source=source)
+
+
+def validate(instance, schema, *, format_checker=None) -> None:
+    """Validate instance against schema, like jsonschema.validate.
+
+    Checking the schema itself against its meta-schema costs more than
+    validating most instances, so it is only done the first time a schema
+    is seen.
+
+    :raises jsonschema.ValidationError: if instance is not valid.
+    """
+    validator_class = _get_validator_class(json.dumps(schema, sort_keys=True))
+    validator = validator_class(schema, format_checker=format_checker)
+    for error in validator.iter_errors(instance):
+        raise error
+
+
+@functools.lru_cache(maxsize=None)
+def _read_schema(schema_file: str) -> Tuple[Dict[str, Any], str]:
+    # Validators share the schema, it is only ever read from.
+    with open(schema_file, "rb") as fp:
+        contents = fp.read()
+    return json.loads(contents.decode()), hashlib.sha384(contents).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_validator_class(schema_key: str):
+    schema = json.loads(schema_key)
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class
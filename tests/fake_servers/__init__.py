@@ -20,6 +20,7 @@ import json
 import logging
 import http.server
 import os
+import socketserver
 import urllib.parse
 import pymacaroons
 
@@ -57,6 +58,53 @@ class FakeFileHTTPRequestHandler(BaseHTTPRequestHandler):
             self.wfile.write(data.encode())
 
 
+class FakeLibrarianServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, server_address):
+        super().__init__(server_address, FakeLibrarianRequestHandler)
+        self.content = bytes(range(256)) * 1024
+        self.range_requests = []
+
+
+class FakeLibrarianRequestHandler(BaseHTTPRequestHandler):
+    """Serve files with support for byte ranges unless under /no-ranges/.
+
+    HEAD requests fail under /no-head/, and ranges past the first one fail
+    under /failing-ranges/.
+    """
+
+    def do_HEAD(self):
+        if self.path.startswith("/no-head/"):
+            self.send_error(405)
+            return
+        self._send_headers(200, len(self.server.content))
+
+    def do_GET(self):
+        content = self.server.content
+        range_header = self.headers.get("Range")
+        if range_header and not self.path.startswith("/no-ranges/"):
+            start, end = range_header[len("bytes=") :].split("-")
+            self.server.range_requests.append((int(start), int(end)))
+            if self.path.startswith("/failing-ranges/") and int(start) > 0:
+                self.send_error(500)
+                return
+            content = content[int(start) : int(end) + 1]
+            self._send_headers(206, len(content))
+        else:
+            self._send_headers(200, len(content))
+        self.wfile.write(content)
+
+    def _send_headers(self, status, length):
+        self.send_response(status)
+        if not self.path.startswith("/no-ranges/"):
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Length", length)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.end_headers()
+
+
 class FakePartsServer(http.server.HTTPServer):
     def __init__(self, server_address):
         super().__init__(server_address, FakePartsRequestHandler)
@@ -28,6 +28,7 @@ from ._fixtures import (  # noqa: F401
     GitRepo,
     HgRepo,
     FakeBaseEnvironment,
+    FakeLibrarianServerRunning,
     FakeParts,
     FakePartsServerRunning,
     FakePartsWiki,
@@ -309,6 +309,11 @@ class FakePartsWikiWithSlashesRunning(FakeServerRunning):
     fake_server = fake_servers.FakePartsWikiWithSlashesServer
 
 
+class FakeLibrarianServerRunning(FakeServerRunning):
+
+    fake_server = fake_servers.FakeLibrarianServer
+
+
 class FakePartsServerRunning(FakeServerRunning):
 
     fake_server = fake_servers.FakePartsServer
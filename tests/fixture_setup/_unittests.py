@@ -327,6 +327,9 @@ class FakeSnapCommand(fixtures.Fixture):
         self.install_success = True
         self.refresh_success = True
         self._email = "-"
+        # Map of snap names to a (path to a local .snap, revision) tuple for
+        # snap download to provide.
+        self.download_snaps = dict()
 
     def _setUp(self):
         original_check_call = snapcraft.internal.repo.snaps.check_call
@@ -377,8 +380,8 @@ class FakeSnapCommand(fixtures.Fixture):
     def _is_snap_command(self, cmd):
         return self._get_snap_cmd(cmd) in ["install", "refresh", "whoami", "download"]
 
-    def _fake_snap_command(self, cmd, *args, **kwargs):
-        cmd = self._get_snap_cmd(cmd)
+    def _fake_snap_command(self, snap_cmd, *args, **kwargs):
+        cmd = self._get_snap_cmd(snap_cmd)
         if cmd == "install" and not self.install_success:
             raise subprocess.CalledProcessError(returncode=1, cmd=cmd)
         elif cmd == "refresh" and not self.refresh_success:
@@ -386,8 +389,20 @@ class FakeSnapCommand(fixtures.Fixture):
         elif cmd == "whoami":
             return "email: {}".format(self._email).encode()
         elif cmd == "download":
+            self._download(snap_cmd, cwd=kwargs.get("cwd"))
             return "Downloaded  ".encode()
 
+    def _download(self, cmd, *, cwd=None):
+        snap_name = cmd[cmd.index("download") + 1]
+        if snap_name not in self.download_snaps:
+            return
+
+        snap_path, revision = self.download_snaps[snap_name]
+        snap_file = os.path.join(cwd or "", "{}_{}".format(snap_name, revision))
+        shutil.copyfile(snap_path, snap_file + ".snap")
+        with open(snap_file + ".assert", "w") as assertion_file:
+            print("type: snap-revision", file=assertion_file)
+
 
 class FakeAptCache(fixtures.Fixture):
     class Cache:
@@ -432,6 +447,10 @@ class FakeAptCache(fixtures.Fixture):
         def update(self, *args, **kwargs):
             pass
 
+        def clear(self):
+            for package in self.packages.values():
+                package.mark_keep()
+
         def get_changes(self):
             return [
                 self.packages[package]
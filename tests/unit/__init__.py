@@ -138,6 +138,13 @@ class TestCase(testscenarios.WithScenarios, testtools.TestCase):
         self.addCleanup(common.set_extensionsdir, common.get_extensionsdir())
         self.addCleanup(common.set_keyringsdir, common.get_keyringsdir())
         self.addCleanup(common.reset_env)
+        # Package indexes are kept for a whole session, start each test afresh.
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.repo._deb._package_indexes",
+                snapcraft.internal.repo._deb._PackageIndexes(),
+            )
+        )
         common.set_schemadir(os.path.join(get_snapcraft_path(), "schema"))
         self.fake_logger = fixtures.FakeLogger(level=logging.ERROR)
         self.useFixture(self.fake_logger)
@@ -313,6 +320,8 @@ class TestCase(testscenarios.WithScenarios, testtools.TestCase):
             confinement=confinement,
             snap_type=snap_type,
             soname_cache=elf.SonameCache(),
+            stage_snaps_pipeline=snapcraft.internal.pluginhandler.StageSnapsPipeline(),
+            machine_manifest=snapcraft.internal.pluginhandler.MachineManifest(),
         )
 
 
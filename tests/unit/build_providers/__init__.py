@@ -36,6 +36,7 @@ class ProviderImpl(Provider):
         )
 
         self.run_mock = mock.Mock()
+        self.run_stream_mock = mock.Mock()
         self.launch_mock = mock.Mock()
         self.start_mock = mock.Mock()
         self.is_mounted_mock = mock.Mock(return_value=False)
@@ -51,6 +52,9 @@ class ProviderImpl(Provider):
     def _run(self, command, hide_output=False) -> Optional[bytes]:
         return self.run_mock(command)
 
+    def _run_stream(self, command, *, stdin=None, stdout=None) -> None:
+        self.run_stream_mock(command, stdin=stdin, stdout=stdout)
+
     def _launch(self) -> None:
         self.launch_mock()
 
@@ -16,9 +16,10 @@
 
 import os
 import subprocess
-from typing import Any, Dict
+from typing import Any, Dict, List
 from unittest import mock
 
+import fixtures
 from testtools.matchers import Equals, FileContains, FileExists
 
 from snapcraft.internal.errors import SnapcraftEnvironmentError
@@ -35,6 +36,7 @@ class FakeContainer:
 
     def __init__(self, config: Dict[str, Any], wait: bool) -> None:
         self._status = "STOPPED"
+        self.name = config["name"]
         self.config = config
         self.devices = dict()  # type: Dict[str, Any]
 
@@ -101,6 +103,9 @@ class FakeContainers:
     def get(self, container_name: str) -> FakeContainer:
         return self._containers[container_name]
 
+    def all(self) -> List[FakeContainer]:
+        return list(self._containers.values())
+
     def create(self, config: Dict[str, Any], wait: bool) -> FakeContainer:
         self.create_mock(config=config, wait=wait)
         self._containers[config["name"]] = FakeContainer(config, wait)
@@ -260,6 +265,89 @@ class LXDInitTest(LXDBaseTest):
         )
 
 
+class LXDWarmInstanceTest(LXDBaseTest):
+    def setUp(self):
+        super().setUp()
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAP_REVISION", "100"))
+        self.warm_instance_name = "snapcraft-warm-core16-{}-100".format(
+            self.project.deb_arch
+        )
+
+    def test_create_saves_warm_instance(self):
+        stale_warm_container = self.fake_pylxd_client.containers.create(
+            {"name": "snapcraft-warm-core16-{}-99".format(self.project.deb_arch)},
+            wait=True,
+        )
+        other_base_warm_container = self.fake_pylxd_client.containers.create(
+            {"name": "snapcraft-warm-core18-{}-99".format(self.project.deb_arch)},
+            wait=True,
+        )
+        self.fake_pylxd_client.containers.create_mock.reset_mock()
+
+        LXD(project=self.project, echoer=self.echoer_mock).create()
+
+        self.fake_pylxd_client.containers.create_mock.assert_called_with(
+            config={
+                "name": self.warm_instance_name,
+                "source": {"type": "copy", "source": self.instance_name},
+            },
+            wait=True,
+        )
+        stale_warm_container.delete_mock.assert_called_once_with(wait=True)
+        other_base_warm_container.delete_mock.assert_not_called()
+
+    def test_create_from_warm_instance(self):
+        self.fake_pylxd_client.containers.create(
+            {"name": self.warm_instance_name}, wait=True
+        )
+        self.fake_pylxd_client.containers.create_mock.reset_mock()
+
+        LXD(project=self.project, echoer=self.echoer_mock).create()
+
+        self.fake_pylxd_client.containers.create_mock.assert_called_once_with(
+            config=mock.ANY, wait=True
+        )
+        container = self.fake_pylxd_client.containers.get(self.instance_name)
+        self.assertThat(
+            container.config["source"],
+            Equals({"type": "copy", "source": self.warm_instance_name}),
+        )
+        container.start_mock.assert_called_once_with(wait=True)
+        # The clone waits for cloud-init and is refreshed, as the warm
+        # instance may be older than the snaps in the store.
+        self.assertThat(self.check_call_mock.call_count, Equals(2))
+        self.check_call_mock.assert_has_calls(
+            [
+                mock.call(
+                    [
+                        "/snap/bin/lxc",
+                        "exec",
+                        self.instance_name,
+                        "--",
+                        "env",
+                        "SNAPCRAFT_HAS_TTY=False",
+                        "cloud-init",
+                        "status",
+                        "--wait",
+                    ]
+                ),
+                mock.call(
+                    [
+                        "/snap/bin/lxc",
+                        "exec",
+                        self.instance_name,
+                        "--",
+                        "env",
+                        "SNAPCRAFT_HAS_TTY=False",
+                        "snapcraft",
+                        "refresh",
+                    ]
+                ),
+            ]
+        )
+
+
 class LXDLaunchedTest(LXDBaseTest):
     def setUp(self):
         super().setUp()
@@ -408,6 +496,23 @@ class LXDLaunchedTest(LXDBaseTest):
             ]
         )
 
+    def test_run_stream(self):
+        stdin = mock.Mock()
+        self.instance._run_stream(["tar", "--extract"], stdin=stdin)
+
+        self.check_call_mock.assert_called_once_with(
+            [
+                "/snap/bin/lxc",
+                "exec",
+                "snapcraft-project-name",
+                "--",
+                "tar",
+                "--extract",
+            ],
+            stdin=stdin,
+            stdout=None,
+        )
+
 
 class EnsureLXDTest(LXDBaseTest):
     def test_linux(self):
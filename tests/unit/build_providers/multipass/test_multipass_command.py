@@ -458,6 +458,34 @@ class MultipassCommandMountTest(MultipassCommandPassthroughBaseTest):
         self.check_output_mock.assert_not_called()
 
 
+class MultipassCommandExecuteStreamTest(MultipassCommandPassthroughBaseTest):
+    def test_execute_stream(self):
+        stdin = mock.Mock()
+        stdout = mock.Mock()
+        self.multipass_command.execute_stream(
+            instance_name=self.instance_name,
+            command=["tar", "--create"],
+            stdin=stdin,
+            stdout=stdout,
+        )
+
+        self.check_call_mock.assert_called_once_with(
+            ["multipass", "exec", self.instance_name, "--", "tar", "--create"],
+            stdin=stdin,
+            stdout=stdout,
+        )
+
+    def test_execute_stream_fails(self):
+        self.check_call_mock.side_effect = subprocess.CalledProcessError(1, "tar")
+
+        self.assertRaises(
+            errors.ProviderExecError,
+            self.multipass_command.execute_stream,
+            instance_name=self.instance_name,
+            command=["tar", "--create"],
+        )
+
+
 class MultipassCommandCopyFilesTest(MultipassCommandPassthroughBaseTest):
     def test_copy_files(self):
         source = "source-file"
@@ -18,9 +18,17 @@ import contextlib
 import os
 import pathlib
 from textwrap import dedent
-from unittest.mock import call, patch, Mock
-
-from testtools.matchers import Equals, EndsWith, DirExists, FileContains, Not
+from unittest.mock import ANY, call, patch, Mock
+
+import fixtures
+from testtools.matchers import (
+    Equals,
+    EndsWith,
+    DirExists,
+    FileContains,
+    FileExists,
+    Not,
+)
 
 from . import BaseProviderBaseTest, MacBaseProviderWithBasesBaseTest, ProviderImpl
 from snapcraft.internal.build_providers import errors, _base_provider
@@ -97,6 +105,77 @@ class BaseProviderTest(BaseProviderBaseTest):
 
         self.assertThat(provider.provider_project_dir, DirExists())
 
+    def test_launch_instance_saves_warm_instance(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAP_REVISION", "100"))
+        warm_instance_name = "snapcraft-warm-core16-{}-100".format(
+            self.project.deb_arch
+        )
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+        provider.start_mock.side_effect = errors.ProviderInstanceNotFoundError(
+            instance_name=self.instance_name
+        )
+        stale_warm_instance_dir = provider._get_warm_instance_dir(
+            "snapcraft-warm-core16-{}-99".format(self.project.deb_arch)
+        )
+        os.makedirs(stale_warm_instance_dir)
+
+        def launch():
+            with open(
+                os.path.join(provider.provider_project_dir, "snap-registry.yaml"), "w"
+            ) as registry_file:
+                print("snapcraft: [{revision: '100'}]", file=registry_file)
+
+        provider.launch_mock.side_effect = launch
+        with patch.object(provider, "_save_warm_instance") as save_warm_mock:
+            provider.launch_instance()
+
+        save_warm_mock.assert_called_once_with(warm_instance_name)
+        self.assertThat(
+            os.path.join(
+                provider._get_warm_instance_dir(warm_instance_name),
+                "snap-registry.yaml",
+            ),
+            FileContains("snapcraft: [{revision: '100'}]\n"),
+        )
+        self.assertThat(stale_warm_instance_dir, Not(DirExists()))
+
+    def test_launch_instance_from_warm_instance(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAP_REVISION", "100"))
+        warm_instance_name = "snapcraft-warm-core16-{}-100".format(
+            self.project.deb_arch
+        )
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+        provider.start_mock.side_effect = errors.ProviderInstanceNotFoundError(
+            instance_name=self.instance_name
+        )
+        warm_instance_dir = provider._get_warm_instance_dir(warm_instance_name)
+        os.makedirs(warm_instance_dir)
+        with open(
+            os.path.join(warm_instance_dir, "snap-registry.yaml"), "w"
+        ) as registry_file:
+            print("snapcraft: [{revision: '100'}]", file=registry_file)
+
+        with patch.object(
+            provider, "_launch_from_warm_instance", return_value=True
+        ) as launch_warm_mock:
+            provider.launch_instance()
+
+        launch_warm_mock.assert_called_once_with(warm_instance_name)
+        provider.launch_mock.assert_not_called()
+        provider.run_mock.assert_called_once_with(["snapcraft", "refresh"])
+        provider.save_info_mock.assert_called_once_with({"base": "core16"})
+        self.assertThat(
+            os.path.join(provider.provider_project_dir, "snap-registry.yaml"),
+            FileContains("snapcraft: [{revision: '100'}]\n"),
+        )
+
+    def test_no_warm_instance_when_not_a_snap(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAP_REVISION", "100"))
+        self.useFixture(fixtures.EnvironmentVariable("SNAP_NAME"))
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+
+        self.assertThat(provider._get_warm_instance_name(), Equals(None))
+
     def test_expose_prime(self):
         provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
         provider.expose_prime()
@@ -133,6 +212,132 @@ class BaseProviderTest(BaseProviderBaseTest):
             ]
         )
 
+    def test_share_caches(self):
+        provider = ProviderImpl(
+            project=self.project,
+            echoer=self.echoer_mock,
+            build_provider_flags=dict(share_caches=True),
+        )
+
+        provider.mount_project()
+
+        cache_root = os.path.join(self.xdg_path, ".cache", "snapcraft")
+        provider.mount_mock.assert_has_calls(
+            [
+                call(self.project._project_dir, "/root/project"),
+                call(
+                    os.path.join(cache_root, "compiler"),
+                    "/root/.cache/snapcraft/compiler",
+                ),
+                call(
+                    os.path.join(cache_root, "dependencies"),
+                    "/root/.cache/snapcraft/dependencies",
+                ),
+                call(os.path.join(cache_root, "files"), "/root/.cache/snapcraft/files"),
+                call(
+                    os.path.join(cache_root, "plugins"),
+                    "/root/.cache/snapcraft/plugins",
+                ),
+                call(
+                    os.path.join(cache_root, "stage-packages"),
+                    "/root/.cache/snapcraft/stage-packages",
+                ),
+                call(
+                    os.path.join(cache_root, "stage-snaps"),
+                    "/root/.cache/snapcraft/stage-snaps",
+                ),
+                call(
+                    os.path.join(cache_root, "wheels"),
+                    "/root/.cache/snapcraft/wheels",
+                ),
+                call(
+                    os.path.join(cache_root, "plugins", "rust", "registry"),
+                    "/root/.cargo/registry",
+                ),
+            ]
+        )
+        self.assertThat(os.path.join(cache_root, "stage-packages"), DirExists())
+
+    def test_copy_project(self):
+        provider = ProviderImpl(
+            project=self.project,
+            echoer=self.echoer_mock,
+            build_provider_flags=dict(copy_project=True),
+        )
+
+        provider.mount_project()
+
+        provider.mount_mock.assert_not_called()
+        provider.run_stream_mock.assert_has_calls(
+            [
+                call(["mkdir", "-p", "/root/project"], stdin=None, stdout=None),
+                call(
+                    [
+                        "tar",
+                        "--extract",
+                        "--no-same-owner",
+                        "--directory",
+                        "/root/project",
+                    ],
+                    stdin=ANY,
+                    stdout=None,
+                ),
+            ]
+        )
+        self.assertThat(
+            os.path.join(provider.provider_project_dir, "project-sync.json"),
+            FileExists(),
+        )
+
+    def test_copy_project_already_mounted(self):
+        provider = ProviderImpl(
+            project=self.project,
+            echoer=self.echoer_mock,
+            build_provider_flags=dict(copy_project=True),
+        )
+        provider.is_mounted_mock.return_value = True
+
+        provider.mount_project()
+
+        provider.run_stream_mock.assert_not_called()
+        self.echoer_mock.warning.assert_called_once_with(
+            "The project is mounted into the build environment, "
+            "clean the project to copy it instead."
+        )
+
+    def test_pack_project_pulls_snap_when_copied(self):
+        provider = ProviderImpl(
+            project=self.project,
+            echoer=self.echoer_mock,
+            build_provider_flags=dict(copy_project=True),
+        )
+
+        provider.pack_project(output="out/project.snap")
+
+        provider.run_mock.assert_called_once_with(
+            ["snapcraft", "snap", "--output", "out/project.snap"]
+        )
+        provider.run_stream_mock.assert_called_once_with(
+            [
+                "find",
+                "/root/project/out",
+                "-mindepth",
+                "1",
+                "-maxdepth",
+                "1",
+                "(",
+                "-name",
+                "project.snap",
+                ")",
+                "-type",
+                "f",
+                "-printf",
+                "%P\\0",
+            ],
+            stdin=None,
+            stdout=ANY,
+        )
+
     def test_ensure_base_same_base(self):
         provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
         provider.project.info.base = "core16"
@@ -265,6 +470,48 @@ class BaseProviderTest(BaseProviderBaseTest):
             ),
         )
 
+    def test_passthrough_environment_compiler_cache(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE_SIZE", "10G")
+        )
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+        provider.build_provider_flags = dict(compiler_cache="ccache")
+
+        results = provider._get_env_command()
+
+        self.assertThat(
+            results,
+            Equals(
+                [
+                    "env",
+                    "SNAPCRAFT_HAS_TTY=False",
+                    "SNAPCRAFT_COMPILER_CACHE=ccache",
+                    "SNAPCRAFT_COMPILER_CACHE_SIZE=10G",
+                ]
+            ),
+        )
+
+    def test_passthrough_environment_offline(self):
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+        provider.build_provider_flags = dict(offline=True)
+
+        results = provider._get_env_command()
+
+        self.assertThat(
+            results, Equals(["env", "SNAPCRAFT_HAS_TTY=False", "SNAPCRAFT_OFFLINE=1"]),
+        )
+
+    def test_passthrough_environment_content_digests(self):
+        provider = ProviderImpl(project=self.project, echoer=self.echoer_mock)
+        provider.build_provider_flags = dict(content_digests=True)
+
+        results = provider._get_env_command()
+
+        self.assertThat(
+            results,
+            Equals(["env", "SNAPCRAFT_HAS_TTY=False", "SNAPCRAFT_CONTENT_DIGESTS=1"]),
+        )
+
 
 class BaseProviderProvisionSnapcraftTest(BaseProviderBaseTest):
     def test_setup_snapcraft(self):
@@ -447,7 +694,7 @@ class GetCloudUserDataTest(BaseProviderBaseTest):
                 devices: ["/"]
                 ignore_growroot_disabled: false
             runcmd:
-            - ["ln", "-s", "../usr/share/zoneinfo/America/Argentina/Cordoba", "/etc/localtime"]
+            - ["ln", "-sf", "../usr/share/zoneinfo/America/Argentina/Cordoba", "/etc/localtime"]
             write_files:
                 - path: /root/.bashrc
                   permissions: 0644
@@ -0,0 +1,150 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+import tarfile
+
+from testtools.matchers import Contains, DirExists, Equals, FileContains, FileExists
+from testtools.matchers import Not
+
+from snapcraft.internal.build_providers import _sync
+from tests import unit
+
+
+class FakeStreamRunner:
+    """Run the commands meant for the instance on the host."""
+
+    def __init__(self):
+        self.commands = []
+        self.pushed = []
+
+    def __call__(self, command, *, stdin=None, stdout=None):
+        self.commands.append(command)
+        if command[0] == "tar" and "--extract" in command:
+            with tarfile.open(fileobj=stdin, mode="r") as tar:
+                self.pushed.extend(tar.getnames())
+            # Rewind the file descriptor tar reads from, not only the buffer.
+            os.lseek(stdin.fileno(), 0, os.SEEK_SET)
+        subprocess.check_call(command, stdin=stdin, stdout=stdout)
+
+
+class PushDirectoryTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs(os.path.join("project", "src"))
+        os.makedirs(os.path.join("project", "parts"))
+        for path in ("snapcraft.yaml", "src/main.c", "parts/ignored", "old.snap"):
+            with open(os.path.join("project", path), "w") as f:
+                print(path, file=f)
+        os.symlink("main.c", os.path.join("project", "src", "link"))
+
+        self.run_stream = FakeStreamRunner()
+        self.target = os.path.abspath("instance-project")
+
+    def _push(self):
+        self.run_stream.pushed.clear()
+        _sync.push_directory(
+            source_dir="project",
+            target=self.target,
+            state_filepath="project-sync.json",
+            run_stream=self.run_stream,
+        )
+
+    def test_push(self):
+        self._push()
+
+        self.assertThat(
+            os.path.join(self.target, "snapcraft.yaml"),
+            FileContains("snapcraft.yaml\n"),
+        )
+        self.assertThat(
+            os.path.join(self.target, "src", "main.c"), FileContains("src/main.c\n")
+        )
+        self.assertThat(
+            os.readlink(os.path.join(self.target, "src", "link")), Equals("main.c")
+        )
+        self.assertThat(os.path.join(self.target, "parts"), Not(DirExists()))
+        self.assertThat(os.path.join(self.target, "old.snap"), Not(FileExists()))
+
+    def test_push_only_changes(self):
+        self._push()
+        self._push()
+
+        self.assertThat(self.run_stream.pushed, Equals([]))
+
+        with open(os.path.join("project", "src", "new.c"), "w") as f:
+            print("new", file=f)
+        self._push()
+
+        self.assertThat(self.run_stream.pushed, Equals(["src", "src/new.c"]))
+        self.assertThat(
+            os.path.join(self.target, "src", "new.c"), FileContains("new\n")
+        )
+
+    def test_push_removes_deleted(self):
+        self._push()
+        os.remove(os.path.join("project", "src", "main.c"))
+        os.remove(os.path.join("project", "src", "link"))
+        os.rmdir(os.path.join("project", "src"))
+        with open(os.path.join("project", "src"), "w") as f:
+            print("now a file", file=f)
+
+        self._push()
+
+        self.assertThat(os.path.join(self.target, "src"), FileContains("now a file\n"))
+        self.assertThat(self.run_stream.pushed, Equals(["src"]))
+
+
+class PullFilesTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs("instance-project/parts")
+        for path in ("a_1.snap", "b_1.snap", "snapcraft.yaml", "parts/c_1.snap"):
+            with open(os.path.join("instance-project", path), "w") as f:
+                print(path, file=f)
+        os.mkdir("host-project")
+
+        self.run_stream = FakeStreamRunner()
+
+    def test_pull_files(self):
+        _sync.pull_files(
+            source_dir=os.path.abspath("instance-project"),
+            patterns=["*.snap"],
+            destination="host-project",
+            run_stream=self.run_stream,
+        )
+
+        self.assertThat(
+            sorted(os.listdir("host-project")), Equals(["a_1.snap", "b_1.snap"])
+        )
+        self.assertThat(
+            os.path.join("host-project", "a_1.snap"), FileContains("a_1.snap\n")
+        )
+
+    def test_pull_files_no_match(self):
+        _sync.pull_files(
+            source_dir=os.path.abspath("instance-project"),
+            patterns=["missing.snap"],
+            destination="host-project",
+            run_stream=self.run_stream,
+        )
+
+        self.assertThat(os.listdir("host-project"), Equals([]))
+        self.assertThat(self.run_stream.commands, Not(Contains(["tar"])))
+        self.assertThat(len(self.run_stream.commands), Equals(1))
@@ -0,0 +1,57 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import threading
+
+from testtools.matchers import DirExists, Equals
+
+from snapcraft.internal import cache
+from tests import unit
+
+
+class PluginCacheTestCase(unit.TestCase):
+    def test_cache_dir(self):
+        plugin_cache = cache.PluginCache(plugin_name="go", namespace="mod")
+
+        self.assertThat(
+            plugin_cache.cache_dir,
+            Equals(os.path.join(plugin_cache.cache_root, "plugins", "go", "mod")),
+        )
+        self.assertThat(plugin_cache.cache_dir, DirExists())
+
+
+class LockedTestCase(unit.TestCase):
+    def test_locked_excludes_others(self):
+        events = []
+        inside = threading.Event()
+
+        def hold_lock():
+            with cache.locked("shared"):
+                inside.set()
+                # Give the main thread the chance to try for the lock.
+                threading.Event().wait(0.2)
+                events.append("released")
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        inside.wait()
+        with cache.locked("shared"):
+            events.append("acquired")
+        thread.join()
+
+        self.assertThat(events, Equals(["released", "acquired"]))
+        self.assertThat("shared", DirExists())
@@ -0,0 +1,150 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import json
+import os
+import subprocess
+from textwrap import dedent
+
+import fixtures
+from testtools.matchers import Equals, Is
+
+from snapcraft.internal import cache, errors
+from tests import unit
+
+
+class GetCompilerCacheTestCase(unit.TestCase):
+    def test_disabled(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", None))
+
+        self.assertThat(cache.get_compiler_cache(), Is(None))
+
+    def test_enabled(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", "sccache")
+        )
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE_SIZE", "20G")
+        )
+
+        compiler_cache = cache.get_compiler_cache()
+
+        self.expectThat(compiler_cache.launcher, Equals("sccache"))
+        self.expectThat(compiler_cache.max_size, Equals("20G"))
+        self.assertThat(
+            compiler_cache.cache_dir,
+            Equals(os.path.join(compiler_cache.cache_root, "compiler", "sccache")),
+        )
+
+    def test_unsupported(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", "distcc")
+        )
+
+        self.assertRaises(errors.InvalidCompilerCacheError, cache.get_compiler_cache)
+
+
+class CompilerCacheEnvironmentTestCase(unit.TestCase):
+    def test_ccache(self):
+        compiler_cache = cache.CompilerCache(launcher="ccache")
+
+        self.assertThat(
+            compiler_cache.get_environment(compiler_prefix="aarch64-linux-gnu-"),
+            Equals(
+                {
+                    "CC": "ccache aarch64-linux-gnu-gcc",
+                    "CXX": "ccache aarch64-linux-gnu-g++",
+                    "CCACHE_DIR": compiler_cache.cache_dir,
+                    "CCACHE_MAXSIZE": "5G",
+                }
+            ),
+        )
+
+    def test_sccache(self):
+        compiler_cache = cache.CompilerCache(launcher="sccache", max_size="1G")
+
+        self.assertThat(
+            compiler_cache.get_environment(),
+            Equals(
+                {
+                    "CC": "sccache gcc",
+                    "CXX": "sccache g++",
+                    "SCCACHE_DIR": compiler_cache.cache_dir,
+                    "SCCACHE_CACHE_SIZE": "1G",
+                    "RUSTC_WRAPPER": "sccache",
+                }
+            ),
+        )
+
+
+class CompilerCacheStatsTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.fake_check_output = self.useFixture(
+            fixtures.MockPatch("subprocess.check_output")
+        ).mock
+
+    def test_ccache(self):
+        self.fake_check_output.return_value = dedent(
+            """\
+            cache_miss\t3
+            direct_cache_hit\t5
+            files_in_cache\t12
+            preprocessed_cache_hit\t2
+            """
+        ).encode()
+
+        self.assertThat(
+            cache.CompilerCache(launcher="ccache").get_stats(), Equals((7, 3))
+        )
+
+    def test_ccache_legacy(self):
+        self.fake_check_output.side_effect = [
+            subprocess.CalledProcessError(1, ["ccache"]),
+            dedent(
+                """\
+                cache directory                     /root/.ccache
+                cache hit (direct)                     5
+                cache hit (preprocessed)               2
+                cache miss                             3
+                files in cache                        12
+                """
+            ).encode(),
+        ]
+
+        self.assertThat(
+            cache.CompilerCache(launcher="ccache").get_stats(), Equals((7, 3))
+        )
+
+    def test_sccache(self):
+        self.fake_check_output.return_value = json.dumps(
+            {
+                "stats": {
+                    "cache_hits": {"counts": {"C/C++": 4, "Rust": 6}},
+                    "cache_misses": {"counts": {"Rust": 1}},
+                }
+            }
+        ).encode()
+
+        self.assertThat(
+            cache.CompilerCache(launcher="sccache").get_stats(), Equals((10, 1))
+        )
+
+    def test_unavailable(self):
+        self.fake_check_output.side_effect = FileNotFoundError()
+
+        self.assertThat(cache.CompilerCache(launcher="sccache").get_stats(), Is(None))
@@ -0,0 +1,130 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import fixtures
+from testtools.matchers import DirExists, Equals, Is, Not
+
+from snapcraft.internal import cache, errors
+from tests import unit
+
+
+def _write(path: str, content: str) -> None:
+    with open(path, "w") as f:
+        f.write(content)
+
+
+class GetLockfilesDigestTestCase(unit.TestCase):
+    def test_no_lockfiles(self):
+        self.assertThat(
+            cache.get_lockfiles_digest(["missing.lock"], extra=["foo"]), Is(None)
+        )
+
+    def test_digest(self):
+        _write("a.lock", "a")
+        _write("b.lock", "b")
+
+        digest = cache.get_lockfiles_digest(["a.lock", "b.lock", "missing.lock"])
+
+        self.expectThat(digest, Not(Is(None)))
+        self.expectThat(
+            cache.get_lockfiles_digest(["a.lock", "b.lock"]), Equals(digest)
+        )
+
+        _write("b.lock", "changed")
+        self.expectThat(
+            cache.get_lockfiles_digest(["a.lock", "b.lock"]), Not(Equals(digest))
+        )
+
+    def test_extra(self):
+        _write("a.lock", "a")
+
+        digest = cache.get_lockfiles_digest(["a.lock"], extra=["foo", "bar"])
+
+        self.expectThat(
+            cache.get_lockfiles_digest(["a.lock"], extra=["bar", "foo"]),
+            Equals(digest),
+        )
+        self.expectThat(
+            cache.get_lockfiles_digest(["a.lock"], extra=["foo"]), Not(Equals(digest))
+        )
+
+
+class DependencyCacheTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", None))
+        self.dependency_cache = cache.DependencyCache(ecosystem="npm")
+
+    def test_store_dir(self):
+        self.assertThat(
+            self.dependency_cache.store_dir,
+            Equals(
+                os.path.join(
+                    self.xdg_path, ".cache", "snapcraft", "dependencies", "npm", "store"
+                )
+            ),
+        )
+        self.assertThat(self.dependency_cache.store_dir, DirExists())
+
+    def test_fetch_records_lockfiles(self):
+        with self.dependency_cache.fetch(part_name="part", digest="1234") as offline:
+            self.assertThat(offline, Is(False))
+
+        self.assertThat(self.dependency_cache.has_lockfiles("1234"), Is(True))
+
+    def test_cached_fetch_is_not_offline(self):
+        self.dependency_cache.add_lockfiles("1234")
+
+        with self.dependency_cache.fetch(part_name="part", digest="1234") as offline:
+            self.assertThat(offline, Is(False))
+
+    def test_failed_fetch_does_not_record_lockfiles(self):
+        def fetch():
+            with self.dependency_cache.fetch(part_name="part", digest="1234"):
+                raise RuntimeError()
+
+        self.assertRaises(RuntimeError, fetch)
+
+        self.assertThat(self.dependency_cache.has_lockfiles("1234"), Is(False))
+
+    def test_fetch_without_lockfiles(self):
+        with self.dependency_cache.fetch(part_name="part", digest=None) as offline:
+            self.assertThat(offline, Is(False))
+
+    def test_offline(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        self.dependency_cache.add_lockfiles("1234")
+
+        with self.dependency_cache.fetch(part_name="part", digest="1234") as offline:
+            self.assertThat(offline, Is(True))
+
+        with self.dependency_cache.fetch(part_name="part", digest=None) as offline:
+            self.assertThat(offline, Is(True))
+
+    def test_offline_cache_miss(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+
+        def fetch():
+            with self.dependency_cache.fetch(part_name="part", digest="1234"):
+                pass
+
+        raised = self.assertRaises(errors.DependencyCacheMissError, fetch)
+
+        self.assertThat(raised.part_name, Equals("part"))
+        self.assertThat(raised.ecosystem, Equals("npm"))
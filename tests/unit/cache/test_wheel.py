@@ -0,0 +1,74 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from testtools.matchers import Equals, FileContains, Not
+
+from snapcraft.internal import cache
+from tests import unit
+
+
+class WheelCacheTestCase(unit.TestCase):
+    def test_cache_dir(self):
+        wheel_cache = cache.WheelCache(build_environment=dict(CFLAGS="-O2"))
+
+        self.expectThat(
+            os.path.dirname(wheel_cache.cache_dir),
+            Equals(os.path.join(self.xdg_path, ".cache", "snapcraft", "wheels")),
+        )
+        self.expectThat(
+            cache.WheelCache(build_environment=dict(CFLAGS="-O2")).cache_dir,
+            Equals(wheel_cache.cache_dir),
+        )
+        self.expectThat(
+            cache.WheelCache(build_environment=dict(CFLAGS="-O3")).cache_dir,
+            Not(Equals(wheel_cache.cache_dir)),
+        )
+        # Only the environment compilers are run with matters.
+        self.expectThat(
+            cache.WheelCache(
+                build_environment=dict(CFLAGS="-O2", HOME="/home/user")
+            ).cache_dir,
+            Equals(wheel_cache.cache_dir),
+        )
+
+    def test_add(self):
+        wheel_cache = cache.WheelCache(build_environment=dict())
+        wheel_name = "foo-1.0-cp36-cp36m-linux_x86_64.whl"
+        with open(wheel_name, "w") as wheel_file:
+            wheel_file.write("wheel")
+
+        wheel_cache.add(wheel_name)
+
+        self.assertThat(os.listdir(wheel_cache.cache_dir), Equals([wheel_name]))
+        self.assertThat(
+            os.path.join(wheel_cache.cache_dir, wheel_name), FileContains("wheel")
+        )
+
+    def test_add_keeps_cached_wheel(self):
+        wheel_cache = cache.WheelCache(build_environment=dict())
+        wheel_name = "foo-1.0-cp36-cp36m-linux_x86_64.whl"
+        with open(os.path.join(wheel_cache.cache_dir, wheel_name), "w") as wheel_file:
+            wheel_file.write("cached")
+        with open(wheel_name, "w") as wheel_file:
+            wheel_file.write("new")
+
+        wheel_cache.add(wheel_name)
+
+        self.assertThat(
+            os.path.join(wheel_cache.cache_dir, wheel_name), FileContains("cached")
+        )
@@ -14,6 +14,8 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
+
 import click
 from unittest import mock
 
@@ -36,6 +38,15 @@ class TestProviderOptions(unit.TestCase):
                 kwargs=dict(http_proxy="1.1.1.1", https_proxy="1.1.1.1"),
             ),
         ),
+        (
+            "host compiler cache",
+            dict(provider="host", kwargs=dict(compiler_cache="ccache")),
+        ),
+        ("host offline", dict(provider="host", kwargs=dict(offline=True))),
+        (
+            "host content digests",
+            dict(provider="host", kwargs=dict(content_digests=True)),
+        ),
         ("lxd empty", dict(provider="lxd", kwargs=dict())),
         ("lxd http proxy", dict(provider="lxd", kwargs=dict(http_proxy="1.1.1.1"))),
         ("lxd https proxy", dict(provider="lxd", kwargs=dict(https_proxy="1.1.1.1"))),
@@ -150,3 +161,29 @@ class TestInvalidBuildProviderFlags(unit.TestCase):
                 "invalid-provider",
                 **kwargs,
             )
+
+
+class TestApplyHostProviderFlags(unit.TestCase):
+    def test_compiler_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", None))
+        self.useFixture(fixtures.EnvironmentVariable("compiler_cache", None))
+
+        options.apply_host_provider_flags(dict(compiler_cache="sccache"))
+
+        self.assertThat(os.environ["SNAPCRAFT_COMPILER_CACHE"], Equals("sccache"))
+
+    def test_offline(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", None))
+        self.useFixture(fixtures.EnvironmentVariable("offline", None))
+
+        options.apply_host_provider_flags(dict(offline=True))
+
+        self.assertThat(os.environ["SNAPCRAFT_OFFLINE"], Equals("1"))
+
+    def test_content_digests(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_CONTENT_DIGESTS", None))
+        self.useFixture(fixtures.EnvironmentVariable("content_digests", None))
+
+        options.apply_host_provider_flags(dict(content_digests=True))
+
+        self.assertThat(os.environ["SNAPCRAFT_CONTENT_DIGESTS"], Equals("1"))
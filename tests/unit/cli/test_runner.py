@@ -0,0 +1,70 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+from testtools.matchers import Equals
+
+from snapcraft.cli._runner import command_groups
+from tests import unit
+
+
+class CommandGroupsTest(unit.TestCase):
+    def test_command_groups_registered(self):
+        for command_group, commands in command_groups.items():
+            module_name, group_name = command_group.split(":")
+            group = getattr(importlib.import_module(module_name), group_name)
+
+            self.assertThat(sorted(commands), Equals(sorted(group.commands)))
+
+
+class StartupImportsTest(unit.TestCase):
+    def test_startup_does_not_import_command_groups(self):
+        # snapcraftctl and snapcraft --version only need the entry point,
+        # anything else imported at startup slows down every call.
+        topdir = os.path.abspath(os.path.join(__file__, "..", "..", "..", ".."))
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import json, sys, snapcraft.cli.__main__; "
+                "print(json.dumps(sorted(sys.modules)))",
+            ],
+            cwd=topdir,
+        )
+        imported = set(json.loads(output.decode()))
+
+        for module in (
+            "apt",
+            "elftools",
+            "jsonschema",
+            "launchpadlib",
+            "lxml",
+            "pkg_resources",
+            "raven",
+            "requests",
+            "snapcraft.cli.lifecycle",
+            "snapcraft.cli.store",
+            "snapcraft.internal.build_providers",
+            "snapcraft.internal.repo",
+            "snapcraft.project",
+            "snapcraft.storeapi",
+        ):
+            self.assertNotIn(module, imported)
@@ -22,7 +22,7 @@ import fixtures
 from testtools.matchers import Contains, Equals, StartsWith
 
 from snapcraft.cli.help import _TOPICS
-from snapcraft.cli._runner import run
+from snapcraft.cli._runner import command_groups, run
 
 from . import CommandBaseTestCase
 
@@ -164,7 +164,9 @@ class TopicWithDevelTestCase(HelpCommandBaseTestCase):
 
 class TestHelpForCommand(HelpCommandBaseTestCase):
 
-    scenarios = [(c, dict(command=c)) for c in run.commands]
+    scenarios = [
+        (c, dict(command=c)) for commands in command_groups.values() for c in commands
+    ]
 
     def test_help_for_command(self):
         result = self.run_command(["help", self.command])
@@ -172,5 +174,6 @@ class TestHelpForCommand(HelpCommandBaseTestCase):
         # Verify that the first line of help text is correct
         # to ensure no name squatting takes place.
         self.assertThat(
-            result.output, Contains(run.commands[self.command].help.split("\n")[0])
+            result.output,
+            Contains(run.find_command(None, self.command).help.split("\n")[0]),
         )
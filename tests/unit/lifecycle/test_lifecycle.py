@@ -28,12 +28,14 @@ from testtools.matchers import (
     Equals,
     FileContains,
     FileExists,
+    Is,
     Not,
 )
 
 import snapcraft
 from snapcraft.internal import (
     errors,
+    jobserver,
     pluginhandler,
     lifecycle,
     project_loader,
@@ -92,6 +94,66 @@ class ExecutionTestCase(LifecycleTestBase):
             Contains("'part2' has dependencies that need to be staged: part1"),
         )
 
+    @mock.patch("snapcraft.repo.snaps.install_snaps")
+    @mock.patch("snapcraft.internal.repo.Repo.install_build_packages", return_value=[])
+    @mock.patch("snapcraft.internal.repo.check_for_command")
+    def test_build_reports_compiler_cache_stats(
+        self,
+        mock_check_for_command,
+        mock_install_build_packages,
+        mock_install_build_snaps,
+    ):
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", "ccache")
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.cache.CompilerCache.get_stats",
+                side_effect=[(10, 2), (15, 5)],
+            )
+        )
+        project_config = self.make_snapcraft_project(
+            textwrap.dedent(
+                """\
+                parts:
+                  part1:
+                    plugin: nil
+                """
+            )
+        )
+
+        lifecycle.execute(steps.BUILD, project_config)
+
+        mock_install_build_packages.assert_called_once_with({"ccache"})
+        mock_check_for_command.assert_called_once_with("ccache")
+        self.assertThat(
+            self.fake_logger.output,
+            Contains("Compiler cache (ccache) for part 'part1': 5 hits, 3 misses"),
+        )
+
+    @mock.patch("snapcraft.repo.snaps.install_snaps")
+    def test_build_does_not_share_jobserver_with_scriptlets(
+        self, mock_install_build_snaps
+    ):
+        project_config = self.make_snapcraft_project(
+            textwrap.dedent(
+                """\
+                parts:
+                  part1:
+                    plugin: nil
+                    override-build: echo "$MAKEFLAGS" > $SNAPCRAFT_PART_INSTALL/flags
+                """
+            )
+        )
+
+        lifecycle.execute(steps.BUILD, project_config)
+
+        self.assertThat(
+            os.path.join("parts", "part1", "install", "flags"),
+            FileContains(matcher=Not(Contains("--jobserver-auth="))),
+        )
+        self.assertThat(jobserver.get_jobserver(), Is(None))
+
     @mock.patch("snapcraft.repo.snaps.install_snaps")
     def test_no_exception_when_dependency_is_required_but_already_staged(
         self, mock_install_build_snaps
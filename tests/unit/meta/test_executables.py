@@ -0,0 +1,126 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest import mock
+
+from testtools.matchers import Equals, Is
+
+from snapcraft.internal.meta import command
+from snapcraft.internal.meta._executables import ExecutableIndex
+from tests import unit
+
+
+def _create_file(file_path: str, *, content="", mode=0o755) -> None:
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w") as f:
+        f.write(content)
+    os.chmod(file_path, mode)
+
+
+class ExecutableIndexTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.prime_dir = os.path.join(self.path, "prime")
+        _create_file(os.path.join(self.prime_dir, "opt", "ros", "bin", "roslaunch"))
+        _create_file(os.path.join(self.prime_dir, "opt", "data", "foo"), mode=0o644)
+        _create_file(os.path.join(self.prime_dir, "usr", "lib", "foo"))
+        _create_file(
+            os.path.join(self.prime_dir, "bin", "script"),
+            content="#!/usr/bin/env python3 -u\nprint()\n",
+        )
+        os.makedirs(os.path.join(self.prime_dir, "opt", "dir"))
+
+        self.index = ExecutableIndex(self.prime_dir)
+
+    def test_is_executable(self):
+        self.expectThat(
+            self.index.is_executable(os.path.join(self.prime_dir, "usr", "lib", "foo")),
+            Is(True),
+        )
+        self.expectThat(
+            self.index.is_executable(
+                os.path.join(self.prime_dir, "opt", "data", "foo")
+            ),
+            Is(False),
+        )
+        self.expectThat(
+            self.index.is_executable(os.path.join(self.prime_dir, "opt", "dir")),
+            Is(False),
+        )
+        self.expectThat(
+            self.index.is_executable(os.path.join(self.prime_dir, "missing")),
+            Is(False),
+        )
+
+    def test_missing_paths_are_not_cached(self):
+        path = os.path.join(self.prime_dir, "new")
+        self.assertThat(self.index.exists(path), Is(False))
+
+        _create_file(path)
+
+        self.assertThat(self.index.exists(path), Is(True))
+
+    def test_find_walks_once(self):
+        with mock.patch("os.walk", side_effect=os.walk) as walk_mock:
+            self.expectThat(
+                self.index.find("roslaunch"),
+                Equals(os.path.join(self.prime_dir, "opt", "ros", "bin", "roslaunch")),
+            )
+            self.expectThat(
+                self.index.find("foo"),
+                Equals(os.path.join(self.prime_dir, "usr", "lib", "foo")),
+            )
+            self.expectThat(
+                self.index.find("ros/bin/roslaunch"),
+                Equals(os.path.join(self.prime_dir, "opt", "ros", "bin", "roslaunch")),
+            )
+            self.expectThat(self.index.find("missing"), Is(None))
+
+        self.assertThat(walk_mock.call_count, Equals(1))
+
+    def test_read_shebang_once(self):
+        script_path = os.path.join(self.prime_dir, "bin", "script")
+        no_shebang_path = os.path.join(self.prime_dir, "usr", "lib", "foo")
+
+        self.expectThat(
+            self.index.read_shebang(script_path), Equals(b"/usr/bin/env python3 -u")
+        )
+        self.expectThat(self.index.read_shebang(no_shebang_path), Is(None))
+
+        with mock.patch("builtins.open") as open_mock:
+            self.index.read_shebang(script_path)
+            self.index.read_shebang(no_shebang_path)
+        open_mock.assert_not_called()
+
+    def test_commands_share_index(self):
+        commands = [
+            command.Command(app_name=name, command_name="command", command=binary)
+            for name, binary in [("ros", "roslaunch"), ("script", "script")]
+        ]
+
+        with mock.patch("os.walk", side_effect=os.walk) as walk_mock:
+            for cmd in commands:
+                cmd.prime_command(
+                    can_use_wrapper=True,
+                    prime_dir=self.prime_dir,
+                    executable_index=self.index,
+                )
+
+        self.expectThat(commands[0].command, Equals("opt/ros/bin/roslaunch"))
+        self.expectThat(commands[1].command, Equals("bin/script"))
+        self.assertThat(walk_mock.call_count, Equals(1))
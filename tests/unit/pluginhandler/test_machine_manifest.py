@@ -0,0 +1,107 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import subprocess
+
+import fixtures
+from testtools.matchers import Equals
+
+from snapcraft.internal.pluginhandler import _machine_manifest
+from tests import unit
+
+
+class MachineManifestTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        with open("boot_id", "w") as boot_id_file:
+            print("boot-id", file=boot_id_file)
+        open("status", "w").close()
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.pluginhandler._machine_manifest._BOOT_ID_PATH",
+                os.path.abspath("boot_id"),
+            )
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.pluginhandler._machine_manifest._DPKG_STATUS_PATH",
+                os.path.abspath("status"),
+            )
+        )
+
+        self.fake_check_output = self.useFixture(
+            fixtures.MockPatch("subprocess.check_output", return_value=b"Linux 4.10\n")
+        ).mock
+        self.fake_installed_packages = self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.repo.Repo.get_installed_packages",
+                return_value=["patchelf=0.9", "apt=1.6"],
+            )
+        ).mock
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.repo.snaps.get_installed_snaps",
+                return_value=["core18=10"],
+            )
+        )
+
+    def test_get_collects_once(self):
+        machine_manifest = _machine_manifest.MachineManifest()
+        machine_manifest.prefetch()
+
+        manifest = machine_manifest.get()
+        manifest["installed-snaps"].append("modified=1")
+
+        self.assertThat(
+            machine_manifest.get(),
+            Equals(
+                {
+                    "uname": "Linux 4.10",
+                    "installed-packages": ["apt=1.6", "patchelf=0.9"],
+                    "installed-snaps": ["core18=10"],
+                }
+            ),
+        )
+        self.assertThat(self.fake_check_output.call_count, Equals(1))
+        self.assertThat(self.fake_installed_packages.call_count, Equals(1))
+
+    def test_uname_error(self):
+        self.fake_check_output.side_effect = subprocess.CalledProcessError(1, "uname")
+
+        self.assertThat(_machine_manifest.MachineManifest().get(), Equals({}))
+
+    def test_installed_packages_cached_until_dpkg_changes(self):
+        for _ in range(2):
+            self.assertThat(
+                _machine_manifest.MachineManifest().get()["installed-packages"],
+                Equals(["apt=1.6", "patchelf=0.9"]),
+            )
+        self.assertThat(self.fake_installed_packages.call_count, Equals(1))
+
+        status_mtime = os.stat("status").st_mtime
+        os.utime("status", (status_mtime + 1, status_mtime + 1))
+        _machine_manifest.MachineManifest().get()
+        self.assertThat(self.fake_installed_packages.call_count, Equals(2))
+
+    def test_installed_packages_not_cached_without_boot_id(self):
+        os.remove("boot_id")
+
+        _machine_manifest.MachineManifest().get()
+        _machine_manifest.MachineManifest().get()
+
+        self.assertThat(self.fake_installed_packages.call_count, Equals(2))
@@ -22,10 +22,17 @@ import stat
 import tempfile
 from collections import OrderedDict
 from textwrap import dedent
-from unittest.mock import call, Mock, MagicMock, patch
+from unittest.mock import ANY, call, Mock, MagicMock, patch
 
 import fixtures
-from testtools.matchers import Contains, Equals, FileExists, MatchesRegex, Not
+from testtools.matchers import (
+    Contains,
+    Equals,
+    FileContains,
+    FileExists,
+    MatchesRegex,
+    Not,
+)
 
 import snapcraft
 from . import mocks
@@ -434,7 +441,7 @@ class PluginTestCase(unit.TestCase):
         handler = self.load_part("test-part")
         handler.build()
         mock_organize.assert_called_once_with(
-            "test-part", {}, handler.plugin.installdir, False
+            "test-part", {}, handler.plugin.installdir, False, ANY
         )
 
     @patch("snapcraft.internal.pluginhandler._organize_filesets")
@@ -450,7 +457,7 @@ class PluginTestCase(unit.TestCase):
         handler.makedirs()
         handler.update_build()
         mock_organize.assert_called_once_with(
-            "test-part", {}, handler.plugin.installdir, True
+            "test-part", {}, handler.plugin.installdir, True, ANY
         )
 
 
@@ -656,6 +663,34 @@ class OrganizeTestCase(unit.TestCase):
                 expected_overwrite=[(["bar"], "")],
             ),
         ),
+        (
+            "overwrite_existing_file_in_directory",
+            dict(
+                setup_dirs=["bin", os.path.join("usr", "bin")],
+                setup_files=[
+                    os.path.join("bin", "foo"),
+                    os.path.join("usr", "bin", "foo"),
+                ],
+                organize_set={"bin/foo": "usr/bin/"},
+                expected=errors.SnapcraftOrganizeError,
+                expected_message=".*trying to organize file 'bin/foo' to 'usr/bin/foo', but 'usr/bin/foo' already exists.*",
+                expected_overwrite=[([], "bin"), (["foo"], os.path.join("usr", "bin"))],
+            ),
+        ),
+        (
+            "*_overwrite_existing_file_in_directory",
+            dict(
+                setup_dirs=["bin", os.path.join("usr", "bin")],
+                setup_files=[
+                    os.path.join("bin", "foo"),
+                    os.path.join("usr", "bin", "foo"),
+                ],
+                organize_set={"bin/*": "usr/bin/"},
+                expected=errors.SnapcraftOrganizeError,
+                expected_message=".*trying to organize file 'bin/\\*' to 'usr/bin/foo', but 'usr/bin/foo' already exists.*",
+                expected_overwrite=[([], "bin"), (["foo"], os.path.join("usr", "bin"))],
+            ),
+        ),
         (
             "*_for_files",
             dict(
@@ -765,6 +800,96 @@ class OrganizeTestCase(unit.TestCase):
         self._organize_and_assert(True)
 
 
+class OrganizeJournalTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.base_dir = "install"
+        self.journal = pluginhandler._organize.OrganizeJournal(
+            os.path.join("part", "organize.json")
+        )
+
+    def _write(self, path, content):
+        path = os.path.join(self.base_dir, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def _organize(self, organize_set, overwrite):
+        return pluginhandler._organize_filesets(
+            "part-name", organize_set, self.base_dir, overwrite, self.journal
+        )
+
+    def test_directory_is_renamed(self):
+        self._write(os.path.join("usr", "lib", "foo"), "foo")
+        inode = os.stat(os.path.join(self.base_dir, "usr", "lib", "foo")).st_ino
+
+        moves = self._organize({"usr/lib": "lib"}, False)
+
+        self.assertThat(moves, Equals([(os.path.join("usr", "lib"), "lib")]))
+        self.assertThat(
+            os.stat(os.path.join(self.base_dir, "lib", "foo")).st_ino, Equals(inode)
+        )
+        self.assertThat(os.listdir(os.path.join(self.base_dir, "usr")), Equals([]))
+        self.assertThat(
+            self.journal.load(), Equals({"usr/lib": [os.path.join("lib", "foo")]})
+        )
+
+    def test_overwrite_only_touches_changed_files(self):
+        self._write(os.path.join("usr", "lib", "unchanged"), "unchanged")
+        self._write(os.path.join("usr", "lib", "changed"), "old")
+        self._write(os.path.join("usr", "lib", "removed"), "removed")
+        self._write("other", "other")
+        self._organize({"usr/lib": "lib", "other": "lib/other"}, False)
+        unchanged_path = os.path.join(self.base_dir, "lib", "unchanged")
+        unchanged_inode = os.stat(unchanged_path).st_ino
+
+        # An update installs the files again.
+        self._write(os.path.join("usr", "lib", "unchanged"), "unchanged")
+        self._write(os.path.join("usr", "lib", "changed"), "new")
+        self._organize({"usr/lib": "lib", "other": "lib/other"}, True)
+
+        self.assertThat(
+            sorted(os.listdir(os.path.join(self.base_dir, "lib"))),
+            Equals(["changed", "other", "unchanged"]),
+        )
+        self.assertThat(os.stat(unchanged_path).st_ino, Equals(unchanged_inode))
+        self.assertThat(
+            os.path.join(self.base_dir, "lib", "changed"), FileContains("new")
+        )
+        self.assertThat(os.listdir(os.path.join(self.base_dir, "usr")), Equals([]))
+
+    def test_overwrite_keeps_files_not_installed_again(self):
+        self._write("foo", "foo")
+        self._write("bar", "bar")
+        self._organize({"foo": "bin/foo", "bar": "bin/bar"}, False)
+
+        self._write("foo", "new")
+        self._organize({"foo": "bin/foo", "bar": "bin/bar"}, True)
+
+        self.assertThat(os.path.join(self.base_dir, "bin", "foo"), FileContains("new"))
+        self.assertThat(os.path.join(self.base_dir, "bin", "bar"), FileContains("bar"))
+        self.assertThat(
+            self.journal.load(),
+            Equals(
+                {
+                    "bar": [os.path.join("bin", "bar")],
+                    "foo": [os.path.join("bin", "foo")],
+                }
+            ),
+        )
+
+    def test_overwrite_globbed_directory_without_journal(self):
+        self._write(os.path.join("dir1", "foo"), "foo")
+        self._write(os.path.join("dir", "dir1", "stale"), "stale")
+
+        self._organize({"dir1*": "dir/"}, True)
+
+        self.assertThat(
+            os.listdir(os.path.join(self.base_dir, "dir", "dir1")), Equals(["foo"])
+        )
+
+
 class RealStageTestCase(unit.TestCase):
     def make_snapcraft_project(self):
         snapcraft_yaml_file_path = self.make_snapcraft_yaml(
@@ -977,12 +1102,6 @@ class StateBaseTestCase(unit.TestCase):
         self.get_elf_files_mock.return_value = frozenset()
         self.addCleanup(patcher.stop)
 
-        self.useFixture(
-            fixtures.MockPatch(
-                "snapcraft.internal.xattrs.read_origin_stage_package", return_value=None
-            )
-        )
-
 
 class PullStateTestCase(StateBaseTestCase):
     def test_pull_build_packages_without_grammar_properties(self):
@@ -1595,6 +1714,38 @@ class StateTestCase(StateBaseTestCase):
         self.assertTrue(type(state.project_options) is OrderedDict)
         self.assertThat(len(state.project_options), Equals(0))
 
+    def test_prime_state_with_stage_packages(self):
+        fake_repo = Mock()
+        fake_repo.unpack.return_value = {
+            "bin/1": "foo=1.0",
+            "lib/2": "bar=1.0",
+            "share/3": "baz=1.0",
+        }
+        self.handler = self.load_part(
+            "test_part",
+            part_properties={
+                "stage-packages": ["foo", "bar", "baz"],
+                "organize": {"lib/2": "bin/2"},
+                "prime": ["bin"],
+            },
+            stage_packages_repo=fake_repo,
+        )
+        self.handler.makedirs()
+        for path in fake_repo.unpack.return_value:
+            path = os.path.join(self.handler.plugin.installdir, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+        self.handler.prepare_build()
+        self.handler.build()
+        self.handler.stage()
+        self.handler.prime()
+
+        self.assertThat(
+            self.handler.get_prime_state().primed_stage_packages,
+            Equals({"foo=1.0", "bar=1.0"}),
+        )
+
     def test_prime_state_with_scriptlet_metadata(self):
         self.handler = self.load_part(
             "test_part",
@@ -2294,6 +2445,94 @@ class IsOutdatedTest(unit.TestCase):
         )
 
 
+class IsOutdatedContentDigestsTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_CONTENT_DIGESTS", "1"))
+        self.handler = self.load_part("test-part", part_properties=dict(source="."))
+        self.handler.makedirs()
+
+    def _mark_later(self, step, reference_step):
+        reference_stat = os.stat(
+            states.get_step_state_file(self.handler.plugin.statedir, reference_step)
+        )
+        os.utime(
+            states.get_step_state_file(self.handler.plugin.statedir, step),
+            (reference_stat.st_atime, reference_stat.st_mtime + 1),
+        )
+
+    def _write_source(self, content):
+        with open(os.path.join(self.handler.plugin.sourcedir, "file"), "w") as f:
+            f.write(content)
+
+    def test_pull_is_not_outdated_by_timestamps(self):
+        with open("file", "w") as f:
+            f.write("1")
+        self.handler.source_handler.pull()
+        self.handler.mark_pull_done()
+
+        # Checkouts reset timestamps without changing content.
+        pull_state_path = states.get_step_state_file(
+            self.handler.plugin.statedir, steps.PULL
+        )
+        modify_time = os.stat(pull_state_path).st_mtime + 1
+        os.utime("file", (modify_time, modify_time))
+
+        self.assertFalse(
+            self.handler.is_outdated(steps.PULL), "Pull step was unexpectedly outdated"
+        )
+
+    def test_build_is_outdated_when_pull_content_changed(self):
+        self._write_source("1")
+        self.handler.mark_pull_done()
+        self.handler.mark_build_done()
+
+        self.handler.mark_pull_done()
+        self._mark_later(steps.PULL, steps.BUILD)
+
+        self.assertFalse(
+            self.handler.is_outdated(steps.BUILD),
+            "Build step was unexpectedly outdated",
+        )
+
+        self._write_source("2")
+        self.handler.mark_pull_done()
+        self._mark_later(steps.PULL, steps.BUILD)
+
+        self.assertThat(
+            self.handler.get_outdated_report(steps.BUILD).previous_step_modified,
+            Equals(steps.PULL),
+        )
+
+    def test_stage_is_not_outdated_by_steps_before_build(self):
+        self._write_source("1")
+        self.handler.mark_pull_done()
+        self.handler.mark_build_done()
+        self.handler.mark_stage_done(set(), set())
+
+        self._write_source("2")
+        self.handler.mark_pull_done()
+        self._mark_later(steps.PULL, steps.STAGE)
+
+        self.assertFalse(
+            self.handler.is_outdated(steps.STAGE),
+            "Stage step was unexpectedly outdated",
+        )
+
+    def test_outdated_without_recorded_digests(self):
+        self.handler.mark_build_done()
+        pull_state_path = states.get_step_state_file(
+            self.handler.plugin.statedir, steps.PULL
+        )
+        open(pull_state_path, "w").close()
+        self._mark_later(steps.PULL, steps.BUILD)
+
+        self.assertTrue(
+            self.handler.is_outdated(steps.BUILD), "Expected build step to be outdated"
+        )
+
+
 class CleanBaseTestCase(unit.TestCase):
     def clear_common_directories(self):
         if os.path.exists(self.parts_dir):
@@ -16,11 +16,12 @@
 
 import functools
 import os
+import selectors
 import subprocess
 from textwrap import dedent
 
 from unittest import mock
-from testtools.matchers import Contains, FileContains, FileExists
+from testtools.matchers import Contains, Equals, FileContains, FileExists, HasLength
 
 from snapcraft.internal import errors
 from snapcraft.internal.pluginhandler import _runner
@@ -196,6 +197,45 @@ class RunnerTestCase(unit.TestCase):
 
         self.assertThat(os.path.join("primedir", "fake-prime"), FileExists())
 
+    def test_multiple_builtin_function_calls(self):
+        os.mkdir("builddir")
+
+        calls = []
+
+        runner = _runner.Runner(
+            part_properties={
+                "override-build": "snapcraftctl build\nsnapcraftctl build"
+            },
+            sourcedir="sourcedir",
+            builddir="builddir",
+            stagedir="stagedir",
+            primedir="primedir",
+            builtin_functions={"build": lambda: calls.append("build")},
+        )
+
+        runner.build()
+
+        self.assertThat(calls, Equals(["build", "build"]))
+
+
+class ProcessExitWatcherTestCase(unit.TestCase):
+    def _assert_exit_detected(self):
+        process = subprocess.Popen(["sh", "-c", "exit 3"])
+
+        with _runner._ProcessExitWatcher(process) as watcher:
+            with selectors.DefaultSelector() as selector:
+                selector.register(watcher.fileno(), selectors.EVENT_READ)
+                self.assertThat(selector.select(timeout=10), HasLength(1))
+
+            self.assertThat(watcher.returncode, Equals(3))
+
+    def test_exit_detected(self):
+        self._assert_exit_detected()
+
+    def test_exit_detected_without_pidfd(self):
+        with mock.patch("os.pidfd_open", side_effect=AttributeError, create=True):
+            self._assert_exit_detected()
+
 
 class RunnerFailureTestCase(unit.TestCase):
     def test_failure_on_last_script_command_results_in_failure(self):
@@ -0,0 +1,89 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+from testtools.matchers import Equals
+
+from snapcraft.internal.pluginhandler import _organize_filesets
+from snapcraft.internal.pluginhandler._stage_package_origins import StagePackageOrigins
+from tests import unit
+
+
+class StagePackageOriginsTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.origins = StagePackageOrigins(os.path.join("ubuntu", "origins.json"))
+        self.origins.save(
+            {
+                "usr/bin/foo": "foo=1.0",
+                "usr/lib/libbar.so": "bar=1.0",
+                "usr/lib/bar/data": "bar=1.0",
+                "usr/share/doc/baz": "baz=1.0",
+            }
+        )
+
+    def test_load_missing(self):
+        self.assertThat(StagePackageOrigins("missing.json").load(), Equals({}))
+
+    def test_get_packages(self):
+        self.assertThat(
+            self.origins.get_packages({"usr/bin/foo", "usr/lib/bar/data", "bin/own"}),
+            Equals({"foo=1.0", "bar=1.0"}),
+        )
+
+    def test_organize(self):
+        self.origins.organize(
+            [("usr/bin/foo", "bin/foo"), ("usr/lib", "lib"), ("lib/bar", "bar")]
+        )
+
+        self.assertThat(
+            self.origins.load(),
+            Equals(
+                {
+                    "bin/foo": "foo=1.0",
+                    "lib/libbar.so": "bar=1.0",
+                    "bar/data": "bar=1.0",
+                    "usr/share/doc/baz": "baz=1.0",
+                }
+            ),
+        )
+
+    def test_organize_follows_organize_filesets(self):
+        for path in self.origins.load():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+        moves = _organize_filesets(
+            "part-name",
+            {"usr/bin/*": "bin/", "usr/lib": "lib", "usr/share/doc/baz": "baz"},
+            self.path,
+            False,
+        )
+        self.origins.organize(moves)
+
+        self.assertThat(
+            self.origins.load(),
+            Equals(
+                {
+                    "bin/foo": "foo=1.0",
+                    "lib/libbar.so": "bar=1.0",
+                    "lib/bar/data": "bar=1.0",
+                    "baz": "baz=1.0",
+                }
+            ),
+        )
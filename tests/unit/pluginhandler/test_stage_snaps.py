@@ -0,0 +1,108 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest import mock
+
+from testtools.matchers import Equals, FileExists, HasLength
+
+from snapcraft.internal import pluginhandler, sources
+from snapcraft.internal.repo import errors
+from tests import unit
+
+
+class StageSnapsPipelineTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        data_path = os.path.join(os.path.dirname(unit.__file__), "..", "data")
+        self.fake_snap_command.download_snaps = {
+            "basic": (os.path.join(data_path, "test-snap.snap"), "1")
+        }
+        self.channels = {
+            "latest/stable": {"confinement": "strict"},
+            "latest/edge": {"confinement": "strict"},
+        }
+        self.fake_snapd.find_result = [{"basic": {"channels": self.channels}}]
+
+        patcher = mock.patch(
+            "snapcraft.internal.sources.Snap.provision",
+            autospec=True,
+            side_effect=sources.Snap.provision,
+        )
+        self.provision_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_fetch_extracts_revision_once(self):
+        pipeline = pluginhandler.StageSnapsPipeline()
+
+        entries = pipeline.fetch(["basic", "basic/latest/edge"])
+
+        self.assertThat(set(entries.values()), HasLength(1))
+        self.assertThat(self.fake_snap_command.calls, HasLength(2))
+        self.assertThat(self.provision_mock.call_count, Equals(1))
+        entry_path = entries["basic"]
+        self.assertThat(os.path.basename(entry_path), Equals("basic_1"))
+        self.assertThat(
+            os.path.join(entry_path, "tree", "meta.basic", "snap.yaml"), FileExists()
+        )
+
+        # Fetching again is served from memory.
+        self.assertThat(pipeline.fetch(["basic"]), Equals({"basic": entry_path}))
+        self.assertThat(self.fake_snap_command.calls, HasLength(2))
+
+    def test_fetch_known_revision_from_cache(self):
+        pluginhandler.StageSnapsPipeline().fetch(["basic"])
+        self.fake_snap_command.calls.clear()
+        for channel in self.channels.values():
+            channel["revision"] = "1"
+
+        pluginhandler.StageSnapsPipeline().fetch(["basic/latest/edge"])
+
+        self.assertThat(self.fake_snap_command.calls, Equals([]))
+        self.assertThat(self.provision_mock.call_count, Equals(1))
+
+    def test_fetch_unavailable(self):
+        self.assertRaises(
+            errors.SnapUnavailableError,
+            pluginhandler.StageSnapsPipeline().fetch,
+            ["basic/latest/beta"],
+        )
+
+    def test_provision(self):
+        pipeline = pluginhandler.StageSnapsPipeline()
+        os.makedirs("snaps")
+
+        pipeline.provision(["basic"], snaps_dir="snaps", dst="install")
+        pipeline.provision(["basic/latest/edge"], snaps_dir="snaps", dst="install2")
+
+        self.assertThat(os.path.join("snaps", "basic_1.snap"), FileExists())
+        self.assertThat(os.path.join("snaps", "basic_1.assert"), FileExists())
+        for dst in ("install", "install2"):
+            self.assertThat(os.path.join(dst, "meta.basic", "snap.yaml"), FileExists())
+        self.assertThat(self.provision_mock.call_count, Equals(1))
+
+    def test_provision_does_not_link_the_cache(self):
+        pipeline = pluginhandler.StageSnapsPipeline()
+        os.makedirs("snaps")
+
+        pipeline.provision(["basic"], snaps_dir="snaps", dst="install")
+
+        for path in (
+            os.path.join("snaps", "basic_1.snap"),
+            os.path.join("install", "meta.basic", "snap.yaml"),
+        ):
+            self.assertThat(os.stat(path).st_nlink, Equals(1))
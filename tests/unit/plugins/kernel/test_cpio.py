@@ -0,0 +1,103 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import gzip
+import io
+import os
+import subprocess
+
+from testtools.matchers import Equals
+
+from snapcraft.plugins import _kernel
+from tests import unit
+
+
+def _read_newc(archive):
+    entries = []
+    while True:
+        header = archive.read(110)
+        assert header[:6] == b"070701"
+        fields = [int(header[6 + i * 8 : 14 + i * 8], 16) for i in range(13)]
+        mode, size, namesize = fields[1], fields[6], fields[11]
+        name = archive.read(namesize)[:-1].decode()
+        archive.read(-(110 + namesize) % 4)
+        data = archive.read(size)
+        archive.read(-size % 4)
+        if name == "TRAILER!!!":
+            return entries
+        entries.append((name, mode, fields[2], data))
+
+
+class WriteNewcTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs(os.path.join("root", "lib", "modules"))
+        with open(os.path.join("root", "lib", "modules", "modules.dep"), "w") as f:
+            f.write("a.ko:\n")
+        os.symlink("lib", os.path.join("root", "usr"))
+        with open(os.path.join("root", "init"), "wb") as f:
+            f.write(b"\0" * 3)
+        os.chmod(os.path.join("root", "init"), 0o755)
+
+    def test_write_newc(self):
+        archive = io.BytesIO()
+
+        _kernel.write_newc("root", archive)
+
+        archive.seek(0)
+        entries = _read_newc(archive)
+        self.assertThat(
+            [(name, oct(mode), uid, data) for name, mode, uid, data in entries],
+            Equals(
+                [
+                    (".", oct(0o40000 | os.stat("root").st_mode & 0o7777), 0, b""),
+                    ("init", "0o100755", 0, b"\0" * 3),
+                    ("lib", oct(os.stat("root/lib").st_mode), 0, b""),
+                    ("usr", oct(os.lstat("root/usr").st_mode), 0, b"lib"),
+                    ("lib/modules", oct(os.stat("root/lib/modules").st_mode), 0, b""),
+                    (
+                        "lib/modules/modules.dep",
+                        oct(os.stat("root/lib/modules/modules.dep").st_mode),
+                        0,
+                        b"a.ko:\n",
+                    ),
+                ]
+            ),
+        )
+        self.assertThat(len(archive.getvalue()) % 4, Equals(0))
+
+    def test_write_initrd(self):
+        _kernel.write_initrd("root", "initrd.img", compression_cmd=["gzip", "-c"])
+
+        with gzip.open("initrd.img") as archive:
+            names = [name for name, _, _, _ in _read_newc(archive)]
+
+        self.assertThat(
+            names,
+            Equals(
+                [".", "init", "lib", "usr", "lib/modules", "lib/modules/modules.dep"]
+            ),
+        )
+
+    def test_write_initrd_compressor_fails(self):
+        self.assertRaises(
+            subprocess.CalledProcessError,
+            _kernel.write_initrd,
+            "root",
+            "initrd.img",
+            compression_cmd=["false"],
+        )
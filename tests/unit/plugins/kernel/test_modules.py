@@ -0,0 +1,171 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from textwrap import dedent
+
+from testtools.matchers import Equals, HasLength
+
+from snapcraft.plugins import _kernel
+from tests import unit
+
+
+class ModulesDepTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.modules_path = os.path.join("install", "lib", "modules", "4.4")
+        os.makedirs(self.modules_path)
+        self.write(
+            "modules.dep",
+            """\
+            kernel/fs/squashfs/squashfs.ko: kernel/lib/xz/xz_dec.ko
+            kernel/lib/xz/xz_dec.ko:
+            kernel/fs/fat/vfat.ko: kernel/fs/fat/fat.ko
+            kernel/fs/fat/fat.ko:
+            kernel/fs/nls/nls_cp437.ko:
+            kernel/drivers/usb/storage/usb-storage.ko.xz:
+            kernel/crypto/crc32c_generic.ko:
+            kernel/fs/ext4/ext4.ko: kernel/fs/mbcache.ko kernel/fs/jbd2/jbd2.ko
+            kernel/fs/mbcache.ko:
+            kernel/fs/jbd2/jbd2.ko:
+            """,
+        )
+
+    def write(self, name, content):
+        with open(os.path.join(self.modules_path, name), "w") as f:
+            f.write(dedent(content))
+
+    def get_module_paths(self, modules):
+        modules_dep = _kernel.ModulesDep(root="install", kernel_release="4.4")
+        return sorted(
+            os.path.relpath(p, self.modules_path)
+            for p in modules_dep.get_module_paths(modules)
+        )
+
+    def test_dependencies(self):
+        self.assertThat(
+            self.get_module_paths(["squashfs", "vfat"]),
+            Equals(
+                [
+                    "kernel/fs/fat/fat.ko",
+                    "kernel/fs/fat/vfat.ko",
+                    "kernel/fs/squashfs/squashfs.ko",
+                    "kernel/lib/xz/xz_dec.ko",
+                ]
+            ),
+        )
+
+    def test_shared_dependencies(self):
+        self.assertThat(
+            self.get_module_paths(["vfat", "fat"]),
+            Equals(["kernel/fs/fat/fat.ko", "kernel/fs/fat/vfat.ko"]),
+        )
+
+    def test_dashes_and_underscores(self):
+        self.assertThat(
+            self.get_module_paths(["usb_storage", "nls-cp437"]),
+            Equals(
+                [
+                    "kernel/drivers/usb/storage/usb-storage.ko.xz",
+                    "kernel/fs/nls/nls_cp437.ko",
+                ]
+            ),
+        )
+
+    def test_alias(self):
+        self.write(
+            "modules.alias",
+            """\
+            # Aliases extracted from modules themselves.
+            alias crc32c crc32c_generic
+            alias fs-ext* ext4
+            """,
+        )
+
+        self.assertThat(
+            self.get_module_paths(["crc32c", "fs-ext4"]),
+            Equals(
+                [
+                    "kernel/crypto/crc32c_generic.ko",
+                    "kernel/fs/ext4/ext4.ko",
+                    "kernel/fs/jbd2/jbd2.ko",
+                    "kernel/fs/mbcache.ko",
+                ]
+            ),
+        )
+
+    def test_softdep(self):
+        self.write(
+            "modules.softdep",
+            """\
+            # Soft dependencies extracted from modules themselves.
+            softdep ext4 pre: crc32c_generic post: missing
+            """,
+        )
+
+        self.assertThat(
+            self.get_module_paths(["ext4"]),
+            Equals(
+                [
+                    "kernel/crypto/crc32c_generic.ko",
+                    "kernel/fs/ext4/ext4.ko",
+                    "kernel/fs/jbd2/jbd2.ko",
+                    "kernel/fs/mbcache.ko",
+                ]
+            ),
+        )
+
+    def test_builtin(self):
+        self.write("modules.builtin", "kernel/fs/overlayfs/overlay.ko\n")
+
+        self.assertThat(self.get_module_paths(["overlay"]), Equals([]))
+
+    def test_not_found(self):
+        raised = self.assertRaises(
+            _kernel.errors.KernelModuleNotFoundError,
+            self.get_module_paths,
+            ["missing"],
+        )
+
+        self.assertThat(raised.module, Equals("missing"))
+        self.assertThat(raised.kernel_release, Equals("4.4"))
+
+    def test_modules_dep_not_found(self):
+        os.remove(os.path.join(self.modules_path, "modules.dep"))
+
+        raised = self.assertRaises(
+            _kernel.errors.KernelModulesDepNotFoundError,
+            _kernel.ModulesDep,
+            root="install",
+            kernel_release="4.4",
+        )
+
+        self.assertThat(raised.kernel_release, Equals("4.4"))
+
+    def test_many_modules(self):
+        # A chain of dependencies as long as the ones of large initrds.
+        self.write(
+            "modules.dep",
+            "".join(
+                "kernel/m{}.ko: {}\n".format(
+                    i, " ".join("kernel/m{}.ko".format(d) for d in range(i))
+                )
+                for i in range(500)
+            ),
+        )
+
+        self.assertThat(self.get_module_paths(["m499", "m250"]), HasLength(500))
@@ -20,8 +20,10 @@ import subprocess
 import fixtures
 from unittest import mock
 
-from testtools.matchers import Contains, Equals, HasLength
+from testtools.matchers import Contains, Equals, FileExists, HasLength, Not
 
+from snapcraft.internal import cache
+from snapcraft.internal import errors as snapcraft_errors
 from snapcraft.plugins._python import _pip, errors
 
 from ._basesuite import PythonBaseTestCase
@@ -457,7 +459,14 @@ class PipDownloadTest(PipCommandBaseTestCase):
     ]
 
     def _assert_mock_run_with(self, *args, **kwargs):
-        common_args = ["download", "--disable-pip-version-check", "--dest", mock.ANY]
+        common_args = [
+            "download",
+            "--disable-pip-version-check",
+            "--dest",
+            mock.ANY,
+            "--find-links",
+            mock.ANY,
+        ]
         common_args.extend(*args)
         self.mock_run.assert_called_once_with(common_args, **kwargs)
 
@@ -470,6 +479,96 @@ class PipDownloadTest(PipCommandBaseTestCase):
         self._assert_mock_run_with(self.expected_args, **self.expected_kwargs)
 
 
+class PipDownloadCacheTest(PipCommandBaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.store_dir = cache.DependencyCache(ecosystem="pip").store_dir
+        with open("requirements.txt", "w") as requirements_file:
+            print("foo==1.0", file=requirements_file)
+
+        def fake_download(command, **kwargs):
+            open(os.path.join("part_dir", "python-packages", "foo.tar.gz"), "w").close()
+
+        self.mock_run.side_effect = fake_download
+
+    def _assert_downloaded(self, cache_args, package_args):
+        self.mock_run.assert_called_once_with(
+            [
+                "download",
+                "--disable-pip-version-check",
+                "--dest",
+                os.path.join("part_dir", "python-packages"),
+            ]
+            + cache_args
+            + package_args,
+            cwd=None,
+        )
+
+    def test_download_populates_cache(self):
+        self.pip.download([], requirements=["requirements.txt"])
+
+        self._assert_downloaded(
+            ["--find-links", self.store_dir], ["--requirement", "requirements.txt"]
+        )
+        self.assertThat(os.path.join(self.store_dir, "foo.tar.gz"), FileExists())
+
+    def test_cached_download_can_use_the_index(self):
+        self.pip.download([], requirements=["requirements.txt"])
+        self.mock_run.reset_mock()
+
+        self.pip.download([], requirements=["requirements.txt"])
+
+        self._assert_downloaded(
+            ["--find-links", self.store_dir], ["--requirement", "requirements.txt"]
+        )
+
+    def test_cached_download_offline(self):
+        self.pip.download([], requirements=["requirements.txt"])
+        self.mock_run.reset_mock()
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+
+        self.pip.download([], requirements=["requirements.txt"])
+
+        self._assert_downloaded(
+            ["--no-index", "--find-links", self.store_dir],
+            ["--requirement", "requirements.txt"],
+        )
+
+    def test_changed_requirements_are_downloaded(self):
+        self.pip.download([], requirements=["requirements.txt"])
+        self.mock_run.reset_mock()
+        with open("requirements.txt", "w") as requirements_file:
+            print("foo==2.0", file=requirements_file)
+
+        self.pip.download([], requirements=["requirements.txt"])
+
+        self._assert_downloaded(
+            ["--find-links", self.store_dir], ["--requirement", "requirements.txt"]
+        )
+
+    def test_offline_without_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+
+        raised = self.assertRaises(
+            snapcraft_errors.DependencyCacheMissError,
+            self.pip.download,
+            [],
+            requirements=["requirements.txt"],
+        )
+
+        self.assertThat(raised.part_name, Equals("part_dir"))
+        self.assertThat(raised.ecosystem, Equals("pip"))
+        self.mock_run.assert_not_called()
+
+    def test_offline_without_requirements(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+
+        self.pip.download(["foo"])
+
+        self._assert_downloaded(["--no-index", "--find-links", self.store_dir], ["foo"])
+
+
 class PipInstallTest(PipCommandBaseTestCase):
 
     scenarios = [
@@ -593,6 +692,8 @@ class PipInstallTest(PipCommandBaseTestCase):
             "--no-index",
             "--find-links",
             mock.ANY,
+            "--find-links",
+            mock.ANY,
         ]
         common_args.extend(*args)
         self.mock_run.assert_called_once_with(common_args, **kwargs)
@@ -814,12 +915,24 @@ class PipWheelTest(PipCommandBaseTestCase):
         ),
     ]
 
+    def setUp(self):
+        super().setUp()
+
+        # The name of the project in setup_py_dir.
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.common.run_output", return_value="test-project"
+            )
+        )
+
     def _assert_mock_run_with(self, *args, **kwargs):
         common_args = [
             "wheel",
             "--no-index",
             "--find-links",
             mock.ANY,
+            "--find-links",
+            mock.ANY,
             "--wheel-dir",
             mock.ANY,
         ]
@@ -835,6 +948,94 @@ class PipWheelTest(PipCommandBaseTestCase):
         self._assert_mock_run_with(self.expected_args, **self.expected_kwargs)
 
 
+class PipWheelCacheTest(PipCommandBaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.wheel_cache = self.pip._get_wheel_cache()
+        # A wheel which was downloaded.
+        open(
+            os.path.join("part_dir", "python-packages", "bar-1.0-py3-none-any.whl"),
+            "w",
+        ).close()
+
+        def fake_wheel(command, **kwargs):
+            wheel_dir = command[command.index("--wheel-dir") + 1]
+            for wheel in [
+                "foo-1.0-cp36-cp36m-linux_x86_64.whl",
+                "bar-1.0-py3-none-any.whl",
+            ]:
+                open(os.path.join(wheel_dir, wheel), "w").close()
+
+        self.mock_run.side_effect = fake_wheel
+
+    def test_wheel_uses_cache(self):
+        self.pip.wheel(["foo"])
+
+        command = self.mock_run.call_args[0][0]
+        self.assertThat(
+            command[: command.index("--wheel-dir")],
+            Equals(
+                [
+                    "wheel",
+                    "--no-index",
+                    "--find-links",
+                    os.path.join("part_dir", "python-packages"),
+                    "--find-links",
+                    self.wheel_cache.cache_dir,
+                ]
+            ),
+        )
+
+    def test_built_wheels_are_cached(self):
+        self.pip.wheel(["foo", "bar"])
+
+        self.assertThat(
+            os.listdir(self.wheel_cache.cache_dir),
+            Equals(["foo-1.0-cp36-cp36m-linux_x86_64.whl"]),
+        )
+
+    @mock.patch("snapcraft.internal.common.run_output", return_value="Foo\n")
+    def test_project_wheel_is_not_cached(self, mock_run_output):
+        self.pip.wheel([], setup_py_dir="test_setup_py_dir")
+
+        self.assertThat(os.listdir(self.wheel_cache.cache_dir), Equals([]))
+        mock_run_output.assert_called_once_with(
+            [mock.ANY, "setup.py", "--name"], cwd="test_setup_py_dir", env=mock.ANY
+        )
+
+    @mock.patch(
+        "snapcraft.internal.common.run_output",
+        return_value="running egg_info\nmy_project\n",
+    )
+    def test_project_dependency_wheels_are_cached(self, mock_run_output):
+        self.pip.wheel([], setup_py_dir="test_setup_py_dir")
+
+        self.assertThat(
+            os.listdir(self.wheel_cache.cache_dir),
+            Equals(["foo-1.0-cp36-cp36m-linux_x86_64.whl"]),
+        )
+
+    @mock.patch(
+        "snapcraft.internal.common.run_output",
+        side_effect=subprocess.CalledProcessError(1, ["setup.py"]),
+    )
+    def test_no_wheels_cached_for_unknown_project(self, mock_run_output):
+        self.pip.wheel([], setup_py_dir="test_setup_py_dir")
+
+        self.assertThat(os.listdir(self.wheel_cache.cache_dir), Equals([]))
+
+    def test_cache_follows_build_environment(self):
+        self.useFixture(
+            fixtures.MockPatch("snapcraft.internal.common.env", new=['CFLAGS="-O3"'])
+        )
+
+        self.assertThat(
+            self.pip._get_wheel_cache().cache_dir,
+            Not(Equals(self.wheel_cache.cache_dir)),
+        )
+
+
 class PipListTestCase(PipCommandBaseTestCase):
     def test_none(self):
         self.mock_run.return_value = "{}"
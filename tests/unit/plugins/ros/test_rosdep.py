@@ -224,6 +224,111 @@ class RosdepTestCase(unit.TestCase):
             Equals({"apt": {"lib1"}, "pip": {"lib2"}}),
         )
 
+    def test_resolve_dependencies(self):
+        self.check_output_mock.return_value = (
+            b"#ROSDEP[bar]\n#apt\nlib1\n#ROSDEP[foo]\n#apt\nlib2 lib3\n#pip\nlib4"
+        )
+
+        self.assertThat(
+            self.rosdep.resolve_dependencies(["foo", "bar"]),
+            Equals(
+                {
+                    "foo": {"apt": {"lib2", "lib3"}, "pip": {"lib4"}},
+                    "bar": {"apt": {"lib1"}},
+                }
+            ),
+        )
+
+        self.check_output_mock.assert_called_once_with(
+            [
+                "rosdep",
+                "resolve",
+                "bar",
+                "foo",
+                "--rosdistro",
+                "kinetic",
+                "--os",
+                "ubuntu:xenial",
+            ],
+            env=mock.ANY,
+        )
+
+    def test_resolve_dependencies_invalid_dependency(self):
+        def run(args, **kwargs):
+            if args[2:4] == ["bar", "foo"]:
+                raise subprocess.CalledProcessError(
+                    1, "foo", b"#ROSDEP[bar]\n#ROSDEP[foo]\n#apt\nlib1"
+                )
+            raise subprocess.CalledProcessError(1, "foo")
+
+        self.check_output_mock.side_effect = run
+
+        raised = self.assertRaises(
+            rosdep.RosdepDependencyNotResolvedError,
+            self.rosdep.resolve_dependencies,
+            ["foo", "bar"],
+        )
+
+        self.assertThat(raised.dependency, Equals("bar"))
+
+    def test_resolve_dependencies_cached(self):
+        self.check_output_mock.return_value = b""
+        sources_cache_path = os.path.join(
+            self.rosdep._rosdep_cache_path, "rosdep", "sources.cache"
+        )
+        os.makedirs(sources_cache_path)
+        with open(os.path.join(sources_cache_path, "index"), "w") as index_file:
+            index_file.write("sources")
+        self.rosdep.setup()
+
+        self.check_output_mock.return_value = b"#apt\nlib1"
+        self.rosdep.resolve_dependency("foo")
+        self.check_output_mock.reset_mock()
+
+        # The resolution is shared with other parts.
+        other_rosdep = rosdep.Rosdep(
+            ros_distro="kinetic",
+            ros_package_path="package_path",
+            rosdep_path="rosdep_path",
+            ubuntu_distro="xenial",
+            ubuntu_sources="sources",
+            ubuntu_keyrings=["keyring"],
+            project=self.project,
+        )
+        self.check_output_mock.return_value = b""
+        other_rosdep.setup()
+        self.check_output_mock.reset_mock()
+
+        self.assertThat(
+            other_rosdep.resolve_dependency("foo"), Equals({"apt": {"lib1"}})
+        )
+        self.check_output_mock.assert_not_called()
+
+    def test_resolve_dependencies_not_cached_for_other_sources(self):
+        self.check_output_mock.return_value = b""
+        sources_cache_path = os.path.join(
+            self.rosdep._rosdep_cache_path, "rosdep", "sources.cache"
+        )
+        os.makedirs(sources_cache_path)
+        index_path = os.path.join(sources_cache_path, "index")
+        with open(index_path, "w") as index_file:
+            index_file.write("sources")
+        self.rosdep.setup()
+
+        self.check_output_mock.return_value = b"#apt\nlib1"
+        self.rosdep.resolve_dependency("foo")
+
+        with open(index_path, "w") as index_file:
+            index_file.write("updated sources")
+        self.check_output_mock.return_value = b""
+        self.rosdep.setup()
+        self.check_output_mock.reset_mock()
+        self.check_output_mock.return_value = b"#apt\nlib2"
+
+        self.assertThat(
+            self.rosdep.resolve_dependency("foo"), Equals({"apt": {"lib2"}})
+        )
+
     def test_run(self):
         rosdep = self.rosdep
         rosdep._run(["qux"])
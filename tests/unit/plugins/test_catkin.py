@@ -1655,7 +1655,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         self.catkin_mock.find.side_effect = exception
 
     def test_find_system_dependencies_system_only(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"apt": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {"bar": {"apt": {"baz"}}}
 
         self.assertThat(
             catkin._find_system_dependencies(
@@ -1665,11 +1665,11 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
         self.rosdep_mock.get_dependencies.assert_called_once_with("foo")
-        self.rosdep_mock.resolve_dependency.assert_called_once_with("bar")
+        self.rosdep_mock.resolve_dependencies.assert_called_once_with(["bar"])
         self.catkin_mock.find.assert_called_once_with("bar")
 
     def test_find_system_dependencies_system_only_no_packages(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"apt": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {"bar": {"apt": {"baz"}}}
 
         self.assertThat(
             catkin._find_system_dependencies(
@@ -1679,7 +1679,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
         self.rosdep_mock.get_dependencies.assert_called_once_with()
-        self.rosdep_mock.resolve_dependency.assert_called_once_with("bar")
+        self.rosdep_mock.resolve_dependencies.assert_called_once_with(["bar"])
         self.catkin_mock.find.assert_called_once_with("bar")
 
     def test_find_system_dependencies_already_satisfied_in_source(self):
@@ -1694,7 +1694,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
 
         self.rosdep_mock.get_dependencies.assert_called_once_with()
         self.rospack_mock.list_names.assert_called_once_with()
-        self.rosdep_mock.resolve_dependency.assert_not_called()
+        self.rosdep_mock.resolve_dependencies.assert_not_called()
         self.catkin_mock.find.assert_not_called()
 
     def test_find_system_dependencies_local_only(self):
@@ -1708,7 +1708,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         self.rosdep_mock.get_dependencies.assert_has_calls(
             [mock.call("foo"), mock.call("bar")], any_order=True
         )
-        self.rosdep_mock.resolve_dependency.assert_not_called()
+        self.rosdep_mock.resolve_dependencies.assert_not_called()
         self.catkin_mock.find.assert_not_called()
 
     def test_find_system_dependencies_satisfied_in_stage(self):
@@ -1724,11 +1724,11 @@ class FindSystemDependenciesTestCase(unit.TestCase):
 
         self.rosdep_mock.get_dependencies.assert_called_once_with("foo")
         self.catkin_mock.find.assert_called_once_with("bar")
-        self.rosdep_mock.resolve_dependency.assert_not_called()
+        self.rosdep_mock.resolve_dependencies.assert_not_called()
 
     def test_find_system_dependencies_mixed(self):
         self.rosdep_mock.get_dependencies.return_value = {"bar", "baz", "qux"}
-        self.rosdep_mock.resolve_dependency.return_value = {"apt": {"quux"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {"baz": {"apt": {"quux"}}}
 
         def _fake_find(package_name):
             if package_name == "qux":
@@ -1746,7 +1746,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         self.rosdep_mock.get_dependencies.assert_has_calls(
             [mock.call("foo"), mock.call("bar")], any_order=True
         )
-        self.rosdep_mock.resolve_dependency.assert_called_once_with("baz")
+        self.rosdep_mock.resolve_dependencies.assert_called_once_with(["baz"])
         self.catkin_mock.find.assert_has_calls(
             [mock.call("baz"), mock.call("qux")], any_order=True
         )
@@ -1754,8 +1754,8 @@ class FindSystemDependenciesTestCase(unit.TestCase):
     def test_find_system_dependencies_missing_local_dependency(self):
         # Setup a dependency on a non-existing package, and it doesn't resolve
         # to a system dependency.'
-        exception = _ros.rosdep.RosdepDependencyNotResolvedError("foo")
-        self.rosdep_mock.resolve_dependency.side_effect = exception
+        exception = _ros.rosdep.RosdepDependencyNotResolvedError("bar")
+        self.rosdep_mock.resolve_dependencies.side_effect = exception
 
         raised = self.assertRaises(
             catkin.CatkinInvalidSystemDependencyError,
@@ -1778,7 +1778,9 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
     def test_find_system_dependencies_raises_if_unsupported_type(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"unsupported-type": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {
+            "bar": {"unsupported-type": {"baz"}}
+        }
 
         raised = self.assertRaises(
             catkin.CatkinUnsupportedDependencyTypeError,
@@ -21,7 +21,7 @@ from unittest import mock
 from testtools.matchers import Equals, HasLength
 
 import snapcraft
-from snapcraft.internal import errors
+from snapcraft.internal import errors, jobserver
 from snapcraft.plugins import cmake
 from tests import fixture_setup, unit
 from typing import Any, Dict, List, Tuple
@@ -87,6 +87,23 @@ class CMakeTest(CMakeBaseTest):
                     cwd=plugin.builddir,
                     env=mock.ANY,
                 ),
+                mock.call(
+                    ["cmake", "--build", ".", "--target", "install", "--", "-j2"],
+                    cwd=plugin.builddir,
+                    env=mock.ANY,
+                ),
+            ]
+        )
+
+    def test_build_with_jobserver(self):
+        plugin = cmake.CMakePlugin("test-part", self.options, self.project)
+        os.makedirs(plugin.builddir)
+        with jobserver.serve(2) as server:
+            plugin.build()
+
+        self.run_mock.assert_has_calls(
+            [
+                mock.call(["cmake", "--build", "."], cwd=plugin.builddir, env=mock.ANY),
                 mock.call(
                     ["cmake", "--build", ".", "--target", "install"],
                     cwd=plugin.builddir,
@@ -94,6 +111,8 @@ class CMakeTest(CMakeBaseTest):
                 ),
             ]
         )
+        for call in self.run_mock.call_args_list[1:]:
+            self.assertThat(call[1]["env"]["MAKEFLAGS"], Equals(server.get_makeflags()))
 
     def test_build_referencing_sourcedir_with_subdir(self):
         self.options.source_subdir = "subdir"
@@ -116,7 +135,7 @@ class CMakeTest(CMakeBaseTest):
                     env=mock.ANY,
                 ),
                 mock.call(
-                    ["cmake", "--build", ".", "--target", "install"],
+                    ["cmake", "--build", ".", "--target", "install", "--", "-j2"],
                     cwd=plugin.builddir,
                     env=mock.ANY,
                 ),
@@ -271,7 +290,7 @@ class CMakeBuildTest(CMakeBaseTest):
                     env=mock.ANY,
                 ),
                 mock.call(
-                    ["cmake", "--build", ".", "--target", "install"],
+                    ["cmake", "--build", ".", "--target", "install", "--", "-j2"],
                     cwd=plugin.builddir,
                     env=mock.ANY,
                 ),
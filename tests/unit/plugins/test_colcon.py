@@ -1143,7 +1143,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         self.rosdep_mock.get_dependencies.return_value = {"bar"}
 
     def test_find_system_dependencies_system_only(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"apt": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {"bar": {"apt": {"baz"}}}
 
         self.assertThat(
             colcon._find_system_dependencies({"foo"}, self.rosdep_mock),
@@ -1151,10 +1151,10 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
         self.rosdep_mock.get_dependencies.assert_called_once_with("foo")
-        self.rosdep_mock.resolve_dependency.assert_called_once_with("bar")
+        self.rosdep_mock.resolve_dependencies.assert_called_once_with(["bar"])
 
     def test_find_system_dependencies_system_only_no_packages(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"apt": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {"bar": {"apt": {"baz"}}}
 
         self.assertThat(
             colcon._find_system_dependencies(None, self.rosdep_mock),
@@ -1162,7 +1162,7 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
         self.rosdep_mock.get_dependencies.assert_called_once_with()
-        self.rosdep_mock.resolve_dependency.assert_called_once_with("bar")
+        self.rosdep_mock.resolve_dependencies.assert_called_once_with(["bar"])
 
     def test_find_system_dependencies_local_only(self):
         self.assertThat(
@@ -1173,13 +1173,13 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         self.rosdep_mock.get_dependencies.assert_has_calls(
             [mock.call("foo"), mock.call("bar")], any_order=True
         )
-        self.rosdep_mock.resolve_dependency.assert_not_called()
+        self.rosdep_mock.resolve_dependencies.assert_not_called()
 
     def test_find_system_dependencies_missing_local_dependency(self):
         # Setup a dependency on a non-existing package, and it doesn't resolve
         # to a system dependency.'
-        exception = _ros.rosdep.RosdepDependencyNotResolvedError("foo")
-        self.rosdep_mock.resolve_dependency.side_effect = exception
+        exception = _ros.rosdep.RosdepDependencyNotResolvedError("bar")
+        self.rosdep_mock.resolve_dependencies.side_effect = exception
 
         raised = self.assertRaises(
             colcon.ColconInvalidSystemDependencyError,
@@ -1200,7 +1200,9 @@ class FindSystemDependenciesTestCase(unit.TestCase):
         )
 
     def test_find_system_dependencies_raises_if_unsupported_type(self):
-        self.rosdep_mock.resolve_dependency.return_value = {"unsupported-type": {"baz"}}
+        self.rosdep_mock.resolve_dependencies.return_value = {
+            "bar": {"unsupported-type": {"baz"}}
+        }
 
         raised = self.assertRaises(
             colcon.ColconUnsupportedDependencyTypeError,
@@ -50,12 +50,15 @@ class GoPluginBaseTest(unit.TestCase):
 
         def fake_go_build(command, cwd, *args, **kwargs):
             if command[0] == "go" and command[1] == "build" and "-o" in command:
-                open(
-                    os.path.join(command[command.index("-o") + 1], "binary"), "w"
-                ).close()
-            elif command[0] == "go" and command[1] == "build" and "-o" not in command:
-                # the package is -1
-                open(os.path.join(cwd, os.path.basename(command[-1])), "w").close()
+                output_index = command.index("-o") + 1
+                output = command[output_index]
+                if not os.path.isdir(output):
+                    open(output, "w").close()
+                    return
+                # Binaries are named after their packages.
+                packages = command[output_index + 1 :]
+                for binary in [os.path.basename(p) for p in packages] or ["binary"]:
+                    open(os.path.join(output, binary), "w").close()
 
         fake_run = self.useFixture(
             fixtures.MockPatch(
@@ -64,10 +67,20 @@ class GoPluginBaseTest(unit.TestCase):
         )
         self.run_mock = fake_run.mock
 
+        self.go_list_output = ""
+
+        def fake_go_run_output(command, *args, **kwargs):
+            if command[:2] == ["go", "list"]:
+                return self.go_list_output
+            return mock.DEFAULT
+
         fake_run_output = self.useFixture(
-            fixtures.MockPatch("snapcraft.internal.common.run_output")
+            fixtures.MockPatch(
+                "snapcraft.internal.common.run_output", side_effect=fake_go_run_output
+            )
         )
         self.run_output_mock = fake_run_output.mock
+        self.run_output_mock.return_value = "go version go1.13 linux/amd64"
 
 
 class GoPluginPropertiesTest(unit.TestCase):
@@ -255,7 +268,7 @@ class GoPluginPropertiesTest(unit.TestCase):
 class MockElfFile:
     def __init__(self, *, path: str) -> None:
         self.path = path
-        self.is_dynamic = True
+        self.is_dynamic = os.path.basename(path) != "static"
 
 
 class GoPluginTest(GoPluginBaseTest):
@@ -322,6 +335,50 @@ class GoPluginTest(GoPluginBaseTest):
             ["go", "mod", "download"], cwd=plugin.sourcedir, env=mock.ANY
         )
 
+    def test_pull_go_mod_cached(self):
+        class Options:
+            source = "dir"
+            go_channel = "latest/stable"
+            go_packages = []
+            go_importpath = ""
+
+        self.run_output_mock.return_value = "go version go13 linux/amd64"
+
+        plugin = go.GoPlugin("test-part", Options(), self.project)
+
+        os.makedirs(plugin.sourcedir)
+        open(os.path.join(plugin.sourcedir, "go.mod"), "w").close()
+
+        plugin.pull()
+        self.expectThat(
+            self.run_mock.call_args[1]["env"].get("GOPROXY"), Not(Equals("off"))
+        )
+        plugin.pull()
+        self.expectThat(
+            self.run_mock.call_args[1]["env"].get("GOPROXY"), Not(Equals("off"))
+        )
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        plugin.pull()
+        self.expectThat(self.run_mock.call_args[1]["env"]["GOPROXY"], Equals("off"))
+
+    def test_pull_go_mod_offline_without_cache(self):
+        class Options:
+            source = "dir"
+            go_channel = "latest/stable"
+            go_packages = []
+            go_importpath = ""
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        self.run_output_mock.return_value = "go version go13 linux/amd64"
+
+        plugin = go.GoPlugin("test-part", Options(), self.project)
+
+        os.makedirs(plugin.sourcedir)
+        open(os.path.join(plugin.sourcedir, "go.mod"), "w").close()
+
+        self.assertRaises(errors.DependencyCacheMissError, plugin.pull)
+        self.run_mock.assert_not_called()
+
     def test_go_mod_requires_newer_go_version(self):
         class Options:
             source = "dir"
@@ -402,18 +459,18 @@ class GoPluginTest(GoPluginBaseTest):
 
         self.run_mock.reset_mock()
         self.run_output_mock.reset_mock()
-        self.run_output_mock.return_value = "dir/pkg/main main"
+        self.go_list_output = "dir/pkg/main main"
 
         plugin.build()
 
-        self.run_output_mock.assert_called_once_with(
+        self.run_output_mock.assert_any_call(
             ["go", "list", "-f", "{{.ImportPath}} {{.Name}}", "./dir/..."],
             cwd=plugin._gopath_src,
             env=mock.ANY,
         )
 
         self.run_mock.assert_called_once_with(
-            ["go", "build", "dir/pkg/main"],
+            ["go", "build", "-o", plugin._install_bin_dir, "dir/pkg/main"],
             cwd=os.path.join(plugin.installdir, "bin"),
             env=mock.ANY,
         )
@@ -440,13 +497,61 @@ class GoPluginTest(GoPluginBaseTest):
         plugin.build()
 
         self.run_mock.assert_called_once_with(
-            ["go", "build", plugin.options.go_packages[0]],
+            ["go", "build", "-o", plugin._install_bin_dir] + plugin.options.go_packages,
             cwd=os.path.join(plugin.installdir, "bin"),
             env=mock.ANY,
         )
 
         self.assert_go_paths(plugin)
 
+    def test_build_go_packages_with_old_go(self):
+        class Options:
+            source = ""
+            go_channel = "latest/stable"
+            go_packages = ["github.com/gotools/vet", "github.com/gotools/lint"]
+            go_importpath = ""
+            go_buildtags = ""
+
+        self.run_output_mock.return_value = "go version go1.10.4 linux/amd64"
+        plugin = go.GoPlugin("test-part", Options(), self.project)
+
+        os.makedirs(plugin.sourcedir)
+
+        plugin.pull()
+
+        os.makedirs(plugin.builddir)
+
+        self.run_mock.reset_mock()
+        plugin.build()
+
+        self.assertThat(self.run_mock.call_count, Equals(2))
+        self.run_mock.assert_has_calls(
+            [
+                mock.call(
+                    [
+                        "go",
+                        "build",
+                        "-o",
+                        os.path.join(plugin._install_bin_dir, "vet"),
+                        "github.com/gotools/vet",
+                    ],
+                    cwd=os.path.join(plugin.installdir, "bin"),
+                    env=mock.ANY,
+                ),
+                mock.call(
+                    [
+                        "go",
+                        "build",
+                        "-o",
+                        os.path.join(plugin._install_bin_dir, "lint"),
+                        "github.com/gotools/lint",
+                    ],
+                    cwd=os.path.join(plugin.installdir, "bin"),
+                    env=mock.ANY,
+                ),
+            ]
+        )
+
     def test_clean_build(self):
         class Options:
             source = "dir"
@@ -510,11 +615,11 @@ class GoPluginTest(GoPluginBaseTest):
         plugin.pull()
 
         os.makedirs(plugin.builddir)
-        self.run_output_mock.return_value = "github.com/snapcore/launcher main"
+        self.go_list_output = "github.com/snapcore/launcher main"
 
         plugin.build()
 
-        self.run_output_mock.assert_called_once_with(
+        self.run_output_mock.assert_any_call(
             [
                 "go",
                 "list",
@@ -534,7 +639,13 @@ class GoPluginTest(GoPluginBaseTest):
                     env=mock.ANY,
                 ),
                 mock.call(
-                    ["go", "build", "github.com/snapcore/launcher"],
+                    [
+                        "go",
+                        "build",
+                        "-o",
+                        plugin._install_bin_dir,
+                        "github.com/snapcore/launcher",
+                    ],
                     cwd=os.path.join(plugin.installdir, "bin"),
                     env=mock.ANY,
                 ),
@@ -572,6 +683,27 @@ class GoPluginTest(GoPluginBaseTest):
             env = call_args[1]["env"]
             self.assertTrue("GOPATH" in env, "Expected environment to include GOPATH")
             self.assertThat(env["GOPATH"], Equals(plugin._gopath))
+            self.assertThat(
+                env["GOMODCACHE"],
+                Equals(
+                    os.path.join(
+                        self.xdg_path,
+                        ".cache",
+                        "snapcraft",
+                        "dependencies",
+                        "go",
+                        "store",
+                    )
+                ),
+            )
+            self.assertThat(
+                env["GOCACHE"],
+                Equals(
+                    os.path.join(
+                        self.xdg_path, ".cache", "snapcraft", "plugins", "go", "build"
+                    )
+                ),
+            )
 
             self.assertTrue(
                 "CGO_LDFLAGS" in env, "Expected environment to include CGO_LDFLAGS"
@@ -608,18 +740,25 @@ class GoPluginTest(GoPluginBaseTest):
         os.makedirs(plugin.builddir)
 
         self.run_mock.reset_mock()
-        self.run_output_mock.return_value = "dir/pkg/main main"
+        self.go_list_output = "dir/pkg/main main"
 
         plugin.build()
 
-        self.run_output_mock.assert_called_once_with(
+        self.run_output_mock.assert_any_call(
             ["go", "list", "-f", "{{.ImportPath}} {{.Name}}", "./dir/..."],
             cwd=plugin._gopath_src,
             env=mock.ANY,
         )
 
         self.run_mock.assert_called_once_with(
-            ["go", "build", "-tags=testbuildtag1,testbuildtag2", "dir/pkg/main"],
+            [
+                "go",
+                "build",
+                "-tags=testbuildtag1,testbuildtag2",
+                "-o",
+                plugin._install_bin_dir,
+                "dir/pkg/main",
+            ],
             cwd=os.path.join(plugin.installdir, "bin"),
             env=mock.ANY,
         )
@@ -650,16 +789,15 @@ class GoPluginTest(GoPluginBaseTest):
             env=mock.ANY,
         )
 
-    @mock.patch("snapcraft.internal.elf.ElfFile")
+    @mock.patch("snapcraft.internal.elf.ElfFile", side_effect=MockElfFile)
     def test_build_classic_dynamic_relink(self, mock_elffile):
         class Options:
             source = ""
             go_channel = "latest/stable"
-            go_packages = ["github.com/gotools/vet"]
+            go_packages = ["github.com/gotools/vet", "github.com/gotools/static"]
             go_importpath = ""
             go_buildtags = ""
 
-        mock_elffile.return_value = MockElfFile(path="foo")
         self.project.info.confinement = "classic"
         plugin = go.GoPlugin("test-part", Options(), self.project)
 
@@ -672,11 +810,13 @@ class GoPluginTest(GoPluginBaseTest):
         self.run_mock.reset_mock()
         plugin.build()
 
+        # Only the dynamic binary is relinked.
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
                 mock.call(
-                    ["go", "build", plugin.options.go_packages[0]],
+                    ["go", "build", "-o", plugin._install_bin_dir]
+                    + plugin.options.go_packages,
                     cwd=os.path.join(plugin.installdir, "bin"),
                     env=mock.ANY,
                 ),
@@ -686,7 +826,9 @@ class GoPluginTest(GoPluginBaseTest):
                         "build",
                         "-ldflags",
                         "-linkmode=external",
-                        plugin.options.go_packages[0],
+                        "-o",
+                        plugin._install_bin_dir,
+                        "github.com/gotools/vet",
                     ],
                     cwd=os.path.join(plugin.installdir, "bin"),
                     env=mock.ANY,
@@ -694,9 +836,34 @@ class GoPluginTest(GoPluginBaseTest):
             ]
         )
 
-        self.assert_go_paths(plugin)
+    @mock.patch("snapcraft.internal.elf.ElfFile", side_effect=MockElfFile)
+    def test_build_classic_static_not_relinked(self, mock_elffile):
+        class Options:
+            source = ""
+            go_channel = "latest/stable"
+            go_packages = ["github.com/gotools/static"]
+            go_importpath = ""
+            go_buildtags = ""
+
+        self.project.info.confinement = "classic"
+        plugin = go.GoPlugin("test-part", Options(), self.project)
+
+        os.makedirs(plugin.sourcedir)
+
+        plugin.pull()
+
+        os.makedirs(plugin.builddir)
+
+        self.run_mock.reset_mock()
+        plugin.build()
+
+        self.run_mock.assert_called_once_with(
+            ["go", "build", "-o", plugin._install_bin_dir] + plugin.options.go_packages,
+            cwd=os.path.join(plugin.installdir, "bin"),
+            env=mock.ANY,
+        )
 
-    @mock.patch("snapcraft.internal.elf.ElfFile")
+    @mock.patch("snapcraft.internal.elf.ElfFile", side_effect=MockElfFile)
     def test_build_go_mod_classic_dynamic_relink(self, mock_elffile):
         class Options:
             source = ""
@@ -707,7 +874,6 @@ class GoPluginTest(GoPluginBaseTest):
 
         self.run_output_mock.return_value = "go version go13 linux/amd64"
 
-        mock_elffile.return_value = MockElfFile(path="foo")
         self.project.info.confinement = "classic"
         plugin = go.GoPlugin("test-part", Options(), self.project)
 
@@ -23,7 +23,7 @@ from testtools.matchers import Equals, HasLength
 from unittest import mock
 
 import snapcraft
-from snapcraft.internal import errors
+from snapcraft.internal import errors, jobserver
 from snapcraft.plugins import kbuild
 from tests import unit
 
@@ -108,14 +108,15 @@ class KBuildPluginTestCase(unit.TestCase):
         self.assertThat(run_mock.call_count, Equals(2))
         run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2"]),
+                mock.call(["make", "-j2"], env=None),
                 mock.call(
                     [
                         "make",
                         "-j2",
                         "CONFIG_PREFIX={}".format(plugin.installdir),
                         "install",
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -128,6 +129,32 @@ class KBuildPluginTestCase(unit.TestCase):
 
         self.assertThat(config_contents, Equals("ACCEPT=y\n"))
 
+    @mock.patch("subprocess.check_call")
+    @mock.patch.object(kbuild.KBuildPlugin, "run")
+    def test_build_with_jobserver(self, run_mock, check_call_mock):
+        self.options.kconfigfile = "config"
+        with open(self.options.kconfigfile, "w") as f:
+            f.write("ACCEPT=y\n")
+
+        plugin = kbuild.KBuildPlugin("test-part", self.options, self.project)
+
+        os.makedirs(plugin.builddir)
+
+        with jobserver.serve(2) as server:
+            plugin.build()
+
+        run_mock.assert_has_calls(
+            [
+                mock.call(["make"], env=mock.ANY),
+                mock.call(
+                    ["make", "CONFIG_PREFIX={}".format(plugin.installdir), "install"],
+                    env=mock.ANY,
+                ),
+            ]
+        )
+        for call in run_mock.call_args_list:
+            self.assertThat(call[1]["env"]["MAKEFLAGS"], Equals(server.get_makeflags()))
+
     @mock.patch("subprocess.check_call")
     @mock.patch.object(kbuild.KBuildPlugin, "run")
     def test_build_verbose_with_kconfigfile(self, run_mock, check_call_mock):
@@ -156,7 +183,7 @@ class KBuildPluginTestCase(unit.TestCase):
         self.assertThat(run_mock.call_count, Equals(2))
         run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "V=1"]),
+                mock.call(["make", "-j2", "V=1"], env=None),
                 mock.call(
                     [
                         "make",
@@ -164,7 +191,8 @@ class KBuildPluginTestCase(unit.TestCase):
                         "V=1",
                         "CONFIG_PREFIX={}".format(plugin.installdir),
                         "install",
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -200,14 +228,15 @@ class KBuildPluginTestCase(unit.TestCase):
         self.assertThat(run_mock.call_count, Equals(2))
         run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2"]),
+                mock.call(["make", "-j2"], env=None),
                 mock.call(
                     [
                         "make",
                         "-j2",
                         "CONFIG_PREFIX={}".format(plugin.installdir),
                         "install",
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -263,14 +292,15 @@ ACCEPT=n
         self.assertThat(run_mock.call_count, Equals(3))
         run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2"]),
+                mock.call(["make", "-j2"], env=None),
                 mock.call(
                     [
                         "make",
                         "-j2",
                         "CONFIG_PREFIX={}".format(plugin.installdir),
                         "install",
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
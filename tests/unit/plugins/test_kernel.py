@@ -21,7 +21,13 @@ import subprocess
 import textwrap
 
 import fixtures
-from testtools.matchers import Contains, Equals, FileContains, HasLength
+from testtools.matchers import (
+    Equals,
+    FileContains,
+    FileExists,
+    HasLength,
+    Not,
+)
 from unittest import mock
 
 from textwrap import dedent
@@ -29,7 +35,7 @@ from textwrap import dedent
 import snapcraft
 from snapcraft import storeapi
 from snapcraft.internal import errors
-from snapcraft.plugins import kernel
+from snapcraft.plugins import _kernel, kernel
 from tests import unit
 
 
@@ -67,6 +73,10 @@ class KernelPluginTestCase(unit.TestCase):
         self.check_call_mock = patcher.start()
         self.addCleanup(patcher.stop)
 
+        patcher = mock.patch("snapcraft.plugins._kernel.write_initrd")
+        self.write_initrd_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
         patcher = mock.patch.object(kernel.KernelPlugin, "run")
         self.run_mock = patcher.start()
         self.addCleanup(patcher.stop)
@@ -154,7 +164,7 @@ class KernelPluginTestCase(unit.TestCase):
             self.assertIn(property, resulting_build_properties)
 
     def _assert_generic_check_call(self, builddir, installdir, os_snap_path):
-        self.assertThat(self.check_call_mock.call_count, Equals(4))
+        self.assertThat(self.check_call_mock.call_count, Equals(3))
         self.check_call_mock.assert_has_calls(
             [
                 mock.call('yes "" | make -j2 oldconfig', shell=True, cwd=builddir),
@@ -167,14 +177,13 @@ class KernelPluginTestCase(unit.TestCase):
                     cwd=os.path.join(builddir, "initrd-staging"),
                     shell=True,
                 ),
-                mock.call(
-                    "find . | cpio --create --format=newc | "
-                    "gzip > {}".format(os.path.join(installdir, "initrd-4.4.2.img")),
-                    cwd=os.path.join(builddir, "initrd-staging"),
-                    shell=True,
-                ),
             ]
         )
+        self.write_initrd_mock.assert_called_once_with(
+            os.path.join(builddir, "initrd-staging"),
+            os.path.join(installdir, "initrd-4.4.2.img"),
+            compression_cmd=["pigz", "-c", "-p", "2"],
+        )
 
     def _assert_common_assets(self, installdir):
         for asset in [
@@ -295,6 +304,17 @@ class KernelPluginTestCase(unit.TestCase):
 
         self.assertRaises(RuntimeError, plugin._unpack_generic_initrd)
 
+    def _make_modules(self, modules_path, modules_dep):
+        os.makedirs(modules_path)
+        with open(os.path.join(modules_path, "modules.dep"), "w") as f:
+            f.write(modules_dep)
+        open(os.path.join(modules_path, "modules.dep.bin"), "w").close()
+        for line in modules_dep.splitlines():
+            for module in line.replace(":", "").split():
+                module_path = os.path.join(modules_path, module)
+                os.makedirs(os.path.dirname(module_path), exist_ok=True)
+                open(module_path, "w").close()
+
     def test_pack_initrd_modules(self):
         self.options.kernel_initrd_modules = ["squashfs", "vfat"]
 
@@ -304,9 +324,17 @@ class KernelPluginTestCase(unit.TestCase):
         plugin.kernel_release = "4.4"
         modules_path = os.path.join(plugin.installdir, "lib", "modules", "4.4")
         initrd_modules_staging_path = os.path.join("staging", "lib", "modules", "4.4")
-        os.makedirs(modules_path)
-        open(os.path.join(modules_path, "modules.dep"), "w").close()
-        open(os.path.join(modules_path, "modules.dep.bin"), "w").close()
+        self._make_modules(
+            modules_path,
+            dedent(
+                """\
+                kernel/fs/squashfs/squashfs.ko:
+                kernel/fs/fat/vfat.ko: kernel/fs/fat/fat.ko
+                kernel/fs/fat/fat.ko:
+                kernel/fs/fat/msdos.ko: kernel/fs/fat/fat.ko
+                """
+            ),
+        )
         os.makedirs(initrd_modules_staging_path)
         open(os.path.join(plugin.installdir, "initrd-4.4.img"), "w").close()
 
@@ -314,20 +342,25 @@ class KernelPluginTestCase(unit.TestCase):
             m_unpack.return_value = "staging"
             plugin._make_initrd()
 
-        modprobe_cmd = [
-            "modprobe",
-            "-n",
-            "--show-depends",
-            "-d",
-            plugin.installdir,
-            "-S",
-            "4.4",
-        ]
-        self.run_output_mock.assert_has_calls(
-            [mock.call(modprobe_cmd + ["squashfs"], env=mock.ANY)]
+        for module_info in [
+            "modules.dep",
+            "modules.dep.bin",
+            "kernel/fs/squashfs/squashfs.ko",
+            "kernel/fs/fat/vfat.ko",
+            "kernel/fs/fat/fat.ko",
+        ]:
+            self.assertThat(
+                os.path.join(initrd_modules_staging_path, module_info), FileExists()
+            )
+        self.assertThat(
+            os.path.join(initrd_modules_staging_path, "kernel/fs/fat/msdos.ko"),
+            Not(FileExists()),
         )
-        self.run_output_mock.assert_has_calls(
-            [mock.call(modprobe_cmd + ["vfat"], env=mock.ANY)]
+        self.run_output_mock.assert_not_called()
+        self.write_initrd_mock.assert_called_once_with(
+            "staging",
+            os.path.join(plugin.installdir, "initrd-4.4.img"),
+            compression_cmd=["pigz", "-c", "-p", "2"],
         )
 
     def test_pack_initrd_modules_return_same_deps(self):
@@ -339,37 +372,44 @@ class KernelPluginTestCase(unit.TestCase):
         plugin.kernel_release = "4.4"
         modules_path = os.path.join(plugin.installdir, "lib", "modules", "4.4")
         initrd_modules_staging_path = os.path.join("staging", "lib", "modules", "4.4")
-        os.makedirs(modules_path)
-        open(os.path.join(modules_path, "modules.dep"), "w").close()
-        open(os.path.join(modules_path, "modules.dep.bin"), "w").close()
+        self._make_modules(
+            modules_path,
+            dedent(
+                """\
+                squashfs.ko: serport.ko
+                vfat.ko: serport.ko
+                serport.ko:
+                """
+            ),
+        )
         os.makedirs(initrd_modules_staging_path)
         open(os.path.join(plugin.installdir, "initrd-4.4.img"), "w").close()
-        open(os.path.join(plugin.installdir, "serport.ko"), "w").close()
-
-        self.run_output_mock.return_value = "insmod {}/serport.ko".format(
-            plugin.installdir
-        )
 
         with mock.patch.object(plugin, "_unpack_generic_initrd") as m_unpack:
             m_unpack.return_value = "staging"
             plugin._make_initrd()
 
-        modprobe_cmd = [
-            "modprobe",
-            "-n",
-            "--show-depends",
-            "-d",
-            plugin.installdir,
-            "-S",
-            "4.4",
-        ]
-        self.run_output_mock.assert_has_calls(
-            [mock.call(modprobe_cmd + ["squashfs"], env=mock.ANY)]
-        )
-        self.run_output_mock.assert_has_calls(
-            [mock.call(modprobe_cmd + ["vfat"], env=mock.ANY)]
+        self.assertThat(
+            os.path.join(initrd_modules_staging_path, "serport.ko"), FileExists()
         )
 
+    def test_pack_initrd_missing_module(self):
+        self.options.kernel_initrd_modules = ["squashfs"]
+
+        plugin = kernel.KernelPlugin("test-part", self.options, self.project)
+
+        plugin.kernel_release = "4.4"
+        modules_path = os.path.join(plugin.installdir, "lib", "modules", "4.4")
+        self._make_modules(modules_path, "vfat.ko:\n")
+
+        with mock.patch.object(plugin, "_unpack_generic_initrd") as m_unpack:
+            m_unpack.return_value = "staging"
+            raised = self.assertRaises(
+                _kernel.errors.KernelModuleNotFoundError, plugin._make_initrd
+            )
+
+        self.assertThat(raised.module, Equals("squashfs"))
+
     @mock.patch.object(snapcraft.ProjectOptions, "kernel_arch", new="not_arm")
     def test_build_with_kconfigfile(self):
         self.options.kconfigfile = "config"
@@ -389,7 +429,7 @@ class KernelPluginTestCase(unit.TestCase):
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -401,7 +441,8 @@ class KernelPluginTestCase(unit.TestCase):
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -430,7 +471,7 @@ class KernelPluginTestCase(unit.TestCase):
 
         plugin.build()
 
-        self.assertThat(self.check_call_mock.call_count, Equals(4))
+        self.assertThat(self.check_call_mock.call_count, Equals(3))
         self.check_call_mock.assert_has_calls(
             [
                 mock.call(
@@ -445,21 +486,13 @@ class KernelPluginTestCase(unit.TestCase):
                     cwd=os.path.join(plugin.builddir, "initrd-staging"),
                     shell=True,
                 ),
-                mock.call(
-                    "find . | cpio --create --format=newc | "
-                    "gzip > {}".format(
-                        os.path.join(plugin.installdir, "initrd-4.4.2.img")
-                    ),
-                    cwd=os.path.join(plugin.builddir, "initrd-staging"),
-                    shell=True,
-                ),
             ]
         )
 
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "V=1", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "V=1", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -472,7 +505,8 @@ class KernelPluginTestCase(unit.TestCase):
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -552,7 +586,7 @@ class KernelPluginTestCase(unit.TestCase):
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -564,7 +598,8 @@ class KernelPluginTestCase(unit.TestCase):
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -615,7 +650,7 @@ ACCEPT=n
         self.run_mock.assert_has_calls(
             [
                 mock.call(["make", "-j1", "defconfig"]),
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -627,7 +662,8 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -676,7 +712,7 @@ ACCEPT=n
         self.run_mock.assert_has_calls(
             [
                 mock.call(["make", "-j1", "defconfig", "defconfig2"]),
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -688,7 +724,8 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -718,7 +755,9 @@ ACCEPT=n
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules", "fake-dtb.dtb"]),
+                mock.call(
+                    ["make", "-j2", "bzImage", "modules", "fake-dtb.dtb"], env=None
+                ),
                 mock.call(
                     [
                         "make",
@@ -730,7 +769,8 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -782,23 +822,14 @@ ACCEPT=n
                 return
             os.makedirs(modules_dir)
 
-        self.check_call_mock.side_effect = fake_unpack
-
-        def fake_output(*args, **kwargs):
-            if args[0][:3] == ["modprobe", "-n", "--show-depends"]:
-                module_path = os.path.join(
-                    plugin.installdir, "lib", "modules", "4.4.2", "some-module.ko"
-                )
-                open(module_path, "w").close()
-                return "insmod {} enable_fbdev=1\n".format(module_path)
-            else:
-                raise Exception(args[0])
-
-        self.run_output_mock.side_effect = fake_output
+            modules_path = os.path.join(plugin.installdir, "lib", "modules", "4.4.2")
+            with open(os.path.join(modules_path, "modules.dep"), "w") as f:
+                f.write("kernel/some-module.ko:\nkernel/my-fake-module.ko:\n")
+            os.makedirs(os.path.join(modules_path, "kernel"), exist_ok=True)
+            for module in ("some-module.ko", "my-fake-module.ko"):
+                open(os.path.join(modules_path, "kernel", module), "w").close()
 
-        # Set a path that doesn't contain '/sbin' so we can verify that it's
-        # added to the modprobe call.
-        self.useFixture(fixtures.EnvironmentVariable("PATH", "/usr/bin"))
+        self.check_call_mock.side_effect = fake_unpack
 
         plugin.build()
 
@@ -809,7 +840,7 @@ ACCEPT=n
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -821,38 +852,22 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
 
-        class _check_env:
-            def __init__(self, test):
-                self.test = test
-
-            def __eq__(self, other):
-                self.test.assertThat(other, Contains("PATH"))
-                paths = other["PATH"].split(":")
-                self.test.assertThat(paths, Contains("/sbin"))
-                return True
-
-        self.assertThat(self.run_output_mock.call_count, Equals(1))
-        self.run_output_mock.assert_has_calls(
-            [
-                mock.call(
-                    [
-                        "modprobe",
-                        "-n",
-                        "--show-depends",
-                        "-d",
-                        plugin.installdir,
-                        "-S",
-                        "4.4.2",
-                        "my-fake-module",
-                    ],
-                    env=_check_env(self),
-                )
-            ]
+        initrd_modules_path = os.path.join(
+            plugin.builddir, "initrd-staging", "lib", "modules", "4.4.2"
+        )
+        self.assertThat(
+            os.path.join(initrd_modules_path, "kernel", "my-fake-module.ko"),
+            FileExists(),
+        )
+        self.assertThat(
+            os.path.join(initrd_modules_path, "kernel", "some-module.ko"),
+            Not(FileExists()),
         )
 
         config_file = os.path.join(plugin.builddir, ".config")
@@ -897,7 +912,7 @@ ACCEPT=n
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -909,7 +924,8 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -952,7 +968,7 @@ ACCEPT=n
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -960,7 +976,8 @@ ACCEPT=n
                         "CONFIG_PREFIX={}".format(plugin.installdir),
                         "modules_install",
                         "INSTALL_MOD_PATH={}".format(plugin.installdir),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -1012,7 +1029,7 @@ ACCEPT=n
         self.assertThat(self.run_mock.call_count, Equals(2))
         self.run_mock.assert_has_calls(
             [
-                mock.call(["make", "-j2", "bzImage", "modules"]),
+                mock.call(["make", "-j2", "bzImage", "modules"], env=None),
                 mock.call(
                     [
                         "make",
@@ -1024,7 +1041,8 @@ ACCEPT=n
                         "INSTALL_FW_PATH={}".format(
                             os.path.join(plugin.installdir, "lib", "firmware")
                         ),
-                    ]
+                    ],
+                    env=None,
                 ),
             ]
         )
@@ -17,11 +17,12 @@
 import os
 import textwrap
 
+import fixtures
 from unittest import mock
 from testtools.matchers import Equals, HasLength
 
 import snapcraft
-from snapcraft.internal import errors
+from snapcraft.internal import errors, jobserver
 from snapcraft.plugins import make
 from tests import unit
 
@@ -168,6 +169,49 @@ class MakePluginTestCase(unit.TestCase):
             ]
         )
 
+    @mock.patch.object(make.MakePlugin, "run")
+    def test_build_with_jobserver(self, run_mock):
+        plugin = make.MakePlugin("test-part", self.options, self.project)
+        os.makedirs(plugin.sourcedir)
+
+        with jobserver.serve(2) as server:
+            plugin.build()
+
+        run_mock.assert_has_calls([mock.call(["make"], env=mock.ANY)])
+        self.assertThat(
+            run_mock.call_args_list[0][1]["env"]["MAKEFLAGS"],
+            Equals(server.get_makeflags()),
+        )
+
+    @mock.patch.object(make.MakePlugin, "run")
+    def test_build_with_jobserver_keeps_makeflags(self, run_mock):
+        self.useFixture(fixtures.EnvironmentVariable("MAKEFLAGS", "-k -j8 V=1"))
+        plugin = make.MakePlugin("test-part", self.options, self.project)
+        os.makedirs(plugin.sourcedir)
+
+        with jobserver.serve(2) as server:
+            plugin.build()
+
+        self.assertThat(
+            run_mock.call_args_list[0][1]["env"]["MAKEFLAGS"],
+            Equals(
+                "-k V=1 -j --jobserver-fds={0},{1} --jobserver-auth={0},{1}".format(
+                    *server.fds
+                )
+            ),
+        )
+
+    @mock.patch.object(make.MakePlugin, "run")
+    def test_build_disable_parallel_with_jobserver(self, run_mock):
+        self.options.disable_parallel = True
+        plugin = make.MakePlugin("test-part", self.options, self.project)
+        os.makedirs(plugin.sourcedir)
+
+        with jobserver.serve(2):
+            plugin.build()
+
+        run_mock.assert_has_calls([mock.call(["make", "-j1"], env=None)])
+
     @mock.patch.object(make.MakePlugin, "run")
     def test_build_makefile(self, run_mock):
         self.options.makefile = "makefile.linux"
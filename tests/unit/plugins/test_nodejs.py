@@ -26,7 +26,7 @@ from testscenarios.scenarios import multiply_scenarios
 from testtools.matchers import Equals, HasLength, FileExists
 
 from snapcraft.plugins import nodejs
-from snapcraft.internal import errors
+from snapcraft.internal import cache, errors
 from snapcraft.project import Project
 from tests import fixture_setup, unit
 
@@ -254,6 +254,7 @@ class NodePluginTest(NodePluginBaseTest):
             self.useFixture(fixtures.EnvironmentVariable(v, getattr(self, v)))
 
         self.options.nodejs_package_manager = self.package_manager
+        self.store_dir = cache.DependencyCache(ecosystem=self.package_manager).store_dir
 
     def get_npm_cmd(self, plugin):
         return os.path.join(plugin._npm_dir, "bin", "npm")
@@ -309,7 +310,14 @@ class NodePluginTest(NodePluginBaseTest):
         if self.package_manager == "npm":
             expected_run_calls = [
                 mock.call(
-                    [self.get_npm_cmd(plugin), "install", "--unsafe-perm"],
+                    [
+                        self.get_npm_cmd(plugin),
+                        "install",
+                        "--unsafe-perm",
+                        "--cache",
+                        self.store_dir,
+                        "--prefer-offline",
+                    ],
                     cwd=plugin.builddir,
                     env=expected_env,
                 ),
@@ -323,6 +331,8 @@ class NodePluginTest(NodePluginBaseTest):
                         self.get_npm_cmd(plugin),
                         "install",
                         "--unsafe-perm",
+                        "--cache",
+                        self.store_dir,
                         "--offline",
                         "--prod",
                     ],
@@ -341,14 +351,26 @@ class NodePluginTest(NodePluginBaseTest):
             if self.https_proxy is not None:
                 cmd.extend(["--https-proxy", self.https_proxy])
             expected_run_calls = [
-                mock.call(cmd + ["install"], cwd=plugin.builddir, env=expected_env),
+                mock.call(
+                    cmd
+                    + ["install", "--cache-folder", self.store_dir, "--prefer-offline"],
+                    cwd=plugin.builddir,
+                    env=expected_env,
+                ),
                 mock.call(
                     cmd + ["pack", "--filename", "test-nodejs-1.0.tgz"],
                     cwd=plugin.builddir,
                     env=expected_env,
                 ),
                 mock.call(
-                    cmd + ["install", "--offline", "--prod"],
+                    cmd
+                    + [
+                        "install",
+                        "--cache-folder",
+                        self.store_dir,
+                        "--offline",
+                        "--prod",
+                    ],
                     cwd=os.path.join(plugin.builddir, "package"),
                     env=expected_env,
                 ),
@@ -367,6 +389,36 @@ class NodePluginTest(NodePluginBaseTest):
         ]
         self.tar_mock.assert_has_calls(expected_tar_calls)
 
+    def test_build_with_cached_lockfile(self):
+        plugin = nodejs.NodePlugin("test-part", self.options, self.project)
+
+        self.create_assets(plugin)
+        open(os.path.join(plugin.builddir, "yarn.lock"), "w").close()
+
+        plugin.build()
+        self.run_mock.reset_mock()
+        plugin.build()
+
+        self.assertThat(
+            self.run_mock.call_args_list[0][0][0][-1], Equals("--prefer-offline")
+        )
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        self.run_mock.reset_mock()
+        plugin.build()
+
+        self.assertThat(self.run_mock.call_args_list[0][0][0][-1], Equals("--offline"))
+
+    def test_build_offline_without_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        plugin = nodejs.NodePlugin("test-part", self.options, self.project)
+
+        self.create_assets(plugin)
+        open(os.path.join(plugin.builddir, "yarn.lock"), "w").close()
+
+        self.assertRaises(errors.DependencyCacheMissError, plugin.build)
+        self.run_mock.assert_not_called()
+
     def test_build_scoped_name(self):
         plugin = nodejs.NodePlugin("test-part", self.options, self.project)
 
@@ -377,7 +429,14 @@ class NodePluginTest(NodePluginBaseTest):
         if self.package_manager == "npm":
             expected_run_calls = [
                 mock.call(
-                    [self.get_npm_cmd(plugin), "install", "--unsafe-perm"],
+                    [
+                        self.get_npm_cmd(plugin),
+                        "install",
+                        "--unsafe-perm",
+                        "--cache",
+                        self.store_dir,
+                        "--prefer-offline",
+                    ],
                     cwd=os.path.join(plugin.builddir),
                     env=mock.ANY,
                 ),
@@ -391,6 +450,8 @@ class NodePluginTest(NodePluginBaseTest):
                         self.get_npm_cmd(plugin),
                         "install",
                         "--unsafe-perm",
+                        "--cache",
+                        self.store_dir,
                         "--offline",
                         "--prod",
                     ],
@@ -405,14 +466,26 @@ class NodePluginTest(NodePluginBaseTest):
             if self.https_proxy is not None:
                 cmd.extend(["--https-proxy", self.https_proxy])
             expected_run_calls = [
-                mock.call(cmd + ["install"], cwd=plugin.builddir, env=mock.ANY),
+                mock.call(
+                    cmd
+                    + ["install", "--cache-folder", self.store_dir, "--prefer-offline"],
+                    cwd=plugin.builddir,
+                    env=mock.ANY,
+                ),
                 mock.call(
                     cmd + ["pack", "--filename", "org-name-1.0.tgz"],
                     cwd=plugin.builddir,
                     env=mock.ANY,
                 ),
                 mock.call(
-                    cmd + ["install", "--offline", "--prod"],
+                    cmd
+                    + [
+                        "install",
+                        "--cache-folder",
+                        self.store_dir,
+                        "--offline",
+                        "--prod",
+                    ],
                     cwd=os.path.join(plugin.builddir, "package"),
                     env=mock.ANY,
                 ),
@@ -427,57 +500,89 @@ class NodePluginTest(NodePluginBaseTest):
         self.tar_mock.assert_has_calls(expected_tar_calls)
 
 
+def _write_node_package(package_dir, package_json):
+    os.makedirs(package_dir, exist_ok=True)
+    with open(os.path.join(package_dir, "package.json"), "w") as json_file:
+        json.dump(package_json, json_file)
+
+
 class NodePluginManifestTest(NodePluginBaseTest):
     scenarios = multiply_scenarios(
         [
             (
                 "simple",
                 dict(
-                    ls_output=(
-                        '{"dependencies": {'
-                        '   "testpackage1": {"version": "1.0"},'
-                        '   "testpackage2": {"version": "1.2"}}}'
-                    ),
+                    node_modules={
+                        "testpackage1": {"version": "1.0"},
+                        "testpackage2": {"version": "1.2"},
+                    },
                     expected_dependencies=["testpackage1=1.0", "testpackage2=1.2"],
                 ),
             ),
             (
                 "nested",
                 dict(
-                    ls_output=(
-                        '{"dependencies": {'
-                        '   "testpackage1": {'
-                        '      "version": "1.0",'
-                        '      "dependencies": {'
-                        '        "testpackage2": {"version": "1.2"}}}}}'
-                    ),
+                    node_modules={
+                        "testpackage1": {"version": "1.0"},
+                        "testpackage1/node_modules/testpackage2": {"version": "1.2"},
+                    },
                     expected_dependencies=["testpackage1=1.0", "testpackage2=1.2"],
                 ),
             ),
+            (
+                "breadth first",
+                dict(
+                    node_modules={
+                        "a": {"version": "1.0"},
+                        "a/node_modules/c": {"version": "2.0"},
+                        "b": {"version": "1.1"},
+                    },
+                    expected_dependencies=["a=1.0", "b=1.1", "c=2.0"],
+                ),
+            ),
+            (
+                "scoped",
+                dict(
+                    node_modules={
+                        "@org/testpackage1": {"version": "1.0"},
+                        "testpackage2": {"version": "1.2"},
+                    },
+                    expected_dependencies=[
+                        "@org/testpackage1=1.0",
+                        "testpackage2=1.2",
+                    ],
+                ),
+            ),
             (
                 "missing",
                 dict(
-                    ls_output=(
-                        '{"dependencies": {'
-                        '   "testpackage1": {"version": "1.0"},'
-                        '   "testpackage2": {"version": "1.2"},'
-                        '   "missing": {"noversion": "dummy"}}}'
-                    ),
+                    node_modules={
+                        "testpackage1": {"version": "1.0"},
+                        "testpackage2": {"version": "1.2"},
+                        "missing": {"noversion": "dummy"},
+                    },
                     expected_dependencies=["testpackage1=1.0", "testpackage2=1.2"],
                 ),
             ),
-            ("none", dict(ls_output="{}", expected_dependencies=[])),
+            ("none", dict(node_modules={}, expected_dependencies=[])),
         ],
         [("npm", dict(package_manager="npm")), ("yarn", dict(package_manager="yarn"))],
     )
 
     def test_get_manifest_with_node_packages(self):
-        self.run_output_mock.return_value = self.ls_output
-        self.options.node_package_manager = self.package_manager
+        self.options.nodejs_package_manager = self.package_manager
 
         plugin = nodejs.NodePlugin("test-part", self.options, self.project)
 
         self.create_assets(plugin)
+        for path, package_json in self.node_modules.items():
+            _write_node_package(
+                os.path.join(plugin.builddir, "package", "node_modules", path),
+                package_json,
+            )
+        node_modules_dir = os.path.join(plugin.builddir, "package", "node_modules")
+        os.makedirs(node_modules_dir, exist_ok=True)
+        open(os.path.join(node_modules_dir, ".yarn-integrity"), "w").close()
 
         plugin.build()
 
@@ -489,6 +594,65 @@ class NodePluginManifestTest(NodePluginBaseTest):
         )
 
 
+class NodePluginPackageLockManifestTest(NodePluginBaseTest):
+    scenarios = [
+        (
+            "lockfileVersion 1",
+            dict(
+                package_lock={
+                    "lockfileVersion": 1,
+                    "dependencies": {
+                        "testpackage1": {
+                            "version": "1.0",
+                            "dependencies": {"testpackage3": {"version": "1.3"}},
+                        },
+                        "testpackage2": {"version": "1.2"},
+                        "devpackage": {"version": "2.0", "dev": True},
+                    },
+                }
+            ),
+        ),
+        (
+            "lockfileVersion 2",
+            dict(
+                package_lock={
+                    "lockfileVersion": 2,
+                    "packages": {
+                        "": {"name": "test-nodejs", "version": "1.0"},
+                        "node_modules/devpackage": {"version": "2.0", "dev": True},
+                        "node_modules/testpackage1": {"version": "1.0"},
+                        "node_modules/testpackage1/node_modules/testpackage3": {
+                            "version": "1.3"
+                        },
+                        "node_modules/testpackage2": {"version": "1.2"},
+                    },
+                }
+            ),
+        ),
+    ]
+
+    def test_get_manifest_with_package_lock(self):
+        self.options.nodejs_package_manager = "npm"
+        plugin = nodejs.NodePlugin("test-part", self.options, self.project)
+
+        self.create_assets(plugin)
+        package_dir = os.path.join(plugin.builddir, "package")
+        os.makedirs(package_dir)
+        with open(os.path.join(package_dir, "package-lock.json"), "w") as lock_file:
+            json.dump(self.package_lock, lock_file)
+        # The lockfile is preferred over scanning the installed packages.
+        _write_node_package(
+            os.path.join(package_dir, "node_modules", "unlocked"), {"version": "3.0"}
+        )
+
+        plugin.build()
+
+        self.assertThat(
+            plugin.get_manifest()["node-packages"],
+            Equals(["testpackage1=1.0", "testpackage2=1.2", "testpackage3=1.3"]),
+        )
+
+
 class NodePluginYarnLockManifestTest(NodePluginBaseTest):
     def test_get_manifest_with_yarn_lock_file(self):
         self.options.nodejs_package_manager = "yarn"
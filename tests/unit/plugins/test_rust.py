@@ -20,6 +20,7 @@ import os
 import subprocess
 import textwrap
 
+import fixtures
 from testtools.matchers import Contains, Equals, FileExists, Not
 from unittest import mock
 import toml
@@ -394,6 +395,46 @@ class RustPluginTest(RustPluginBaseTest):
             ]
         )
 
+    @mock.patch.object(rust.sources, "Script")
+    def test_pull_with_cached_lockfile(self, script_mock):
+        plugin = rust.RustPlugin("test-part", self.options, self.project)
+        os.makedirs(plugin.sourcedir)
+        open(os.path.join(plugin.sourcedir, "rust-toolchain"), "w").close()
+        open(os.path.join(plugin.sourcedir, "Cargo.lock"), "w").close()
+
+        plugin.options.rust_revision = []
+        plugin.options.rust_channel = []
+
+        plugin.pull()
+        self.run_mock.reset_mock()
+        plugin.pull()
+
+        self.run_mock.assert_called_with(
+            [
+                plugin._cargo_cmd,
+                "fetch",
+                "--manifest-path",
+                os.path.join(plugin.sourcedir, "Cargo.toml"),
+            ],
+            cwd=plugin.builddir,
+            env=plugin._build_env(),
+        )
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_OFFLINE", "1"))
+        plugin.pull()
+
+        self.run_mock.assert_called_with(
+            [
+                plugin._cargo_cmd,
+                "fetch",
+                "--manifest-path",
+                os.path.join(plugin.sourcedir, "Cargo.toml"),
+                "--offline",
+            ],
+            cwd=plugin.builddir,
+            env=plugin._build_env(),
+        )
+
     @mock.patch.object(rust.sources, "Script")
     def test_pull_with_channel(self, script_mock):
         plugin = rust.RustPlugin("test-part", self.options, self.project)
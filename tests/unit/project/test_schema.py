@@ -17,11 +17,13 @@
 from textwrap import dedent
 from unittest import mock
 
+import jsonschema
 from testscenarios.scenarios import multiply_scenarios
 from testtools.matchers import Contains, Equals, MatchesAny, MatchesRegex
 
 from . import ProjectBaseTest
 from snapcraft.project import errors
+from snapcraft.project import _schema
 from snapcraft.project._schema import Validator
 from tests import unit
 
@@ -78,6 +80,7 @@ class ValidationTest(ValidationBaseTest):
     def test_schema_file_not_found(self):
         mock_the_open = mock.mock_open()
         mock_the_open.side_effect = FileNotFoundError()
+        _schema._read_schema.cache_clear()
 
         with mock.patch("snapcraft.project._schema.open", mock_the_open, create=True):
             raised = self.assertRaises(errors.YamlValidationError, Validator, self.data)
@@ -85,6 +88,26 @@ class ValidationTest(ValidationBaseTest):
         expected_message = "snapcraft validation file is missing from installation path"
         self.assertThat(raised.message, Equals(expected_message))
 
+    def test_schema_checked_once(self):
+        schema = {
+            "$schema": "http://json-schema.org/draft-07/schema#",
+            "properties": {"test-schema-checked-once": {"type": "string"}},
+        }
+
+        validator_class = jsonschema.validators.validator_for(schema)
+
+        with mock.patch.object(validator_class, "check_schema") as check_mock:
+            _schema.validate({"test-schema-checked-once": "valid"}, schema)
+            raised = self.assertRaises(
+                jsonschema.ValidationError,
+                _schema.validate,
+                {"test-schema-checked-once": 1},
+                schema,
+            )
+
+        self.assertThat(raised.message, Equals("1 is not of type 'string'"))
+        check_mock.assert_called_once_with(schema)
+
     def test_icon_missing_is_valid_yaml(self):
         self.mock_path_exists.return_value = False
 
@@ -14,13 +14,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import os
 from textwrap import dedent
+from unittest import mock
 
 from testtools.matchers import Contains, Equals
 
 from . import LoadPartBaseTest, ProjectLoaderBaseTest
 
 from snapcraft.internal.project_loader import errors
+from snapcraft.project import errors as project_errors
 import snapcraft.internal.project_loader._config as _config
 from tests import unit
 
@@ -238,6 +241,71 @@ class DependenciesTest(ProjectLoaderBaseTest):
         )
 
 
+class ResolvedProjectCacheTest(LoadPartBaseTest):
+    def setUp(self):
+        super().setUp()
+
+        self.snapcraft_yaml = dedent(
+            """\
+            name: test
+            base: core18
+            version: "1.0"
+            summary: test
+            description: nothing
+            icon: icon.png
+            confinement: strict
+            grade: devel
+
+            parts:
+              part1:
+                plugin: nil
+        """
+        )
+        open("icon.png", "w").close()
+
+        patcher = mock.patch(
+            "snapcraft.internal.project_loader._config.apply_extensions",
+            wraps=_config.apply_extensions,
+        )
+        self.apply_extensions_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resolved_once(self):
+        config = self.make_snapcraft_project(self.snapcraft_yaml)
+        cached_config = self.make_snapcraft_project(self.snapcraft_yaml)
+
+        self.assertThat(cached_config.data, Equals(config.data))
+        self.assertThat(self.apply_extensions_mock.call_count, Equals(1))
+
+    def test_resolved_again_on_change(self):
+        self.make_snapcraft_project(self.snapcraft_yaml)
+        self.make_snapcraft_project(self.snapcraft_yaml.replace("1.0", "2.0"))
+
+        self.assertThat(self.apply_extensions_mock.call_count, Equals(2))
+
+    def test_resolved_again_on_extensions_change(self):
+        self.make_snapcraft_project(self.snapcraft_yaml)
+        with mock.patch(
+            "snapcraft.internal.project_loader._config.get_extensions_digest",
+            return_value="changed",
+        ):
+            self.make_snapcraft_project(self.snapcraft_yaml)
+
+        self.assertThat(self.apply_extensions_mock.call_count, Equals(2))
+
+    def test_validated_again_on_missing_icon(self):
+        self.make_snapcraft_project(self.snapcraft_yaml)
+        os.remove("icon.png")
+
+        raised = self.assertRaises(
+            project_errors.YamlValidationError,
+            self.make_snapcraft_project,
+            self.snapcraft_yaml,
+        )
+
+        self.assertThat(raised.message, Contains("'icon.png' does not exist"))
+
+
 class FilesetsTest(unit.TestCase):
     def setUp(self):
         super().setUp()
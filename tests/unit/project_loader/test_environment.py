@@ -515,6 +515,29 @@ class EnvironmentTest(ProjectLoaderBaseTest):
         env = project_config.parts.build_env_for_part(project_config.parts.all_parts[0])
         self.assertThat(env, Contains('SNAPCRAFT_PROJECT_DIR="{}"'.format(self.path)))
 
+    def test_compiler_cache(self):
+        self.useFixture(
+            fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", "ccache")
+        )
+        project_config = self.make_snapcraft_project(self.snapcraft_yaml)
+        env = project_config.parts.build_env_for_part(project_config.parts.all_parts[0])
+
+        self.expectThat(project_config.build_tools, Contains("ccache"))
+        self.expectThat(env, Contains('CC="ccache gcc"'))
+        self.expectThat(env, Contains('CXX="ccache g++"'))
+        self.assertThat(
+            env,
+            Contains('CCACHE_DIR="{}"'.format(project_config.compiler_cache.cache_dir)),
+        )
+
+    def test_no_compiler_cache(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_COMPILER_CACHE", None))
+        project_config = self.make_snapcraft_project(self.snapcraft_yaml)
+        env = project_config.parts.build_env_for_part(project_config.parts.all_parts[0])
+
+        self.expectThat(project_config.build_tools, Not(Contains("ccache")))
+        self.assertThat(env, Not(Contains('CC="ccache gcc"')))
+
     def test_build_environment(self):
         self.useFixture(FakeOsRelease())
 
@@ -20,11 +20,11 @@ import textwrap
 from unittest import mock
 
 import fixtures
-from testtools.matchers import Equals, Contains
+from testtools.matchers import Contains, Equals, FileExists, Not
 
 from snapcraft.internal.sources.errors import SnapcraftPullError
-from snapcraft.internal.remote_build import LaunchpadClient, errors
-from tests import unit
+from snapcraft.internal.remote_build import LaunchpadClient, _launchpad, errors
+from tests import fixture_setup, unit
 from . import TestDir
 
 
@@ -307,7 +307,8 @@ class LaunchpadTestCase(unit.TestCase):
                 mock.call(
                     url="url_for/build_log_file_2", gunzip=True, dst="test_amd64.txt"
                 ),
-            ]
+            ],
+            any_order=True,
         )
 
     @mock.patch("snapcraft.internal.remote_build.LaunchpadClient._download_file")
@@ -325,7 +326,131 @@ class LaunchpadTestCase(unit.TestCase):
                 )
             ]
         )
-        mock_log.assert_called_with("Build failed for arch 'amd64'.")
+        mock_log.assert_any_call("Build failed for arch 'amd64'.")
+
+    @mock.patch("snapcraft.internal.remote_build.LaunchpadClient._download_file")
+    @mock.patch("time.sleep")
+    def test_monitor_build_fetches_finished_builds_early(
+        self, mock_sleep, mock_download_file
+    ):
+        pending = SnapBuildEntryImpl(
+            arch_tag="amd64",
+            buildstate="Currently building",
+            self_link="http://build_self_link_2",
+            build_log_url="url_for/build_log_file_2",
+        )
+        done = SnapBuildEntryImpl(
+            arch_tag="i386",
+            buildstate="Successfully built",
+            self_link="http://build_self_link_1",
+            build_log_url="url_for/build_log_file_1",
+        )
+        built = SnapBuildEntryImpl(
+            arch_tag="amd64",
+            buildstate="Successfully built",
+            self_link="http://build_self_link_2",
+            build_log_url="url_for/build_log_file_2",
+        )
+        builds = [[done, pending]] * 3 + [[done, built]]
+
+        def get_builds(snap):
+            state = builds.pop(0)
+            if not builds:
+                # The i386 artifacts were fetched while amd64 was building.
+                fetch_artifacts.mock.assert_called_once_with(
+                    dict(done.__dict__), mock.ANY
+                )
+            return [dict(b.__dict__) for b in state]
+
+        self.useFixture(
+            fixtures.MockPatchObject(self.lpc, "_get_builds", side_effect=get_builds)
+        )
+        fetch_artifacts = self.useFixture(
+            fixtures.MockPatchObject(
+                self.lpc, "_fetch_artifacts", wraps=self.lpc._fetch_artifacts
+            )
+        )
+
+        self.lpc.start_build()
+        self.lpc.monitor_build(interval=30)
+
+        # Polling backs off while nothing changes.
+        self.assertThat(
+            mock_sleep.mock_calls, Equals([mock.call(5), mock.call(10), mock.call(20)])
+        )
+        self.assertThat(mock_download_file.call_count, Equals(3))
+
+    def test_download_file_in_ranges(self):
+        server = self.useFixture(fixture_setup.FakeLibrarianServerRunning())
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.remote_build._launchpad._DOWNLOAD_RANGE_MIN_SIZE",
+                32 * 1024,
+            )
+        )
+
+        self.lpc._download_file(url=server.url + "test.snap", dst="test.snap")
+
+        with open("test.snap", "rb") as f:
+            self.assertThat(f.read(), Equals(server.server.content))
+        self.assertThat(
+            sorted(server.server.range_requests),
+            Equals([(0, 65535), (65536, 131071), (131072, 196607), (196608, 262143)]),
+        )
+
+    def test_download_file_without_ranges(self):
+        server = self.useFixture(fixture_setup.FakeLibrarianServerRunning())
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.remote_build._launchpad._DOWNLOAD_RANGE_MIN_SIZE",
+                32 * 1024,
+            )
+        )
+
+        self.lpc._download_file(url=server.url + "no-ranges/test.snap", dst="test.snap")
+
+        with open("test.snap", "rb") as f:
+            self.assertThat(f.read(), Equals(server.server.content))
+        self.assertThat(server.server.range_requests, Equals([]))
+
+    def test_download_file_with_failing_range(self):
+        server = self.useFixture(fixture_setup.FakeLibrarianServerRunning())
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.remote_build._launchpad._DOWNLOAD_RANGE_MIN_SIZE",
+                32 * 1024,
+            )
+        )
+
+        self.assertFalse(
+            _launchpad._download_ranged(
+                server.url + "failing-ranges/test.snap", "test.snap"
+            )
+        )
+        self.assertThat("test.snap", Not(FileExists()))
+
+        # The file is then downloaded as a single stream.
+        self.lpc._download_file(
+            url=server.url + "failing-ranges/test.snap", dst="test.snap"
+        )
+
+        with open("test.snap", "rb") as f:
+            self.assertThat(f.read(), Equals(server.server.content))
+
+    def test_download_file_with_failing_head(self):
+        server = self.useFixture(fixture_setup.FakeLibrarianServerRunning())
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.remote_build._launchpad._DOWNLOAD_RANGE_MIN_SIZE",
+                32 * 1024,
+            )
+        )
+
+        self.lpc._download_file(url=server.url + "no-head/test.snap", dst="test.snap")
+
+        with open("test.snap", "rb") as f:
+            self.assertThat(f.read(), Equals(server.server.content))
+        self.assertThat(server.server.range_requests, Equals([]))
 
     def test_get_build_status(self):
         self.lpc.start_build()
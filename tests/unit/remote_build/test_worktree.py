@@ -16,6 +16,9 @@
 
 import os
 import tarfile
+from unittest import mock
+
+from testtools.matchers import Equals
 
 from snapcraft.internal.remote_build import WorkTree
 from snapcraft.project import Project
@@ -184,3 +187,39 @@ class WorkTreeTestCase(unit.TestCase):
         )
         self.assertTrue(self._dest.exists("repo", "snap"))
         self.assertTrue(self._dest.exists("repo", "snap", "snapcraft.yaml"))
+
+    def test_archive_is_reproducible(self):
+        self._wt.prepare_repository()
+        with open(self.archive_path("my-part"), "rb") as f:
+            first_archive = f.read()
+
+        self.load_project_and_worktree()
+        self._wt.prepare_repository()
+        with open(self.archive_path("my-part"), "rb") as f:
+            self.assertThat(f.read(), Equals(first_archive))
+
+        with tarfile.open(self.archive_path("my-part"), "r") as t:
+            for m in t.getmembers():
+                self.assertThat((m.mtime, m.uid, m.gid), Equals((0, 0, 0)))
+
+    def test_archive_unchanged_sources_not_recompressed(self):
+        self._wt.prepare_repository()
+
+        self.load_project_and_worktree()
+        with mock.patch(
+            "snapcraft.internal.remote_build._worktree._gzip_parallel"
+        ) as mock_gzip:
+            self._wt.prepare_repository()
+        mock_gzip.assert_not_called()
+        self.assertTrue(self.tarball_file_contains("my-part", None, "foo"))
+
+    def test_archive_changed_sources_recompressed(self):
+        self._wt.prepare_repository()
+
+        with open(os.path.join(self._source.path, "foo"), "w") as f:
+            f.write("changed")
+        self.load_project_and_worktree()
+        self._wt.prepare_repository()
+
+        with tarfile.open(self.archive_path("my-part"), "r") as t:
+            self.assertThat(t.extractfile("./foo").read(), Equals(b"changed"))
@@ -17,7 +17,9 @@
 import os
 import stat
 from textwrap import dedent
+from unittest import mock
 
+import fixtures
 from testtools.matchers import Equals, FileContains, FileExists, Not
 
 from snapcraft.internal import errors
@@ -340,3 +342,37 @@ class FixSUIDTestCase(RepoBaseTestCase):
         BaseRepo(self.tempdir).normalize(self.tempdir)
 
         self.assertThat(stat.S_IMODE(os.stat(file).st_mode), Equals(self.expected_mod))
+
+
+class MarkOriginStagePackageTestCase(RepoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs(os.path.join(self.tempdir, "usr", "bin"))
+        open(os.path.join(self.tempdir, "usr", "bin", "foo"), "w").close()
+        open(os.path.join(self.tempdir, "README"), "w").close()
+
+        patcher = mock.patch(
+            "snapcraft.internal.xattrs.write_origin_stage_package", autospec=True
+        )
+        self.write_mock = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_mark_origin_stage_package(self):
+        origins = BaseRepo(self.tempdir)._mark_origin_stage_package(
+            self.tempdir, "foo=1.0"
+        )
+
+        self.assertThat(
+            origins,
+            Equals({os.path.join("usr", "bin", "foo"): "foo=1.0", "README": "foo=1.0"}),
+        )
+        self.write_mock.assert_not_called()
+
+    def test_mark_origin_stage_package_mirrors_xattrs_for_build_info(self):
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_BUILD_INFO", "1"))
+
+        BaseRepo(self.tempdir)._mark_origin_stage_package(self.tempdir, "foo=1.0")
+
+        self.assertThat(self.write_mock.call_count, Equals(2))
+        self.write_mock.assert_any_call(os.path.join(self.tempdir, "README"), "foo=1.0")
@@ -377,6 +377,67 @@ class UbuntuTestCaseWithFakeAptCache(RepoBaseTestCase):
         )
 
 
+class PackageIndexesTestCase(RepoBaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.fake_apt_cache = fixture_setup.FakeAptCache()
+        self.useFixture(self.fake_apt_cache)
+        self.fake_apt_cache.add_package(
+            fixture_setup.FakeAptCachePackage("main-package", "1.0", installed=True)
+        )
+        self.fake_apt_cache.add_packages(["other-package"])
+        self.sources = "deb http://archive.ubuntu.com/ubuntu xenial main"
+
+        self.snapshot = (1, 1)
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.internal.repo._deb._get_host_snapshot",
+                side_effect=lambda: self.snapshot,
+            )
+        )
+
+    def test_host_cache_is_shared(self):
+        self.assertTrue(repo.Repo.build_package_is_valid("other-package"))
+        self.assertTrue(repo.Repo.is_package_installed("main-package"))
+        self.assertThat(
+            repo.Repo.get_installed_packages(), Equals(["main-package=1.0"])
+        )
+
+        self.assertThat(self.fake_apt_cache.mock_apt_cache.call_count, Equals(1))
+
+    def test_host_cache_reloaded_on_change(self):
+        repo.Repo.build_package_is_valid("main-package")
+        self.snapshot = (2, 1)
+        repo.Repo.build_package_is_valid("main-package")
+
+        self.assertThat(self.fake_apt_cache.mock_apt_cache.call_count, Equals(2))
+
+    def test_archive_cache_is_shared(self):
+        ubuntu = repo.Ubuntu(self.tempdir, sources=self.sources)
+        other_ubuntu = repo.Ubuntu(
+            os.path.join(self.tempdir, "other"), sources=self.sources
+        )
+
+        self.assertTrue(ubuntu.is_valid("main-package"))
+        self.assertFalse(other_ubuntu.is_valid("missing-package"))
+        ubuntu.get(["other-package"])
+
+        self.assertThat(self.fake_apt_cache.mock_apt_cache.call_count, Equals(1))
+        # Marked changes do not leak out of a use of the cache.
+        self.assertThat(self.fake_apt_cache.cache.get_changes(), Equals([]))
+        self.assertThat(
+            os.path.join(self.tempdir, "download", "other-package.deb"), FileExists()
+        )
+
+    def test_archive_cache_per_sources(self):
+        repo.Ubuntu(self.tempdir, sources=self.sources).is_valid("main-package")
+        repo.Ubuntu(self.tempdir, sources=self.sources + " universe").is_valid(
+            "main-package"
+        )
+
+        self.assertThat(self.fake_apt_cache.mock_apt_cache.call_count, Equals(2))
+
+
 class AutokeepTestCase(RepoBaseTestCase):
     def test_autokeep(self):
         self.fake_apt_cache = fixture_setup.FakeAptCache()
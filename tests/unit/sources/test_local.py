@@ -18,12 +18,15 @@ import copy
 import os
 import shutil
 
+import fixtures
 from unittest import mock
 from testtools.matchers import DirExists, Equals, FileContains, FileExists, Not
 
+from snapcraft import yaml_utils
 from snapcraft.internal import common
 from snapcraft.internal import errors
 from snapcraft.internal import sources
+from snapcraft.internal import states
 from tests import unit
 
 
@@ -341,6 +344,87 @@ class TestLocalUpdate(unit.TestCase):
         self.assertThat(os.path.join(destination, "dir", "file2"), FileExists())
 
 
+class TestLocalUpdateContentDigests(unit.TestCase):
+    """Verify that the local source detects changes by content."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.useFixture(fixtures.EnvironmentVariable("SNAPCRAFT_CONTENT_DIGESTS", "1"))
+        os.mkdir("source")
+        os.mkdir("destination")
+        with open(os.path.join("source", "file"), "w") as f:
+            f.write("1")
+
+        self.local = sources.Local("source", "destination")
+        self.local.pull()
+        self._mark_pulled()
+
+    def _mark_pulled(self):
+        state = states.PullState([], part_properties={})
+        state.content_manifest = self.local.content_manifest
+        with open("state", "w") as f:
+            yaml_utils.dump(state, stream=f)
+
+    def _touch(self, path):
+        modify_time = os.stat("state").st_mtime + 1
+        os.utime(path, (modify_time, modify_time))
+
+    def test_file_touched(self):
+        self._touch(os.path.join("source", "file"))
+
+        self.assertFalse(
+            self.local.check("state"), "Expected no update to be available"
+        )
+
+    def test_file_modified_keeping_timestamp(self):
+        file_stat = os.stat(os.path.join("source", "file"))
+        os.unlink(os.path.join("destination", "file"))
+        shutil.copy2(os.path.join("source", "file"), "destination")
+        with open(os.path.join("source", "file"), "w") as f:
+            f.write("2")
+        os.utime(
+            os.path.join("source", "file"), (file_stat.st_atime, file_stat.st_mtime)
+        )
+
+        self.assertTrue(self.local.check("state"), "Expected update to be available")
+
+        self.local.update()
+        self.assertThat(os.path.join("destination", "file"), FileContains("2"))
+        self._mark_pulled()
+        self.assertFalse(
+            self.local.check("state"), "Expected no update to be available"
+        )
+
+    def test_file_added(self):
+        os.mkdir(os.path.join("source", "dir"))
+        with open(os.path.join("source", "dir", "file"), "w") as f:
+            f.write("1")
+
+        self.assertTrue(self.local.check("state"), "Expected update to be available")
+
+        self.local.update()
+        self.assertThat(os.path.join("destination", "dir", "file"), FileContains("1"))
+
+    def test_file_removed(self):
+        os.remove(os.path.join("source", "file"))
+
+        self.assertTrue(self.local.check("state"), "Expected update to be available")
+
+        self.local.update()
+        self.assertThat(os.path.join("destination", "file"), Not(FileExists()))
+
+    def test_without_recorded_manifest(self):
+        self.local.content_manifest = None
+        self._mark_pulled()
+        self._touch(os.path.join("source", "file"))
+
+        self.assertTrue(self.local.check("state"), "Expected update to be available")
+
+        self.local.update()
+        self.assertThat(self.local.content_manifest, Not(Equals(None)))
+
+
 class TestLocalUpdateSnapcraftYaml(unit.TestCase):
 
     scenarios = [
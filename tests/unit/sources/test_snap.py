@@ -22,6 +22,7 @@ from unittest import mock
 from testtools.matchers import DirExists, Equals, FileExists, MatchesRegex
 
 from snapcraft.internal import sources
+from snapcraft.internal.errors import SquashfsUnsupportedCompressionError
 from tests import unit
 
 
@@ -61,10 +62,22 @@ class TestSnap(unit.TestCase):
         else:
             self.assertRaises(KeyError, sources._source_handler["snap"])
 
+    def test_pull_snap_file_without_name_fails(self):
+        with mock.patch(
+            "snapcraft.internal.squashfs.SquashFsImage.read_file",
+            return_value=b"summary: no name",
+        ):
+            snap_source = sources.Snap(self.test_file_path, self.dest_dir)
+            self.assertRaises(sources.errors.InvalidSnapError, snap_source.pull)
+
+    @mock.patch(
+        "snapcraft.internal.squashfs.SquashFsImage",
+        side_effect=SquashfsUnsupportedCompressionError(compression="lzo"),
+    )
     @mock.patch(
         "subprocess.check_output", side_effect=subprocess.CalledProcessError(1, [])
     )
-    def test_pull_failure_bad_unsquash(self, mock_run):
+    def test_pull_failure_bad_unsquash(self, mock_run, mock_image):
         snap_source = sources.Snap(self.test_file_path, self.dest_dir)
         raised = self.assertRaises(sources.errors.SnapcraftPullError, snap_source.pull)
         self.assertThat(
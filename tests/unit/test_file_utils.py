@@ -14,14 +14,16 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import errno
 import os
 import re
 import subprocess
 from unittest import mock
 
+import fixtures
 import testtools
 import testscenarios
-from testtools.matchers import Equals
+from testtools.matchers import Equals, FileExists, Not
 
 from snapcraft import file_utils
 from snapcraft.internal.errors import (
@@ -189,6 +191,92 @@ class TestLinkOrCopy(unit.TestCase):
         self.assertTrue(os.path.isfile("foo2/bar/baz/4"))
 
 
+class TestClone(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs(os.path.join("foo", "bar"))
+        with open(os.path.join("foo", "1"), "wb") as f:
+            f.write(b"data" * 1024)
+        os.chmod(os.path.join("foo", "1"), 0o751)
+        open(os.path.join("foo", "bar", "2"), "w").close()
+        os.symlink("1", os.path.join("foo", "1-link"))
+
+        self.useFixture(
+            fixtures.MockPatch("snapcraft.file_utils._reflink_unsupported", set())
+        )
+        self.useFixture(
+            fixtures.MockPatch(
+                "snapcraft.file_utils._copy_file_range_unsupported", set()
+            )
+        )
+
+    def assert_is_copy(self, source, destination):
+        self.assertFalse(os.path.samefile(source, destination))
+        with open(source, "rb") as s, open(destination, "rb") as d:
+            self.assertThat(d.read(), Equals(s.read()))
+        self.assertThat(os.stat(destination).st_mode, Equals(os.stat(source).st_mode))
+        self.assertThat(os.stat(destination).st_mtime, Equals(os.stat(source).st_mtime))
+
+    def test_clone(self):
+        file_utils.clone(os.path.join("foo", "1"), "1")
+
+        self.assert_is_copy(os.path.join("foo", "1"), "1")
+
+    def test_clone_overwrites(self):
+        os.link(os.path.join("foo", "1"), "1")
+
+        file_utils.clone(os.path.join("foo", "1"), "1")
+
+        self.assert_is_copy(os.path.join("foo", "1"), "1")
+
+    def test_clone_symlink(self):
+        file_utils.clone(
+            os.path.join("foo", "1-link"), os.path.join("foo", "bar", "1-link")
+        )
+
+        self.assertThat(os.path.join("foo", "bar", "1-link"), Not(FileExists()))
+        self.assertThat(os.readlink(os.path.join("foo", "bar", "1-link")), Equals("1"))
+
+    @mock.patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "unsupported"))
+    def test_clone_without_reflink_support(self, mock_ioctl):
+        file_utils.clone(os.path.join("foo", "1"), "1")
+        file_utils.clone(os.path.join("foo", "1"), "2")
+
+        self.assert_is_copy(os.path.join("foo", "1"), "1")
+        self.assert_is_copy(os.path.join("foo", "1"), "2")
+        # Support is only probed once per filesystem.
+        self.assertThat(mock_ioctl.call_count, Equals(1))
+
+    @mock.patch("fcntl.ioctl", side_effect=OSError(errno.EOPNOTSUPP, "unsupported"))
+    def test_clone_without_copy_file_range_support(self, mock_ioctl):
+        self.useFixture(
+            fixtures.MockPatch(
+                "os.copy_file_range",
+                side_effect=OSError(errno.EXDEV, "cross-device"),
+                create=True,
+            )
+        )
+
+        file_utils.clone(os.path.join("foo", "1"), "1")
+
+        self.assert_is_copy(os.path.join("foo", "1"), "1")
+
+    @mock.patch("fcntl.ioctl", side_effect=OSError(errno.EIO, "I/O error"))
+    def test_clone_error_falls_back_to_copy(self, mock_ioctl):
+        file_utils.clone(os.path.join("foo", "1"), "1")
+
+        self.assert_is_copy(os.path.join("foo", "1"), "1")
+
+    def test_clone_tree(self):
+        file_utils.clone_tree("foo", "qux", ignore=lambda d, f: ["2"])
+
+        self.assert_is_copy(os.path.join("foo", "1"), os.path.join("qux", "1"))
+        self.assertThat(os.path.join("qux", "1-link"), unit.LinkExists("1"))
+        self.assertTrue(os.path.isdir(os.path.join("qux", "bar")))
+        self.assertFalse(os.path.exists(os.path.join("qux", "bar", "2")))
+
+
 class RequiresCommandSuccessTestCase(unit.TestCase):
     @mock.patch("subprocess.check_call")
     def test_requires_command_works(self, mock_check_call):
@@ -290,6 +378,63 @@ class RequiresPathExistsTestCase(unit.TestCase):
         self.assertThat(str(raised), Equals("what? 'foo'"))
 
 
+class CalculateContentManifestTestCase(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        os.makedirs(os.path.join("root", "dir"))
+        with open(os.path.join("root", "file"), "w") as f:
+            f.write("file")
+        with open(os.path.join("root", "dir", "file"), "w") as f:
+            f.write("file")
+        os.symlink("dir", os.path.join("root", "link"))
+
+    def test_manifest(self):
+        manifest = file_utils.calculate_content_manifest("root")
+
+        self.assertThat(
+            sorted(manifest), Equals([os.path.join("dir", "file"), "file", "link"])
+        )
+        self.expectThat(manifest["file"], Equals(manifest[os.path.join("dir", "file")]))
+        self.expectThat(manifest["link"], Not(Equals(manifest["file"])))
+
+    def test_manifest_of_paths(self):
+        manifest = file_utils.calculate_content_manifest(
+            "root", paths=["file", "dir", "missing"]
+        )
+
+        self.assertThat(list(manifest), Equals(["file"]))
+
+    def test_manifest_ignore(self):
+        manifest = file_utils.calculate_content_manifest(
+            "root", ignore=lambda directory, files: ["dir"]
+        )
+
+        self.assertThat(sorted(manifest), Equals(["file", "link"]))
+
+    def test_manifest_follows_content(self):
+        manifest = file_utils.calculate_content_manifest("root")
+
+        os.utime(os.path.join("root", "file"), (0, 0))
+        self.expectThat(file_utils.calculate_content_manifest("root"), Equals(manifest))
+
+        with open(os.path.join("root", "file"), "w") as f:
+            f.write("changed")
+        self.expectThat(
+            file_utils.calculate_content_manifest("root"), Not(Equals(manifest))
+        )
+
+    def test_manifest_digest(self):
+        self.assertThat(
+            file_utils.calculate_manifest_digest(dict(a="1", b="2")),
+            Equals(file_utils.calculate_manifest_digest(dict(b="2", a="1"))),
+        )
+        self.assertThat(
+            file_utils.calculate_manifest_digest(dict(a="1", b="2")),
+            Not(Equals(file_utils.calculate_manifest_digest(dict(a="2", b="1")))),
+        )
+
+
 class TestGetLinkerFromFile(unit.TestCase):
     def test_get_linker_version_from_basename(self):
         self.assertThat(
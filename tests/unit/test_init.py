@@ -26,3 +26,18 @@ class VersionTestCase(unit.TestCase):
         self.useFixture(fixtures.EnvironmentVariable("SNAP_NAME", "snapcraft"))
         self.useFixture(fixtures.EnvironmentVariable("SNAP_VERSION", "3.14"))
         self.assertThat(snapcraft._get_version(), Equals("3.14"))
+
+
+class LazyAttributesTestCase(unit.TestCase):
+    def test_lazy_attribute(self):
+        from snapcraft._baseplugin import BasePlugin
+
+        self.assertThat(snapcraft.BasePlugin, Equals(BasePlugin))
+
+    def test_lazy_module(self):
+        from snapcraft.internal import repo
+
+        self.assertThat(snapcraft.repo, Equals(repo))
+
+    def test_unknown_attribute(self):
+        self.assertRaises(AttributeError, getattr, snapcraft, "does_not_exist")
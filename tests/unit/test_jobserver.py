@@ -0,0 +1,114 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+from unittest import mock
+
+from testtools.matchers import Equals, Is
+
+from snapcraft.internal import common, jobserver
+from tests import unit
+
+
+def _take_tokens(read_fd: int) -> bytes:
+    os.set_blocking(read_fd, False)
+    try:
+        return os.read(read_fd, 512)
+    except BlockingIOError:
+        return b""
+    finally:
+        os.set_blocking(read_fd, True)
+
+
+class JobServerTest(unit.TestCase):
+    def test_tokens(self):
+        with jobserver.JobServer(4) as server:
+            # The first job runs without a token.
+            self.assertThat(_take_tokens(server.fds[0]), Equals(b"+++"))
+
+    def test_single_job_has_no_tokens(self):
+        with jobserver.JobServer(1) as server:
+            self.assertThat(_take_tokens(server.fds[0]), Equals(b""))
+
+    def test_reset_restores_lost_tokens(self):
+        with jobserver.JobServer(3) as server:
+            os.read(server.fds[0], 1)
+
+            server.reset()
+
+            self.assertThat(_take_tokens(server.fds[0]), Equals(b"++"))
+
+    def test_reset_does_not_add_tokens(self):
+        with jobserver.JobServer(3) as server:
+            server.reset()
+
+            self.assertThat(_take_tokens(server.fds[0]), Equals(b"++"))
+
+    def test_makeflags(self):
+        with jobserver.JobServer(2) as server:
+            self.assertThat(
+                server.get_makeflags(),
+                Equals(
+                    "-j --jobserver-fds={0},{1} --jobserver-auth={0},{1}".format(
+                        *server.fds
+                    )
+                ),
+            )
+
+    def test_makeflags_keeps_options(self):
+        with jobserver.JobServer(2) as server:
+            self.assertThat(
+                server.get_makeflags(
+                    "k -j4 --jobserver-auth=3,4 -I/usr/include -- V=1"
+                ),
+                Equals(
+                    "k -I/usr/include -j --jobserver-fds={0},{1} "
+                    "--jobserver-auth={0},{1} -- V=1".format(*server.fds)
+                ),
+            )
+
+    def test_close(self):
+        server = jobserver.JobServer(2)
+        server.close()
+
+        self.assertRaises(OSError, os.fstat, server.fds[0])
+        self.assertRaises(OSError, os.fstat, server.fds[1])
+
+
+class ServeTest(unit.TestCase):
+    def test_serve(self):
+        self.assertThat(jobserver.get_jobserver(), Is(None))
+
+        with jobserver.serve(2) as server:
+            self.assertThat(jobserver.get_jobserver(), Is(server))
+
+        self.assertThat(jobserver.get_jobserver(), Is(None))
+        self.assertRaises(OSError, os.fstat, server.fds[0])
+
+    @mock.patch("subprocess.check_call")
+    def test_run_passes_fds(self, check_call_mock):
+        with jobserver.serve(2) as server:
+            common.run(["make"])
+
+        check_call_mock.assert_called_once_with(
+            ["/bin/sh"], stdin=mock.ANY, pass_fds=server.fds
+        )
+
+    @mock.patch("subprocess.check_call")
+    def test_run_without_jobserver(self, check_call_mock):
+        common.run(["make"])
+
+        check_call_mock.assert_called_once_with(["/bin/sh"], stdin=mock.ANY)
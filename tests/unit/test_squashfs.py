@@ -0,0 +1,340 @@
+# -*- Mode:Python; indent-tabs-mode:nil; tab-width:4 -*-
+#
+# Copyright (C) 2020 Canonical Ltd
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License version 3 as
+# published by the Free Software Foundation.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+import lzma
+import os
+import struct
+import subprocess
+from unittest import mock
+
+from testtools.matchers import (
+    DirExists,
+    Equals,
+    FileContains,
+    FileExists,
+    Not,
+    PathExists,
+)
+
+from snapcraft.internal import errors, squashfs
+from tests import unit
+
+
+_BLOCK_SIZE = 4096
+
+
+class _SquashFsWriter:
+    """Minimal squashfs writer to build test images.
+
+    Metadata is stored uncompressed, data blocks are xz compressed. The tree
+    is a dict of name to bytes (file), dict (directory), str (symlink) or
+    a tuple ("hardlink", name) pointing to a previous file in the same
+    directory.
+    """
+
+    def __init__(self, tree):
+        self._data = bytearray(96)
+        self._inodes = bytearray()
+        self._directories = bytearray()
+        self._fragment = bytearray()
+        self._inode_count = 0
+        root, _, _ = self._add_directory(tree)
+        fragment_start = len(self._data)
+        compressed_fragment = lzma.compress(bytes(self._fragment))
+        self._data += compressed_fragment
+        inode_table = len(self._data)
+        self._data += _metadata(self._inodes)
+        directory_table = len(self._data)
+        self._data += _metadata(self._directories)
+        fragment_table = self._add_table(
+            struct.pack("<QII", fragment_start, len(compressed_fragment), 0)
+        )
+        id_table = self._add_table(struct.pack("<I", os.getuid()))
+        self._data[:96] = struct.pack(
+            "<IIIIIHHHHHHQQQQQQQQ",
+            0x73717368,
+            self._inode_count,
+            0,
+            _BLOCK_SIZE,
+            1,
+            4,
+            _BLOCK_SIZE.bit_length() - 1,
+            0,
+            1,
+            4,
+            0,
+            root,
+            len(self._data),
+            id_table,
+            0xFFFFFFFFFFFFFFFF,
+            inode_table,
+            directory_table,
+            fragment_table,
+            0xFFFFFFFFFFFFFFFF,
+        )
+
+    def write(self, path):
+        with open(path, "wb") as f:
+            f.write(self._data)
+
+    def _add_table(self, entries):
+        metadata_start = len(self._data)
+        self._data += _metadata(entries)
+        table_start = len(self._data)
+        self._data += struct.pack("<Q", metadata_start)
+        return table_start
+
+    def _add_inode(self, inode_type, mode, payload):
+        self._inode_count += 1
+        reference = _reference(len(self._inodes))
+        self._inodes += struct.pack(
+            "<HHHHII", inode_type, mode, 0, 0, 1234567890, self._inode_count
+        )
+        self._inodes += payload
+        return reference, self._inode_count, inode_type
+
+    def _add_file(self, content):
+        start = len(self._data)
+        sizes = []
+        whole_blocks = len(content) // _BLOCK_SIZE
+        for index in range(whole_blocks):
+            block = content[index * _BLOCK_SIZE : (index + 1) * _BLOCK_SIZE]
+            if not any(block):
+                # Sparse block.
+                sizes.append(0)
+                continue
+            compressed = lzma.compress(block)
+            self._data += compressed
+            sizes.append(len(compressed))
+        tail = content[whole_blocks * _BLOCK_SIZE :]
+        fragment_offset = len(self._fragment)
+        self._fragment += tail
+        payload = struct.pack("<IIII", start, 0, fragment_offset, len(content))
+        payload += struct.pack("<{}I".format(len(sizes)), *sizes)
+        return self._add_inode(2, 0o644, payload)
+
+    def _add_directory(self, tree):
+        entries = []
+        for name, value in sorted(tree.items()):
+            if isinstance(value, bytes):
+                entries.append((name, self._add_file(value)))
+            elif isinstance(value, dict):
+                entries.append((name, self._add_directory(value)))
+            elif isinstance(value, tuple):
+                entries.append((name, dict(entries)[value[1]]))
+            else:
+                target = value.encode()
+                payload = struct.pack("<II", 1, len(target)) + target
+                entries.append((name, self._add_inode(3, 0o777, payload)))
+
+        listing_position = len(self._directories)
+        for name, (reference, number, inode_type) in entries:
+            self._directories += struct.pack("<IIi", 0, reference >> 16, number)
+            self._directories += struct.pack(
+                "<HhHH", reference & 0xFFFF, 0, inode_type, len(name) - 1
+            )
+            self._directories += name.encode()
+        listing_size = len(self._directories) - listing_position
+        listing = _reference(listing_position)
+        payload = struct.pack(
+            "<IIHHI", listing >> 16, 2, listing_size + 3, listing & 0xFFFF, 0
+        )
+        return self._add_inode(1, 0o755, payload)
+
+
+def _metadata(data):
+    # Uncompressed metadata blocks of 8 KiB.
+    blocks = bytearray()
+    for offset in range(0, max(len(data), 1), 8192):
+        chunk = data[offset : offset + 8192]
+        blocks += struct.pack("<H", len(chunk) | 0x8000) + chunk
+    return bytes(blocks)
+
+
+def _reference(position):
+    # Position in the uncompressed metadata stream to an inode reference.
+    block, offset = divmod(position, 8192)
+    return (block * 8194) << 16 | offset
+
+
+class SquashFsImageTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        self.big_content = os.urandom(_BLOCK_SIZE * 3) + b"tail"
+        self.sparse_content = b"start" + bytes(_BLOCK_SIZE * 2) + b"end"
+        tree = {
+            "meta": {"snap.yaml": b"name: test\n"},
+            "bin": {
+                "big": self.big_content,
+                "big-link": ("hardlink", "big"),
+                "link": "big",
+                "sparse": self.sparse_content,
+            },
+            "empty": {},
+            "empty-file": b"",
+        }
+        self.image_path = os.path.join(self.path, "test.snap")
+        _SquashFsWriter(tree).write(self.image_path)
+
+    def test_list(self):
+        with squashfs.SquashFsImage(self.image_path) as image:
+            self.assertThat(
+                image.list(),
+                Equals(
+                    [
+                        "bin",
+                        "bin/big",
+                        "bin/big-link",
+                        "bin/link",
+                        "bin/sparse",
+                        "empty",
+                        "empty-file",
+                        "meta",
+                        "meta/snap.yaml",
+                    ]
+                ),
+            )
+
+    def test_read_file(self):
+        with squashfs.SquashFsImage(self.image_path) as image:
+            self.assertThat(image.read_file("bin/big"), Equals(self.big_content))
+            self.assertThat(image.read_file("bin/sparse"), Equals(self.sparse_content))
+            self.assertThat(image.read_file("meta/snap.yaml"), Equals(b"name: test\n"))
+
+    def test_read_file_not_found(self):
+        with squashfs.SquashFsImage(self.image_path) as image:
+            self.assertRaises(
+                errors.SquashfsPathNotFoundError, image.read_file, "bin/missing"
+            )
+            self.assertRaises(errors.SquashfsPathNotFoundError, image.read_file, "bin")
+
+    def test_exists(self):
+        with squashfs.SquashFsImage(self.image_path) as image:
+            self.assertTrue(image.exists("bin/link"))
+            self.assertFalse(image.exists("bin/missing"))
+
+    def test_extract(self):
+        squashfs.extract(self.image_path, "dest")
+
+        big = os.path.join("dest", "bin", "big")
+        with open(big, "rb") as f:
+            self.assertThat(f.read(), Equals(self.big_content))
+        with open(os.path.join("dest", "bin", "sparse"), "rb") as f:
+            self.assertThat(f.read(), Equals(self.sparse_content))
+        self.assertThat(
+            os.path.samefile(big, os.path.join("dest", "bin", "big-link")),
+            Equals(True),
+        )
+        self.assertThat(os.readlink(os.path.join("dest", "bin", "link")), Equals("big"))
+        self.assertThat(os.stat(big).st_mtime, Equals(1234567890))
+        self.assertThat(os.stat(big).st_mode & 0o777, Equals(0o644))
+        self.assertThat(os.path.join("dest", "empty"), DirExists())
+        self.assertThat(os.path.join("dest", "empty-file"), FileContains(""))
+
+    def test_extract_paths_and_rename(self):
+        os.makedirs(os.path.join("dest", "meta.test"))
+        with open(os.path.join("dest", "meta.test", "snap.yaml"), "w") as f:
+            f.write("old")
+
+        squashfs.extract(
+            self.image_path, "dest", paths=["meta"], rename={"meta": "meta.test"}
+        )
+
+        self.assertThat(
+            os.path.join("dest", "meta.test", "snap.yaml"),
+            FileContains("name: test\n"),
+        )
+        self.assertThat(os.path.join("dest", "meta"), Not(PathExists()))
+        self.assertThat(os.path.join("dest", "bin"), Not(PathExists()))
+
+    def test_invalid_image(self):
+        with open("invalid.snap", "wb") as f:
+            f.write(b"not a squashfs image" * 10)
+
+        self.assertRaises(
+            errors.SquashfsReadError, squashfs.SquashFsImage, "invalid.snap"
+        )
+
+
+class SnapFixturesTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.data_path = os.path.join(os.path.dirname(unit.__file__), "..", "data")
+
+    def test_read_file(self):
+        self.assertThat(
+            squashfs.read_file(
+                os.path.join(self.data_path, "test-snap.snap"), "meta/snap.yaml"
+            ),
+            Equals(
+                b"architectures:\n- amd64\n"
+                b"description: Description of the most simple snap\n"
+                b"name: basic\nsummary: Summary of the most simple snap\n"
+                b"version: 0.1\n"
+            ),
+        )
+
+    def test_extract(self):
+        squashfs.extract(
+            os.path.join(self.data_path, "test-snap-with-icon.snap"), "dest"
+        )
+
+        self.assertThat(os.path.join("dest", "meta", "snap.yaml"), FileExists())
+        self.assertThat(os.path.join("dest", "meta", "gui", "icon.svg"), FileExists())
+
+
+class UnsquashfsFallbackTest(unit.TestCase):
+    def setUp(self):
+        super().setUp()
+
+        patcher = mock.patch(
+            "snapcraft.internal.squashfs.SquashFsImage",
+            side_effect=errors.SquashfsUnsupportedCompressionError(compression="lzo"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch(
+            "snapcraft.file_utils.get_tool_path", side_effect=lambda x: x
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @mock.patch("subprocess.check_output")
+    def test_read_file(self, mock_check_output):
+        def _unsquashfs(command):
+            path = os.path.join(command[3], "meta", "snap.yaml")
+            os.makedirs(os.path.dirname(path))
+            with open(path, "w") as f:
+                f.write("name: test")
+
+        mock_check_output.side_effect = _unsquashfs
+
+        self.assertThat(
+            squashfs.read_file("test.snap", "meta/snap.yaml"), Equals(b"name: test")
+        )
+        mock_check_output.assert_called_once_with(
+            ["unsquashfs", "-force", "-dest", mock.ANY, "test.snap", "meta/snap.yaml"]
+        )
+
+    @mock.patch(
+        "subprocess.check_output", side_effect=subprocess.CalledProcessError(1, [])
+    )
+    def test_unsquashfs_failure(self, mock_check_output):
+        self.assertRaises(
+            errors.SquashfsReadError, squashfs.read_file, "test.snap", "meta/snap.yaml"
+        )